@@ -0,0 +1,119 @@
+import argparse
+import datetime
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+from typing import List
+
+
+def setup_django(db_path: Path):
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'django_app.settings')
+    import django  # pylint: disable=import-outside-toplevel
+    from django.conf import settings  # pylint: disable=import-outside-toplevel
+    from django.core.management import call_command  # pylint: disable=import-outside-toplevel
+    from django.test.utils import setup_test_environment  # pylint: disable=import-outside-toplevel
+
+    settings.DATABASES['default']['NAME'] = db_path
+    django.setup()
+    setup_test_environment()
+    call_command('migrate', verbosity=0)
+
+
+def git_commit() -> str | None:
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', 'HEAD'],
+            capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def parse_args(argv: List[str]):
+    parser = argparse.ArgumentParser(
+        prog='python -m benchmarks',
+        description='Runs the category benchmarks and emits JSON results'
+    )
+    parser.add_argument(
+        '--sizes', default='1000',
+        help='comma separated dataset sizes, e.g. 1000,100000,1000000')
+    parser.add_argument('--filter', help='only run benchmarks whose name contains this')
+    parser.add_argument('--rounds', type=int, default=5)
+    parser.add_argument('--iterations', type=int, default=20)
+    parser.add_argument('--output', type=Path, help='write the JSON results to this file')
+    parser.add_argument('--compare', type=Path, help='JSON results of a previous run')
+    parser.add_argument(
+        '--threshold', type=float, default=0.10,
+        help='relative slowdown of the median reported as a regression')
+    return parser.parse_args(argv)
+
+
+def main(argv: List[str] = None) -> int:
+    args = parse_args(sys.argv[1:] if argv is None else argv)
+    sizes = [int(size) for size in args.sizes.split(',') if size]
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        setup_django(Path(tmp_dir) / 'benchmarks.sqlite3')
+
+        # pylint: disable=import-outside-toplevel,unused-import
+        from benchmarks import bench_api, bench_entities, bench_repositories, bench_use_cases
+        from benchmarks.runner import compare, registry, results_to_dict, run_benchmark
+
+        benchmarks = registry.select(args.filter)
+        results = []
+        for bench in [bench for bench in benchmarks if not bench.sized]:
+            results.append(run_benchmark(bench, None, args.rounds, args.iterations))
+            print_result(results[-1])
+        for size in sizes:
+            for bench in [bench for bench in benchmarks if bench.sized]:
+                results.append(run_benchmark(bench, size, args.rounds, args.iterations))
+                print_result(results[-1])
+
+    import django  # pylint: disable=import-outside-toplevel
+    output = results_to_dict(results, {
+        'commit': git_commit(),
+        'created_at': datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        'python': platform.python_version(),
+        'django': django.get_version(),
+        'platform': platform.platform(),
+        'sizes': sizes,
+        'rounds': args.rounds,
+        'iterations': args.iterations,
+    })
+    if args.output:
+        args.output.write_text(json.dumps(output, indent=2), encoding='utf-8')
+    else:
+        print(json.dumps(output))
+
+    if not args.compare:
+        return 0
+
+    baseline = json.loads(args.compare.read_text(encoding='utf-8'))
+    regressions = 0
+    for comparison in compare(baseline, output):
+        is_regression = comparison.is_regression(args.threshold)
+        regressions += is_regression
+        print(
+            f"{comparison.name:<60} {str(comparison.size or ''):>8} "
+            f"{comparison.change:+8.1%}{'  REGRESSION' if is_regression else ''}",
+            file=sys.stderr
+        )
+    return 1 if regressions else 0
+
+
+def print_result(result):
+    print(
+        f'{result.name:<60} {str(result.size or ""):>8} '
+        f'median {result.stats.median * 1e6:>12.1f}us '
+        f'p95 {result.stats.p95 * 1e6:>12.1f}us '
+        f'{result.stats.ops_per_sec:>12.1f} ops/s',
+        file=sys.stderr
+    )
+
+
+if __name__ == '__main__':
+    sys.exit(main())
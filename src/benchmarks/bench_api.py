@@ -0,0 +1,66 @@
+from django.db import transaction
+from django.test import Client
+
+from benchmarks import datasets
+from benchmarks.bench_repositories import last_page, FILTER, PER_PAGE
+from benchmarks.runner import benchmark
+from core.category.infra.django_app.api import resolve_once
+from django_app import container
+
+
+def _get(client: Client, path: str, params=None):
+    def operation():
+        response = client.get(path, params)
+        assert response.status_code == 200, response.status_code
+    return operation
+
+
+@benchmark('api')
+def list_categories(context):
+    datasets.load_table(context.size)
+    return _get(Client(), '/categories/')
+
+
+@benchmark('api')
+def list_categories_filtered_deep(context):
+    datasets.load_table(context.size)
+    return _get(Client(), '/categories/', {
+        'page': last_page(context.size),
+        'per_page': PER_PAGE,
+        'sort': 'name',
+        'filter': FILTER
+    })
+
+
+@benchmark('api')
+def get_category(context):
+    datasets.load_table(context.size)
+    category_id = datasets.category_ids(context.size)[-1]
+    return _get(Client(), f'/categories/{category_id}/')
+
+
+@benchmark('api')
+def create_category(context):
+    datasets.load_table(context.size)
+    client = Client()
+
+    def operation():
+        response = client.post(
+            '/categories/', {'name': 'Movie'}, content_type='application/json')
+        assert response.status_code == 201, response.status_code
+
+    with transaction.atomic():
+        yield operation
+        transaction.set_rollback(True)
+
+
+# per request cost of resolving a use case: through the container provider
+# (what CategoryResource did on every request) against the cached handler
+@benchmark('dispatch', sized=False)
+def container_provider_resolution(_context):
+    return container.use_case_category_get_category
+
+
+@benchmark('dispatch', sized=False)
+def cached_resolution(_context):
+    return resolve_once(container.use_case_category_get_category)
@@ -0,0 +1,19 @@
+from benchmarks.runner import benchmark
+from core.category.domain.entities import Category
+
+
+@benchmark('entities', sized=False)
+def category_construction(_context):
+    return lambda: Category(name='Movie', description='some description')
+
+
+@benchmark('entities', sized=False)
+def category_validation(_context):
+    category = Category(name='Movie', description='some description')
+    return category.validate
+
+
+@benchmark('entities', sized=False)
+def category_to_dict(_context):
+    category = Category(name='Movie', description='some description')
+    return category.to_dict
@@ -0,0 +1,216 @@
+import functools
+import math
+import tempfile
+from pathlib import Path
+from typing import Callable
+
+from django.db import transaction
+
+from benchmarks import datasets
+from benchmarks.runner import benchmark
+from core.__seedwork.domain.value_objects import UniqueEntityID
+from core.category.domain.entities import Category
+from core.category.domain.repositories import CategoryRepository
+from core.category.infra.django_app.repositories import CategoryDjangoRepository
+from core.category.infra.django_app.search import search_backend
+from core.category.infra.in_memory.search_engines import HAS_NUMPY, search_engine
+from core.category.infra.in_memory.snapshot import load_snapshot, save_snapshot
+
+PER_PAGE = 15
+FILTER = 'filmes'
+
+
+@functools.lru_cache(maxsize=None)
+def last_page(size: int) -> int:
+    matches = sum(1 for row in datasets.rows(size) if FILTER in row['name'].lower())
+    return max(1, math.ceil(matches / PER_PAGE))
+
+
+def search_params(size: int, deep: bool) -> CategoryRepository.SearchParams:
+    return CategoryRepository.SearchParams(
+        page=last_page(size) if deep else 1,
+        per_page=PER_PAGE,
+        sort='name',
+        sort_dir='asc',
+        filter=FILTER
+    )
+
+
+def new_categories(calls: int):
+    return iter([Category(name=f'Movie {index}') for index in range(calls)])
+
+
+@benchmark('in_memory_repository', 'insert')
+def in_memory_insert(context):
+    repo = datasets.in_memory_repository(context.size)
+    entities = new_categories(context.calls)
+    return lambda: repo.insert(next(entities))
+
+
+@benchmark('in_memory_repository', 'find_by_id')
+def in_memory_find_by_id(context):
+    repo = datasets.in_memory_repository(context.size)
+    entity_id = repo.items[-1].id
+    return lambda: repo.find_by_id(entity_id)
+
+
+@benchmark('in_memory_repository', 'search_default')
+def in_memory_search_default(context):
+    repo = datasets.in_memory_repository(context.size)
+    params = CategoryRepository.SearchParams()
+    return lambda: repo.search(params)
+
+
+@benchmark('in_memory_repository', 'search_filtered_sorted_shallow')
+def in_memory_search_filtered_sorted_shallow(context):
+    repo = datasets.in_memory_repository(context.size)
+    params = search_params(context.size, deep=False)
+    return lambda: repo.search(params)
+
+
+@benchmark('in_memory_repository', 'search_filtered_sorted_deep')
+def in_memory_search_filtered_sorted_deep(context):
+    repo = datasets.in_memory_repository(context.size)
+    params = search_params(context.size, deep=True)
+    return lambda: repo.search(params)
+
+
+@benchmark('columnar_repository', 'insert')
+def columnar_insert(context):
+    repo = datasets.columnar_repository(context.size)
+    entities = new_categories(context.calls)
+    return lambda: repo.insert(next(entities))
+
+
+@benchmark('columnar_repository', 'find_by_id')
+def columnar_find_by_id(context):
+    repo = datasets.columnar_repository(context.size)
+    entity_id = datasets.categories(context.size)[-1].id
+    return lambda: repo.find_by_id(entity_id)
+
+
+@benchmark('columnar_repository', 'search_default')
+def columnar_search_default(context):
+    repo = datasets.columnar_repository(context.size)
+    params = CategoryRepository.SearchParams()
+    return lambda: repo.search(params)
+
+
+@benchmark('columnar_repository', 'search_filtered_sorted_shallow')
+def columnar_search_filtered_sorted_shallow(context):
+    repo = datasets.columnar_repository(context.size)
+    params = search_params(context.size, deep=False)
+    return lambda: repo.search(params)
+
+
+@benchmark('columnar_repository', 'search_filtered_sorted_deep')
+def columnar_search_filtered_sorted_deep(context):
+    repo = datasets.columnar_repository(context.size)
+    params = search_params(context.size, deep=True)
+    return lambda: repo.search(params)
+
+
+# the same columns searched by each engine, numpy ones only when it is installed
+def columnar_search(engine: str, params: Callable[[int], CategoryRepository.SearchParams]):
+    def setup(context):
+        repo = datasets.columnar_repository(context.size)
+        repo.engine = search_engine(engine)
+        search_params_ = params(context.size)
+        return lambda: repo.search(search_params_)
+    return setup
+
+
+for _engine in ('python', 'numpy') if HAS_NUMPY else ('python',):
+    benchmark('columnar_search_engine', f'{_engine}_default')(
+        columnar_search(_engine, lambda size: CategoryRepository.SearchParams()))
+    benchmark('columnar_search_engine', f'{_engine}_filtered_sorted_shallow')(
+        columnar_search(_engine, functools.partial(search_params, deep=False)))
+    benchmark('columnar_search_engine', f'{_engine}_filtered_sorted_deep')(
+        columnar_search(_engine, functools.partial(search_params, deep=True)))
+
+
+@benchmark('django_repository', 'insert')
+def django_insert(context):
+    datasets.load_table(context.size)
+    repo = CategoryDjangoRepository()
+    entities = new_categories(context.calls)
+    with transaction.atomic():
+        yield lambda: repo.insert(next(entities))
+        transaction.set_rollback(True)
+
+
+@benchmark('django_repository', 'find_by_id')
+def django_find_by_id(context):
+    datasets.load_table(context.size)
+    repo = CategoryDjangoRepository()
+    entity_id = datasets.category_ids(context.size)[-1]
+    return lambda: repo.find_by_id(entity_id)
+
+
+@benchmark('django_repository', 'search_default')
+def django_search_default(context):
+    datasets.load_table(context.size)
+    repo = CategoryDjangoRepository()
+    params = CategoryRepository.SearchParams()
+    return lambda: repo.search(params)
+
+
+@benchmark('django_repository', 'search_filtered_sorted_shallow')
+def django_search_filtered_sorted_shallow(context):
+    datasets.load_table(context.size)
+    repo = CategoryDjangoRepository()
+    params = search_params(context.size, deep=False)
+    return lambda: repo.search(params)
+
+
+@benchmark('django_repository', 'search_filtered_sorted_deep')
+def django_search_filtered_sorted_deep(context):
+    datasets.load_table(context.size)
+    repo = CategoryDjangoRepository()
+    params = search_params(context.size, deep=True)
+    return lambda: repo.search(params)
+
+
+# the first page of FILTER through each search backend, the full-text index
+# is installed by the migrations the benchmarks run
+@benchmark('search_backend', 'icontains')
+def search_icontains(context):
+    datasets.load_table(context.size)
+    repo = CategoryDjangoRepository(search_backend=search_backend('icontains'))
+    params = search_params(context.size, deep=False)
+    return lambda: repo.search(params)
+
+
+@benchmark('search_backend', 'fulltext')
+def search_fulltext(context):
+    datasets.load_table(context.size)
+    repo = CategoryDjangoRepository(search_backend=search_backend('fulltext'))
+    params = search_params(context.size, deep=False)
+    return lambda: repo.search(params)
+
+
+@benchmark('search_backend', 'fulltext_ranked')
+def search_fulltext_ranked(context):
+    datasets.load_table(context.size)
+    repo = CategoryDjangoRepository(search_backend=search_backend('fulltext'))
+    params = CategoryRepository.SearchParams(per_page=PER_PAGE, sort='rank', filter=FILTER)
+    return lambda: repo.search(params)
+
+
+# a warm start of the in-memory repository: loading its snapshot against
+# building validated categories from rows, like a load from the database
+@benchmark('in_memory_snapshot', 'load')
+def in_memory_snapshot_load(context):
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = Path(tmp_dir) / 'categories.snapshot'
+        save_snapshot(datasets.categories(context.size), path)
+        yield lambda: load_snapshot(path)
+
+
+@benchmark('in_memory_snapshot', 'validated_rows')
+def in_memory_snapshot_validated_rows(context):
+    rows = [
+        {'unique_entity_id': UniqueEntityID(row.pop('id')), **row}
+        for row in datasets.rows(context.size)
+    ]
+    yield lambda: [Category(**row) for row in rows]
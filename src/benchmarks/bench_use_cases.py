@@ -0,0 +1,55 @@
+from django.db import transaction
+
+from benchmarks import datasets
+from benchmarks.bench_repositories import last_page, FILTER, PER_PAGE
+from benchmarks.runner import benchmark
+from core.category.application.use_cases import (
+    CreateCategoryUseCase,
+    GetCategoryUseCase,
+    ListCategoriesUseCase
+)
+from core.category.infra.django_app.repositories import CategoryDjangoRepository
+
+
+@benchmark('use_cases')
+def create_category(context):
+    datasets.load_table(context.size)
+    use_case = CreateCategoryUseCase(CategoryDjangoRepository())
+    input_param = CreateCategoryUseCase.Input(name='Movie')
+    with transaction.atomic():
+        yield lambda: use_case.execute(input_param)
+        transaction.set_rollback(True)
+
+
+@benchmark('use_cases')
+def get_category(context):
+    datasets.load_table(context.size)
+    use_case = GetCategoryUseCase(CategoryDjangoRepository())
+    input_param = GetCategoryUseCase.Input(datasets.category_ids(context.size)[-1])
+    return lambda: use_case.execute(input_param)
+
+
+@benchmark('use_cases')
+def list_categories_shallow(context):
+    datasets.load_table(context.size)
+    use_case = ListCategoriesUseCase(CategoryDjangoRepository())
+    input_param = ListCategoriesUseCase.Input(
+        per_page=PER_PAGE, sort='name', filter=FILTER)
+    return lambda: use_case.execute(input_param)
+
+
+@benchmark('use_cases')
+def list_categories_deep(context):
+    datasets.load_table(context.size)
+    use_case = ListCategoriesUseCase(CategoryDjangoRepository())
+    input_param = ListCategoriesUseCase.Input(
+        page=last_page(context.size), per_page=PER_PAGE, sort='name', filter=FILTER)
+    return lambda: use_case.execute(input_param)
+
+
+@benchmark('use_cases')
+def list_categories_in_memory(context):
+    use_case = ListCategoriesUseCase(datasets.in_memory_repository(context.size))
+    input_param = ListCategoriesUseCase.Input(
+        per_page=PER_PAGE, sort='name', filter=FILTER)
+    return lambda: use_case.execute(input_param)
@@ -0,0 +1,119 @@
+"""
+Mixed readers/writers benchmark of the SQLite profiles.
+
+Reader threads list categories while writer threads create them through the
+API, i.e. through CategoryDjangoRepository, for a fixed duration. Every
+profile runs on a fresh database file (the journal mode is stored in the
+file) and reports the throughput, latency percentiles and failed requests
+of readers and writers:
+
+    pdm run concurrency --size 10000 --readers 6 --writers 2 --duration 10
+"""
+import argparse
+import itertools
+import logging
+import sys
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, List
+
+from benchmarks.load import print_result, run_mixed, write_results
+from benchmarks.runner import Operation
+
+PROFILES: Dict[str, Dict[str, Any]] = {
+    'default': {},
+}
+
+
+def profiles() -> Dict[str, Dict[str, Any]]:
+    from django_app.database import SQLITE_PRAGMAS  # pylint: disable=import-outside-toplevel
+    return {**PROFILES, 'tuned': SQLITE_PRAGMAS}
+
+
+def reader() -> Operation:
+    from django.test import Client  # pylint: disable=import-outside-toplevel
+    client = Client()
+
+    def operation():
+        response = client.get('/categories/', {'sort': 'name', 'filter': 'filmes'})
+        assert response.status_code == 200, response.status_code
+    return operation
+
+
+_names = itertools.count()
+
+
+def writer() -> Operation:
+    from django.test import Client  # pylint: disable=import-outside-toplevel
+    client = Client()
+
+    def operation():
+        response = client.post(
+            '/categories/', {'name': f'Category {next(_names)}'}, content_type='application/json')
+        assert response.status_code == 201, response.status_code
+    return operation
+
+
+def use_database(path: Path, pragmas: Dict[str, Any], size: int) -> None:
+    # pylint: disable=import-outside-toplevel
+    from django.core.management import call_command
+    from django.db import connections
+
+    from core.category.infra.fixtures import CategoryDatasetFixture
+
+    connections.close_all()
+    connections.settings['default']['NAME'] = path
+    connections.settings['default']['SQLITE_PRAGMAS'] = pragmas
+    call_command('migrate', verbosity=0)
+    CategoryDatasetFixture(seed=0).populate_table(size)
+    connections.close_all()
+
+
+def parse_args(argv: List[str]):
+    parser = argparse.ArgumentParser(
+        prog='python -m benchmarks.concurrency',
+        description='Runs concurrent readers and writers against each SQLite profile'
+    )
+    parser.add_argument('--size', type=int, default=1000, help='categories in the table')
+    parser.add_argument('--readers', type=int, default=6)
+    parser.add_argument('--writers', type=int, default=2)
+    parser.add_argument('--duration', type=float, default=5.0, help='seconds per profile')
+    parser.add_argument(
+        '--profiles', default='default,tuned',
+        help='comma separated profiles: default (SQLite defaults) and tuned (SQLITE_PRAGMAS)')
+    parser.add_argument('--output', type=Path, help='write the JSON results to this file')
+    return parser.parse_args(argv)
+
+
+def main(argv: List[str] = None) -> int:
+    args = parse_args(sys.argv[1:] if argv is None else argv)
+    # slow request and use case warnings would drown the results
+    logging.disable(logging.WARNING)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        from benchmarks.__main__ import setup_django  # pylint: disable=import-outside-toplevel
+        setup_django(Path(tmp_dir) / 'setup.sqlite3')
+        available = profiles()
+
+        results = []
+        for name in args.profiles.split(','):
+            if name not in available:
+                print(f'unknown profile {name}, use one of {", ".join(available)}', file=sys.stderr)
+                return 2
+            use_database(Path(tmp_dir) / f'{name}.sqlite3', available[name], args.size)
+            workloads = {'read': (reader, args.readers), 'write': (writer, args.writers)}
+            for result in run_mixed(name, workloads, args.duration):
+                results.append(result)
+                print_result(result)
+
+    write_results(results, {
+        'size': args.size,
+        'readers': args.readers,
+        'writers': args.writers,
+        'duration': args.duration,
+    }, args.output)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
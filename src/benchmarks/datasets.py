@@ -0,0 +1,44 @@
+import functools
+from typing import Any, Dict, Iterator, List
+
+from core.category.domain.entities import Category
+from core.category.infra.in_memory.columnar import CategoryColumnarRepository
+from core.category.infra.in_memory.repositories import CategoryInMemoryRepository
+from core.category.infra.fixtures import CategoryDatasetFixture
+
+fixture = CategoryDatasetFixture(seed=0)
+
+# the size of the rows in the categories table, under 'size'
+_loaded_table: Dict[str, int] = {}
+
+
+def rows(size: int) -> Iterator[Dict[str, Any]]:
+    return fixture.rows(size)
+
+
+@functools.lru_cache(maxsize=None)
+def categories(size: int) -> List[Category]:
+    return list(fixture.categories(size))
+
+
+def in_memory_repository(size: int) -> CategoryInMemoryRepository:
+    return CategoryInMemoryRepository(items=list(categories(size)))
+
+
+def columnar_repository(size: int) -> CategoryColumnarRepository:
+    return CategoryColumnarRepository(categories(size))
+
+
+def load_table(size: int) -> None:
+    # (re)fill the categories table only when the requested size changes
+    if _loaded_table.get('size') == size:
+        return
+
+    from core.category.infra.django_app.models import CategoryModel  # pylint: disable=import-outside-toplevel
+    CategoryModel.objects.all().delete()
+    fixture.populate_table(size)
+    _loaded_table['size'] = size
+
+
+def category_ids(size: int) -> List[str]:
+    return [row['id'] for row in rows(size)]
@@ -0,0 +1,274 @@
+"""
+Load test of the category API.
+
+Several threads send requests through the Django test client, each thread
+with its own database connection like the threads of a worker, and the
+latency of every request is kept to report its percentiles. By default
+`GET /categories/` runs once per DB_CONN_MAX_AGE value to show what
+persistent connections save on each request:
+
+    pdm run load --size 10000 --threads 8 --requests 4000 --conn-max-age 0,60
+"""
+import argparse
+import datetime
+import itertools
+import json
+import math
+import platform
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from benchmarks.runner import Operation, percentile
+
+
+@dataclass(frozen=True, slots=True)
+class LoadResult:
+    name: str
+    threads: int
+    requests: int
+    errors: int
+    elapsed: float
+    mean: float
+    p50: float
+    p95: float
+    p99: float
+    max: float
+    requests_per_sec: float
+
+    @staticmethod
+    def from_latencies(
+        name: str, threads: int, latencies: List[float], elapsed: float, errors: int = 0
+    ) -> 'LoadResult':
+        ordered = sorted(latencies) or [math.nan]
+        return LoadResult(
+            name=name,
+            threads=threads,
+            requests=len(latencies),
+            errors=errors,
+            elapsed=elapsed,
+            mean=statistics.fmean(ordered),
+            p50=percentile(ordered, 0.50),
+            p95=percentile(ordered, 0.95),
+            p99=percentile(ordered, 0.99),
+            max=ordered[-1],
+            requests_per_sec=len(latencies) / elapsed if elapsed > 0 else 0.0
+        )
+
+
+@dataclass(slots=True)
+class _Worker:
+    make_operation: Callable[[], Operation]
+    count: Optional[int]
+    latencies: List[float] = field(default_factory=list)
+    errors: int = 0
+
+
+def _run_threads(workers: List[_Worker], warmup: int, duration: Optional[float] = None) -> float:
+    """Runs every worker in its own thread, each one `count` times or until
+    `duration` seconds passed, and returns the elapsed time. A failing
+    operation is counted as an error, a failing setup aborts the run."""
+    from django.db import connections  # pylint: disable=import-outside-toplevel
+
+    setup_errors: List[BaseException] = []
+    start = threading.Barrier(len(workers) + 1)
+    stop = threading.Event()
+
+    def run(worker: _Worker):
+        try:
+            operation = worker.make_operation()
+            for _ in range(warmup):
+                operation()
+        except BaseException as exception:  # pylint: disable=broad-except
+            setup_errors.append(exception)
+            start.abort()
+            connections.close_all()
+            return
+        try:
+            start.wait()
+            calls = itertools.count() if worker.count is None else range(worker.count)
+            for _ in calls:
+                if stop.is_set():
+                    break
+                started_at = time.perf_counter()
+                try:
+                    operation()
+                except Exception:  # pylint: disable=broad-except
+                    worker.errors += 1
+                    continue
+                worker.latencies.append(time.perf_counter() - started_at)
+        except threading.BrokenBarrierError:
+            pass
+        finally:
+            connections.close_all()
+
+    threads = [threading.Thread(target=run, args=(worker,)) for worker in workers]
+    for thread in threads:
+        thread.start()
+    try:
+        start.wait()
+    except threading.BrokenBarrierError:
+        pass
+    started_at = time.perf_counter()
+    if duration is not None:
+        stop.wait(duration)
+        stop.set()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started_at
+
+    if setup_errors:
+        raise setup_errors[0]
+    return elapsed
+
+
+def run_load(
+    name: str,
+    make_operation: Callable[[], Operation],
+    threads: int,
+    requests: int,
+    warmup: int = 10
+) -> LoadResult:
+    """Runs `requests` operations split across `threads` threads, every
+    thread builds its own operation with make_operation()."""
+    workers = [
+        _Worker(make_operation, requests // threads + (index < requests % threads))
+        for index in range(threads)
+    ]
+    elapsed = _run_threads(workers, warmup)
+    return LoadResult.from_latencies(
+        name, threads,
+        [latency for worker in workers for latency in worker.latencies],
+        elapsed, sum(worker.errors for worker in workers)
+    )
+
+
+def run_mixed(
+    name: str,
+    workloads: Dict[str, Tuple[Callable[[], Operation], int]],
+    duration: float,
+    warmup: int = 10
+) -> List[LoadResult]:
+    """Runs every workload, e.g. {'read': (make_reader, 6), 'write':
+    (make_writer, 2)}, on its number of threads at the same time for
+    `duration` seconds and returns one result per workload."""
+    workers = {
+        role: [_Worker(make_operation, None) for _ in range(threads)]
+        for role, (make_operation, threads) in workloads.items()
+    }
+    elapsed = _run_threads(
+        [worker for role_workers in workers.values() for worker in role_workers],
+        warmup, duration
+    )
+    return [
+        LoadResult.from_latencies(
+            f'{name}.{role}', len(role_workers),
+            [latency for worker in role_workers for latency in worker.latencies],
+            elapsed, sum(worker.errors for worker in role_workers)
+        )
+        for role, role_workers in workers.items()
+    ]
+
+
+def list_categories() -> Operation:
+    from django.test import Client  # pylint: disable=import-outside-toplevel
+
+    client = Client()
+
+    def operation():
+        response = client.get('/categories/')
+        assert response.status_code == 200, response.status_code
+    return operation
+
+
+def set_conn_max_age(conn_max_age: Optional[int], health_checks: bool) -> None:
+    # read by the connections every thread opens from now on
+    from django.db import connections  # pylint: disable=import-outside-toplevel
+    connections.settings['default']['CONN_MAX_AGE'] = conn_max_age
+    connections.settings['default']['CONN_HEALTH_CHECKS'] = health_checks
+
+
+def parse_conn_max_age(value: str) -> Optional[int]:
+    return None if value.lower() == 'none' else int(value)
+
+
+def parse_args(argv: List[str]):
+    parser = argparse.ArgumentParser(
+        prog='python -m benchmarks.load',
+        description='Load tests GET /categories/ and reports its latency percentiles'
+    )
+    parser.add_argument('--size', type=int, default=1000, help='categories in the table')
+    parser.add_argument('--threads', type=int, default=8)
+    parser.add_argument('--requests', type=int, default=2000, help='total requests per run')
+    parser.add_argument(
+        '--conn-max-age', default='0,60',
+        help='comma separated DB_CONN_MAX_AGE values, one run each (none for unlimited)')
+    parser.add_argument('--no-health-checks', action='store_true')
+    parser.add_argument('--output', type=Path, help='write the JSON results to this file')
+    return parser.parse_args(argv)
+
+
+def main(argv: List[str] = None) -> int:
+    args = parse_args(sys.argv[1:] if argv is None else argv)
+    if args.threads < 1 or args.requests < args.threads:
+        print('--threads must be positive and --requests at least --threads', file=sys.stderr)
+        return 2
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        # pylint: disable=import-outside-toplevel
+        from benchmarks.__main__ import setup_django
+        setup_django(Path(tmp_dir) / 'load.sqlite3')
+        from benchmarks import datasets
+        datasets.load_table(args.size)
+
+        results = []
+        for value in args.conn_max_age.split(','):
+            conn_max_age = parse_conn_max_age(value)
+            set_conn_max_age(conn_max_age, not args.no_health_checks)
+            results.append(run_load(
+                f'list_categories[conn_max_age={conn_max_age}]',
+                list_categories, args.threads, args.requests
+            ))
+            print_result(results[-1])
+
+    write_results(results, {'size': args.size, 'threads': args.threads}, args.output)
+    return 0
+
+
+def write_results(results: List[LoadResult], meta: Dict[str, Any], output: Optional[Path]) -> None:
+    # pylint: disable=import-outside-toplevel
+    import django
+    from benchmarks.__main__ import git_commit
+    data = {
+        'meta': {
+            'commit': git_commit(),
+            'created_at': datetime.datetime.now(datetime.timezone.utc).isoformat(),
+            'python': platform.python_version(),
+            'django': django.get_version(),
+            'platform': platform.platform(),
+            **meta,
+        },
+        'results': [asdict(result) for result in results]
+    }
+    if output:
+        output.write_text(json.dumps(data, indent=2), encoding='utf-8')
+    else:
+        print(json.dumps(data))
+
+
+def print_result(result: LoadResult):
+    print(
+        f'{result.name:<40} p50 {result.p50 * 1e3:>8.2f}ms p95 {result.p95 * 1e3:>8.2f}ms '
+        f'p99 {result.p99 * 1e3:>8.2f}ms max {result.max * 1e3:>8.2f}ms '
+        f'{result.requests_per_sec:>8.1f} req/s {result.errors} errors',
+        file=sys.stderr
+    )
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,163 @@
+import inspect
+import math
+import statistics
+import time
+from dataclasses import asdict, dataclass, field
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+Operation = Callable[[], Any]
+
+
+@dataclass(frozen=True, slots=True)
+class BenchmarkContext:
+    size: int
+    calls: int
+
+
+@dataclass(frozen=True, slots=True)
+class Benchmark:
+    group: str
+    name: str
+    setup: Callable[[BenchmarkContext], Operation | Iterator[Operation]]
+    sized: bool = True
+
+    @property
+    def full_name(self) -> str:
+        return f'{self.group}.{self.name}'
+
+
+def percentile(ordered: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of already sorted samples."""
+    return ordered[min(len(ordered) - 1, max(0, math.ceil(len(ordered) * fraction) - 1))]
+
+
+@dataclass(frozen=True, slots=True)
+class Stats:
+    min: float
+    max: float
+    mean: float
+    median: float
+    p95: float
+    stddev: float
+    ops_per_sec: float
+
+    @staticmethod
+    def from_samples(samples: List[float]) -> 'Stats':
+        ordered = sorted(samples)
+        median = statistics.median(ordered)
+        return Stats(
+            min=ordered[0],
+            max=ordered[-1],
+            mean=statistics.fmean(ordered),
+            median=median,
+            p95=percentile(ordered, 0.95),
+            stddev=statistics.pstdev(ordered),
+            ops_per_sec=1 / median if median > 0 else math.inf
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class Result:
+    name: str
+    size: Optional[int]
+    rounds: int
+    iterations: int
+    stats: Stats
+
+
+@dataclass(slots=True)
+class Registry:
+    benchmarks: List[Benchmark] = field(default_factory=list)
+
+    def register(self, group: str, name: str = None, sized: bool = True):
+        def decorator(setup):
+            self.benchmarks.append(
+                Benchmark(group=group, name=name or setup.__name__,
+                          setup=setup, sized=sized)
+            )
+            return setup
+        return decorator
+
+    def select(self, pattern: Optional[str] = None) -> List[Benchmark]:
+        return [
+            bench for bench in self.benchmarks
+            if not pattern or pattern in bench.full_name
+        ]
+
+
+registry = Registry()
+benchmark = registry.register
+
+
+def run_benchmark(
+    bench: Benchmark,
+    size: Optional[int],
+    rounds: int = 5,
+    iterations: int = 20,
+    warmup: int = 1
+) -> Result:
+    # every round times `iterations` calls, its per call duration is a sample
+    context = BenchmarkContext(size=size, calls=(rounds + warmup) * iterations)
+    prepared = bench.setup(context)
+    teardown = prepared if inspect.isgenerator(prepared) else None
+    operation = next(prepared) if teardown else prepared
+
+    samples = []
+    try:
+        for round_number in range(warmup + rounds):
+            started_at = time.perf_counter()
+            for _ in range(iterations):
+                operation()
+            elapsed = time.perf_counter() - started_at
+            if round_number >= warmup:
+                samples.append(elapsed / iterations)
+    finally:
+        if teardown:
+            next(teardown, None)
+
+    return Result(
+        name=bench.full_name,
+        size=size if bench.sized else None,
+        rounds=rounds,
+        iterations=iterations,
+        stats=Stats.from_samples(samples)
+    )
+
+
+def results_to_dict(results: List[Result], meta: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        'meta': meta,
+        'results': [asdict(result) for result in results]
+    }
+
+
+@dataclass(frozen=True, slots=True)
+class Comparison:
+    name: str
+    size: Optional[int]
+    baseline: float
+    current: float
+
+    @property
+    def change(self) -> float:
+        return (self.current - self.baseline) / self.baseline
+
+    def is_regression(self, threshold: float) -> bool:
+        return self.change > threshold
+
+
+def compare(baseline: Dict[str, Any], current: Dict[str, Any]) -> List[Comparison]:
+    baseline_medians = {
+        (result['name'], result['size']): result['stats']['median']
+        for result in baseline['results']
+    }
+    return [
+        Comparison(
+            name=result['name'],
+            size=result['size'],
+            baseline=baseline_medians[(result['name'], result['size'])],
+            current=result['stats']['median']
+        )
+        for result in current['results']
+        if (result['name'], result['size']) in baseline_medians
+    ]
@@ -0,0 +1,77 @@
+import threading
+import unittest
+
+from benchmarks.load import LoadResult, parse_conn_max_age, run_load, run_mixed
+from benchmarks.runner import percentile
+
+
+class TestLoadResult(unittest.TestCase):
+
+    def test_percentile(self):
+        ordered = [float(value) for value in range(1, 101)]
+        self.assertEqual(percentile(ordered, 0.50), 50)
+        self.assertEqual(percentile(ordered, 0.99), 99)
+        self.assertEqual(percentile(ordered, 1.0), 100)
+        self.assertEqual(percentile([3.0], 0.0), 3)
+
+    def test_from_latencies(self):
+        result = LoadResult.from_latencies('list', 2, [0.004, 0.001, 0.003, 0.002], 0.5)
+        self.assertEqual(result.requests, 4)
+        self.assertEqual(result.p50, 0.002)
+        self.assertEqual(result.p99, 0.004)
+        self.assertEqual(result.max, 0.004)
+        self.assertAlmostEqual(result.mean, 0.0025)
+        self.assertAlmostEqual(result.requests_per_sec, 8)
+
+    def test_parse_conn_max_age(self):
+        self.assertEqual(parse_conn_max_age('60'), 60)
+        self.assertIsNone(parse_conn_max_age('None'))
+
+
+class TestRunLoad(unittest.TestCase):
+
+    def test_requests_split_across_threads(self):
+        calls = []
+        lock = threading.Lock()
+
+        def make_operation():
+            def operation():
+                with lock:
+                    calls.append(threading.get_ident())
+            return operation
+
+        result = run_load('noop', make_operation, threads=3, requests=10, warmup=0)
+
+        self.assertEqual(result.requests, 10)
+        self.assertEqual(result.threads, 3)
+        self.assertEqual(len(set(calls)), 3)
+
+    def test_errors_are_raised(self):
+        def make_operation():
+            raise RuntimeError('setup failed')
+
+        with self.assertRaisesRegex(RuntimeError, 'setup failed'):
+            run_load('broken', make_operation, threads=2, requests=2)
+
+    def test_failed_operations_are_counted(self):
+        def make_operation():
+            def operation():
+                raise AssertionError(500)
+            return operation
+
+        result = run_load('failing', make_operation, threads=2, requests=4, warmup=0)
+
+        self.assertEqual(result.requests, 0)
+        self.assertEqual(result.errors, 4)
+
+    def test_run_mixed(self):
+        def make_operation():
+            return lambda: None
+
+        results = run_mixed('profile', {
+            'read': (make_operation, 2), 'write': (make_operation, 1)
+        }, duration=0.05, warmup=0)
+
+        self.assertEqual([result.name for result in results], ['profile.read', 'profile.write'])
+        self.assertEqual([result.threads for result in results], [2, 1])
+        self.assertTrue(all(result.requests > 0 for result in results))
@@ -0,0 +1,94 @@
+import unittest
+
+from benchmarks.runner import BenchmarkContext, Registry, Stats, compare, results_to_dict, run_benchmark
+
+
+class TestStats(unittest.TestCase):
+
+    def test_from_samples(self):
+        stats = Stats.from_samples([0.4, 0.1, 0.2, 0.3])
+        self.assertEqual(stats.min, 0.1)
+        self.assertEqual(stats.max, 0.4)
+        self.assertAlmostEqual(stats.mean, 0.25)
+        self.assertAlmostEqual(stats.median, 0.25)
+        self.assertEqual(stats.p95, 0.4)
+        self.assertAlmostEqual(stats.ops_per_sec, 4)
+
+
+class TestRunner(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.registry = Registry()
+
+    def test_register_and_select(self):
+        @self.registry.register('group')
+        def first(_context):
+            return lambda: None
+
+        @self.registry.register('other', 'second', sized=False)
+        def _second(_context):
+            return lambda: None
+
+        self.assertEqual(
+            [bench.full_name for bench in self.registry.select()],
+            ['group.first', 'other.second']
+        )
+        self.assertEqual(
+            [bench.full_name for bench in self.registry.select('other')],
+            ['other.second']
+        )
+        self.assertFalse(self.registry.select('other')[0].sized)
+        self.assertEqual(first.__name__, 'first')
+
+    def test_run_benchmark(self):
+        calls = []
+        contexts = []
+
+        @self.registry.register('group')
+        def operation(context):
+            contexts.append(context)
+            return lambda: calls.append(1)
+
+        result = run_benchmark(
+            self.registry.select()[0], 100, rounds=3, iterations=4, warmup=1)
+
+        self.assertEqual(contexts, [BenchmarkContext(size=100, calls=16)])
+        self.assertEqual(len(calls), 16)
+        self.assertEqual(result.name, 'group.operation')
+        self.assertEqual(result.size, 100)
+        self.assertEqual(result.rounds, 3)
+        self.assertEqual(result.iterations, 4)
+
+    def test_run_generator_benchmark_tears_down(self):
+        events = []
+
+        @self.registry.register('group', sized=False)
+        def operation(_context):
+            events.append('setup')
+            yield lambda: None
+            events.append('teardown')
+
+        result = run_benchmark(self.registry.select()[0], 100, rounds=1, iterations=1)
+        self.assertEqual(events, ['setup', 'teardown'])
+        self.assertIsNone(result.size)
+
+    def test_compare(self):
+        @self.registry.register('group')
+        def operation(_context):
+            return lambda: None
+
+        current = results_to_dict(
+            [run_benchmark(self.registry.select()[0], 10, rounds=1, iterations=1)],
+            {}
+        )
+        median = current['results'][0]['stats']['median']
+        baseline = {'results': [
+            {'name': 'group.operation', 'size': 10, 'stats': {'median': median / 2}},
+            {'name': 'group.removed', 'size': 10, 'stats': {'median': 1}},
+        ]}
+
+        comparisons = compare(baseline, current)
+        self.assertEqual(len(comparisons), 1)
+        self.assertAlmostEqual(comparisons[0].change, 1.0)
+        self.assertTrue(comparisons[0].is_regression(0.5))
+        self.assertFalse(comparisons[0].is_regression(1.5))
@@ -13,6 +13,7 @@ class SearchInput(Generic[Filter]):
     sort: Optional[str] = None
     sort_dir: Optional[str] = None
     filter: Optional[Filter] = None
+    fields: Optional[List[str]] = None
 
 
 Item = TypeVar('Item')
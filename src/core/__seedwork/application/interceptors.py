@@ -0,0 +1,260 @@
+import abc
+import contextlib
+import cProfile
+import itertools
+import json
+import logging
+import random
+import threading
+import time
+from abc import ABC
+from collections import deque
+from contextvars import ContextVar
+from dataclasses import asdict, dataclass, field, replace
+from pathlib import Path
+from typing import Any, Callable, ContextManager, Deque, Dict, Generic, Iterator, List, Optional, Sequence, Tuple
+
+from core.__seedwork.application.use_cases import AsyncUseCase, Input, Output, UseCase
+
+logger = logging.getLogger(__name__)
+
+
+class UseCaseInterceptor(ABC):
+
+    @abc.abstractmethod
+    def intercept(self, use_case: Any, input_param: Any) -> ContextManager[None]:
+        raise NotImplementedError()
+
+
+_context_interceptors: ContextVar[Tuple[UseCaseInterceptor, ...]] = ContextVar(
+    'context_interceptors', default=()
+)
+
+
+@contextlib.contextmanager
+def intercept_executions(interceptor: UseCaseInterceptor) -> Iterator[None]:
+    """Adds `interceptor` to the chain of every intercepted use case executed
+    in the current context (e.g. a request), inside the chain of the use
+    case. Nested calls add interceptors, the outermost one is entered first."""
+    token = _context_interceptors.set(_context_interceptors.get() + (interceptor,))
+    try:
+        yield
+    finally:
+        _context_interceptors.reset(token)
+
+
+class _Intercepted:
+
+    __slots__ = ('use_case', 'interceptors')
+
+    def __init__(self, use_case: Any, interceptors: Sequence[UseCaseInterceptor]):
+        self.use_case = use_case
+        self.interceptors = tuple(interceptors)
+
+    def __getattr__(self, name: str):
+        return getattr(self.use_case, name)
+
+    def _chain(self) -> Tuple[UseCaseInterceptor, ...]:
+        # the first interceptor is the outermost one
+        context_interceptors = _context_interceptors.get()
+        return self.interceptors + context_interceptors if context_interceptors else self.interceptors
+
+    def _enter(self, stack: contextlib.ExitStack, chain: Sequence[UseCaseInterceptor], input_param: Any) -> None:
+        for interceptor in chain:
+            stack.enter_context(interceptor.intercept(self.use_case, input_param))
+
+
+class InterceptedUseCase(_Intercepted, Generic[Input, Output]):
+    """Runs the execute() of a use case inside a chain of interceptors."""
+
+    use_case: UseCase[Input, Output]
+
+    def execute(self, input_param: Input) -> Output:
+        chain = self._chain()
+        if not chain:
+            return self.use_case.execute(input_param)
+        with contextlib.ExitStack() as stack:
+            self._enter(stack, chain, input_param)
+            return self.use_case.execute(input_param)
+
+
+class AsyncInterceptedUseCase(_Intercepted, Generic[Input, Output]):
+
+    use_case: AsyncUseCase[Input, Output]
+
+    async def execute(self, input_param: Input) -> Output:
+        chain = self._chain()
+        if not chain:
+            return await self.use_case.execute(input_param)
+        with contextlib.ExitStack() as stack:
+            self._enter(stack, chain, input_param)
+            return await self.use_case.execute(input_param)
+
+
+def use_case_name(use_case: Any) -> str:
+    return type(use_case).__name__
+
+
+@dataclass(slots=True, frozen=True)
+class TimingInterceptor(UseCaseInterceptor):
+
+    record: Callable[[float, str], None]
+
+    @contextlib.contextmanager
+    def intercept(self, use_case: Any, input_param: Any) -> Iterator[None]:
+        started_at = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(time.perf_counter() - started_at, use_case_name(use_case))
+
+
+@dataclass(slots=True, frozen=True)
+class SlowCallLoggingInterceptor(UseCaseInterceptor):
+
+    threshold_ms: float
+
+    @contextlib.contextmanager
+    def intercept(self, use_case: Any, input_param: Any) -> Iterator[None]:
+        started_at = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed_ms = (time.perf_counter() - started_at) * 1000
+            if elapsed_ms >= self.threshold_ms:
+                logger.warning(
+                    'slow use case %s took %.1fms input=%.200r',
+                    use_case_name(use_case), elapsed_ms, input_param
+                )
+
+
+# cProfile profilers are process-wide on Python 3.12 (a second one fails to
+# enable) and mix up the frames of the threads before, one samples at a time
+_profiler_lock = threading.Lock()
+
+
+@dataclass(slots=True, frozen=True)
+class ProfilingInterceptor(UseCaseInterceptor):
+    """Profiles a sampled fraction of the executions with cProfile and dumps
+    each profile to output_dir, ready for pstats or snakeviz.
+
+    A sample is skipped while another one runs, in any thread, executions
+    nested in a profiled one are already part of its profile. Async use
+    cases are never profiled: the profiler would stay on across their awaits
+    and record every other coroutine of the event loop."""
+
+    sample_rate: float
+    output_dir: Optional[Path]
+    sample: Callable[[], float] = random.random
+    _sequence: Iterator[int] = field(default_factory=itertools.count)
+
+    @contextlib.contextmanager
+    def intercept(self, use_case: Any, input_param: Any) -> Iterator[None]:
+        if (
+            not self.output_dir or isinstance(use_case, AsyncUseCase)
+            or self.sample() >= self.sample_rate or not _profiler_lock.acquire(blocking=False)
+        ):
+            yield
+            return
+
+        profile = cProfile.Profile()
+        try:
+            profile.enable()
+            yield
+        finally:
+            profile.disable()
+            _profiler_lock.release()
+            output_dir = Path(self.output_dir)
+            output_dir.mkdir(parents=True, exist_ok=True)
+            profile.dump_stats(
+                output_dir / f'{use_case_name(use_case)}-{time.time_ns()}-{next(self._sequence, 0)}.prof'
+            )
+
+
+@dataclass(slots=True, frozen=True)
+class Span:
+    name: str
+    trace_id: str
+    span_id: str
+    parent_id: Optional[str]
+    start_time: float
+    duration: float
+    status: str
+    attributes: Dict[str, Any]
+
+
+class SpanExporter(ABC):
+
+    @abc.abstractmethod
+    def export(self, span: Span) -> None:
+        raise NotImplementedError()
+
+
+class InMemorySpanExporter(SpanExporter):
+    """Keeps the last `maxlen` spans."""
+
+    def __init__(self, maxlen: int = 1000):
+        self.spans: Deque[Span] = deque(maxlen=maxlen)
+
+    def export(self, span: Span) -> None:
+        self.spans.append(span)
+
+    def finished_spans(self) -> List[Span]:
+        return list(self.spans)
+
+
+class JsonLinesSpanExporter(SpanExporter):
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+
+    def export(self, span: Span) -> None:
+        line = json.dumps(asdict(span), default=str)
+        with self._lock, self.path.open('a', encoding='utf-8') as file:
+            file.write(line + '\n')
+
+
+_current_span: ContextVar[Optional[Span]] = ContextVar('current_span', default=None)
+
+
+def _new_id(bits: int) -> str:
+    return f'{random.getrandbits(bits):0{bits // 4}x}'
+
+
+@dataclass(slots=True, frozen=True)
+class TracingInterceptor(UseCaseInterceptor):
+    """Records a span per execution, nested executions become child spans.
+    Disabled without an exporter."""
+
+    exporter: Optional[SpanExporter]
+
+    @contextlib.contextmanager
+    def intercept(self, use_case: Any, input_param: Any) -> Iterator[None]:
+        if self.exporter is None:
+            yield
+            return
+        parent = _current_span.get()
+        span = Span(
+            name=use_case_name(use_case),
+            trace_id=parent.trace_id if parent else _new_id(128),
+            span_id=_new_id(64),
+            parent_id=parent.span_id if parent else None,
+            start_time=time.time(),
+            duration=0.0,
+            status='ok',
+            attributes={'input': type(input_param).__name__}
+        )
+        token = _current_span.set(span)
+        started_at = time.perf_counter()
+        status = 'ok'
+        try:
+            yield
+        except BaseException as exception:
+            status = f'error: {type(exception).__name__}'
+            raise
+        finally:
+            _current_span.reset(token)
+            self.exporter.export(replace(
+                span, duration=time.perf_counter() - started_at, status=status
+            ))
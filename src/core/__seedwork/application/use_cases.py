@@ -11,3 +11,10 @@ class UseCase(Generic[Input, Output], ABC):
     @abc.abstractmethod
     def execute(self, input_param: Input) -> Output:
         raise NotImplementedError()
+
+
+class AsyncUseCase(Generic[Input, Output], ABC):
+
+    @abc.abstractmethod
+    async def execute(self, input_param: Input) -> Output:
+        raise NotImplementedError()
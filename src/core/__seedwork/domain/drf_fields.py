@@ -0,0 +1,35 @@
+import os
+
+from django.conf import settings
+from rest_framework.fields import BooleanField, CharField
+
+# DRF fields need configured settings, outside of a Django project (e.g. the
+# domain unit tests) fall back to a minimal configuration
+if not settings.configured and 'DJANGO_SETTINGS_MODULE' not in os.environ:
+    settings.configure(USE_I18N=False)
+
+
+class StrictCharField(CharField):
+
+    def to_internal_value(self, data):
+        if not isinstance(data, str):
+            self.fail('invalid')
+
+        return super().to_internal_value(data)
+
+
+class StrictBooleanField(BooleanField):
+
+    # pylint: disable=inconsistent-return-statements
+    def to_internal_value(self, data):
+        try:
+            if data is True:
+                return True
+            if data is False:
+                return False
+            if data is None and self.allow_null:
+                return None
+        except TypeError:
+            pass
+
+        self.fail('invalid', input=data)
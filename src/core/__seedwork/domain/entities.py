@@ -1,15 +1,21 @@
 from abc import ABC
-from dataclasses import Field, asdict, dataclass, field
-from typing import Any
+from dataclasses import MISSING, Field, dataclass, field, fields
+from typing import Any, List
 
+from core.__seedwork.domain.events import DomainEvent
 from core.__seedwork.domain.value_objects import UniqueEntityID
 
+_NOT_PROPS = ('unique_entity_id', '_events')
+
 
 @dataclass(frozen=True, slots=True)
 class Entity(ABC):
 
     unique_entity_id: UniqueEntityID = field(
         default_factory=UniqueEntityID)
+    # recorded by the entity, written with it by the repository
+    _events: List[DomainEvent] = field(
+        default_factory=list, init=False, repr=False, compare=False)
 
     @property
     def id(self):  # pylint: disable=invalid-name
@@ -20,11 +26,57 @@ class Entity(ABC):
         return self
 
     def to_dict(self):
-        entity_dict = asdict(self)
-        entity_dict.pop('unique_entity_id')
+        entity_dict = {
+            entity_field.name: getattr(self, entity_field.name)
+            for entity_field in fields(self)
+            if entity_field.name not in _NOT_PROPS
+        }
         entity_dict['id'] = self.id
         return entity_dict
 
+    @property
+    def events(self) -> List[DomainEvent]:
+        """Events recorded since the entity was last saved."""
+        return list(self._events)
+
+    def record_event(self, event: DomainEvent) -> None:
+        self._events.append(event)
+
+    def clear_events(self) -> None:
+        self._events.clear()
+
+    def copy(self):
+        """A shallow copy with a list of events of its own, changing it
+        leaves this entity as it is."""
+        entity = object.__new__(type(self))
+        for entity_field in fields(self):
+            object.__setattr__(entity, entity_field.name, getattr(self, entity_field.name))
+        object.__setattr__(entity, '_events', list(self._events))
+        return entity
+
     @classmethod
     def get_field(cls, entity_field: str) -> Field:
         return cls.__dataclass_fields__[entity_field]  # pylint: disable=no-member
+
+    @classmethod
+    def restore(cls, **props):
+        # rebuilds an entity from data that was already validated (storage,
+        # snapshots, generated datasets) skipping __post_init__ validation
+        unknown = props.keys() - cls.__dataclass_fields__.keys()  # pylint: disable=no-member
+        if unknown:
+            raise TypeError(
+                f"{cls.__name__}.restore() got unexpected arguments: {', '.join(sorted(unknown))}")
+
+        entity = object.__new__(cls)
+        for entity_field in cls.__dataclass_fields__.values():  # pylint: disable=no-member
+            if entity_field.name in props:
+                value = props[entity_field.name]
+            elif entity_field.default is not MISSING:
+                value = entity_field.default
+            elif entity_field.default_factory is not MISSING:
+                value = entity_field.default_factory()
+            else:
+                raise TypeError(
+                    f"{cls.__name__}.restore() missing required argument: '{entity_field.name}'")
+            object.__setattr__(entity, entity_field.name, value)
+        return entity
@@ -0,0 +1,27 @@
+import datetime
+from dataclasses import dataclass, field, fields
+from typing import Any, Dict
+
+
+def _now() -> datetime.datetime:
+    return datetime.datetime.now(datetime.timezone.utc)
+
+
+@dataclass(frozen=True, slots=True, kw_only=True)
+class DomainEvent:
+    """Something that happened to an aggregate, recorded by the entity and
+    persisted with the change that caused it."""
+
+    aggregate_id: str
+    occurred_at: datetime.datetime = field(default_factory=_now)
+
+    @property
+    def event_type(self) -> str:
+        return type(self).__name__
+
+    def payload(self) -> Dict[str, Any]:
+        return {
+            event_field.name: getattr(self, event_field.name)
+            for event_field in fields(self)
+            if event_field.name not in ('aggregate_id', 'occurred_at')
+        }
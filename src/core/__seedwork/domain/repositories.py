@@ -1,8 +1,11 @@
 from abc import ABC
 import abc
 from dataclasses import dataclass, field
+from itertools import compress, count, repeat
 import math
-from typing import Any, Generic, List, Optional, TypeVar
+import operator
+import threading
+from typing import Any, AsyncIterator, Dict, Generic, Iterable, Iterator, List, Optional, Tuple, TypeVar
 from core.__seedwork.domain.entities import Entity
 from core.__seedwork.domain.exceptions import NotFoundException
 
@@ -13,6 +16,24 @@ Input = TypeVar('Input')
 Output = TypeVar('Output')
 Filter = TypeVar('Filter', str, Any)
 
+DEFAULT_BATCH_SIZE = 500
+
+
+def check_batch_size(batch_size: int) -> int:
+    # checked when iter_all() is called, not on the first next() of its generator
+    if batch_size < 1:
+        raise ValueError(f'batch_size must be greater than 0, got {batch_size}')
+    return batch_size
+
+
+def _projection(fields: Optional[List[str]], projectable_fields: List[str]) -> Optional[List[str]]:
+    if not fields:
+        return None
+    projection = [field for field in fields if field in projectable_fields]
+    if not projection:
+        return None
+    return ['id'] + [field for field in projection if field != 'id']
+
 
 class RepositoryInterface(Generic[ET], ABC):
 
@@ -20,6 +41,10 @@ class RepositoryInterface(Generic[ET], ABC):
     def insert(self, entity: ET) -> None:
         raise NotImplementedError()
 
+    @abc.abstractmethod
+    def bulk_insert(self, entities: List[ET]) -> None:
+        raise NotImplementedError()
+
     @abc.abstractmethod
     def find_by_id(self, entity_id: str | UniqueEntityID) -> ET:
         raise NotImplementedError()
@@ -28,10 +53,22 @@ class RepositoryInterface(Generic[ET], ABC):
     def find_all(self) -> List[ET]:
         raise NotImplementedError()
 
+    @abc.abstractmethod
+    def iter_all(self, batch_size: int = DEFAULT_BATCH_SIZE) -> Iterator[ET]:
+        raise NotImplementedError()
+
     @abc.abstractmethod
     def update(self, entity: ET) -> None:
         raise NotImplementedError()
 
+    @abc.abstractmethod
+    def upsert(self, entity: ET) -> None:
+        raise NotImplementedError()
+
+    @abc.abstractmethod
+    def bulk_upsert(self, entities: List[ET]) -> None:
+        raise NotImplementedError()
+
     @abc.abstractmethod
     def delete(self, entity_id: str | UniqueEntityID) -> None:
         raise NotImplementedError()
@@ -40,11 +77,55 @@ class RepositoryInterface(Generic[ET], ABC):
 class SearchableRepositoryInterface(Generic[ET, Input, Output], RepositoryInterface[ET], ABC):
 
     sortable_fields: List[str] = []
+    projectable_fields: List[str] = []
 
     @abc.abstractmethod
     def search(self, input_params: Input) -> Output:
         raise NotImplementedError()
 
+    def _apply_projection(self, fields: Optional[List[str]]) -> Optional[List[str]]:
+        return _projection(fields, self.projectable_fields)
+
+
+class AsyncRepositoryInterface(Generic[ET], ABC):
+
+    @abc.abstractmethod
+    async def insert(self, entity: ET) -> None:
+        raise NotImplementedError()
+
+    @abc.abstractmethod
+    async def find_by_id(self, entity_id: str | UniqueEntityID) -> ET:
+        raise NotImplementedError()
+
+    @abc.abstractmethod
+    async def find_all(self) -> List[ET]:
+        raise NotImplementedError()
+
+    @abc.abstractmethod
+    def iter_all(self, batch_size: int = DEFAULT_BATCH_SIZE) -> AsyncIterator[ET]:
+        raise NotImplementedError()
+
+    @abc.abstractmethod
+    async def update(self, entity: ET) -> None:
+        raise NotImplementedError()
+
+    @abc.abstractmethod
+    async def delete(self, entity_id: str | UniqueEntityID) -> None:
+        raise NotImplementedError()
+
+
+class AsyncSearchableRepositoryInterface(Generic[ET, Input, Output], AsyncRepositoryInterface[ET], ABC):
+
+    sortable_fields: List[str] = []
+    projectable_fields: List[str] = []
+
+    @abc.abstractmethod
+    async def search(self, input_params: Input) -> Output:
+        raise NotImplementedError()
+
+    def _apply_projection(self, fields: Optional[List[str]]) -> Optional[List[str]]:
+        return _projection(fields, self.projectable_fields)
+
 
 @dataclass(slots=True, kw_only=True)
 class SearchParams(Generic[Filter]):
@@ -53,12 +134,14 @@ class SearchParams(Generic[Filter]):
     sort: Optional[str] = None
     sort_dir: Optional[str] = None
     filter: Optional[Filter] = None
+    fields: Optional[List[str]] = None
 
     def __post_init__(self):
         self.normalize_page()
         self.normalize_per_page()
         self.normalize_sort()
         self.normalize_sort_dir()
+        self.normalize_fields()
 
     def normalize_page(self):
         page = self._convert_to_int(self.page)
@@ -88,6 +171,12 @@ class SearchParams(Generic[Filter]):
         self.filter = None if self.filter == "" or self.filter is None \
             else str(self.filter)
 
+    def normalize_fields(self):
+        fields = self.fields.split(',') if isinstance(self.fields, str) \
+            else self.fields or []
+        fields = [str(field).strip() for field in fields]
+        self.fields = list(dict.fromkeys(field for field in fields if field)) or None
+
     def _convert_to_int(self, value: Any, default=0) -> int:
         try:
             return int(value)
@@ -108,6 +197,7 @@ class SearchResult(Generic[ET, Filter]):  # pylint: disable=too-many-instance-at
     sort: Optional[str] = None
     sort_dir: Optional[str] = None
     filter: Optional[Filter] = None
+    fields: Optional[List[str]] = None
 
     def __post_init__(self):
         object.__setattr__(
@@ -125,41 +215,171 @@ class SearchResult(Generic[ET, Filter]):  # pylint: disable=too-many-instance-at
             "last_page": self.last_page,
             "sort": self.sort,
             "sort_dir": self.sort_dir,
-            "filter": self.filter
+            "filter": self.filter,
+            "fields": self.fields
         }
 
 
+def _clear_events(entities: Iterable[Entity]) -> None:
+    # in memory there is no outbox to write the events to, they are dropped
+    # once the write succeeds instead of piling up on the stored entities
+    for entity in entities:
+        entity.clear_events()
+
+
+def _position(items: List[ET], entity: ET) -> int:
+    # by identity, list.index() would compare every item before it with __eq__
+    return next(compress(count(), map(operator.is_, items, repeat(entity))))
+
+
 @dataclass(slots=True)
 class InMemoryRepository(RepositoryInterface[ET], ABC):
+    """With `thread_safe`, writers never change the list of items in place:
+    under a lock, they copy it, change the copy and publish it with an index
+    of the items by id. Readers don't lock, each one reads the list (or the
+    index) once and works on that consistent version while writes go on. A
+    write costs a copy of the list, O(n), reads are unaffected. find_by_id()
+    returns a copy of the entity: the published ones are shared by every
+    version, a caller changing its entity (e.g. failing validation halfway
+    through an update) must not change them."""
 
     items: List[ET] = field(default_factory=lambda: [])
+    thread_safe: bool = field(default=False, kw_only=True)
+    _lock: threading.Lock = field(default_factory=threading.Lock, init=False, repr=False, compare=False)
+    # the published items and their index by id, assigned as one tuple
+    _indexed: Tuple[Optional[List[ET]], Dict[str, ET]] = field(
+        default_factory=lambda: (None, {}), init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        if self.thread_safe:
+            # a copy, the caller's list is not ours to publish
+            self._publish(list(self.items), {item.id: item for item in self.items})
 
     def insert(self, entity: ET) -> None:
-        self.items.append(entity)
+        if not self.thread_safe:
+            self.items.append(entity)
+        else:
+            with self._lock:
+                items, index = self._copy()
+                items.append(entity)
+                index[entity.id] = entity
+                self._publish(items, index)
+        _clear_events([entity])
+
+    def bulk_insert(self, entities: List[ET]) -> None:
+        if not self.thread_safe:
+            self.items.extend(entities)
+        else:
+            with self._lock:
+                items, index = self._copy()
+                items.extend(entities)
+                index.update((entity.id, entity) for entity in entities)
+                self._publish(items, index)
+        _clear_events(entities)
 
     def find_by_id(self, entity_id: str | UniqueEntityID) -> ET:
         id_str = str(entity_id)
-        return self._get(id_str)
+        entity = self._get(id_str)
+        return entity.copy() if self.thread_safe else entity
 
     def find_all(self) -> List[ET]:
-        return self.items
+        # callers can't change a published list
+        return list(self.items) if self.thread_safe else self.items
+
+    def iter_all(self, batch_size: int = DEFAULT_BATCH_SIZE) -> Iterator[ET]:
+        check_batch_size(batch_size)
+        # iterate over a snapshot so writes made while the caller is
+        # consuming the generator don't shift or skip items
+        return self._iter_batches(tuple(self.items), batch_size)
+
+    @staticmethod
+    def _iter_batches(snapshot: Tuple[ET, ...], batch_size: int) -> Iterator[ET]:
+        for start in range(0, len(snapshot), batch_size):
+            yield from snapshot[start:start + batch_size]
 
     def update(self, entity: ET) -> None:
-        entity_found = self._get(entity.id)
-        index = self.items.index(entity_found)
-        self.items[index] = entity
+        if not self.thread_safe:
+            entity_found = self._get(entity.id)
+            index = self.items.index(entity_found)
+            self.items[index] = entity
+        else:
+            with self._lock:
+                entity_found = self._get(entity.id)
+                items, index = self._copy()
+                items[_position(items, entity_found)] = entity
+                index[entity.id] = entity
+                self._publish(items, index)
+        _clear_events([entity])
+
+    def upsert(self, entity: ET) -> None:
+        self.bulk_upsert([entity])
+
+    def bulk_upsert(self, entities: List[ET]) -> None:
+        if not self.thread_safe:
+            self._upsert_into(self.items, entities)
+        else:
+            with self._lock:
+                items, index = self._copy()
+                self._upsert_into(items, entities)
+                index.update((entity.id, entity) for entity in entities)
+                self._publish(items, index)
+        _clear_events(entities)
 
     def delete(self, entity_id: str | UniqueEntityID) -> None:
         id_str = str(entity_id)
-        entity_found = self._get(id_str)
-        self.items.remove(entity_found)
+        if not self.thread_safe:
+            entity_found = self._get(id_str)
+            self.items.remove(entity_found)
+            return
+        with self._lock:
+            entity_found = self._get(id_str)
+            items, index = self._copy()
+            del items[_position(items, entity_found)]
+            del index[id_str]
+            self._publish(items, index)
 
     def _get(self, entity_id: str) -> ET:
-        entity = next(filter(lambda i: i.id == entity_id, self.items), None)
+        items = self.items
+        if self.thread_safe:
+            indexed_items, index = self._indexed
+            # the index is of another list when items were assigned directly,
+            # or for the instant between the two assignments of _publish()
+            if indexed_items is items:
+                entity = index.get(entity_id)
+                if not entity:
+                    raise NotFoundException(f"Entity not found using ID '{entity_id}'")
+                return entity
+        entity = next(filter(lambda i: i.id == entity_id, items), None)
         if not entity:
             raise NotFoundException(f"Entity not found using ID '{entity_id}'")
         return entity
 
+    @staticmethod
+    def _upsert_into(items: List[ET], entities: List[ET]) -> None:
+        # index positions by id once, so the batch costs O(n + m) instead of
+        # a linear scan of the items for every entity
+        positions = {item.id: position for position, item in enumerate(items)}
+        for entity in entities:
+            position = positions.get(entity.id)
+            if position is None:
+                positions[entity.id] = len(items)
+                items.append(entity)
+            else:
+                items[position] = entity
+
+    def _copy(self) -> Tuple[List[ET], Dict[str, ET]]:
+        items = self.items
+        indexed_items, index = self._indexed
+        if indexed_items is not items:
+            index = {item.id: item for item in items}
+        return list(items), dict(index)
+
+    def _publish(self, items: List[ET], index: Dict[str, ET]) -> None:
+        # a reader holding the previous list or index keeps a consistent
+        # version, the published list is never changed again
+        self._indexed = (items, index)
+        self.items = items
+
 
 class InMemorySearchableRepository(
     Generic[ET, Filter],
@@ -172,6 +392,7 @@ class InMemorySearchableRepository(
     ABC
 ):
     def search(self, input_params: SearchParams[Filter]) -> SearchResult[ET, Filter]:
+        projection = self._apply_projection(input_params.fields)
         items_filtered = self._apply_filter(self.items, input_params.filter)
         items_sorted = self._apply_sort(
             items_filtered, input_params.sort, input_params.sort_dir
@@ -179,6 +400,11 @@ class InMemorySearchableRepository(
         items_paginated = self._apply_paginate(
             items_sorted, input_params.page, input_params.per_page
         )
+        if projection:
+            items_paginated = [
+                {field: getattr(item, field) for field in projection}
+                for item in items_paginated
+            ]
 
         return SearchResult(
             items=items_paginated,
@@ -187,7 +413,8 @@ class InMemorySearchableRepository(
             per_page=input_params.per_page,
             sort=input_params.sort,
             sort_dir=input_params.sort_dir,
-            filter=input_params.filter
+            filter=input_params.filter,
+            fields=projection
         )
 
     @abc.abstractmethod
@@ -203,4 +430,4 @@ class InMemorySearchableRepository(
     def _apply_paginate(self, items: List[ET], page: int, per_page: int) -> List[ET]:
         start = (page - 1) * per_page
         limit = start + per_page
-        return items[slice(start, limit)]
+        return list(items[slice(start, limit)])
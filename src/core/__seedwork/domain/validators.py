@@ -1,14 +1,22 @@
 from abc import ABC
 import abc
 from dataclasses import dataclass
-from typing import Any, Dict, Generic, List, TypeVar
-from django.conf import settings
-from rest_framework.fields import BooleanField, CharField
-from rest_framework.serializers import Serializer
+from typing import Any, Dict, Generic, List, TypeVar, TYPE_CHECKING
 from .exceptions import ValidationException
 
-if not settings.configured:
-    settings.configure(USE_I18N=False)
+if TYPE_CHECKING:
+    from rest_framework.serializers import Serializer
+
+# the DRF fields need Django and DRF, they are only imported on first use
+# so the domain layer can be imported without them
+_DRF_FIELDS = ('StrictBooleanField', 'StrictCharField')
+
+
+def __getattr__(name: str):
+    if name in _DRF_FIELDS:
+        from core.__seedwork.domain import drf_fields  # pylint: disable=import-outside-toplevel
+        return getattr(drf_fields, name)
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
 
 
 @dataclass(frozen=True, slots=True)
@@ -58,7 +66,7 @@ class ValidatorFieldsInterface(ABC, Generic[PropsValidated]):
 
 class DRFValidator(ValidatorFieldsInterface[PropsValidated], ABC):
 
-    def validate(self, data: Serializer):
+    def validate(self, data: 'Serializer'):
 
         if data.is_valid():
             self.validated_data = dict(data.validated_data)
@@ -69,29 +77,3 @@ class DRFValidator(ValidatorFieldsInterface[PropsValidated], ABC):
             for field, _errors in data.errors.items()
         }
         return False
-
-
-class StrictCharField(CharField):
-
-    def to_internal_value(self, data):
-        if not isinstance(data, str):
-            self.fail('invalid')
-
-        return super().to_internal_value(data)
-
-
-class StrictBooleanField(BooleanField):
-
-    # pylint: disable=inconsistent-return-statements
-    def to_internal_value(self, data):
-        try:
-            if data is True:
-                return True
-            if data is False:
-                return False
-            if data is None and self.allow_null:
-                return None
-        except TypeError:
-            pass
-
-        self.fail('invalid', input=data)
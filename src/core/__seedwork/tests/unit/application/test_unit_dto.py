@@ -20,6 +20,7 @@ class TestSearchInput(unittest.TestCase):
             'sort': Optional[str],
             'sort_dir': Optional[str],
             'filter': Optional[Filter],
+            'fields': Optional[List[str]],
         })
 
 
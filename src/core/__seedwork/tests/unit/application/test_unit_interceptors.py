@@ -0,0 +1,236 @@
+import asyncio
+import contextlib
+import json
+import pstats
+import tempfile
+import threading
+import unittest
+from dataclasses import dataclass
+from pathlib import Path
+
+from core.__seedwork.application.interceptors import (
+    AsyncInterceptedUseCase,
+    InMemorySpanExporter,
+    InterceptedUseCase,
+    JsonLinesSpanExporter,
+    ProfilingInterceptor,
+    SlowCallLoggingInterceptor,
+    TimingInterceptor,
+    TracingInterceptor,
+    UseCaseInterceptor,
+    intercept_executions
+)
+from core.__seedwork.application.use_cases import AsyncUseCase, UseCase
+
+
+@dataclass(slots=True, frozen=True)
+class StubUseCase(UseCase):
+
+    Input = int
+
+    def execute(self, input_param: int) -> int:
+        if input_param < 0:
+            raise ValueError('negative')
+        return input_param * 2
+
+
+@dataclass(slots=True, frozen=True)
+class StubAsyncUseCase(AsyncUseCase):
+
+    async def execute(self, input_param: int) -> int:
+        return input_param * 3
+
+
+@dataclass(slots=True, frozen=True)
+class NestingUseCase(UseCase):
+
+    inner: InterceptedUseCase
+
+    def execute(self, input_param: int) -> int:
+        return self.inner.execute(input_param) + 1
+
+
+class RecordingInterceptor(UseCaseInterceptor):
+
+    def __init__(self, name, calls):
+        self.name = name
+        self.calls = calls
+
+    @contextlib.contextmanager
+    def intercept(self, use_case, input_param):
+        self.calls.append(f'enter {self.name} {type(use_case).__name__} {input_param}')
+        yield
+        self.calls.append(f'exit {self.name}')
+
+
+class TestInterceptedUseCaseUnit(unittest.TestCase):
+
+    def test_chain_order(self):
+        calls = []
+        use_case = InterceptedUseCase(StubUseCase(), [
+            RecordingInterceptor('outer', calls), RecordingInterceptor('inner', calls)
+        ])
+
+        self.assertEqual(use_case.execute(2), 4)
+        self.assertEqual(calls, [
+            'enter outer StubUseCase 2', 'enter inner StubUseCase 2', 'exit inner', 'exit outer'
+        ])
+        self.assertIs(use_case.Input, int)
+
+    def test_without_interceptors(self):
+        self.assertEqual(InterceptedUseCase(StubUseCase(), []).execute(1), 2)
+
+    def test_async_chain(self):
+        calls = []
+        use_case = AsyncInterceptedUseCase(
+            StubAsyncUseCase(), [RecordingInterceptor('outer', calls)])
+
+        self.assertEqual(asyncio.run(use_case.execute(2)), 6)
+        self.assertEqual(calls, ['enter outer StubAsyncUseCase 2', 'exit outer'])
+
+    def test_context_interceptors(self):
+        calls = []
+        use_case = InterceptedUseCase(StubUseCase(), [RecordingInterceptor('chain', calls)])
+
+        with intercept_executions(RecordingInterceptor('outer', calls)):
+            with intercept_executions(RecordingInterceptor('inner', calls)):
+                use_case.execute(1)
+            use_case.execute(2)
+        use_case.execute(3)
+
+        self.assertEqual(calls, [
+            'enter chain StubUseCase 1', 'enter outer StubUseCase 1', 'enter inner StubUseCase 1',
+            'exit inner', 'exit outer', 'exit chain',
+            'enter chain StubUseCase 2', 'enter outer StubUseCase 2', 'exit outer', 'exit chain',
+            'enter chain StubUseCase 3', 'exit chain',
+        ])
+
+    def test_context_interceptors_of_async_executions(self):
+        calls = []
+        use_case = AsyncInterceptedUseCase(StubAsyncUseCase(), [])
+
+        async def run():
+            with intercept_executions(RecordingInterceptor('request', calls)):
+                return await use_case.execute(2)
+
+        self.assertEqual(asyncio.run(run()), 6)
+        self.assertEqual(calls, ['enter request StubAsyncUseCase 2', 'exit request'])
+
+
+class TestInterceptorsUnit(unittest.TestCase):
+
+    def test_timing_interceptor(self):
+        records = []
+        use_case = InterceptedUseCase(
+            StubUseCase(), [TimingInterceptor(lambda seconds, name: records.append((seconds, name)))])
+
+        use_case.execute(1)
+        with self.assertRaises(ValueError):
+            use_case.execute(-1)
+
+        self.assertEqual([name for _, name in records], ['StubUseCase', 'StubUseCase'])
+        self.assertTrue(all(seconds >= 0 for seconds, _ in records))
+
+    def test_slow_call_logging_interceptor(self):
+        with self.assertLogs('core.__seedwork.application.interceptors', 'WARNING') as logs:
+            InterceptedUseCase(StubUseCase(), [SlowCallLoggingInterceptor(threshold_ms=0)]).execute(3)
+        self.assertEqual(len(logs.records), 1)
+        self.assertIn('slow use case StubUseCase took', logs.records[0].getMessage())
+        self.assertIn('input=3', logs.records[0].getMessage())
+
+        with self.assertNoLogs('core.__seedwork.application.interceptors', 'WARNING'):
+            InterceptedUseCase(
+                StubUseCase(), [SlowCallLoggingInterceptor(threshold_ms=60000)]).execute(3)
+
+    def test_profiling_interceptor(self):
+        with tempfile.TemporaryDirectory() as directory:
+            samples = iter([0.05, 0.5, 0.05])
+            interceptor = ProfilingInterceptor(
+                sample_rate=0.1, output_dir=Path(directory), sample=lambda: next(samples))
+            use_case = InterceptedUseCase(StubUseCase(), [interceptor])
+            for value in range(3):
+                use_case.execute(value)
+
+            profiles = sorted(Path(directory).glob('StubUseCase-*.prof'))
+            self.assertEqual(len(profiles), 2)
+            stats = pstats.Stats(str(profiles[0]))
+            self.assertTrue(any(
+                function == 'execute' for (_, _, function) in stats.stats  # pylint: disable=no-member
+            ))
+
+    def test_profiling_interceptor_samples_one_execution_at_a_time(self):
+        with tempfile.TemporaryDirectory() as directory:
+            interceptor = ProfilingInterceptor(sample_rate=1.0, output_dir=Path(directory))
+            started, release = threading.Event(), threading.Event()
+
+            @dataclass(slots=True, frozen=True)
+            class BlockingUseCase(UseCase):
+
+                def execute(self, input_param: int) -> int:
+                    started.set()
+                    release.wait(5)
+                    return input_param
+
+            thread = threading.Thread(
+                target=InterceptedUseCase(BlockingUseCase(), [interceptor]).execute, args=(1,))
+            thread.start()
+            started.wait(5)
+            # skipped while the other thread is sampled, nested executions too
+            inner = InterceptedUseCase(StubUseCase(), [interceptor])
+            self.assertEqual(InterceptedUseCase(NestingUseCase(inner), [interceptor]).execute(1), 3)
+            release.set()
+            thread.join()
+
+            self.assertEqual(len(list(Path(directory).glob('BlockingUseCase-*.prof'))), 1)
+            self.assertEqual(len(list(Path(directory).glob('*.prof'))), 1)
+
+            InterceptedUseCase(NestingUseCase(inner), [interceptor]).execute(1)
+            self.assertEqual(len(list(Path(directory).glob('NestingUseCase-*.prof'))), 1)
+            self.assertEqual(len(list(Path(directory).glob('*.prof'))), 2)
+
+    def test_profiling_interceptor_skips_async_use_cases(self):
+        with tempfile.TemporaryDirectory() as directory:
+            interceptor = ProfilingInterceptor(sample_rate=1.0, output_dir=Path(directory))
+            use_case = AsyncInterceptedUseCase(StubAsyncUseCase(), [interceptor])
+            self.assertEqual(asyncio.run(use_case.execute(1)), 3)
+            self.assertEqual(list(Path(directory).glob('*.prof')), [])
+
+    def test_profiling_interceptor_is_disabled_without_output_dir(self):
+        interceptor = ProfilingInterceptor(sample_rate=1.0, output_dir=None)
+        self.assertEqual(InterceptedUseCase(StubUseCase(), [interceptor]).execute(1), 2)
+
+    def test_tracing_interceptor(self):
+        exporter = InMemorySpanExporter()
+        tracing = TracingInterceptor(exporter)
+        inner = InterceptedUseCase(StubUseCase(), [tracing])
+        outer = InterceptedUseCase(NestingUseCase(inner), [tracing])
+
+        self.assertEqual(outer.execute(2), 5)
+        with self.assertRaises(ValueError):
+            inner.execute(-1)
+
+        child, parent, failed = exporter.finished_spans()
+        self.assertEqual(parent.name, 'NestingUseCase')
+        self.assertIsNone(parent.parent_id)
+        self.assertEqual(child.name, 'StubUseCase')
+        self.assertEqual(child.parent_id, parent.span_id)
+        self.assertEqual(child.trace_id, parent.trace_id)
+        self.assertEqual(parent.status, 'ok')
+        self.assertEqual(failed.status, 'error: ValueError')
+        self.assertNotEqual(failed.trace_id, parent.trace_id)
+        self.assertGreaterEqual(parent.duration, child.duration)
+
+    def test_tracing_interceptor_is_disabled_without_exporter(self):
+        self.assertEqual(InterceptedUseCase(StubUseCase(), [TracingInterceptor(None)]).execute(1), 2)
+
+    def test_json_lines_span_exporter(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = Path(directory) / 'spans.jsonl'
+            use_case = InterceptedUseCase(
+                StubUseCase(), [TracingInterceptor(JsonLinesSpanExporter(path))])
+            use_case.execute(1)
+            use_case.execute(2)
+
+            spans = [json.loads(line) for line in path.read_text(encoding='utf-8').splitlines()]
+        self.assertEqual([span['name'] for span in spans], ['StubUseCase', 'StubUseCase'])
+        self.assertEqual(spans[0]['attributes'], {'input': 'int'})
@@ -1,5 +1,5 @@
 import unittest
-from core.__seedwork.application.use_cases import UseCase
+from core.__seedwork.application.use_cases import AsyncUseCase, UseCase
 
 
 class TestUseCases(unittest.TestCase):
@@ -11,3 +11,14 @@ class TestUseCases(unittest.TestCase):
             assert_error.exception.args[0],
             "Can't instantiate abstract class UseCase with abstract " +
             "method execute")
+
+
+class TestAsyncUseCases(unittest.TestCase):
+
+    def test_raise_error_when_methods_not_implemented(self):
+        with self.assertRaises(TypeError) as assert_error:
+            AsyncUseCase()  # pylint: disable=E0110
+        self.assertEqual(
+            assert_error.exception.args[0],
+            "Can't instantiate abstract class AsyncUseCase with abstract " +
+            "method execute")
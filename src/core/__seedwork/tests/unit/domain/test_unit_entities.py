@@ -2,6 +2,7 @@ from abc import ABC
 from dataclasses import dataclass, is_dataclass
 import unittest
 from core.__seedwork.domain.entities import Entity
+from core.__seedwork.domain.events import DomainEvent
 from core.__seedwork.domain.value_objects import UniqueEntityID
 
 
@@ -51,3 +52,75 @@ class TestEntityUnit(unittest.TestCase):
         entity = StubEntity(prop1='value1', prop2='value2')
         entity._set('prop1', 'changed')  # pylint: disable=protected-access
         self.assertEqual(entity.prop1, 'changed')
+
+    def test_restore_method(self):
+        entity = StubEntity.restore(
+            unique_entity_id=UniqueEntityID(
+                'c71404e4-1a1f-4587-9ff1-5e6b90589a81'),
+            prop1='value1',
+            prop2='value2'
+        )
+        self.assertEqual(entity, StubEntity(
+            unique_entity_id=UniqueEntityID(
+                'c71404e4-1a1f-4587-9ff1-5e6b90589a81'),
+            prop1='value1',
+            prop2='value2'
+        ))
+
+        entity = StubEntity.restore(prop1='value1', prop2='value2')
+        self.assertIsInstance(entity.unique_entity_id, UniqueEntityID)
+
+        with self.assertRaises(TypeError) as assert_error:
+            StubEntity.restore(prop1='value1')
+        self.assertEqual(
+            assert_error.exception.args[0],
+            "StubEntity.restore() missing required argument: 'prop2'"
+        )
+
+        with self.assertRaises(TypeError) as assert_error:
+            StubEntity.restore(prop1='value1', prop2='value2', fake='fake')
+        self.assertEqual(
+            assert_error.exception.args[0],
+            "StubEntity.restore() got unexpected arguments: fake"
+        )
+
+    def test_record_and_clear_events(self):
+        entity = StubEntity(prop1='value1', prop2='value2')
+        self.assertEqual(entity.events, [])
+
+        event = DomainEvent(aggregate_id=entity.id)
+        entity.record_event(event)
+        self.assertEqual(entity.events, [event])
+        # a copy, the entity alone records its events
+        entity.events.clear()
+        self.assertEqual(entity.events, [event])
+
+        self.assertNotIn('_events', entity.to_dict())
+        self.assertNotIn('_events', repr(entity))
+        self.assertEqual(entity, StubEntity(
+            unique_entity_id=entity.unique_entity_id, prop1='value1', prop2='value2'
+        ))
+
+        entity.clear_events()
+        self.assertEqual(entity.events, [])
+
+    def test_copy_method(self):
+        entity = StubEntity(prop1='value1', prop2='value2')
+        event = DomainEvent(aggregate_id=entity.id)
+        entity.record_event(event)
+
+        copy = entity.copy()
+        self.assertEqual(copy, entity)
+        self.assertIsNot(copy, entity)
+        self.assertEqual(copy.events, [event])
+
+        copy._set('prop1', 'changed')
+        copy.clear_events()
+        self.assertEqual(entity.prop1, 'value1')
+        self.assertEqual(entity.events, [event])
+
+    def test_domain_event(self):
+        event = DomainEvent(aggregate_id='id')
+        self.assertEqual(event.event_type, 'DomainEvent')
+        self.assertEqual(event.payload(), {})
+        self.assertIsNotNone(event.occurred_at.tzinfo)
@@ -1,12 +1,17 @@
 # pylint: disable=protected-access
 from dataclasses import dataclass
+import sys
+import threading
 from typing import List, Optional
 import unittest
 from core.__seedwork.domain.entities import Entity
+from core.__seedwork.domain.events import DomainEvent
 from core.__seedwork.domain.exceptions import NotFoundException
 
 from core.__seedwork.domain.repositories import (
     ET,
+    AsyncRepositoryInterface,
+    AsyncSearchableRepositoryInterface,
     Filter,
     InMemoryRepository,
     InMemorySearchableRepository,
@@ -27,10 +32,40 @@ class TestRepositoryInterface(unittest.TestCase):
         self.assertEqual(
             assert_error.exception.args[0],
             "Can't instantiate abstract class RepositoryInterface with abstract " +
-            "methods delete, find_all, find_by_id, insert, update"
+            "methods bulk_insert, bulk_upsert, delete, find_all, find_by_id, insert, iter_all, update, upsert"
         )
 
 
+class TestAsyncRepositoryInterface(unittest.TestCase):
+
+    def test_raise_error_when_methods_not_implemented(self):
+        with self.assertRaises(TypeError) as assert_error:
+            AsyncRepositoryInterface()  # pylint: disable=abstract-class-instantiated
+
+        self.assertEqual(
+            assert_error.exception.args[0],
+            "Can't instantiate abstract class AsyncRepositoryInterface with abstract " +
+            "methods delete, find_all, find_by_id, insert, iter_all, update"
+        )
+
+
+class TestAsyncSearchableRepositoryInterface(unittest.TestCase):
+
+    def test_raise_error_when_methods_not_implemented(self):
+        with self.assertRaises(TypeError) as assert_error:
+            AsyncSearchableRepositoryInterface()  # pylint: disable=abstract-class-instantiated
+
+        self.assertEqual(
+            assert_error.exception.args[0],
+            "Can't instantiate abstract class AsyncSearchableRepositoryInterface with abstract " +
+            "methods delete, find_all, find_by_id, insert, iter_all, search, update"
+        )
+
+    def test_fields_props(self):
+        self.assertEqual(AsyncSearchableRepositoryInterface.sortable_fields, [])
+        self.assertEqual(AsyncSearchableRepositoryInterface.projectable_fields, [])
+
+
 @dataclass(frozen=True, kw_only=True, slots=True)
 class StubEntity(Entity):
     name: str
@@ -56,6 +91,14 @@ class TestInMemoryRepository(unittest.TestCase):
         self.repo.insert(entity)
         self.assertEqual(self.repo.items[0], entity)
 
+    def test_bulk_insert(self):
+        entities = [StubEntity(name='test', price=5), StubEntity(name='test 2', price=2)]
+        self.repo.bulk_insert(entities)
+        self.assertEqual(self.repo.items, entities)
+
+        self.repo.bulk_insert([])
+        self.assertEqual(self.repo.items, entities)
+
     def test_raise_not_found_exception_in_find_by_id(self):
         with self.assertRaises(NotFoundException) as assert_error:
             self.repo.find_by_id('fake id')
@@ -92,6 +135,35 @@ class TestInMemoryRepository(unittest.TestCase):
         items = self.repo.find_all()
         self.assertEqual(items, [entity])
 
+    def test_iter_all(self):
+        entities = [StubEntity(name=f'test {i}', price=i) for i in range(5)]
+        self.repo.items = list(entities)
+
+        iterator = self.repo.iter_all(batch_size=2)
+        self.assertNotIsInstance(iterator, list)
+        self.assertEqual(list(iterator), entities)
+
+        self.assertEqual(list(StubInMemoryRepository().iter_all()), [])
+
+    def test_iter_all_with_invalid_batch_size(self):
+        for batch_size in (0, -1):
+            with self.assertRaises(ValueError) as assert_error:
+                self.repo.iter_all(batch_size=batch_size)
+            self.assertEqual(
+                assert_error.exception.args[0], f'batch_size must be greater than 0, got {batch_size}')
+
+    def test_iter_all_reads_from_a_snapshot(self):
+        entities = [StubEntity(name=f'test {i}', price=i) for i in range(3)]
+        self.repo.items = list(entities)
+
+        iterator = self.repo.iter_all(batch_size=1)
+        self.assertEqual(next(iterator), entities[0])
+
+        self.repo.delete(entities[1].id)
+        self.repo.insert(StubEntity(name='new', price=10))
+
+        self.assertEqual(list(iterator), entities[1:])
+
     def test_raise_not_found_exception_in_update(self):
         entity = StubEntity(name='test', price=5)
 
@@ -115,6 +187,38 @@ class TestInMemoryRepository(unittest.TestCase):
 
         self.assertEqual(entity_updated, self.repo.items[0])
 
+    def test_upsert(self):
+        entity = StubEntity(name='test', price=5)
+        self.repo.upsert(entity)
+        self.assertEqual(self.repo.items, [entity])
+
+        entity_updated = StubEntity(
+            unique_entity_id=entity.unique_entity_id,
+            name='test',
+            price=1
+        )
+        self.repo.upsert(entity_updated)
+        self.assertEqual(self.repo.items, [entity_updated])
+
+    def test_bulk_upsert(self):
+        entity = StubEntity(name='test', price=5)
+        self.repo.insert(entity)
+
+        entity_updated = StubEntity(
+            unique_entity_id=entity.unique_entity_id,
+            name='test updated',
+            price=1
+        )
+        new_entity = StubEntity(name='new', price=2)
+        new_entity_updated = StubEntity(
+            unique_entity_id=new_entity.unique_entity_id,
+            name='new updated',
+            price=3
+        )
+        self.repo.bulk_upsert([new_entity, entity_updated, new_entity_updated])
+
+        self.assertEqual(self.repo.items, [entity_updated, new_entity_updated])
+
     def test_raise_not_found_exception_in_delete(self):
         entity = StubEntity(name='test', price=5)
 
@@ -146,6 +250,144 @@ class TestInMemoryRepository(unittest.TestCase):
         self.assertEqual(self.repo.items, [])
 
 
+    def test_writes_clear_the_events(self):
+        def changed(*entities: StubEntity) -> List[StubEntity]:
+            for entity in entities:
+                entity.record_event(DomainEvent(aggregate_id=entity.id))
+            return list(entities)
+
+        entity, other = changed(StubEntity(name='a', price=1), StubEntity(name='b', price=2))
+        self.repo.insert(entity)
+        self.repo.bulk_insert(changed(other))
+        self.repo.update(*changed(entity))
+        self.repo.upsert(*changed(entity))
+        self.repo.bulk_upsert(changed(entity, other))
+
+        self.assertEqual([item.events for item in self.repo.items], [[], []])
+
+        # a failed write keeps them
+        missing = changed(StubEntity(name='c', price=3))[0]
+        with self.assertRaises(NotFoundException):
+            self.repo.update(missing)
+        self.assertEqual(len(missing.events), 1)
+
+
+class TestThreadSafeInMemoryRepository(TestInMemoryRepository):
+
+    def setUp(self) -> None:
+        self.repo = StubInMemoryRepository(thread_safe=True)
+
+    def test_writes_publish_a_new_list(self):
+        entities = [StubEntity(name='a', price=1), StubEntity(name='b', price=2)]
+        given = list(entities)
+        repo = StubInMemoryRepository(items=given, thread_safe=True)
+        published = repo.items
+        self.assertIsNot(published, given)
+
+        repo.update(StubEntity(unique_entity_id=entities[0].unique_entity_id, name='a', price=3))
+        repo.delete(entities[1].id)
+        repo.insert(StubEntity(name='c', price=4))
+
+        self.assertEqual(published, entities)
+        self.assertEqual(given, entities)
+        self.assertEqual([item.price for item in repo.items], [3, 4])
+        self.assertEqual(repo.find_all(), repo.items)
+        self.assertIsNot(repo.find_all(), repo.items)
+
+    def test_find_by_id_uses_the_index_of_the_published_list(self):
+        entity = StubEntity(name='a', price=1)
+        self.repo.insert(entity)
+        self.assertIs(self.repo._indexed[0], self.repo.items)
+        self.assertIs(self.repo._get(entity.id), entity)
+
+        # assigned directly, the index is rebuilt by the next write
+        other = StubEntity(name='b', price=2)
+        self.repo.items = [other]
+        self.assertIs(self.repo._get(other.id), other)
+        with self.assertRaises(NotFoundException):
+            self.repo.find_by_id(entity.id)
+        self.repo.insert(entity)
+        self.assertEqual(self.repo._indexed[1], {other.id: other, entity.id: entity})
+
+    def test_find_by_id_returns_a_copy(self):
+        entity = StubEntity(name='a', price=1)
+        self.repo.insert(entity)
+
+        found = self.repo.find_by_id(entity.id)
+        self.assertEqual(found, entity)
+        found._set('price', 2)
+        self.assertEqual(self.repo.find_by_id(entity.id).price, 1)
+
+        self.repo.update(found)
+        self.assertEqual(self.repo.find_by_id(entity.id).price, 2)
+        self.assertEqual(entity.price, 1)
+
+
+class TestThreadSafeInMemoryRepositoryStress(unittest.TestCase):
+
+    def setUp(self) -> None:
+        # switch threads as often as possible to interleave reads and writes
+        self.switch_interval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)
+
+    def tearDown(self) -> None:
+        sys.setswitchinterval(self.switch_interval)
+
+    def test_concurrent_reads_and_writes(self):
+        stable = [StubEntity(name=f'stable {index:03}', price=index) for index in range(200)]
+        repo = StubImMemorySearchableRepository(items=list(stable), thread_safe=True)
+        errors = []
+        writing = threading.Event()
+
+        def run(target):
+            def wrapper(*args):
+                try:
+                    target(*args)
+                except Exception as exception:  # pylint: disable=broad-except
+                    errors.append(exception)
+            return wrapper
+
+        def write(worker):
+            for index in range(150):
+                entity = StubEntity(name=f'temp {worker} {index}', price=-1)
+                repo.insert(entity)
+                assert repo.find_by_id(entity.id) == entity
+                repo.update(StubEntity(unique_entity_id=entity.unique_entity_id, name=entity.name, price=-2))
+                repo.bulk_upsert([StubEntity(unique_entity_id=entity.unique_entity_id, name=entity.name, price=-3)])
+                repo.delete(entity.id)
+
+        def read():
+            while writing.is_set():
+                result = repo.search(SearchParams(sort='name', sort_dir='asc', per_page=50, page=4))
+                names = [item.name for item in result.items]
+                assert names == sorted(names), names
+                assert len(result.items) == min(50, result.total - 150)
+                assert result.total >= 200
+                for entity in stable[::25]:
+                    found = repo.find_by_id(entity.id)
+                    assert found == entity
+                    # changing a found entity changes no published version
+                    found._set('price', -9)
+                ids = [item.id for item in repo.iter_all(batch_size=64)]
+                assert len(ids) == len(set(ids)) >= 200
+
+        writing.set()
+        readers = [threading.Thread(target=run(read)) for _ in range(6)]
+        writers = [threading.Thread(target=run(write), args=(worker,)) for worker in range(6)]
+        for thread in readers + writers:
+            thread.start()
+        for thread in writers:
+            thread.join()
+        writing.clear()
+        for thread in readers:
+            thread.join()
+
+        self.assertEqual(errors, [])
+        self.assertEqual(repo.find_all(), stable)
+        self.assertEqual([entity.price for entity in repo.find_all()], list(range(200)))
+        self.assertEqual(repo._indexed[1], {entity.id: entity for entity in stable})
+
+
 class TestSearchableRepositoryInterface(unittest.TestCase):
 
     def test_raise_error_when_methods_not_implemented(self):
@@ -154,13 +396,16 @@ class TestSearchableRepositoryInterface(unittest.TestCase):
 
         self.assertEqual(
             "Can't instantiate abstract class SearchableRepositoryInterface with abstract " +
-            "methods delete, find_all, find_by_id, insert, search, update",
+            "methods bulk_insert, bulk_upsert, delete, find_all, find_by_id, insert, iter_all, search, update, upsert",
             assert_error.exception.args[0]
         )
 
     def test_sortable_fields_prop(self):
         self.assertEqual(SearchableRepositoryInterface.sortable_fields, [])
 
+    def test_projectable_fields_prop(self):
+        self.assertEqual(SearchableRepositoryInterface.projectable_fields, [])
+
 
 class TestSeaerchParams(unittest.TestCase):
 
@@ -172,7 +417,8 @@ class TestSeaerchParams(unittest.TestCase):
                 'per_page': Optional[int],
                 'sort': Optional[str],
                 'sort_dir': Optional[str],
-                'filter': Optional[Filter]
+                'filter': Optional[Filter],
+                'fields': Optional[List[str]]
             }
         )
 
@@ -294,6 +540,28 @@ class TestSeaerchParams(unittest.TestCase):
             self.assertEqual(params.sort, i['expected'])
 
 
+    def test_fields_prop(self):
+        params = SearchParams()
+        self.assertIsNone(params.fields)
+
+        arrange = [
+            {'fields': None, 'expected': None},
+            {'fields': "", 'expected': None},
+            {'fields': [], 'expected': None},
+            {'fields': " , ", 'expected': None},
+            {'fields': "name", 'expected': ['name']},
+            {'fields': "id,name", 'expected': ['id', 'name']},
+            {'fields': " id , name ,,", 'expected': ['id', 'name']},
+            {'fields': "name,id,name", 'expected': ['name', 'id']},
+            {'fields': ['id', 'name'], 'expected': ['id', 'name']},
+            {'fields': ('name', ''), 'expected': ['name']},
+        ]
+
+        for i in arrange:
+            params = SearchParams(fields=i['fields'])
+            self.assertEqual(params.fields, i['expected'], i)
+
+
 class TestSeaerchResult(unittest.TestCase):
 
     def test_props_annotations(self):
@@ -307,7 +575,8 @@ class TestSeaerchResult(unittest.TestCase):
                 'last_page': int,
                 'sort': Optional[str],
                 'sort_dir': Optional[str],
-                'filter': Optional[Filter]
+                'filter': Optional[Filter],
+                'fields': Optional[List[str]]
             }
         )
 
@@ -330,7 +599,8 @@ class TestSeaerchResult(unittest.TestCase):
                 'last_page': 2,
                 'sort': None,
                 'sort_dir': None,
-                'filter': None
+                'filter': None,
+                'fields': None
             }
         )
 
@@ -341,7 +611,8 @@ class TestSeaerchResult(unittest.TestCase):
             per_page=2,
             sort='name',
             sort_dir='asc',
-            filter='test'
+            filter='test',
+            fields=['id', 'name']
         )
 
         self.assertDictEqual(
@@ -354,7 +625,8 @@ class TestSeaerchResult(unittest.TestCase):
                 'last_page': 2,
                 'sort': 'name',
                 'sort_dir': 'asc',
-                'filter': 'test'
+                'filter': 'test',
+                'fields': ['id', 'name']
             }
         )
 
@@ -381,6 +653,7 @@ class TestSeaerchResult(unittest.TestCase):
 
 class StubImMemorySearchableRepository(InMemorySearchableRepository[StubEntity, str]):
     sortable_fields: List[str] = ['name']
+    projectable_fields: List[str] = ['id', 'name', 'price']
 
     def _apply_filter(self, items: List[StubEntity], filter_param: str | None) -> List[StubEntity]:
         if filter_param:
@@ -472,6 +745,42 @@ class TestImMemorySearchableRepository(unittest.TestCase):
             filter=None
         ))
 
+    def test_apply_projection(self):
+        self.assertIsNone(self.repo._apply_projection(None))
+        self.assertIsNone(self.repo._apply_projection([]))
+        self.assertIsNone(self.repo._apply_projection(['fake']))
+        self.assertEqual(self.repo._apply_projection(['name']), ['id', 'name'])
+        self.assertEqual(
+            self.repo._apply_projection(['price', 'fake', 'id']),
+            ['id', 'price']
+        )
+
+    def test_search_applying_projection(self):
+        items = [
+            StubEntity(name='b', price=1),
+            StubEntity(name='a', price=2),
+        ]
+        self.repo.items = items
+
+        result = self.repo.search(SearchParams(sort='name', fields='name,fake'))
+        self.assertEqual(result, SearchResult(
+            items=[
+                {'id': items[1].id, 'name': 'a'},
+                {'id': items[0].id, 'name': 'b'},
+            ],
+            total=2,
+            current_page=1,
+            per_page=15,
+            sort='name',
+            sort_dir='asc',
+            filter=None,
+            fields=['id', 'name']
+        ))
+
+        result = self.repo.search(SearchParams(fields='fake'))
+        self.assertEqual(result.items, items)
+        self.assertIsNone(result.fields)
+
     def test_search_applying_filter_and_paginate(self):
         items = [
             StubEntity(name='test', price=1),
@@ -0,0 +1,96 @@
+# pylint: disable=invalid-name,no-member
+
+from dataclasses import asdict, dataclass
+from core.__seedwork.application.dto import PaginationOutputMapper
+from core.__seedwork.application.use_cases import AsyncUseCase
+from core.category.application.dto import CategoryOutPutMapper
+from core.category.application.use_cases import (
+    CreateCategoryUseCase,
+    DeleteCategoryUseCase,
+    GetCategoryUseCase,
+    ListCategoriesUseCase,
+    UpdateCategoryUseCase
+)
+
+from core.category.domain.entities import Category
+from core.category.domain.repositories import CategoryAsyncRepository
+
+
+@dataclass(slots=True, frozen=True)
+class AsyncCreateCategoryUseCase(AsyncUseCase):
+
+    category_repo: CategoryAsyncRepository
+
+    Input = CreateCategoryUseCase.Input
+    Output = CreateCategoryUseCase.Output
+
+    async def execute(self, input_param: 'Input') -> 'Output':
+        category = Category.create(
+            **asdict(input_param)
+        )
+        await self.category_repo.insert(category)
+        return CategoryOutPutMapper.from_child(self.Output).to_output(category)
+
+
+@dataclass(slots=True, frozen=True)
+class AsyncGetCategoryUseCase(AsyncUseCase):
+
+    category_repo: CategoryAsyncRepository
+
+    Input = GetCategoryUseCase.Input
+    Output = GetCategoryUseCase.Output
+
+    async def execute(self, input_param: 'Input') -> 'Output':
+        category = await self.category_repo.find_by_id(input_param.id)
+        return CategoryOutPutMapper.from_child(self.Output).to_output(category)
+
+
+@dataclass(slots=True, frozen=True)
+class AsyncListCategoriesUseCase(AsyncUseCase):
+
+    category_repo: CategoryAsyncRepository
+
+    Input = ListCategoriesUseCase.Input
+    Output = ListCategoriesUseCase.Output
+
+    async def execute(self, input_param: 'Input') -> 'Output':
+        search_params = self.category_repo.SearchParams(**asdict(input_param))
+        result = await self.category_repo.search(search_params)
+        items = list(result.items) if result.fields else list(
+            map(CategoryOutPutMapper.without_child().to_output, result.items)
+        )
+        return PaginationOutputMapper\
+            .from_child(self.Output)\
+            .to_output(items, result)
+
+
+@dataclass(slots=True, frozen=True)
+class AsyncUpdateCategoryUseCase(AsyncUseCase):
+
+    category_repo: CategoryAsyncRepository
+
+    Input = UpdateCategoryUseCase.Input
+    Output = UpdateCategoryUseCase.Output
+
+    async def execute(self, input_param: 'Input') -> 'Output':
+        entity = await self.category_repo.find_by_id(input_param.id)
+        entity.update(input_param.name, input_param.description)
+
+        if input_param.is_active is True:
+            entity.activate()
+        if input_param.is_active is False:
+            entity.deactivate()
+
+        await self.category_repo.update(entity)
+        return CategoryOutPutMapper.from_child(self.Output).to_output(entity)
+
+
+@dataclass(slots=True, frozen=True)
+class AsyncDeleteCategoryUseCase(AsyncUseCase):
+
+    category_repo: CategoryAsyncRepository
+
+    Input = DeleteCategoryUseCase.Input
+
+    async def execute(self, input_param: 'Input') -> None:
+        await self.category_repo.delete(input_param.id)
@@ -1,17 +1,24 @@
 # pylint: disable=invalid-name,no-member
 
+import datetime
 from dataclasses import asdict, dataclass
-from typing import Optional
+from typing import Any, Dict, List, Optional
 from core.__seedwork.application.dto import (
     PaginationOutput,
     PaginationOutputMapper,
     SearchInput
 )
 from core.__seedwork.application.use_cases import UseCase
+from core.__seedwork.domain.value_objects import UniqueEntityID
 from core.category.application.dto import CategoryOutPutMapper, CategoryOutput
 
 from core.category.domain.entities import Category
-from core.category.domain.repositories import CategoryRepository
+from core.category.domain.repositories import (
+    CategoryChangeFeed,
+    CategoryRepository,
+    CategoryUpdate,
+    CategoryUpdatesFeed
+)
 
 
 @dataclass(slots=True, frozen=True)
@@ -20,7 +27,7 @@ class CreateCategoryUseCase(UseCase):
     category_repo: CategoryRepository
 
     def execute(self, input_param: 'Input') -> 'Output':
-        category = Category(
+        category = Category.create(
             **asdict(input_param)
         )
         self.category_repo.insert(category)
@@ -74,7 +81,9 @@ class ListCategoriesUseCase(UseCase):
         return self.__to_output(result)
 
     def __to_output(self, result: CategoryRepository.SearchResult):
-        items = list(
+        # projected searches already return plain dicts with only the
+        # requested fields, there is no entity to map
+        items = list(result.items) if result.fields else list(
             map(CategoryOutPutMapper.without_child().to_output, result.items)
         )
         return PaginationOutputMapper\
@@ -123,6 +132,38 @@ class UpdateCategoryUseCase(UseCase):
         pass
 
 
+@dataclass(slots=True, frozen=True)
+class UpsertCategoryUseCase(UseCase):
+
+    category_repo: CategoryRepository
+
+    def execute(self, input_param: 'Input') -> 'Output':
+        category = Category.replace(
+            unique_entity_id=UniqueEntityID(input_param.id),
+            name=input_param.name,
+            description=input_param.description,
+            is_active=input_param.is_active
+        )
+        self.category_repo.upsert(category)
+        # an update keeps the created_at of the stored category
+        return self.__to_output(self.category_repo.find_by_id(category.unique_entity_id))
+
+    def __to_output(self, category: Category):
+        return CategoryOutPutMapper.from_child(UpsertCategoryUseCase.Output).to_output(category)
+
+    @dataclass(slots=True, frozen=True)
+    class Input:
+        id: str
+        name: str
+        description: Optional[str] = Category.get_field(
+            'description').default
+        is_active: Optional[bool] = Category.get_field('is_active').default
+
+    @dataclass(slots=True, frozen=True)
+    class Output(CategoryOutput):
+        pass
+
+
 @dataclass(slots=True, frozen=True)
 class DeleteCategoryUseCase(UseCase):
 
@@ -134,3 +175,111 @@ class DeleteCategoryUseCase(UseCase):
     @dataclass(slots=True, frozen=True)
     class Input:
         id: str
+
+
+@dataclass(slots=True, frozen=True)
+class ListCategoryChangesUseCase(UseCase):
+
+    change_feed: CategoryChangeFeed
+
+    max_limit = 1000
+
+    def execute(self, input_param: 'Input') -> 'Output':
+        since = max(self.__to_int(input_param.since, 0), 0)
+        limit = min(max(self.__to_int(input_param.limit, 100), 1), self.max_limit)
+        # one more change than asked tells whether the feed goes on
+        changes = self.change_feed.changes_since(since, limit + 1)
+        items = [
+            ListCategoryChangesUseCase.Change(**asdict(change)) for change in changes[:limit]
+        ]
+        return ListCategoryChangesUseCase.Output(
+            items=items,
+            next_since=items[-1].sequence if items else since,
+            has_more=len(changes) > limit
+        )
+
+    @staticmethod
+    def __to_int(value: Any, default: int) -> int:
+        try:
+            return int(value)
+        except (ValueError, TypeError):
+            return default
+
+    @dataclass(slots=True, frozen=True)
+    class Input:
+        since: Optional[int] = 0
+        limit: Optional[int] = 100
+
+    @dataclass(slots=True, frozen=True)
+    class Change:
+        sequence: int
+        event_type: str
+        aggregate_id: str
+        occurred_at: datetime.datetime
+        payload: Dict[str, Any]
+
+    @dataclass(slots=True, frozen=True)
+    class Output:
+        items: List['ListCategoryChangesUseCase.Change']
+        next_since: int
+        has_more: bool
+
+
+@dataclass(slots=True, frozen=True)
+class ListCategoryUpdatesUseCase(UseCase):
+
+    updates_feed: CategoryUpdatesFeed
+
+    def execute(self, input_param: 'Input') -> 'Output':
+        # one more update than asked tells whether there are more
+        updates = self.updates_feed.updated_since(
+            input_param.updated_since, input_param.after_id, input_param.limit + 1
+        )
+        items = [self.__to_item(update) for update in updates[:input_param.limit]]
+        last = items[-1] if items else None
+        return ListCategoryUpdatesUseCase.Output(
+            items=items,
+            next_updated_since=last.updated_at if last else input_param.updated_since,
+            next_after_id=last.id if last else input_param.after_id,
+            has_more=len(updates) > input_param.limit
+        )
+
+    @staticmethod
+    def __to_item(update: CategoryUpdate) -> 'ListCategoryUpdatesUseCase.Item':
+        if update.deleted:
+            return ListCategoryUpdatesUseCase.Item(
+                id=update.id, updated_at=update.updated_at, deleted=True
+            )
+        return ListCategoryUpdatesUseCase.Item(
+            id=update.id,
+            updated_at=update.updated_at,
+            deleted=False,
+            name=update.category.name,
+            description=update.category.description,
+            is_active=update.category.is_active,
+            created_at=update.category.created_at
+        )
+
+    @dataclass(slots=True, frozen=True)
+    class Input:
+        updated_since: datetime.datetime
+        after_id: Optional[str] = None
+        limit: int = 100
+
+    @dataclass(slots=True, frozen=True)
+    class Item:
+        id: str  # pylint: disable=invalid-name
+        updated_at: datetime.datetime
+        deleted: bool
+        name: Optional[str] = None
+        description: Optional[str] = None
+        is_active: Optional[bool] = None
+        created_at: Optional[datetime.datetime] = None
+
+    @dataclass(slots=True, frozen=True)
+    class Output:
+        items: List['ListCategoryUpdatesUseCase.Item']
+        # the updated_since and after_id of the next page
+        next_updated_since: datetime.datetime
+        next_after_id: Optional[str]
+        has_more: bool
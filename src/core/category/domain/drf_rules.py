@@ -0,0 +1,10 @@
+from rest_framework import serializers
+from core.__seedwork.domain.drf_fields import StrictBooleanField, StrictCharField
+
+
+class CategoryRules(serializers.Serializer):
+    name = StrictCharField(max_length=255)
+    description = StrictCharField(
+        required=False, allow_null=True, allow_blank=True)
+    is_active = StrictBooleanField(required=False)
+    created_at = serializers.DateTimeField(required=False)
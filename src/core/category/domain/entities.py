@@ -5,6 +5,13 @@ from typing import Optional
 from core.__seedwork.domain.entities import Entity
 from core.__seedwork.domain.exceptions import EntityValidationException
 from core.__seedwork.domain.validators import ValidatorRules
+from core.category.domain.events import (
+    CategoryActivated,
+    CategoryCreated,
+    CategoryDeactivated,
+    CategoryDeleted,
+    CategoryUpdated
+)
 from core.category.domain.validators import CategoryValidatorFactory
 
 
@@ -26,16 +33,43 @@ class Category(Entity):
             )
         self.validate()
 
+    @classmethod
+    def create(cls, **props) -> 'Category':
+        """A new category, records CategoryCreated."""
+        category = cls(**props)
+        category.record_event(CategoryCreated.of(category))
+        return category
+
+    @classmethod
+    def replace(cls, **props) -> 'Category':
+        """The whole state of a category that may already exist, e.g. for an
+        upsert, records CategoryUpdated."""
+        category = cls(**props)
+        category.record_event(CategoryUpdated.of(category))
+        return category
+
     def update(self, name: str, description: str):
+        changed = (name, description) != (self.name, self.description)
         self._set('name', name)
         self._set('description', description)
         self.validate()
+        if changed:
+            self.record_event(CategoryUpdated.of(self))
 
     def activate(self):
-        self._set("is_active", True)
+        if not self.is_active:
+            self._set("is_active", True)
+            self.record_event(CategoryActivated.of(self))
 
     def deactivate(self):
-        self._set('is_active', False)
+        if self.is_active:
+            self._set('is_active', False)
+            self.record_event(CategoryDeactivated.of(self))
+
+    @staticmethod
+    def deleted(entity_id: str) -> CategoryDeleted:
+        # deletes go by id without loading the category
+        return CategoryDeleted(aggregate_id=str(entity_id))
 
     # @classmethod
     # def validate(self, name: str, description: str, is_active: bool = None):
@@ -0,0 +1,55 @@
+import datetime
+from dataclasses import dataclass
+from typing import Optional, TYPE_CHECKING
+
+from core.__seedwork.domain.events import DomainEvent
+
+if TYPE_CHECKING:
+    from core.category.domain.entities import Category
+
+
+@dataclass(frozen=True, slots=True, kw_only=True)
+class CategoryChanged(DomainEvent):
+    """Carries the whole category after the change, so a consumer can apply
+    any of these events as an upsert of the category."""
+
+    name: str
+    description: Optional[str]
+    is_active: bool
+    created_at: datetime.datetime
+
+    @classmethod
+    def of(cls, category: 'Category') -> 'CategoryChanged':
+        return cls(
+            aggregate_id=category.id,
+            name=category.name,
+            description=category.description,
+            is_active=category.is_active,
+            created_at=category.created_at
+        )
+
+
+@dataclass(frozen=True, slots=True, kw_only=True)
+class CategoryCreated(CategoryChanged):
+    pass
+
+
+@dataclass(frozen=True, slots=True, kw_only=True)
+class CategoryUpdated(CategoryChanged):
+    """The name or the description changed, or the whole category was
+    replaced through an upsert."""
+
+
+@dataclass(frozen=True, slots=True, kw_only=True)
+class CategoryActivated(CategoryChanged):
+    pass
+
+
+@dataclass(frozen=True, slots=True, kw_only=True)
+class CategoryDeactivated(CategoryChanged):
+    pass
+
+
+@dataclass(frozen=True, slots=True, kw_only=True)
+class CategoryDeleted(DomainEvent):
+    pass
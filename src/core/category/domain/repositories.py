@@ -1,8 +1,13 @@
+import abc
+import datetime
 from abc import ABC
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
 from core.__seedwork.domain.repositories import (
     SearchParams as DefaultSearchParams,
     SearchResult as DefaultSearchResult,
-    SearchableRepositoryInterface
+    SearchableRepositoryInterface,
+    AsyncSearchableRepositoryInterface
 )
 from core.category.domain.entities import Category
 
@@ -23,3 +28,60 @@ class CategoryRepository(
 ):
     SearchParams = _SearchParams
     SearchResult = _SearchResult
+
+
+class CategoryAsyncRepository(
+    AsyncSearchableRepositoryInterface[
+        Category, _SearchParams, _SearchResult
+    ],
+    ABC
+):
+    SearchParams = _SearchParams
+    SearchResult = _SearchResult
+
+
+@dataclass(frozen=True, slots=True)
+class CategoryChange:
+    sequence: int
+    event_type: str
+    aggregate_id: str
+    occurred_at: datetime.datetime
+    payload: Dict[str, Any]
+
+
+class CategoryChangeFeed(ABC):
+    """The category events in the order they were committed."""
+
+    Change = CategoryChange
+
+    @abc.abstractmethod
+    def changes_since(self, since: int, limit: int) -> List[CategoryChange]:
+        """Up to `limit` changes with a sequence greater than `since`."""
+        raise NotImplementedError()
+
+
+@dataclass(frozen=True, slots=True)
+class CategoryUpdate:
+    id: str  # pylint: disable=invalid-name
+    updated_at: datetime.datetime
+    # None when the category was deleted
+    category: Optional[Category]
+
+    @property
+    def deleted(self) -> bool:
+        return self.category is None
+
+
+class CategoryUpdatesFeed(ABC):
+    """The categories written or deleted from a point in time on, in
+    (updated_at, id) order."""
+
+    Update = CategoryUpdate
+
+    @abc.abstractmethod
+    def updated_since(
+        self, since: datetime.datetime, after_id: Optional[str], limit: int
+    ) -> List[CategoryUpdate]:
+        """Up to `limit` updates from `since` on, the ones at `since` itself
+        only after `after_id` when it is given."""
+        raise NotImplementedError()
@@ -1,22 +1,18 @@
 from typing import Dict
-from rest_framework import serializers
-from core.__seedwork.domain.validators import (
-    DRFValidator,
-    StrictBooleanField,
-    StrictCharField
-)
+from core.__seedwork.domain.validators import DRFValidator
 
 
-class CategoryRules(serializers.Serializer):
-    name = StrictCharField(max_length=255)
-    description = StrictCharField(
-        required=False, allow_null=True, allow_blank=True)
-    is_active = StrictBooleanField(required=False)
-    created_at = serializers.DateTimeField(required=False)
+def __getattr__(name: str):
+    # CategoryRules is built on DRF, imported on first use only
+    if name == 'CategoryRules':
+        from core.category.domain.drf_rules import CategoryRules  # pylint: disable=import-outside-toplevel
+        return CategoryRules
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
 
 
 class CategoryValidator(DRFValidator):
     def validate(self, data: Dict):
+        from core.category.domain.drf_rules import CategoryRules  # pylint: disable=import-outside-toplevel
         rules = CategoryRules(data=data if data is not None else {})
         return super().validate(rules)
 
@@ -1,13 +1,27 @@
-from typing import Callable
+import contextlib
+import functools
+from typing import Callable, ContextManager, TypeVar
 from core.category.application.dto import CategoryOutput
-from core.category.infra.serializers import CategorySerializer
+from core.category.infra.serializers import CategorySerializer, CategoryUpdatesQuerySerializer
 from rest_framework.response import Response
 from rest_framework.request import Request
 from rest_framework.views import APIView
 from rest_framework.status import HTTP_201_CREATED, HTTP_204_NO_CONTENT
-from core.category.application.use_cases import CreateCategoryUseCase, DeleteCategoryUseCase, GetCategoryUseCase, ListCategoriesUseCase, UpdateCategoryUseCase
+from core.category.application.use_cases import CreateCategoryUseCase, DeleteCategoryUseCase, GetCategoryUseCase, ListCategoriesUseCase, ListCategoryChangesUseCase, ListCategoryUpdatesUseCase, UpdateCategoryUseCase
 from dataclasses import asdict, dataclass
 
+T = TypeVar('T')
+
+# times the serialization of a response, injected by the urlconf (e.g.
+# django_app.instrumentation.track_serialization)
+SerializationTracker = Callable[[], ContextManager[None]]
+
+
+def resolve_once(factory: Callable[[], T]) -> Callable[[], T]:
+    # the use cases are stateless singletons: resolve them through the
+    # container on the first request only, later requests hit the cache
+    return functools.cache(factory)
+
 
 @dataclass(slots=True)
 class CategoryResource(APIView):
@@ -17,6 +31,8 @@ class CategoryResource(APIView):
     get_use_case: Callable[[], GetCategoryUseCase]
     update_use_case: Callable[[], UpdateCategoryUseCase]
     delete_use_case: Callable[[], DeleteCategoryUseCase]
+    list_updates_use_case: Callable[[], ListCategoryUpdatesUseCase]
+    track_serialization: SerializationTracker = contextlib.nullcontext
 
     def post(self, request: Request):
         serializer = CategorySerializer(data=request.data)
@@ -24,21 +40,38 @@ class CategoryResource(APIView):
 
         input_param = CreateCategoryUseCase.Input(**serializer.validated_data)
         output = self.create_use_case().execute(input_param)
-        body = CategoryResource.category_to_response(output)
+        with self.track_serialization():
+            body = CategoryResource.category_to_response(output)
         return Response(body, status=HTTP_201_CREATED)
 
     def get(self, request: Request, id: str = None): # pylint: disable=redefined-builtin, invalid-name
       if id:
         return self.get_object(id)
+      if 'updated_since' in request.query_params:
+        return self.list_updates(request)
       input_param = ListCategoriesUseCase.Input(
           **request.query_params.dict())
       output = self.list_use_case().execute(input_param)
-      return Response(asdict(output))
+      with self.track_serialization():
+        body = asdict(output)
+      return Response(body)
+
+    def list_updates(self, request: Request):
+      # keyset pagination over (updated_at, id): pass next_updated_since and
+      # next_after_id of the response as updated_since and after_id
+      serializer = CategoryUpdatesQuerySerializer(data=request.query_params)
+      serializer.is_valid(raise_exception=True)
+      input_param = ListCategoryUpdatesUseCase.Input(**serializer.validated_data)
+      output = self.list_updates_use_case().execute(input_param)
+      with self.track_serialization():
+        body = asdict(output)
+      return Response(body)
 
     def get_object(self, id: str):  # pylint: disable=redefined-builtin, invalid-name
       input_param = GetCategoryUseCase.Input(id)
       output = self.get_use_case().execute(input_param)
-      body = CategoryResource.category_to_response(output)
+      with self.track_serialization():
+        body = CategoryResource.category_to_response(output)
       return Response(body)
 
     def put(self, request: Request, id: str):
@@ -47,7 +80,8 @@ class CategoryResource(APIView):
 
       input_param = UpdateCategoryUseCase.Input(**{'id':id, **serializer.validated_data})
       output = self.update_use_case().execute(input_param)
-      body = CategoryResource.category_to_response(output)
+      with self.track_serialization():
+        body = CategoryResource.category_to_response(output)
       return Response(body)
 
     def delete(self, _request: Request,  id: str):  # pylint: disable=redefined-builtin, invalid-name
@@ -59,3 +93,21 @@ class CategoryResource(APIView):
     def category_to_response(output: CategoryOutput):
       serializer = CategorySerializer(instance=output)
       return serializer.data
+
+
+@dataclass(slots=True)
+class CategoryChangesResource(APIView):
+    """The change feed, GET /categories/changes?since=<next_since>&limit=."""
+
+    list_changes_use_case: Callable[[], ListCategoryChangesUseCase]
+    track_serialization: SerializationTracker = contextlib.nullcontext
+
+    def get(self, request: Request):
+      input_param = ListCategoryChangesUseCase.Input(**{
+        key: value for key, value in request.query_params.dict().items()
+        if key in ('since', 'limit')
+      })
+      output = self.list_changes_use_case().execute(input_param)
+      with self.track_serialization():
+        body = asdict(output)
+      return Response(body)
@@ -1,4 +1,5 @@
 from django.apps import AppConfig
+from django.db.models.signals import post_migrate
 
 
 class CategoryConfig(AppConfig):
@@ -6,3 +7,8 @@ class CategoryConfig(AppConfig):
     name = 'core.category.infra.django_app'
     label = 'category'
     verbose_name = 'Categorias'
+
+    def ready(self):
+        # pylint: disable=import-outside-toplevel
+        from core.category.infra.django_app.search import repair_full_text_search
+        post_migrate.connect(repair_full_text_search, sender=self)
@@ -0,0 +1,144 @@
+import contextlib
+import json
+from dataclasses import asdict, dataclass
+from typing import Any, Callable, Dict
+
+from asgiref.sync import sync_to_async
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import HttpRequest, HttpResponse, JsonResponse
+from django.utils.decorators import method_decorator
+from django.views import View
+from django.views.decorators.csrf import csrf_exempt
+from rest_framework.utils.encoders import JSONEncoder
+from rest_framework.status import (
+    HTTP_201_CREATED,
+    HTTP_204_NO_CONTENT,
+    HTTP_400_BAD_REQUEST,
+    HTTP_404_NOT_FOUND
+)
+
+from core.__seedwork.domain.exceptions import NotFoundException
+from core.category.application.async_use_cases import (
+    AsyncCreateCategoryUseCase,
+    AsyncDeleteCategoryUseCase,
+    AsyncGetCategoryUseCase,
+    AsyncListCategoriesUseCase,
+    AsyncUpdateCategoryUseCase
+)
+from core.category.application.use_cases import ListCategoryChangesUseCase, ListCategoryUpdatesUseCase
+from core.category.infra.django_app.api import CategoryResource, SerializationTracker
+from core.category.infra.serializers import CategorySerializer, CategoryUpdatesQuerySerializer
+
+
+class BadRequest(Exception):
+    errors: Dict[str, Any]
+
+    def __init__(self, errors: Dict[str, Any]) -> None:
+        self.errors = errors
+        super().__init__("Bad Request")
+
+
+# csrf exempt like the DRF views of CategoryResource, csrf_exempt() is
+# copied from dispatch to the view returned by as_view()
+@method_decorator(csrf_exempt, name='dispatch')
+@dataclass(slots=True)
+class AsyncCategoryResource(View):
+
+    create_use_case: Callable[[], AsyncCreateCategoryUseCase]
+    list_use_case: Callable[[], AsyncListCategoriesUseCase]
+    get_use_case: Callable[[], AsyncGetCategoryUseCase]
+    update_use_case: Callable[[], AsyncUpdateCategoryUseCase]
+    delete_use_case: Callable[[], AsyncDeleteCategoryUseCase]
+    list_updates_use_case: Callable[[], ListCategoryUpdatesUseCase]
+    track_serialization: SerializationTracker = contextlib.nullcontext
+
+    async def dispatch(self, request: HttpRequest, *args, **kwargs):  # pylint: disable=invalid-overridden-method
+        try:
+            # slots dataclasses are rebuilt as a new class, so the zero
+            # argument super() can't be used here
+            return await View.dispatch(self, request, *args, **kwargs)
+        except BadRequest as exception:
+            return JsonResponse(exception.errors, status=HTTP_400_BAD_REQUEST)
+        except NotFoundException as exception:
+            return JsonResponse({'detail': str(exception)}, status=HTTP_404_NOT_FOUND)
+
+    async def post(self, request: HttpRequest):
+        validated_data = self.validate_body(request)
+        input_param = AsyncCreateCategoryUseCase.Input(**validated_data)
+        output = await self.create_use_case().execute(input_param)
+        with self.track_serialization():
+            body = CategoryResource.category_to_response(output)
+        return JsonResponse(body, status=HTTP_201_CREATED)
+
+    async def get(self, request: HttpRequest, id: str = None):  # pylint: disable=redefined-builtin, invalid-name
+        if id:
+            return await self.get_object(id)
+        if 'updated_since' in request.GET:
+            return await self.list_updates(request)
+        input_param = AsyncListCategoriesUseCase.Input(**request.GET.dict())
+        output = await self.list_use_case().execute(input_param)
+        with self.track_serialization():
+            return JsonResponse(asdict(output), encoder=DjangoJSONEncoder)
+
+    async def list_updates(self, request: HttpRequest):
+        # see CategoryResource.list_updates, the feed has no async use case
+        serializer = CategoryUpdatesQuerySerializer(data=request.GET)
+        if not serializer.is_valid():
+            raise BadRequest(serializer.errors)
+        input_param = ListCategoryUpdatesUseCase.Input(**serializer.validated_data)
+        output = await sync_to_async(self.list_updates_use_case().execute)(input_param)
+        with self.track_serialization():
+            # DRF's encoder keeps the microseconds of next_updated_since,
+            # DjangoJSONEncoder would round them off and repeat rows
+            return JsonResponse(asdict(output), encoder=JSONEncoder)
+
+    async def get_object(self, id: str):  # pylint: disable=redefined-builtin, invalid-name
+        input_param = AsyncGetCategoryUseCase.Input(str(id))
+        output = await self.get_use_case().execute(input_param)
+        with self.track_serialization():
+            body = CategoryResource.category_to_response(output)
+        return JsonResponse(body)
+
+    async def put(self, request: HttpRequest, id: str):  # pylint: disable=redefined-builtin, invalid-name
+        validated_data = self.validate_body(request)
+        input_param = AsyncUpdateCategoryUseCase.Input(
+            **{'id': str(id), **validated_data})
+        output = await self.update_use_case().execute(input_param)
+        with self.track_serialization():
+            body = CategoryResource.category_to_response(output)
+        return JsonResponse(body)
+
+    async def delete(self, _request: HttpRequest, id: str):  # pylint: disable=redefined-builtin, invalid-name
+        input_param = AsyncDeleteCategoryUseCase.Input(id=str(id))
+        await self.delete_use_case().execute(input_param)
+        return HttpResponse(status=HTTP_204_NO_CONTENT)
+
+    @staticmethod
+    def validate_body(request: HttpRequest) -> Dict[str, Any]:
+        try:
+            data = json.loads(request.body or b'{}')
+        except ValueError as exception:
+            raise BadRequest({'detail': f'JSON parse error - {exception}'}) from exception
+
+        serializer = CategorySerializer(data=data)
+        if not serializer.is_valid():
+            raise BadRequest(serializer.errors)
+        return dict(serializer.validated_data)
+
+
+@dataclass(slots=True)
+class AsyncCategoryChangesResource(View):
+    """CategoryChangesResource under ASGI. The feed has no async use case,
+    the sync one runs in a thread through sync_to_async()."""
+
+    list_changes_use_case: Callable[[], ListCategoryChangesUseCase]
+    track_serialization: SerializationTracker = contextlib.nullcontext
+
+    async def get(self, request: HttpRequest):
+        input_param = ListCategoryChangesUseCase.Input(**{
+            key: value for key, value in request.GET.dict().items()
+            if key in ('since', 'limit')
+        })
+        output = await sync_to_async(self.list_changes_use_case().execute)(input_param)
+        with self.track_serialization():
+            return JsonResponse(asdict(output), encoder=DjangoJSONEncoder)
@@ -0,0 +1,30 @@
+from django.urls import path
+
+from django_app import container
+from .api import resolve_once
+from .async_api import AsyncCategoryChangesResource, AsyncCategoryResource
+
+
+def __init_async_category_resource():
+    return {
+        'create_use_case': resolve_once(container.async_use_case_category_create_category),
+        'list_use_case': resolve_once(container.async_use_case_category_list_categories),
+        'get_use_case': resolve_once(container.async_use_case_category_get_category),
+        'update_use_case': resolve_once(container.async_use_case_category_update_category),
+        'delete_use_case': resolve_once(container.async_use_case_category_delete_category),
+        'list_updates_use_case': resolve_once(container.use_case_category_list_category_updates),
+        'track_serialization': container.track_serialization()
+    }
+
+
+async_category_view = AsyncCategoryResource.as_view(**__init_async_category_resource())
+async_category_changes_view = AsyncCategoryChangesResource.as_view(
+    list_changes_use_case=resolve_once(container.use_case_category_list_category_changes),
+    track_serialization=container.track_serialization()
+)
+
+urlpatterns = [
+    path('categories/', async_category_view),
+    path('categories/changes', async_category_changes_view),
+    path('categories/<uuid:id>/', async_category_view)
+]
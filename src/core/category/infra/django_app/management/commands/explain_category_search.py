@@ -0,0 +1,50 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from core.category.infra.django_app.repositories import CategoryDjangoRepository
+from core.category.infra.django_app.search import search_backend
+from django_app.slow_queries import SlowQueryRecorder
+
+
+class Command(BaseCommand):
+    help = (
+        'Runs a category search and prints the SQL, parameters, duration and '
+        'EXPLAIN output of each of its queries'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--filter')
+        parser.add_argument('--sort')
+        parser.add_argument('--sort-dir')
+        parser.add_argument('--page', type=int, default=1)
+        parser.add_argument('--per-page', type=int, default=15)
+        parser.add_argument('--fields')
+        parser.add_argument(
+            '--backend', choices=['icontains', 'fulltext'],
+            help='the search backend, CATEGORY_SEARCH_BACKEND by default'
+        )
+
+    def handle(self, *args, **options):
+        # the workers' slow query logs live in their own processes
+        # (/admin/slow-queries/), this reproduces one search in this process
+        recorder = SlowQueryRecorder(threshold_ms=0)
+        try:
+            backend = search_backend(
+                options['backend'] or getattr(settings, 'CATEGORY_SEARCH_BACKEND', 'icontains'))
+        except ValueError as error:
+            raise CommandError(error) from error
+        repository = CategoryDjangoRepository(slow_query_recorder=recorder, search_backend=backend)
+        repository.search(CategoryDjangoRepository.SearchParams(
+            page=options['page'],
+            per_page=options['per_page'],
+            sort=options['sort'],
+            sort_dir=options['sort_dir'],
+            filter=options['filter'],
+            fields=options['fields']
+        ))
+
+        for entry in reversed(recorder.entries()):
+            self.stdout.write(self.style.SQL_KEYWORD(entry.sql))
+            self.stdout.write(f'params: {entry.params}')
+            self.stdout.write(f'duration: {entry.duration_ms:.3f}ms')
+            self.stdout.write(f'{entry.explain}\n')
@@ -0,0 +1,246 @@
+import csv
+import datetime
+import json
+import os
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Tuple
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import IntegrityError, transaction
+
+from core.__seedwork.domain.exceptions import EntityValidationException, InvalidUuidException
+from core.__seedwork.domain.validators import ErrorFields
+from core.__seedwork.domain.value_objects import UniqueEntityID
+from core.category.domain.entities import Category
+from core.category.infra.django_app.models import CategoryModel
+from core.category.infra.django_app.repositories import CategoryDjangoRepository
+
+FORMATS = {'.csv': 'csv', '.jsonl': 'jsonl', '.ndjson': 'jsonl'}
+TRUE_VALUES = {'true', '1', 'yes'}
+FALSE_VALUES = {'false', '0', 'no'}
+
+Row = Tuple[int, Any]
+
+
+class RowRejected(Exception):
+    errors: ErrorFields
+
+    def __init__(self, errors: ErrorFields) -> None:
+        self.errors = errors
+        super().__init__("Row Rejected")
+
+
+class Command(BaseCommand):
+    help = 'Streams categories from a CSV or JSONL file into the categories table'
+
+    repo: CategoryDjangoRepository
+    write: Callable[[List[Category]], None]
+    upsert: bool = False
+    make: Callable[..., Category] = Category
+
+    def add_arguments(self, parser):
+        parser.add_argument('file', type=Path)
+        parser.add_argument('--format', choices=['csv', 'jsonl'])
+        parser.add_argument('--batch-size', type=int, default=1000)
+        parser.add_argument(
+            '--rejects', type=Path,
+            help='JSONL file receiving invalid rows (default: <file>.rejects.jsonl)')
+        parser.add_argument(
+            '--checkpoint', type=Path,
+            help='file tracking the last committed row (default: <file>.checkpoint.json)')
+        parser.add_argument(
+            '--upsert', action='store_true',
+            help='update categories whose id already exists instead of rejecting the row')
+        parser.add_argument(
+            '--emit-events', action='store_true',
+            help='write a change event per category to the outbox, off for bulk loads')
+        parser.add_argument(
+            '--resume', action='store_true',
+            help='skip the rows already committed according to the checkpoint')
+
+    def handle(self, *args, **options):
+        path = Path(options['file'])
+        if not path.is_file():
+            raise CommandError(f"File '{path}' does not exist")
+        if options['batch_size'] < 1:
+            raise CommandError('--batch-size must be greater than 0')
+
+        file_format = options['format'] or FORMATS.get(path.suffix.lower())
+        if not file_format:
+            raise CommandError(
+                f"Unable to detect the format of '{path}', use --format")
+
+        rejects_path = Path(options['rejects'] or path.with_name(
+            f'{path.name}.rejects.jsonl'))
+        checkpoint_path = Path(options['checkpoint'] or path.with_name(
+            f'{path.name}.checkpoint.json'))
+        skip = self._load_checkpoint(
+            checkpoint_path, path) if options['resume'] else 0
+
+        self.repo = CategoryDjangoRepository()
+        self.upsert = options['upsert']
+        self.write = self.repo.bulk_upsert if self.upsert else self.repo.bulk_insert
+        if options['emit_events']:
+            self.make = Category.replace if options['upsert'] else Category.create
+        read = imported = rejected = 0
+        last_row = skip
+        started_at = time.perf_counter()
+
+        with open(rejects_path, 'a' if skip else 'w', encoding='utf-8') as rejects:
+            batch: List[Tuple[int, Any, Category]] = []
+            for row_number, raw in self._read_rows(path, file_format, skip):
+                read += 1
+                last_row = row_number
+                try:
+                    batch.append((row_number, raw, self._to_category(raw)))
+                except RowRejected as exception:
+                    self._reject(rejects, row_number, raw, exception.errors)
+                    rejected += 1
+
+                if read % options['batch_size'] == 0:
+                    flushed = self._flush(batch, rejects)
+                    imported += flushed
+                    rejected += len(batch) - flushed
+                    batch = []
+                    self._save_checkpoint(checkpoint_path, path, last_row)
+                    self._progress(read, imported, rejected, started_at)
+
+            flushed = self._flush(batch, rejects)
+            imported += flushed
+            rejected += len(batch) - flushed
+            self._save_checkpoint(checkpoint_path, path, last_row)
+
+        elapsed = time.perf_counter() - started_at
+        self.stdout.write(self.style.SUCCESS(
+            f'Done: {read} rows read, {imported} imported, {rejected} rejected '
+            f'in {elapsed:.2f}s ({self._rate(read, elapsed):.1f} rows/s)'
+        ))
+        if rejected:
+            self.stdout.write(f'Rejected rows written to {rejects_path}')
+
+    def _read_rows(self, path: Path, file_format: str, skip: int) -> Iterator[Row]:
+        with open(path, newline='', encoding='utf-8') as file:
+            if file_format == 'csv':
+                rows = csv.DictReader(file)
+            else:
+                # JSON decoding is deferred to _to_category so skipped lines stay cheap
+                rows = (line.strip() for line in file if line.strip())
+
+            for row_number, raw in enumerate(rows, start=1):
+                if row_number > skip:
+                    yield row_number, raw
+
+    def _to_category(self, raw: Any) -> Category:
+        data = raw
+        if isinstance(raw, str):
+            try:
+                data = json.loads(raw)
+            except ValueError as exception:
+                raise RowRejected({'row': [str(exception)]}) from exception
+        if not isinstance(data, dict):
+            raise RowRejected({'row': ['Row must be an object']})
+
+        props: Dict[str, Any] = {'name': data.get('name')}
+        if data.get('description') not in (None, ''):
+            props['description'] = data['description']
+        if data.get('is_active') not in (None, ''):
+            props['is_active'] = self._to_bool(data['is_active'])
+        if data.get('created_at') not in (None, ''):
+            props['created_at'] = self._to_datetime(data['created_at'])
+
+        try:
+            if data.get('id') not in (None, ''):
+                props['unique_entity_id'] = UniqueEntityID(data['id'])
+            return self.make(**props)
+        except InvalidUuidException as exception:
+            raise RowRejected({'id': [str(exception)]}) from exception
+        except EntityValidationException as exception:
+            raise RowRejected(exception.error) from exception
+
+    def _flush(self, batch: List[Tuple[int, Any, Category]], rejects) -> int:
+        if not batch:
+            return 0
+        try:
+            with transaction.atomic():
+                self.write([category for _, _, category in batch])
+            return len(batch)
+        except IntegrityError:
+            pass
+
+        # some row in the batch conflicts with the table, retry one by one
+        # to isolate it instead of dropping the whole batch
+        imported = 0
+        for row_number, raw, category in batch:
+            try:
+                with transaction.atomic():
+                    self.write([category])
+                imported += 1
+            except IntegrityError as exception:
+                self._reject(rejects, row_number, raw,
+                             self._integrity_errors(category, exception))
+        return imported
+
+    def _integrity_errors(self, category: Category, exception: IntegrityError) -> ErrorFields:
+        # only an insert of an id already in the table is a conflict of the
+        # id, any other constraint is reported as a whole row error
+        if not self.upsert and CategoryModel.objects.filter(pk=category.id).exists():
+            return {'id': [f"Category with id '{category.id}' already exists"]}
+        return {'non_field_errors': [str(exception)]}
+
+    def _reject(self, rejects, row_number: int, raw: Any, errors: ErrorFields):
+        rejects.write(json.dumps(
+            {'row': row_number, 'data': raw, 'errors': errors}) + '\n')
+
+    def _progress(self, read: int, imported: int, rejected: int, started_at: float):
+        elapsed = time.perf_counter() - started_at
+        self.stdout.write(
+            f'{read} rows read, {imported} imported, {rejected} rejected '
+            f'({self._rate(read, elapsed):.1f} rows/s)'
+        )
+
+    @staticmethod
+    def _rate(rows: int, elapsed: float) -> float:
+        return rows / elapsed if elapsed > 0 else 0.0
+
+    @staticmethod
+    def _to_bool(value: Any) -> Any:
+        if isinstance(value, str):
+            if value.strip().lower() in TRUE_VALUES:
+                return True
+            if value.strip().lower() in FALSE_VALUES:
+                return False
+        # anything else is handed to the validator as is and rejected there
+        return value
+
+    @staticmethod
+    def _to_datetime(value: Any) -> Any:
+        if not isinstance(value, str):
+            return value
+        try:
+            created_at = datetime.datetime.fromisoformat(
+                value.replace('Z', '+00:00'))
+        except ValueError as exception:
+            raise RowRejected({'created_at': [str(exception)]}) from exception
+        if created_at.tzinfo is None:
+            created_at = created_at.replace(tzinfo=datetime.timezone.utc)
+        return created_at
+
+    @staticmethod
+    def _load_checkpoint(checkpoint_path: Path, path: Path) -> int:
+        if not checkpoint_path.is_file():
+            return 0
+        checkpoint = json.loads(checkpoint_path.read_text(encoding='utf-8'))
+        if checkpoint.get('file') != str(path.resolve()):
+            raise CommandError(
+                f"Checkpoint '{checkpoint_path}' belongs to another file")
+        return int(checkpoint.get('rows', 0))
+
+    @staticmethod
+    def _save_checkpoint(checkpoint_path: Path, path: Path, rows: int):
+        tmp_path = checkpoint_path.with_name(f'{checkpoint_path.name}.tmp')
+        tmp_path.write_text(
+            json.dumps({'file': str(path.resolve()), 'rows': rows}),
+            encoding='utf-8'
+        )
+        os.replace(tmp_path, checkpoint_path)
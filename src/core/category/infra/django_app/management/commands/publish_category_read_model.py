@@ -0,0 +1,42 @@
+import time
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core.category.infra.django_app.repositories import CategoryDjangoRepository
+from core.category.infra.in_memory.shared import SharedCategoryStore
+from core.category.infra.in_memory.snapshot import CategorySnapshotStore
+
+
+class Command(BaseCommand):
+    help = (
+        'Publishes the categories as a new generation of the read model shared '
+        'by the workers, see core.category.infra.in_memory.shared'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('directory', type=Path)
+        parser.add_argument('--batch-size', type=int, default=5000)
+        parser.add_argument(
+            '--from-snapshot', type=Path,
+            help='reads the categories from the snapshot directory of snapshot_categories '
+                 'instead of the database'
+        )
+        parser.add_argument('--keep', type=int, default=2, help='generations kept, the current one included')
+
+    def handle(self, *args, **options):
+        if options['batch_size'] < 1:
+            raise CommandError('--batch-size must be greater than 0')
+        if options['keep'] < 1:
+            raise CommandError('--keep must be greater than 0')
+
+        started_at = time.perf_counter()
+        if options['from_snapshot']:
+            categories = CategorySnapshotStore(options['from_snapshot']).load().find_all()
+        else:
+            categories = CategoryDjangoRepository().iter_all(options['batch_size'])
+        store = SharedCategoryStore(options['directory'], keep=options['keep'])
+        path = store.publish(categories)
+        self.stdout.write(
+            f'Done: {path.name} is the current generation ({time.perf_counter() - started_at:.1f}s)'
+        )
@@ -0,0 +1,85 @@
+import datetime
+import functools
+import time
+from pathlib import Path
+from typing import Callable, Optional
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core.category.infra.django_app.outbox import JsonLinesPublisher, OutboxRelay
+
+
+class Command(BaseCommand):
+    help = (
+        'Publishes the category events of the outbox as JSON lines, oldest '
+        'first and at least once: a batch is marked published after it was written'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=100)
+        parser.add_argument(
+            '--once', action='store_true',
+            help='publish the pending events and exit instead of polling')
+        parser.add_argument(
+            '--interval', type=float, default=1.0,
+            help='seconds between polls once the outbox is drained')
+        parser.add_argument(
+            '--output', type=Path,
+            help='append the events to this file (default: stdout)')
+        parser.add_argument(
+            '--prune-after', type=float,
+            help='delete the events published more than this many hours ago, '
+                 'at most every --prune-interval seconds and before exiting')
+        parser.add_argument(
+            '--prune-interval', type=float, default=600.0,
+            help='seconds between two prunes while polling')
+
+    def handle(self, *args, **options):
+        if options['batch_size'] < 1:
+            raise CommandError('--batch-size must be greater than 0')
+
+        output = options['output']
+        stream = output.open('a', encoding='utf-8') if output else self.stdout
+        try:
+            relay = OutboxRelay(JsonLinesPublisher(stream), batch_size=options['batch_size'])
+            prune = None
+            if options['prune_after'] is not None:
+                prune = functools.partial(
+                    self._prune, relay, datetime.timedelta(hours=options['prune_after']))
+            published = self._relay(
+                relay, options['once'], options['interval'], prune, options['prune_interval'])
+            if prune is not None:
+                prune()
+        finally:
+            if output:
+                stream.close()
+        self.stderr.write(f'Done: {published} events published')
+
+    def _prune(self, relay: OutboxRelay, older_than: datetime.timedelta) -> None:
+        pruned = relay.prune(older_than)
+        self.stderr.write(f'{pruned} published events pruned')
+
+    @staticmethod
+    def _relay(
+        relay: OutboxRelay,
+        once: bool,
+        interval: float,
+        prune: Optional[Callable[[], None]] = None,
+        prune_interval: float = 600.0
+    ) -> int:
+        published = 0
+        pruned_at = time.monotonic()
+        try:
+            while True:
+                count = relay.relay_once()
+                published += count
+                if count < relay.batch_size:
+                    if once:
+                        return published
+                    # a relay polling for days keeps the outbox small
+                    if prune is not None and time.monotonic() - pruned_at >= prune_interval:
+                        prune()
+                        pruned_at = time.monotonic()
+                    time.sleep(interval)
+        except KeyboardInterrupt:
+            return published
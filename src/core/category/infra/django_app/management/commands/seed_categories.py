@@ -0,0 +1,54 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core.category.infra.fixtures import CategoryDatasetFixture
+
+
+class Command(BaseCommand):
+    help = 'Fills the categories table with a deterministic synthetic dataset'
+
+    def add_arguments(self, parser):
+        parser.add_argument('count', type=int)
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--batch-size', type=int, default=5000)
+        parser.add_argument('--inactive-ratio', type=float, default=0.15)
+        parser.add_argument('--description-ratio', type=float, default=0.6)
+        parser.add_argument('--duplicate-ratio', type=float, default=0.05)
+        parser.add_argument(
+            '--truncate', action='store_true',
+            help='delete every category before seeding')
+
+    def handle(self, *args, **options):
+        if options['count'] < 0:
+            raise CommandError('count must not be negative')
+        if options['batch_size'] < 1:
+            raise CommandError('--batch-size must be greater than 0')
+
+        fixture = CategoryDatasetFixture(
+            seed=options['seed'],
+            inactive_ratio=options['inactive_ratio'],
+            description_ratio=options['description_ratio'],
+            duplicate_ratio=options['duplicate_ratio']
+        )
+
+        if options['truncate']:
+            from core.category.infra.django_app.models import CategoryModel  # pylint: disable=import-outside-toplevel
+            CategoryModel.objects.all().delete()
+
+        started_at = time.perf_counter()
+
+        def progress(inserted: int):
+            elapsed = time.perf_counter() - started_at
+            self.stdout.write(
+                f'{inserted} categories inserted ({inserted / elapsed:.1f} rows/s)')
+
+        fixture.populate_table(
+            options['count'], batch_size=options['batch_size'], on_batch=progress)
+
+        elapsed = time.perf_counter() - started_at
+        rate = options['count'] / elapsed if elapsed > 0 else 0.0
+        self.stdout.write(self.style.SUCCESS(
+            f"Done: {options['count']} categories seeded with seed {options['seed']} "
+            f'in {elapsed:.2f}s ({rate:.1f} rows/s)'
+        ))
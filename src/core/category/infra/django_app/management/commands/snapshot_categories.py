@@ -0,0 +1,35 @@
+import time
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core.category.infra.django_app.repositories import CategoryDjangoRepository
+from core.category.infra.in_memory.repositories import CategoryInMemoryRepository
+from core.category.infra.in_memory.snapshot import CategorySnapshotStore
+
+
+class Command(BaseCommand):
+    help = (
+        'Writes the categories table to a snapshot of the in-memory repository, '
+        'loaded by CategorySnapshotStore on startup'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('directory', type=Path)
+        parser.add_argument('--batch-size', type=int, default=5000)
+
+    def handle(self, *args, **options):
+        if options['batch_size'] < 1:
+            raise CommandError('--batch-size must be greater than 0')
+
+        started_at = time.perf_counter()
+        repo = CategoryInMemoryRepository(
+            items=list(CategoryDjangoRepository().iter_all(options['batch_size']))
+        )
+        store = CategorySnapshotStore(options['directory'])
+        # the database holds every write, the log of an older snapshot is obsolete
+        store.checkpoint(repo)
+        self.stdout.write(
+            f'Done: {len(repo.items)} categories in {store.snapshot_path} '
+            f'({time.perf_counter() - started_at:.1f}s)'
+        )
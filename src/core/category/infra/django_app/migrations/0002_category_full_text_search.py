@@ -0,0 +1,45 @@
+from django.db import migrations
+
+from core.category.infra.django_app.operations import RunVendorSQL
+
+SQLITE_INSTALL = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS categories_fts USING fts5("
+    "name, description, content='categories', content_rowid='rowid', "
+    "tokenize='unicode61 remove_diacritics 2')",
+    "CREATE TRIGGER IF NOT EXISTS categories_fts_insert AFTER INSERT ON categories BEGIN "
+    "INSERT INTO categories_fts(rowid, name, description) "
+    "VALUES (new.rowid, new.name, new.description); END",
+    "CREATE TRIGGER IF NOT EXISTS categories_fts_delete AFTER DELETE ON categories BEGIN "
+    "INSERT INTO categories_fts(categories_fts, rowid, name, description) "
+    "VALUES ('delete', old.rowid, old.name, old.description); END",
+    "CREATE TRIGGER IF NOT EXISTS categories_fts_update "
+    "AFTER UPDATE OF name, description ON categories BEGIN "
+    "INSERT INTO categories_fts(categories_fts, rowid, name, description) "
+    "VALUES ('delete', old.rowid, old.name, old.description); "
+    "INSERT INTO categories_fts(rowid, name, description) "
+    "VALUES (new.rowid, new.name, new.description); END",
+    "INSERT INTO categories_fts(categories_fts) VALUES ('rebuild')",
+]
+SQLITE_UNINSTALL = [
+    'DROP TRIGGER IF EXISTS categories_fts_insert',
+    'DROP TRIGGER IF EXISTS categories_fts_delete',
+    'DROP TRIGGER IF EXISTS categories_fts_update',
+    'DROP TABLE IF EXISTS categories_fts',
+]
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('category', '0001_initial'),
+    ]
+
+    operations = [
+        RunVendorSQL('sqlite', SQLITE_INSTALL, SQLITE_UNINSTALL),
+        RunVendorSQL(
+            'postgresql',
+            ["CREATE INDEX IF NOT EXISTS categories_search_idx ON categories USING GIN ("
+             "(to_tsvector('simple', coalesce(name, '') || ' ' || coalesce(description, ''))))"],
+            ['DROP INDEX IF EXISTS categories_search_idx']
+        ),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 4.2.30 on 2026-10-19 18:29
+
+import core.category.infra.django_app.models
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('category', '0002_category_full_text_search'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OutboxEventModel',
+            fields=[
+                ('sequence', models.BigAutoField(primary_key=True, serialize=False)),
+                ('aggregate_type', models.CharField(max_length=50)),
+                ('aggregate_id', models.UUIDField()),
+                ('event_type', models.CharField(max_length=100)),
+                ('payload', models.JSONField(encoder=core.category.infra.django_app.models.OutboxJSONEncoder)),
+                ('occurred_at', models.DateTimeField()),
+                ('published_at', models.DateTimeField(null=True)),
+            ],
+            options={
+                'db_table': 'outbox',
+                'indexes': [models.Index(condition=models.Q(('published_at__isnull', True)), fields=['sequence'], name='outbox_unpublished_idx')],
+            },
+        ),
+    ]
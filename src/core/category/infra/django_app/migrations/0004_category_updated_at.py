@@ -0,0 +1,70 @@
+# Generated by Django 4.2.30 on 2026-10-19 18:33
+
+from django.db import migrations, models
+from django.db.models import F
+import django.utils.timezone
+
+from core.category.infra.django_app.operations import RunVendorSQL
+
+# SQLite rebuilds the categories table to add the column and to remove it
+# again, which drops the triggers of the full-text index and renumbers the
+# rowids it is keyed on: the index is reinstalled after the rebuild both ways
+SQLITE_REINSTALL = [
+    'DROP TRIGGER IF EXISTS categories_fts_insert',
+    'DROP TRIGGER IF EXISTS categories_fts_delete',
+    'DROP TRIGGER IF EXISTS categories_fts_update',
+    "CREATE TRIGGER categories_fts_insert AFTER INSERT ON categories BEGIN "
+    "INSERT INTO categories_fts(rowid, name, description) "
+    "VALUES (new.rowid, new.name, new.description); END",
+    "CREATE TRIGGER categories_fts_delete AFTER DELETE ON categories BEGIN "
+    "INSERT INTO categories_fts(categories_fts, rowid, name, description) "
+    "VALUES ('delete', old.rowid, old.name, old.description); END",
+    "CREATE TRIGGER categories_fts_update "
+    "AFTER UPDATE OF name, description ON categories BEGIN "
+    "INSERT INTO categories_fts(categories_fts, rowid, name, description) "
+    "VALUES ('delete', old.rowid, old.name, old.description); "
+    "INSERT INTO categories_fts(rowid, name, description) "
+    "VALUES (new.rowid, new.name, new.description); END",
+    "INSERT INTO categories_fts(categories_fts) VALUES ('rebuild')",
+]
+
+
+def backfill_updated_at(apps, schema_editor):
+    category_model = apps.get_model('category', 'CategoryModel')
+    category_model.objects.using(schema_editor.connection.alias).update(updated_at=F('created_at'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('category', '0003_category_outbox'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CategoryTombstoneModel',
+            fields=[
+                ('id', models.UUIDField(primary_key=True, serialize=False)),
+                ('deleted_at', models.DateTimeField()),
+            ],
+            options={
+                'db_table': 'category_tombstones',
+            },
+        ),
+        RunVendorSQL('sqlite', migrations.RunSQL.noop, SQLITE_REINSTALL),
+        migrations.AddField(
+            model_name='categorymodel',
+            name='updated_at',
+            field=models.DateTimeField(default=django.utils.timezone.now),
+        ),
+        migrations.RunPython(backfill_updated_at, migrations.RunPython.noop),
+        RunVendorSQL('sqlite', SQLITE_REINSTALL, migrations.RunSQL.noop),
+        migrations.AddIndex(
+            model_name='categorymodel',
+            index=models.Index(fields=['updated_at', 'id'], name='categories_updated_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='categorytombstonemodel',
+            index=models.Index(fields=['deleted_at', 'id'], name='category_tombstones_idx'),
+        ),
+    ]
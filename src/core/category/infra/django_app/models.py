@@ -1,4 +1,8 @@
+import datetime
+
+from django.core.serializers.json import DjangoJSONEncoder
 from django.db import models
+from django.utils import timezone
 
 # Create your models here.
 class CategoryModel(models.Model):
@@ -7,6 +11,54 @@ class CategoryModel(models.Model):
   description = models.TextField(null=True)
   is_active = models.BooleanField()
   created_at = models.DateTimeField()
+  # bumped by the repository on every write, the watermark of incremental syncs
+  updated_at = models.DateTimeField(default=timezone.now)
 
   class Meta:
     db_table = 'categories'
+    indexes = [
+      # keyset pagination of GET /categories/?updated_since=
+      models.Index(fields=['updated_at', 'id'], name='categories_updated_idx'),
+    ]
+
+
+class CategoryTombstoneModel(models.Model):
+  # what is left of a deleted category for the incremental syncs
+  id = models.UUIDField(primary_key=True, editable=True)
+  deleted_at = models.DateTimeField()
+
+  class Meta:
+    db_table = 'category_tombstones'
+    indexes = [
+      models.Index(fields=['deleted_at', 'id'], name='category_tombstones_idx'),
+    ]
+
+
+class OutboxJSONEncoder(DjangoJSONEncoder):
+  # DjangoJSONEncoder rounds datetimes to milliseconds, the events keep the
+  # exact created_at of the categories
+  def default(self, o):
+    if isinstance(o, datetime.datetime):
+      return o.isoformat()
+    return super().default(o)
+
+
+class OutboxEventModel(models.Model):
+  # the position of the event in the change feed, never reused
+  sequence = models.BigAutoField(primary_key=True)
+  aggregate_type = models.CharField(max_length=50)
+  aggregate_id = models.UUIDField()
+  event_type = models.CharField(max_length=100)
+  payload = models.JSONField(encoder=OutboxJSONEncoder)
+  occurred_at = models.DateTimeField()
+  published_at = models.DateTimeField(null=True)
+
+  class Meta:
+    db_table = 'outbox'
+    indexes = [
+      # what the relay is left to publish
+      models.Index(
+        fields=['sequence'], name='outbox_unpublished_idx',
+        condition=models.Q(published_at__isnull=True)
+      ),
+    ]
@@ -0,0 +1,28 @@
+"""
+Migration operations of the category app.
+
+Migrations keep their SQL inline and only import these operations, which
+must stay backwards compatible with every migration using them.
+"""
+from django.db import migrations
+
+
+class RunVendorSQL(migrations.RunSQL):
+    """RunSQL that only runs on the databases of one vendor, the full-text
+    index is made of different objects on SQLite and PostgreSQL."""
+
+    def __init__(self, vendor: str, sql, reverse_sql=None):
+        super().__init__(sql, reverse_sql)
+        self.vendor = vendor
+
+    def deconstruct(self):
+        name, _, kwargs = super().deconstruct()
+        return name, [self.vendor], kwargs
+
+    def database_forwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor == self.vendor:
+            super().database_forwards(app_label, schema_editor, from_state, to_state)
+
+    def database_backwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor == self.vendor:
+            super().database_backwards(app_label, schema_editor, from_state, to_state)
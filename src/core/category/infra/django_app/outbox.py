@@ -0,0 +1,127 @@
+"""
+Transactional outbox of the category events.
+
+The repositories write the events recorded by the categories to the outbox
+table in the transaction of the change itself, so an event exists if and
+only if its change was committed. The sequence of the outbox rows orders the
+change feed (GET /categories/changes?since=) and the relay command pushes
+the rows not published yet to a downstream sink, at least once each.
+"""
+import abc
+import datetime
+import itertools
+import json
+import sys
+from abc import ABC
+from dataclasses import asdict
+from typing import IO, Iterable, List, Optional
+
+from django.db import transaction
+from django.utils import timezone
+
+from core.__seedwork.domain.events import DomainEvent
+from core.category.domain.repositories import CategoryChange, CategoryChangeFeed
+
+AGGREGATE_TYPE = 'category'
+
+
+def _model():
+    from core.category.infra.django_app.models import OutboxEventModel  # pylint: disable=import-outside-toplevel
+    return OutboxEventModel
+
+
+def append_events(events: Iterable[DomainEvent], using: str) -> None:
+    model = _model()
+    model.objects.using(using).bulk_create([
+        model(
+            aggregate_type=AGGREGATE_TYPE,
+            aggregate_id=event.aggregate_id,
+            event_type=event.event_type,
+            payload=event.payload(),
+            occurred_at=event.occurred_at
+        )
+        for event in events
+    ])
+
+
+def _to_change(row) -> CategoryChange:
+    return CategoryChange(
+        sequence=row.sequence,
+        event_type=row.event_type,
+        aggregate_id=str(row.aggregate_id),
+        occurred_at=row.occurred_at,
+        payload=row.payload
+    )
+
+
+class CategoryDjangoChangeFeed(CategoryChangeFeed):
+    """The sequence of an event is taken when it is inserted, before the
+    transaction of the write commits, so an event can commit after a later
+    one a client already read past. The feed stops at the first event that
+    occurred less than `safety_lag` seconds ago, a transaction taking longer
+    than the lag to commit can still be missed."""
+
+    def __init__(self, safety_lag: float = 5.0):
+        self.safety_lag = safety_lag
+
+    def changes_since(self, since: int, limit: int) -> List[CategoryChange]:
+        horizon = timezone.now() - datetime.timedelta(seconds=self.safety_lag)
+        rows = _model().objects.filter(
+            aggregate_type=AGGREGATE_TYPE, sequence__gt=since
+        ).order_by('sequence')[:limit]
+        committed = itertools.takewhile(lambda row: row.occurred_at < horizon, rows)
+        return [_to_change(row) for row in committed]
+
+
+class EventPublisher(ABC):
+
+    @abc.abstractmethod
+    def publish(self, changes: List[CategoryChange]) -> None:
+        """Raises when the changes could not be delivered."""
+        raise NotImplementedError()
+
+
+class JsonLinesPublisher(EventPublisher):
+
+    def __init__(self, stream: Optional[IO[str]] = None):
+        self.stream = stream or sys.stdout
+
+    def publish(self, changes: List[CategoryChange]) -> None:
+        encoder = _model().payload.field.encoder  # the one of the stored payloads
+        for change in changes:
+            self.stream.write(json.dumps(asdict(change), cls=encoder) + '\n')
+        self.stream.flush()
+
+
+class OutboxRelay:
+
+    def __init__(self, publisher: EventPublisher, batch_size: int = 100, using: str = 'default'):
+        self.publisher = publisher
+        self.batch_size = batch_size
+        self.using = using
+
+    def relay_once(self) -> int:
+        """Publishes the oldest unpublished batch and returns its size. A
+        failed publish rolls back, the batch is published again next time."""
+        with transaction.atomic(using=self.using):
+            # relays running side by side take different batches where the
+            # backend can lock rows (SQLite ignores it, writes are serialized)
+            rows = list(
+                _model().objects.using(self.using)
+                .select_for_update(skip_locked=True)
+                .filter(published_at__isnull=True)
+                .order_by('sequence')[:self.batch_size]
+            )
+            if not rows:
+                return 0
+            self.publisher.publish([_to_change(row) for row in rows])
+            _model().objects.using(self.using).filter(
+                sequence__in=[row.sequence for row in rows]
+            ).update(published_at=timezone.now())
+        return len(rows)
+
+    def prune(self, older_than: datetime.timedelta) -> int:
+        deleted, _ = _model().objects.using(self.using).filter(
+            published_at__lt=timezone.now() - older_than
+        ).delete()
+        return deleted
@@ -1,72 +1,411 @@
-from typing import List, Type, TYPE_CHECKING
+import contextlib
+import datetime
+from dataclasses import asdict
+from typing import (
+  Any, AsyncIterator, Callable, Dict, Iterator, List, Optional, Sequence, Type, TypeVar, TYPE_CHECKING
+)
+from asgiref.sync import sync_to_async
 from django.core import exceptions as django_exceptions
-from django.core.paginator import Paginator
+from django.db import router, transaction
+from django.db.models import Q
+from django.utils import timezone
 from core.__seedwork.domain.exceptions import NotFoundException
+from core.__seedwork.domain.repositories import DEFAULT_BATCH_SIZE, check_batch_size
 from core.__seedwork.domain.value_objects import UniqueEntityID
 from core.category.domain.entities import Category
-from core.category.domain.repositories import CategoryRepository
+from core.category.domain.repositories import (
+  CategoryAsyncRepository,
+  CategoryRepository,
+  CategoryUpdate,
+  CategoryUpdatesFeed
+)
 from core.category.infra.django_app.mappers import CategoryModelMapper
+from core.category.infra.django_app.outbox import append_events
+from core.category.infra.django_app.search import IContainsSearchBackend, RANK, SearchBackend
 
 if TYPE_CHECKING:
+  from django.db.models import QuerySet
   from core.category.infra.django_app.models import CategoryModel
+  from django_app.slow_queries import SlowQueryRecorder
+
+T = TypeVar('T')
+
+def _build_search_query(
+  query: 'QuerySet',
+  input_params: CategoryRepository.SearchParams,
+  sortable_fields: List[str],
+  projection: Optional[List[str]],
+  search_backend: SearchBackend
+) -> 'QuerySet':
+  sort = input_params.sort if input_params.sort in sortable_fields else None
+  if input_params.filter:
+    query = search_backend.filter(query, input_params.filter, rank=sort == RANK)
+  elif sort == RANK:
+    # nothing to rank without a filter
+    sort = None
+  if sort:
+    query = query.order_by(sort if input_params.sort_dir == 'asc' else f"-{sort}")
+  else:
+    query = query.order_by('-created_at')
+  if projection:
+    # select only the requested columns and skip building entities
+    query = query.values(*projection)
+  return query
+
+
+def _not_found(entity_id: str | UniqueEntityID) -> NotFoundException:
+  return NotFoundException(f"Entity not found using ID '{entity_id}'")
+
+
+def _filter_by_id(model: Type['CategoryModel'], entity_id: str | UniqueEntityID) -> 'QuerySet':
+  try:
+    return model.objects.filter(pk=str(entity_id))
+  except django_exceptions.ValidationError as exception:
+    raise _not_found(entity_id) from exception
+
+
+def _update_fields(entity: Category) -> Dict[str, Any]:
+  fields = entity.to_dict()
+  del fields['id']
+  return fields
+
+
+def _write_with_events(
+  model: Type['CategoryModel'], entities: Sequence[Category], write: Callable[[], T]
+) -> T:
+  # the events go to the outbox in the transaction of the write, a write
+  # that fails leaves no event behind
+  events = [event for entity in entities for event in entity.events]
+  if not events:
+    return write()
+  using = router.db_for_write(model)
+  with transaction.atomic(using=using):
+    result = write()
+    append_events(events, using)
+  for entity in entities:
+    entity.clear_events()
+  return result
+
+
+def _insert(model: Type['CategoryModel'], entity: Category) -> None:
+  # the id is always set, without force_insert save() tries an UPDATE first
+  _write_with_events(
+    model, [entity], lambda: CategoryModelMapper.to_model(entity).save(force_insert=True)
+  )
+
+
+def _update(model: Type['CategoryModel'], entity: Category) -> None:
+  def write():
+    # a single UPDATE, the affected row count tells whether the entity exists
+    if not _filter_by_id(model, entity.id).update(
+      **_update_fields(entity), updated_at=timezone.now()
+    ):
+      raise _not_found(entity.id)
+  _write_with_events(model, [entity], write)
+
+
+def _delete(model: Type['CategoryModel'], entity_id: str | UniqueEntityID) -> None:
+  using = router.db_for_write(model)
+  with transaction.atomic(using=using):
+    deleted, _ = _filter_by_id(model, entity_id).delete()
+    if not deleted:
+      raise _not_found(entity_id)
+    _add_tombstone(entity_id, using)
+    append_events([Category.deleted(entity_id)], using)
+
+
+def _add_tombstone(entity_id: str | UniqueEntityID, using: str) -> None:
+  from core.category.infra.django_app.models import CategoryTombstoneModel
+  # a category can be deleted again after an upsert brought it back
+  CategoryTombstoneModel.objects.using(using).bulk_create(
+    [CategoryTombstoneModel(id=str(entity_id), deleted_at=timezone.now())],
+    update_conflicts=True,
+    unique_fields=['id'],
+    update_fields=['deleted_at']
+  )
+
+
+def _to_search_item(item: Any, projection: Optional[List[str]]) -> Category | Dict[str, Any]:
+  if projection:
+    return {**item, 'id': str(item['id'])}
+  return CategoryModelMapper.to_entity(item)
+
 
 class CategoryDjangoRepository(CategoryRepository):
 
     sortable_fields: List[str] = ['name', 'created_at']
+    projectable_fields: List[str] = [
+      'id', 'name', 'description', 'is_active', 'created_at'
+    ]
     model: Type['CategoryModel']
+    slow_query_recorder: Optional['SlowQueryRecorder']
+    search_backend: SearchBackend
 
-    def __init__(self):
+    def __init__(
+      self,
+      slow_query_recorder: Optional['SlowQueryRecorder'] = None,
+      search_backend: Optional[SearchBackend] = None
+    ):
       from core.category.infra.django_app.models import CategoryModel
       self.model = CategoryModel
+      self.slow_query_recorder = slow_query_recorder
+      self.search_backend = search_backend or IContainsSearchBackend()
+      self.sortable_fields = [*type(self).sortable_fields, *self.search_backend.sortable_fields]
 
     def insert(self, entity: Category) -> None:
-        model = CategoryModelMapper.to_model(entity)
-        model.save()
+      _insert(self.model, entity)
+
+    def bulk_insert(self, entities: List[Category]) -> None:
+      _write_with_events(self.model, entities, lambda: self.model.objects.bulk_create(
+        [CategoryModelMapper.to_model(entity) for entity in entities],
+        batch_size=DEFAULT_BATCH_SIZE
+      ))
 
     def find_by_id(self, entity_id: str | UniqueEntityID) -> Category:
       model = self._get(str(entity_id))
       return CategoryModelMapper.to_entity(model)
 
     def find_all(self) -> List[Category]:
-        return [CategoryModelMapper.to_entity(model) for model in self.model.objects.all()]
+        return [
+          CategoryModelMapper.to_entity(model)
+          for model in self.model.objects.using(self._read_db()).all()
+        ]
+
+    def iter_all(self, batch_size: int = DEFAULT_BATCH_SIZE) -> Iterator[Category]:
+      return self._iter_batches(check_batch_size(batch_size))
+
+    def _iter_batches(self, batch_size: int) -> Iterator[Category]:
+      # keyset pagination over the primary key: each batch is an independent,
+      # index-backed query, so no cursor or transaction is held between batches
+      query = self.model.objects.order_by('pk')
+      last_pk = None
+      while True:
+        batch = query if last_pk is None else query.filter(pk__gt=last_pk)
+        models = list(batch[:batch_size])
+        for model in models:
+          yield CategoryModelMapper.to_entity(model)
+        if len(models) < batch_size:
+          return
+        last_pk = models[-1].pk
 
     def update(self, entity: Category) -> None:
-      self._get(entity.id)
-      model = CategoryModelMapper.to_model(entity)
-      model.save()
+      _update(self.model, entity)
+
+    def upsert(self, entity: Category) -> None:
+      self.bulk_upsert([entity])
+
+    def bulk_upsert(self, entities: List[Category]) -> None:
+      # a single INSERT ... ON CONFLICT (id) DO UPDATE per batch, instead of
+      # a lookup followed by an insert or an update for every entity. An id
+      # may appear once per statement (PostgreSQL rejects the second update
+      # of a row), the last entity of an id wins. created_at is kept.
+      latest = {entity.id: entity for entity in entities}
+      _write_with_events(self.model, entities, lambda: self.model.objects.bulk_create(
+        [CategoryModelMapper.to_model(entity) for entity in latest.values()],
+        batch_size=DEFAULT_BATCH_SIZE,
+        update_conflicts=True,
+        unique_fields=['id'],
+        update_fields=['name', 'description', 'is_active', 'updated_at']
+      ))
 
     def delete(self, entity_id: str | UniqueEntityID) -> None:
-      model = self._get(str(entity_id))
-      model.delete()
+      _delete(self.model, entity_id)
 
     def search(self, input_params: CategoryRepository.SearchParams) -> CategoryRepository.SearchResult:
-      query = self.model.objects.all()
-
-      if input_params.filter:
-        query = query.filter(name__icontains=input_params.filter)
-      if input_params.sort and input_params.sort in self.sortable_fields:
-        query = query.order_by(
-          input_params.sort if input_params.sort_dir == 'asc' else f"-{input_params.sort}"
-        )
-      else:
-        query = query.order_by('-created_at')
+      projection = self._apply_projection(input_params.fields)
+      # the count and the page come from the same database
+      using = self._read_db()
+      query = _build_search_query(
+        self.model.objects.using(using), input_params, self.sortable_fields, projection,
+        self.search_backend
+      )
 
-      paginator = Paginator(query, input_params.per_page)
-      page_obj = paginator.page(input_params.page)
+      # a page past the last one is empty, as in the async and in-memory
+      # repositories
+      offset = (input_params.page - 1) * input_params.per_page
+      with self._capture_slow_queries('search', using, search_params=asdict(input_params)):
+        total = query.count()
+        items = [
+          _to_search_item(item, projection)
+          for item in query[offset:offset + input_params.per_page]
+        ]
 
       return CategoryRepository.SearchResult(
-        items=[CategoryModelMapper.to_entity(
-          model) for model in page_obj.object_list],
-        total=paginator.count,
+        items=items,
+        total=total,
         current_page=input_params.page,
         per_page=input_params.per_page,
         sort=input_params.sort,
         sort_dir=input_params.sort_dir,
-        filter=input_params.filter
+        filter=input_params.filter,
+        fields=projection
       )
 
+    def _capture_slow_queries(self, operation: str, using: str, **context: Any):
+      if self.slow_query_recorder is None:
+        return contextlib.nullcontext()
+      return self.slow_query_recorder.capture(
+        using, repository=type(self).__name__, operation=operation, **context
+      )
+
+    def _read_db(self) -> str:
+      # a replica, or the primary after a write, see django_app.routers
+      return router.db_for_read(self.model)
+
     def _get(self, entity_id: str) -> 'CategoryModel':
       try:
-          return self.model.objects.get(pk=entity_id)
+          return self.model.objects.using(self._read_db()).get(pk=entity_id)
       except (self.model.DoesNotExist, django_exceptions.ValidationError) as exception:
-          raise NotFoundException(f"Entity not found using ID '{entity_id}'") from exception
+          raise _not_found(entity_id) from exception
+
+
+class CategoryDjangoAsyncRepository(CategoryAsyncRepository):
+
+    sortable_fields: List[str] = CategoryDjangoRepository.sortable_fields
+    projectable_fields: List[str] = CategoryDjangoRepository.projectable_fields
+    model: Type['CategoryModel']
+    slow_query_recorder: Optional['SlowQueryRecorder']
+    search_backend: SearchBackend
+
+    def __init__(
+      self,
+      slow_query_recorder: Optional['SlowQueryRecorder'] = None,
+      search_backend: Optional[SearchBackend] = None
+    ):
+      from core.category.infra.django_app.models import CategoryModel
+      self.model = CategoryModel
+      self.slow_query_recorder = slow_query_recorder
+      self.search_backend = search_backend or IContainsSearchBackend()
+      self.sortable_fields = [*type(self).sortable_fields, *self.search_backend.sortable_fields]
+
+    # the writes share the outbox transaction of the sync repository, the
+    # async ORM has no transactions
+
+    async def insert(self, entity: Category) -> None:
+      await sync_to_async(_insert)(self.model, entity)
+
+    async def find_by_id(self, entity_id: str | UniqueEntityID) -> Category:
+      model = await self._get(str(entity_id))
+      return CategoryModelMapper.to_entity(model)
+
+    async def find_all(self) -> List[Category]:
+      return [
+        CategoryModelMapper.to_entity(model)
+        async for model in self.model.objects.using(self._read_db()).all()
+      ]
+
+    def iter_all(self, batch_size: int = DEFAULT_BATCH_SIZE) -> AsyncIterator[Category]:
+      return self._iter_batches(check_batch_size(batch_size))
+
+    async def _iter_batches(self, batch_size: int) -> AsyncIterator[Category]:
+      query = self.model.objects.order_by('pk')
+      last_pk = None
+      while True:
+        batch = query if last_pk is None else query.filter(pk__gt=last_pk)
+        models = [model async for model in batch[:batch_size]]
+        for model in models:
+          yield CategoryModelMapper.to_entity(model)
+        if len(models) < batch_size:
+          return
+        last_pk = models[-1].pk
+
+    async def update(self, entity: Category) -> None:
+      await sync_to_async(_update)(self.model, entity)
+
+    async def delete(self, entity_id: str | UniqueEntityID) -> None:
+      await sync_to_async(_delete)(self.model, entity_id)
+
+    async def search(
+      self, input_params: CategoryAsyncRepository.SearchParams
+    ) -> CategoryAsyncRepository.SearchResult:
+      projection = self._apply_projection(input_params.fields)
+      using = self._read_db()
+      query = _build_search_query(
+        self.model.objects.using(using), input_params, self.sortable_fields,
+        projection, self.search_backend
+      )
+
+      offset = (input_params.page - 1) * input_params.per_page
+      async with self._capture_slow_queries('search', using, search_params=asdict(input_params)):
+        items = [
+          _to_search_item(item, projection)
+          async for item in query[offset:offset + input_params.per_page]
+        ]
+        total = await query.acount()
+
+      return CategoryAsyncRepository.SearchResult(
+        items=items,
+        total=total,
+        current_page=input_params.page,
+        per_page=input_params.per_page,
+        sort=input_params.sort,
+        sort_dir=input_params.sort_dir,
+        filter=input_params.filter,
+        fields=projection
+      )
+
+    def _capture_slow_queries(self, operation: str, using: str, **context: Any):
+      if self.slow_query_recorder is None:
+        return contextlib.nullcontext()
+      return self.slow_query_recorder.acapture(
+        using, repository=type(self).__name__, operation=operation, **context
+      )
+
+    def _read_db(self) -> str:
+      return router.db_for_read(self.model)
+
+    async def _get(self, entity_id: str) -> 'CategoryModel':
+      try:
+        return await self.model.objects.using(self._read_db()).aget(pk=entity_id)
+      except (self.model.DoesNotExist, django_exceptions.ValidationError) as exception:
+        raise _not_found(entity_id) from exception
+
+
+
+def _keyset(
+  query: 'QuerySet', field: str, since: datetime.datetime, after_id: Optional[str]
+) -> 'QuerySet':
+  # rows after (since, after_id) in (field, id) order, on the (field, id) index
+  if after_id is None:
+    query = query.filter(**{f'{field}__gte': since})
+  else:
+    query = query.filter(Q(**{f'{field}__gt': since}) | Q(**{field: since, 'id__gt': after_id}))
+  return query.order_by(field, 'id')
+
+
+class CategoryDjangoUpdatesFeed(CategoryUpdatesFeed):
+    """updated_at is taken by the application before the transaction of the
+    write commits, so a write can commit after a later one a client already
+    paged past. Only the writes older than `safety_lag` seconds are served,
+    a transaction taking longer than the lag to commit can still be missed."""
+
+    safety_lag: float
+
+    def __init__(self, safety_lag: float = 5.0):
+      self.safety_lag = safety_lag
+
+    def updated_since(
+      self, since: datetime.datetime, after_id: Optional[str], limit: int
+    ) -> List[CategoryUpdate]:
+      from core.category.infra.django_app.models import CategoryModel, CategoryTombstoneModel
+      using = router.db_for_read(CategoryModel)
+      horizon = timezone.now() - datetime.timedelta(seconds=self.safety_lag)
+      # each table gives at most `limit` rows, merged they give the first `limit`
+      updates = [
+        CategoryUpdate(
+          id=str(model.id), updated_at=model.updated_at,
+          category=CategoryModelMapper.to_entity(model)
+        )
+        for model in _keyset(
+          CategoryModel.objects.using(using).filter(updated_at__lt=horizon),
+          'updated_at', since, after_id
+        )[:limit]
+      ] + [
+        CategoryUpdate(id=str(tombstone.id), updated_at=tombstone.deleted_at, category=None)
+        for tombstone in _keyset(
+          CategoryTombstoneModel.objects.using(using).filter(deleted_at__lt=horizon),
+          'deleted_at', since, after_id
+        )[:limit]
+      ]
+      updates.sort(key=lambda update: (update.updated_at, update.id))
+      return updates[:limit]
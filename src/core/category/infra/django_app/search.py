@@ -0,0 +1,269 @@
+"""
+Search backends of the category repositories.
+
+`icontains` matches the filter as a substring of the name, which can't use
+an index and scans the whole table. `fulltext` matches every word of the
+filter as a word prefix of the name or the description through a full-text
+index: an external-content FTS5 table kept in sync by triggers on SQLite, a
+GIN index over a tsvector expression on PostgreSQL. It also adds `rank` to
+the sortable fields, ascending is the most relevant first, like FTS5's rank.
+
+The full-text index is installed by the category migrations, tests that run
+without migrations call install_full_text_search() themselves.
+
+The FTS5 table keys its rows on the implicit rowid of `categories`, whose
+primary key is a UUID. Anything that renumbers the rowids, a VACUUM or a
+table rebuild like the ones SQLite migrations do to alter a column, leaves
+the index pointing at the wrong rows until it is rebuilt with
+rebuild_full_text_search() (`INSERT INTO categories_fts(categories_fts)
+VALUES ('rebuild')`). A table rebuild also drops the triggers, so every
+`migrate` ends with repair_full_text_search(), which recreates the missing
+triggers and rebuilds the index. A VACUUM still needs a manual rebuild.
+"""
+import abc
+import re
+from abc import ABC
+from typing import Any, List, Optional, TYPE_CHECKING
+
+from django.db import connections
+from django.db.models import BooleanField, FloatField
+from django.db.models.expressions import RawSQL
+from django.db.models.sql.constants import INNER
+
+if TYPE_CHECKING:
+    from django.db.models import QuerySet
+
+RANK = 'rank'
+
+SQLITE_INSTALL = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS categories_fts USING fts5("
+    "name, description, content='categories', content_rowid='rowid', "
+    "tokenize='unicode61 remove_diacritics 2')",
+    "CREATE TRIGGER IF NOT EXISTS categories_fts_insert AFTER INSERT ON categories BEGIN "
+    "INSERT INTO categories_fts(rowid, name, description) "
+    "VALUES (new.rowid, new.name, new.description); END",
+    "CREATE TRIGGER IF NOT EXISTS categories_fts_delete AFTER DELETE ON categories BEGIN "
+    "INSERT INTO categories_fts(categories_fts, rowid, name, description) "
+    "VALUES ('delete', old.rowid, old.name, old.description); END",
+    "CREATE TRIGGER IF NOT EXISTS categories_fts_update "
+    "AFTER UPDATE OF name, description ON categories BEGIN "
+    "INSERT INTO categories_fts(categories_fts, rowid, name, description) "
+    "VALUES ('delete', old.rowid, old.name, old.description); "
+    "INSERT INTO categories_fts(rowid, name, description) "
+    "VALUES (new.rowid, new.name, new.description); END",
+    # indexes the rows inserted before the triggers existed
+    "INSERT INTO categories_fts(categories_fts) VALUES ('rebuild')",
+]
+SQLITE_REBUILD = ["INSERT INTO categories_fts(categories_fts) VALUES ('rebuild')"]
+SQLITE_UNINSTALL = [
+    'DROP TRIGGER IF EXISTS categories_fts_insert',
+    'DROP TRIGGER IF EXISTS categories_fts_delete',
+    'DROP TRIGGER IF EXISTS categories_fts_update',
+    'DROP TABLE IF EXISTS categories_fts',
+]
+
+# the queries must use the exact expression of the index for PostgreSQL to use it
+POSTGRESQL_DOCUMENT = (
+    "to_tsvector('simple', coalesce(categories.name, '') || ' ' "
+    "|| coalesce(categories.description, ''))"
+)
+POSTGRESQL_INSTALL = [
+    "CREATE INDEX IF NOT EXISTS categories_search_idx ON categories USING GIN ("
+    "(to_tsvector('simple', coalesce(name, '') || ' ' || coalesce(description, ''))))",
+]
+POSTGRESQL_UNINSTALL = ['DROP INDEX IF EXISTS categories_search_idx']
+
+
+def search_terms(text: str) -> List[str]:
+    return re.findall(r'\w+', text)
+
+
+class SearchBackend(ABC):
+
+    sortable_fields: List[str] = []
+
+    @abc.abstractmethod
+    def filter(self, query: 'QuerySet', text: str, rank: bool = False) -> 'QuerySet':
+        """Keeps the rows matching `text`, with `rank` also annotates their
+        rank when the backend has one."""
+        raise NotImplementedError()
+
+
+class IContainsSearchBackend(SearchBackend):
+
+    def filter(self, query: 'QuerySet', text: str, rank: bool = False) -> 'QuerySet':
+        return query.filter(name__icontains=text)
+
+
+class SqliteFullTextSearchBackend(SearchBackend):
+
+    sortable_fields: List[str] = [RANK]
+
+    # a match in the name weighs more than one in the description
+    name_weight = 10.0
+    description_weight = 1.0
+
+    @staticmethod
+    def match(text: str) -> Optional[str]:
+        terms = search_terms(text)
+        return ' '.join(f'"{term}"*' for term in terms) if terms else None
+
+    def filter(self, query: 'QuerySet', text: str, rank: bool = False) -> 'QuerySet':
+        match = self.match(text)
+        if match is None:
+            return query.none()
+        if not rank:
+            return query.filter(RawSQL(
+                'categories.rowid IN (SELECT rowid FROM categories_fts WHERE categories_fts MATCH %s)',
+                [match], output_field=BooleanField()
+            ))
+        # bm25() only works in the query running the MATCH: the MATCH runs
+        # once in a derived table joined on the rowid, which also keeps the
+        # matching rows only
+        query = query.all()
+        _join_derived_table(query.query, _FULL_TEXT_RANK_ALIAS, (
+            f'SELECT rowid, bm25(categories_fts, %s, %s) AS {RANK} '
+            'FROM categories_fts WHERE categories_fts MATCH %s'
+        ), [self.name_weight, self.description_weight, match])
+        return query.annotate(**{RANK: RawSQL(
+            f'{_FULL_TEXT_RANK_ALIAS}.{RANK}', [], output_field=FloatField()
+        )})
+
+
+_FULL_TEXT_RANK_ALIAS = 'categories_fts_rank'
+
+
+class _DerivedTableJoin:
+    """INNER JOIN (<sql>) <alias> ON <alias>.rowid = <parent>.rowid, an
+    entry of Query.alias_map (see django.db.models.sql.datastructures.Join
+    for the attributes and methods the entries need)."""
+
+    join_type = INNER
+    filtered_relation = None
+    nullable = False
+
+    def __init__(self, sql: str, params: List[Any], parent_alias: str, table_alias: str):
+        self.sql = sql
+        self.params = params
+        self.parent_alias = parent_alias
+        self.table_alias = table_alias
+        self.table_name = table_alias
+
+    def as_sql(self, compiler, connection):  # pylint: disable=unused-argument
+        parent = compiler.quote_name_unless_alias(self.parent_alias)
+        return (
+            f'{self.join_type} ({self.sql}) {self.table_alias} '
+            f'ON ({self.table_alias}.rowid = {parent}.rowid)'
+        ), list(self.params)
+
+    def relabeled_clone(self, change_map) -> '_DerivedTableJoin':
+        return _DerivedTableJoin(
+            self.sql, self.params,
+            change_map.get(self.parent_alias, self.parent_alias),
+            change_map.get(self.table_alias, self.table_alias)
+        )
+
+    def demote(self) -> '_DerivedTableJoin':
+        return self
+
+    def promote(self) -> '_DerivedTableJoin':
+        return self
+
+    @property
+    def identity(self):
+        return type(self), self.sql, tuple(self.params), self.parent_alias, self.table_alias
+
+    def __eq__(self, other):
+        if not isinstance(other, _DerivedTableJoin):
+            return NotImplemented
+        return self.identity == other.identity
+
+    def __hash__(self):
+        return hash(self.identity)
+
+    def equals(self, other) -> bool:
+        return self.identity == other.identity
+
+
+def _join_derived_table(query, alias: str, sql: str, params: List[Any]) -> None:
+    # the base table comes first in the FROM clause
+    parent_alias = query.get_initial_alias()
+    query.alias_map[alias] = _DerivedTableJoin(sql, params, parent_alias, alias)
+    query.alias_refcount[alias] = 1
+    query.table_map.setdefault(alias, []).append(alias)
+
+
+class PostgresFullTextSearchBackend(SearchBackend):
+
+    sortable_fields: List[str] = [RANK]
+
+    @staticmethod
+    def tsquery(text: str) -> Optional[str]:
+        terms = search_terms(text)
+        return ' & '.join(f'{term}:*' for term in terms) if terms else None
+
+    def filter(self, query: 'QuerySet', text: str, rank: bool = False) -> 'QuerySet':
+        tsquery = self.tsquery(text)
+        if tsquery is None:
+            return query.none()
+        query = query.filter(RawSQL(
+            f"{POSTGRESQL_DOCUMENT} @@ to_tsquery('simple', %s)", [tsquery],
+            output_field=BooleanField()
+        ))
+        if not rank:
+            return query
+        # ts_rank grows with the relevance, negated so ascending is the best first
+        return query.annotate(**{RANK: RawSQL(
+            f"-ts_rank({POSTGRESQL_DOCUMENT}, to_tsquery('simple', %s))", [tsquery],
+            output_field=FloatField()
+        )})
+
+
+_FULL_TEXT_BACKENDS = {
+    'sqlite': SqliteFullTextSearchBackend,
+    'postgresql': PostgresFullTextSearchBackend,
+}
+
+
+def search_backend(name: str = 'icontains', using: str = 'default') -> SearchBackend:
+    """The CATEGORY_SEARCH_BACKEND setting: `icontains` or `fulltext`."""
+    if name == 'icontains':
+        return IContainsSearchBackend()
+    if name != 'fulltext':
+        raise ValueError(f"Unknown search backend '{name}', use 'icontains' or 'fulltext'")
+    vendor = connections[using].vendor
+    if vendor not in _FULL_TEXT_BACKENDS:
+        raise ValueError(f'Full-text search is not supported on {vendor}')
+    return _FULL_TEXT_BACKENDS[vendor]()
+
+
+def _execute(connection, statements: List[str]) -> None:
+    with connection.cursor() as cursor:
+        for statement in statements:
+            cursor.execute(statement)
+
+
+def install_full_text_search(connection) -> None:
+    statements = {'sqlite': SQLITE_INSTALL, 'postgresql': POSTGRESQL_INSTALL}
+    _execute(connection, statements.get(connection.vendor, []))
+
+
+def uninstall_full_text_search(connection) -> None:
+    statements = {'sqlite': SQLITE_UNINSTALL, 'postgresql': POSTGRESQL_UNINSTALL}
+    _execute(connection, statements.get(connection.vendor, []))
+
+
+def rebuild_full_text_search(connection) -> None:
+    """Reindexes every row, after a VACUUM or a rebuild of the categories
+    table renumbered their rowids. PostgreSQL indexes don't need it."""
+    statements = {'sqlite': SQLITE_REBUILD}
+    _execute(connection, statements.get(connection.vendor, []))
+
+
+def repair_full_text_search(sender, using, **kwargs) -> None:  # pylint: disable=unused-argument
+    """post_migrate receiver, reinstalls the SQLite full-text index when the
+    migrations installed it, whatever they did to the categories table."""
+    connection = connections[using]
+    if connection.vendor != 'sqlite' or 'categories_fts' not in connection.introspection.table_names():
+        return
+    _execute(connection, SQLITE_INSTALL)
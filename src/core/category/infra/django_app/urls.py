@@ -1,28 +1,29 @@
 from django.urls import path
-from core.category.application.use_cases import CreateCategoryUseCase
 
-from core.category.infra.in_memory.repositories import CategoryInMemoryRepository
 from django_app import container
-from .api import CategoryResource
+from .api import CategoryChangesResource, CategoryResource, resolve_once
 
 
 def __init_category_resource():
     return {
-        'create_use_case': container.use_case_category_create_category,
-        'list_use_case': container.use_case_category_list_categories,
-        'get_use_case': container.use_case_category_get_category,
-        'update_use_case': container.use_case_category_update_category,
-        'delete_use_case': container.use_case_category_delete_category
+        'create_use_case': resolve_once(container.use_case_category_create_category),
+        'list_use_case': resolve_once(container.use_case_category_list_categories),
+        'get_use_case': resolve_once(container.use_case_category_get_category),
+        'update_use_case': resolve_once(container.use_case_category_update_category),
+        'delete_use_case': resolve_once(container.use_case_category_delete_category),
+        'list_updates_use_case': resolve_once(container.use_case_category_list_category_updates),
+        'track_serialization': container.track_serialization()
     }
 
 
+category_view = CategoryResource.as_view(**__init_category_resource())
+category_changes_view = CategoryChangesResource.as_view(
+    list_changes_use_case=resolve_once(container.use_case_category_list_category_changes),
+    track_serialization=container.track_serialization()
+)
+
 urlpatterns = [
-    path(
-        'categories/', CategoryResource.as_view(
-            **__init_category_resource()
-        )),
-    path(
-        'categories/<uuid:id>/', CategoryResource.as_view(
-            **__init_category_resource()
-        ))
+    path('categories/', category_view),
+    path('categories/changes', category_changes_view),
+    path('categories/<uuid:id>/', category_view)
 ]
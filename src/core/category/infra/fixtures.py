@@ -0,0 +1,119 @@
+"""
+Seedable generator of realistic categories, shared by the tests, the
+benchmarks and the seed_categories command.
+"""
+import datetime
+import itertools
+import random
+import uuid
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from core.__seedwork.domain.value_objects import UniqueEntityID
+from core.category.domain.entities import Category
+from core.category.infra.in_memory.repositories import CategoryInMemoryRepository
+
+PREFIXES = [
+    'Filmes de', 'Séries de', 'Documentários sobre', 'Clássicos de',
+    'Especial', 'Coleção', 'Melhores de', 'Lançamentos de',
+]
+TOPICS = [
+    'Ação', 'Aventura', 'Animação', 'Comédia', 'Drama', 'Ficção Científica',
+    'Fantasia', 'Terror', 'Suspense', 'Romance', 'Música', 'História',
+    'Natureza', 'Esportes', 'Culinária', 'Política', 'Crianças', 'Família',
+    'Anime', 'Faroeste', 'Mistério', 'Biografia', 'Guerra', 'Ciência',
+]
+SUFFIXES = ['', '', '', 'Anos 80', 'Anos 90', 'Nacionais', 'Internacionais',
+            'em Família', 'para Crianças', 'Independentes', 'Premiados']
+DESCRIPTION_WORDS = [
+    'títulos', 'selecionados', 'para', 'você', 'com', 'os', 'melhores',
+    'episódios', 'lançamentos', 'clássicos', 'da', 'temporada', 'e',
+    'produções', 'originais', 'premiadas', 'nacionais', 'estrangeiras',
+]
+
+
+@dataclass(frozen=True, slots=True)
+class CategoryDatasetFixture:
+    seed: int = 0
+    inactive_ratio: float = 0.15
+    description_ratio: float = 0.6
+    duplicate_ratio: float = 0.05
+    start: datetime.datetime = datetime.datetime(
+        2015, 1, 1, tzinfo=datetime.timezone.utc)
+    end: datetime.datetime = datetime.datetime(
+        2023, 1, 1, tzinfo=datetime.timezone.utc)
+    recent_skew: float = 3.0
+
+    def rows(self, size: int) -> Iterator[Dict[str, Any]]:
+        # same seed and size always produce the same rows
+        rand = random.Random(self.seed)
+        span = (self.end - self.start).total_seconds()
+        recent_names: List[str] = []
+
+        for _ in range(size):
+            if recent_names and rand.random() < self.duplicate_ratio:
+                name = rand.choice(recent_names)
+            else:
+                name = self._name(rand)
+                if len(recent_names) < 1000:
+                    recent_names.append(name)
+                else:
+                    recent_names[rand.randrange(1000)] = name
+
+            # u ** skew concentrates timestamps close to `end`
+            age = span * rand.random() ** self.recent_skew
+            yield {
+                'id': str(uuid.UUID(int=rand.getrandbits(128), version=4)),
+                'name': name,
+                'description': self._description(rand)
+                if rand.random() < self.description_ratio else None,
+                'is_active': rand.random() >= self.inactive_ratio,
+                'created_at': self.end - datetime.timedelta(seconds=age),
+            }
+
+    def categories(self, size: int) -> Iterator[Category]:
+        # rows are valid by construction, restore skips per entity validation
+        for row in self.rows(size):
+            yield Category.restore(
+                unique_entity_id=UniqueEntityID(row.pop('id')), **row
+            )
+
+    def populate_in_memory(self, repo: CategoryInMemoryRepository, size: int) -> None:
+        repo.bulk_insert(list(self.categories(size)))
+
+    def populate_table(
+        self,
+        size: int,
+        batch_size: int = 5000,
+        on_batch: Optional[Callable[[int], None]] = None
+    ) -> None:
+        from django.db import transaction  # pylint: disable=import-outside-toplevel
+        from core.category.infra.django_app.models import CategoryModel  # pylint: disable=import-outside-toplevel
+
+        # bulk_create materializes its input, so hand it one batch at a time
+        rows = self.rows(size)
+        inserted = 0
+        with transaction.atomic():
+            while batch := list(itertools.islice(rows, batch_size)):
+                CategoryModel.objects.bulk_create(
+                    [CategoryModel(**row) for row in batch])
+                inserted += len(batch)
+                if on_batch:
+                    on_batch(inserted)
+
+    @staticmethod
+    def _name(rand: random.Random) -> str:
+        parts = [rand.choice(TOPICS)]
+        shape = rand.random()
+        if shape < 0.45:
+            parts.insert(0, rand.choice(PREFIXES))
+        if shape > 0.3:
+            parts.append(rand.choice(SUFFIXES))
+        if rand.random() < 0.2:
+            parts.append(str(rand.randint(1950, 2023)))
+        return ' '.join(part for part in parts if part)[:255]
+
+    @staticmethod
+    def _description(rand: random.Random) -> str:
+        length = int(rand.lognormvariate(2.5, 0.8)) + 1
+        return ' '.join(rand.choice(DESCRIPTION_WORDS) for _ in range(length)).capitalize()
@@ -0,0 +1,350 @@
+"""
+Columnar storage of the in-memory category repository.
+
+CategoryInMemoryRepository keeps a list of Category objects, each one with
+its own UniqueEntityID, id string, datetime and events list: several hundred
+bytes per category before its texts, all tracked by the GC. The columnar
+repository keeps one compact column per field instead:
+
+- the ids as 16 bytes each in a bytearray
+- created_at as int64 microseconds since the epoch
+- is_active as a bitmap
+- the names as uint32 indexes into a table of the distinct names
+- the descriptions as UTF-8 in a single buffer, with the offset and the
+  length (-1 for None) of every row
+
+A row is the position of a category in every column. Searches filter and
+sort row numbers through a search engine, see search_engines, and only the
+rows of the returned page become Category objects.
+"""
+import array
+import datetime
+import uuid
+from typing import Any, Dict, Iterator, List, Optional, Sequence
+
+from core.__seedwork.domain.exceptions import NotFoundException
+from core.__seedwork.domain.repositories import DEFAULT_BATCH_SIZE, check_batch_size
+from core.__seedwork.domain.value_objects import UniqueEntityID
+from core.category.domain.entities import Category
+from core.category.domain.repositories import CategoryRepository
+from core.category.infra.in_memory.search_engines import ColumnarSearchEngine, search_engine
+
+ID_SIZE = 16
+EPOCH = datetime.datetime(1970, 1, 1, tzinfo=datetime.timezone.utc)
+_MICROSECOND = datetime.timedelta(microseconds=1)
+NO_DESCRIPTION = -1
+
+
+def to_microseconds(value: datetime.datetime) -> int:
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=datetime.timezone.utc)
+    return (value - EPOCH) // _MICROSECOND
+
+
+def from_microseconds(value: int) -> datetime.datetime:
+    return EPOCH + datetime.timedelta(microseconds=value)
+
+
+def id_bytes(entity_id: Any) -> Optional[bytes]:
+    try:
+        return uuid.UUID(str(entity_id)).bytes
+    except ValueError:
+        return None
+
+
+class Bitmap:
+    """One bit per row, little endian within each byte."""
+
+    def __init__(self, data: Optional[bytearray] = None, length: int = 0):
+        # read-only buffers (e.g. a memoryview) make a read-only bitmap
+        self.data = bytearray() if data is None else data
+        self.length = length
+
+    def __len__(self) -> int:
+        return self.length
+
+    def __getitem__(self, row: int) -> bool:
+        return bool(self.data[row >> 3] >> (row & 7) & 1)
+
+    def __setitem__(self, row: int, value: bool) -> None:
+        if value:
+            self.data[row >> 3] |= 1 << (row & 7)
+        else:
+            self.data[row >> 3] &= ~(1 << (row & 7)) & 0xFF
+
+    def __iter__(self) -> Iterator[bool]:
+        return map(self.__getitem__, range(self.length))
+
+    def append(self, value: bool) -> None:
+        if self.length >> 3 == len(self.data):
+            self.data.append(0)
+        self.length += 1
+        self[self.length - 1] = value
+
+    def delete(self, row: int) -> None:
+        # shifts the bits after the row down by one, as one big integer
+        value = int.from_bytes(self.data, 'little')
+        value = (value & ((1 << row) - 1)) | ((value >> (row + 1)) << row)
+        self.length -= 1
+        self.data = bytearray(value.to_bytes((self.length + 7) >> 3, 'little'))
+
+
+class CategoryColumns:
+    """The categories of a repository, a column per field."""
+
+    def __init__(self):
+        self.ids = bytearray()
+        self.created_at = array.array('q')
+        self.is_active = Bitmap()
+        self.names = array.array('I')
+        self.name_table: List[str] = []
+        # the names in lower case, for the case insensitive filter
+        self.lowered_names: List[str] = []
+        self._name_index: Dict[str, int] = {}
+        self.descriptions = bytearray()
+        self.description_offsets = array.array('q')
+        self.description_lengths = array.array('i')
+        # bytes of the descriptions buffer no row points to anymore
+        self._garbage = 0
+        self._name_ranks: Optional[List[int]] = None
+
+    def __len__(self) -> int:
+        return len(self.created_at)
+
+    @property
+    def nbytes(self) -> int:
+        """The size of the columns, without the name table strings."""
+        return len(self.ids) + len(self.is_active.data) + len(self.descriptions) + sum(
+            len(column) * column.itemsize for column in (
+                self.created_at, self.names, self.description_offsets, self.description_lengths
+            )
+        )
+
+    def append(self, category: Category) -> None:
+        self.ids += uuid.UUID(category.id).bytes
+        self.created_at.append(to_microseconds(category.created_at))
+        self.is_active.append(bool(category.is_active))
+        self.names.append(self._intern(category.name))
+        offset, length = self._store_description(category.description)
+        self.description_offsets.append(offset)
+        self.description_lengths.append(length)
+
+    def replace(self, row: int, category: Category) -> None:
+        self.created_at[row] = to_microseconds(category.created_at)
+        self.is_active[row] = bool(category.is_active)
+        self.names[row] = self._intern(category.name)
+        self._release_description(row)
+        self.description_offsets[row], self.description_lengths[row] = \
+            self._store_description(category.description)
+        self._compact()
+
+    def delete(self, row: int) -> None:
+        self._release_description(row)
+        del self.ids[row * ID_SIZE:(row + 1) * ID_SIZE]
+        del self.created_at[row]
+        self.is_active.delete(row)
+        del self.names[row]
+        del self.description_offsets[row]
+        del self.description_lengths[row]
+        self._compact()
+
+    def find(self, key: bytes) -> Optional[int]:
+        """The row of an id, a scan of the id column at C speed."""
+        position = self.ids.find(key)
+        while position != -1:
+            if position % ID_SIZE == 0:
+                return position // ID_SIZE
+            position = self.ids.find(key, position + 1)
+        return None
+
+    def positions(self) -> Dict[bytes, int]:
+        ids = bytes(self.ids)
+        return {ids[offset:offset + ID_SIZE]: row for row, offset in enumerate(range(0, len(ids), ID_SIZE))}
+
+    def name_ranks(self) -> List[int]:
+        """The position of every name of the table in sorted order."""
+        if self._name_ranks is None:
+            ranks = [0] * len(self.name_table)
+            for rank, index in enumerate(sorted(range(len(self.name_table)), key=self.name_table.__getitem__)):
+                ranks[index] = rank
+            self._name_ranks = ranks
+        return self._name_ranks
+
+    def category(self, row: int) -> Category:
+        length = self.description_lengths[row]
+        offset = self.description_offsets[row]
+        return Category.restore(
+            unique_entity_id=UniqueEntityID(str(uuid.UUID(bytes=bytes(self.ids[row * ID_SIZE:(row + 1) * ID_SIZE])))),
+            name=self.name_table[self.names[row]],
+            description=None if length == NO_DESCRIPTION
+            else str(self.descriptions[offset:offset + length], 'utf-8'),
+            is_active=self.is_active[row],
+            created_at=from_microseconds(self.created_at[row])
+        )
+
+    def copy(self) -> 'CategoryColumns':
+        columns = CategoryColumns()
+        columns.ids = bytearray(self.ids)
+        columns.created_at = array.array('q', self.created_at)
+        columns.is_active = Bitmap(bytearray(self.is_active.data), self.is_active.length)
+        columns.names = array.array('I', self.names)
+        # names are only ever added to the table
+        columns.name_table = self.name_table
+        columns.lowered_names = self.lowered_names
+        columns.descriptions = bytearray(self.descriptions)
+        columns.description_offsets = array.array('q', self.description_offsets)
+        columns.description_lengths = array.array('i', self.description_lengths)
+        return columns
+
+    def _intern(self, name: str) -> int:
+        index = self._name_index.get(name)
+        if index is None:
+            index = self._name_index[name] = len(self.name_table)
+            self.name_table.append(name)
+            self.lowered_names.append(name.lower())
+            self._name_ranks = None
+        return index
+
+    def _store_description(self, description: Optional[str]):
+        if description is None:
+            return 0, NO_DESCRIPTION
+        encoded = description.encode('utf-8')
+        offset = len(self.descriptions)
+        self.descriptions += encoded
+        return offset, len(encoded)
+
+    def _release_description(self, row: int) -> None:
+        self._garbage += max(self.description_lengths[row], 0)
+
+    def _compact(self) -> None:
+        # updates and deletes leave their old descriptions behind, rewrite
+        # the buffer once they are half of it
+        if self._garbage < 4096 or self._garbage * 2 < len(self.descriptions):
+            return
+        descriptions = bytearray()
+        for row, (offset, length) in enumerate(zip(self.description_offsets, self.description_lengths)):
+            if length == NO_DESCRIPTION:
+                continue
+            self.description_offsets[row] = len(descriptions)
+            descriptions += self.descriptions[offset:offset + length]
+        self.descriptions = descriptions
+        self._garbage = 0
+
+
+def _not_found(entity_id: Any) -> NotFoundException:
+    return NotFoundException(f"Entity not found using ID '{entity_id}'")
+
+
+class CategoryColumnarRepository(CategoryRepository):
+
+    sortable_fields: List[str] = ['name', 'created_at']
+    projectable_fields: List[str] = [
+        'id', 'name', 'description', 'is_active', 'created_at'
+    ]
+
+    def __init__(
+        self, items: Optional[Sequence[Category]] = None, engine: Optional[ColumnarSearchEngine] = None
+    ):
+        self.columns = CategoryColumns()
+        self.engine = engine or search_engine()
+        if items:
+            self.bulk_insert(list(items))
+
+    @property
+    def items(self) -> List[Category]:
+        """Every category, built on each access."""
+        return self.find_all()
+
+    def insert(self, entity: Category) -> None:
+        self.columns.append(entity)
+        entity.clear_events()
+
+    def bulk_insert(self, entities: List[Category]) -> None:
+        for entity in entities:
+            self.columns.append(entity)
+            entity.clear_events()
+
+    def find_by_id(self, entity_id: str | UniqueEntityID) -> Category:
+        columns = self.columns
+        return columns.category(self._row(columns, str(entity_id)))
+
+    def find_all(self) -> List[Category]:
+        columns = self.columns
+        return list(map(columns.category, range(len(columns))))
+
+    def iter_all(self, batch_size: int = DEFAULT_BATCH_SIZE) -> Iterator[Category]:
+        check_batch_size(batch_size)
+        # a copy of the columns, writes made while the caller consumes the
+        # generator don't shift or skip rows
+        return self._iter_rows(self.columns.copy())
+
+    @staticmethod
+    def _iter_rows(columns: CategoryColumns) -> Iterator[Category]:
+        for row in range(len(columns)):
+            yield columns.category(row)
+
+    def update(self, entity: Category) -> None:
+        self.columns.replace(self._row(self.columns, entity.id), entity)
+        entity.clear_events()
+
+    def upsert(self, entity: Category) -> None:
+        self.bulk_upsert([entity])
+
+    def bulk_upsert(self, entities: List[Category]) -> None:
+        # a single pass over the ids for a batch, instead of a scan per entity
+        positions = self.columns.positions() if len(entities) > 1 else None
+        for entity in entities:
+            key = uuid.UUID(entity.id).bytes
+            row = positions.get(key) if positions is not None else self.columns.find(key)
+            if row is None:
+                if positions is not None:
+                    positions[key] = len(self.columns)
+                self.columns.append(entity)
+            else:
+                self.columns.replace(row, entity)
+            entity.clear_events()
+
+    def delete(self, entity_id: str | UniqueEntityID) -> None:
+        self.columns.delete(self._row(self.columns, str(entity_id)))
+
+    def search(self, input_params: CategoryRepository.SearchParams) -> CategoryRepository.SearchResult:
+        projection = self._apply_projection(input_params.fields)
+        # a single reference for the whole search, see CategorySharedRepository
+        columns = self.columns
+        rows = self.engine.filter_rows(columns, input_params.filter) \
+            if input_params.filter else range(len(columns))
+
+        start = (input_params.page - 1) * input_params.per_page
+        stop = start + input_params.per_page
+        rows_sorted = rows
+        if not input_params.sort:
+            rows_sorted = self.engine.sort_rows(columns, rows, 'created_at', True, stop)
+        elif input_params.sort in self.sortable_fields:
+            rows_sorted = self.engine.sort_rows(
+                columns, rows, input_params.sort, input_params.sort_dir == 'desc', stop
+            )
+        # an unknown sort field keeps the insertion order, like the list repository
+        page = rows_sorted[start:stop]
+
+        items = [columns.category(int(row)) for row in page]
+        if projection:
+            items = [{field: getattr(item, field) for field in projection} for item in items]
+
+        return CategoryRepository.SearchResult(
+            items=items,
+            total=len(rows),
+            current_page=input_params.page,
+            per_page=input_params.per_page,
+            sort=input_params.sort,
+            sort_dir=input_params.sort_dir,
+            filter=input_params.filter,
+            fields=projection
+        )
+
+    @staticmethod
+    def _row(columns: CategoryColumns, entity_id: str) -> int:
+        key = id_bytes(entity_id)
+        row = columns.find(key) if key is not None else None
+        if row is None:
+            raise _not_found(entity_id)
+        return row
@@ -2,10 +2,15 @@ from typing import List
 from core.__seedwork.domain.repositories import InMemorySearchableRepository
 from core.category.domain.entities import Category
 from core.category.domain.repositories import CategoryRepository
+from core.category.infra.in_memory.columnar import CategoryColumnarRepository
+from core.category.infra.in_memory.search_engines import search_engine
 
 
 class CategoryInMemoryRepository(CategoryRepository, InMemorySearchableRepository):
     sortable_fields: List[str] = ["name", "created_at"]
+    projectable_fields: List[str] = [
+        "id", "name", "description", "is_active", "created_at"
+    ]
 
     def _apply_filter(self, items: List[Category], filter_param: str | None) -> List[Category]:
         if filter_param:
@@ -21,3 +26,17 @@ class CategoryInMemoryRepository(CategoryRepository, InMemorySearchableRepositor
         return super()._apply_sort(items, sort, sort_dir) \
             if sort \
             else super()._apply_sort(items, "created_at", "desc")
+
+
+def category_in_memory_repository(
+    storage: str = 'objects', engine: str = 'auto', thread_safe: bool = False
+) -> CategoryRepository:
+    """The CATEGORY_IN_MEMORY_STORAGE setting: `objects`, a list of
+    categories, or `columnar`, see core.category.infra.in_memory.columnar.
+    The columnar storage searches with the CATEGORY_IN_MEMORY_SEARCH_ENGINE,
+    the list is copied on write with CATEGORY_IN_MEMORY_THREAD_SAFE."""
+    if storage == 'objects':
+        return CategoryInMemoryRepository(thread_safe=thread_safe)
+    if storage == 'columnar':
+        return CategoryColumnarRepository(engine=search_engine(engine))
+    raise ValueError(f"Unknown in-memory storage '{storage}', use 'objects' or 'columnar'")
@@ -0,0 +1,134 @@
+"""
+Search engines of the columnar category repository.
+
+An engine filters the rows of the columns by the name filter and sorts them
+by a column, both steps on row numbers. `python` runs them with C level
+helpers of the standard library, a heap picks the rows of shallow pages.
+`numpy` runs them on NumPy views of the columns, no copy of the columns is
+made: boolean masks filter, a stable argsort sorts and a partition picks
+the candidates of shallow pages before sorting only them. Both return the
+rows in the order sorted() would, ties keep the order of insertion.
+
+NumPy is optional, `auto` uses it when it is installed. It is imported by
+the first numpy engine, not with this module: importing NumPy takes longer
+than the whole domain does.
+"""
+import abc
+import heapq
+import importlib
+import importlib.util
+from abc import ABC
+from itertools import compress, repeat
+from typing import List, Sequence, TYPE_CHECKING
+
+HAS_NUMPY = importlib.util.find_spec('numpy') is not None
+
+if TYPE_CHECKING:
+    import numpy
+    from core.category.infra.in_memory.columnar import CategoryColumns
+
+# pages deeper than this fraction of the rows are sorted fully instead of
+# picking their candidates first
+TOP_K_RATIO = 0.1
+
+
+class ColumnarSearchEngine(ABC):
+
+    @abc.abstractmethod
+    def filter_rows(self, columns: 'CategoryColumns', text: str) -> Sequence[int]:
+        """The rows whose name contains `text`, ignoring case, in order."""
+        raise NotImplementedError()
+
+    @abc.abstractmethod
+    def sort_rows(
+        self, columns: 'CategoryColumns', rows: Sequence[int], sort: str, descending: bool, needed: int
+    ) -> Sequence[int]:
+        """`rows` sorted by the `sort` column, at least the first `needed`."""
+        raise NotImplementedError()
+
+
+class PythonSearchEngine(ColumnarSearchEngine):
+
+    def filter_rows(self, columns: 'CategoryColumns', text: str) -> Sequence[int]:
+        # each distinct name is tested once, the rows are then picked by
+        # their name index
+        matches = bytes(map(str.__contains__, columns.lowered_names, repeat(text.lower())))
+        return list(compress(range(len(columns)), map(matches.__getitem__, columns.names)))
+
+    def sort_rows(
+        self, columns: 'CategoryColumns', rows: Sequence[int], sort: str, descending: bool, needed: int
+    ) -> Sequence[int]:
+        if sort == 'name':
+            ranks = columns.name_ranks()
+            keys = list(map(ranks.__getitem__, map(columns.names.__getitem__, rows)))
+        else:
+            keys = list(map(columns.created_at.__getitem__, rows))
+        positions = range(len(rows))
+        if needed < len(rows) * TOP_K_RATIO:
+            # equivalent to sorted(...)[:needed], in O(n log needed)
+            select = heapq.nlargest if descending else heapq.nsmallest
+            order = select(needed, positions, key=keys.__getitem__)
+        else:
+            order = sorted(positions, key=keys.__getitem__, reverse=descending)
+        return list(map(rows.__getitem__, order))
+
+
+class NumpySearchEngine(ColumnarSearchEngine):
+
+    def __init__(self):
+        if not HAS_NUMPY:
+            raise ValueError('The numpy search engine needs NumPy, install it or use the python engine')
+        self.numpy = importlib.import_module('numpy')
+
+    def _view(self, column) -> 'numpy.ndarray':
+        # shares the memory of the column (an array or a memoryview cast to
+        # its type), which can't be resized while the view is alive: views
+        # never outlive a call
+        return self.numpy.frombuffer(column, dtype=getattr(column, 'typecode', None) or column.format)
+
+    def filter_rows(self, columns: 'CategoryColumns', text: str) -> Sequence[int]:
+        numpy = self.numpy
+        matches = numpy.frombuffer(
+            bytes(map(str.__contains__, columns.lowered_names, repeat(text.lower()))), dtype=numpy.bool_
+        )
+        if not len(columns):
+            return []
+        return numpy.flatnonzero(matches[self._view(columns.names)])
+
+    def sort_rows(
+        self, columns: 'CategoryColumns', rows: Sequence[int], sort: str, descending: bool, needed: int
+    ) -> List[int]:
+        if not len(rows) or needed <= 0:
+            return []
+        numpy = self.numpy
+        rows = numpy.arange(len(columns)) if isinstance(rows, range) else numpy.asarray(rows)
+        if sort == 'name':
+            ranks = numpy.array(columns.name_ranks(), dtype=numpy.int64)
+            keys = ranks[self._view(columns.names)[rows]]
+        else:
+            keys = self._view(columns.created_at)[rows]
+        if descending:
+            # a stable ascending sort of the opposite keys keeps ties in
+            # order, like sorted(reverse=True)
+            keys = -keys
+        needed = min(needed, len(keys))
+        if needed < len(keys) * TOP_K_RATIO:
+            # every key up to the needed-th smallest, then only those sorted
+            kth = numpy.partition(keys, needed - 1)[needed - 1]
+            candidates = numpy.flatnonzero(keys <= kth)
+            order = candidates[numpy.argsort(keys[candidates], kind='stable')[:needed]]
+        else:
+            order = numpy.argsort(keys, kind='stable')[:needed]
+        return rows[order].tolist()
+
+
+def search_engine(name: str = 'auto') -> ColumnarSearchEngine:
+    """The CATEGORY_IN_MEMORY_SEARCH_ENGINE setting: `python`, `numpy`, or
+    `auto`, numpy when it is installed."""
+    if name == 'auto':
+        name = 'numpy' if HAS_NUMPY else 'python'
+    if name == 'python':
+        return PythonSearchEngine()
+    if name == 'numpy':
+        return NumpySearchEngine()
+    raise ValueError(f"Unknown search engine '{name}', use 'auto', 'python' or 'numpy'")
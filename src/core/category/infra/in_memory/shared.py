@@ -0,0 +1,350 @@
+"""
+Read-only category read model shared by the worker processes of a host.
+
+A loader (the publish_category_read_model command) writes the categories as
+a generation file holding the columns of the columnar repository, each one
+at an 8 byte aligned offset, and renames it into the store directory. It
+then points CURRENT at the new generation with an atomic rename. Workers map
+the generation of CURRENT read-only and read the columns in place through
+memoryviews: the pages are in the page cache once, shared by every process
+instead of a copy of the categories per worker. Only the table of the
+distinct names is decoded in each process.
+
+A worker checks CURRENT at most every `refresh_interval` seconds and swaps
+to a new generation with a single assignment. Reads that started on the
+previous generation finish on it, its file stays mapped until they are done
+even when the loader already removed it. Put the directory on a tmpfs
+(e.g. /dev/shm) to keep it off the disk.
+
+The columns are in the byte order of the host that wrote them, the files
+are meant for the processes of that host.
+"""
+import array
+import logging
+import mmap
+import os
+import re
+import struct
+import sys
+import time
+from itertools import accumulate, pairwise
+from pathlib import Path
+from typing import Iterable, Iterator, List, Optional
+
+from core.__seedwork.domain.repositories import DEFAULT_BATCH_SIZE
+from core.__seedwork.domain.value_objects import UniqueEntityID
+from core.category.domain.entities import Category
+from core.category.domain.repositories import CategoryRepository
+from core.category.infra.in_memory.columnar import (
+    ID_SIZE,
+    Bitmap,
+    CategoryColumnarRepository,
+    CategoryColumns
+)
+from core.category.infra.in_memory.search_engines import ColumnarSearchEngine, search_engine
+
+MAGIC = b'CATCOLS1'
+
+_HEADER = struct.Struct('<QQ?7x')
+_SECTION = struct.Struct('<QQ')
+_SECTIONS = 10
+_ALIGNMENT = 8
+
+_GENERATION = re.compile(r'categories-(\d+)\.columns')
+
+logger = logging.getLogger(__name__)
+
+
+class ReadModelError(Exception):
+    pass
+
+
+class ReadOnlyRepositoryError(Exception):
+    pass
+
+
+def _aligned(offset: int) -> int:
+    return -(-offset // _ALIGNMENT) * _ALIGNMENT
+
+
+def write_columns(columns: CategoryColumns, path: Path) -> None:
+    """Writes to a temporary file renamed over `path`."""
+    path = Path(path)
+    names = [name.encode('utf-8') for name in columns.name_table]
+    sections = [
+        bytes(columns.ids),
+        columns.created_at.tobytes(),
+        bytes(columns.is_active.data),
+        columns.names.tobytes(),
+        array.array('I', columns.name_ranks()).tobytes(),
+        array.array('q', accumulate(map(len, names), initial=0)).tobytes(),
+        b''.join(names),
+        columns.description_offsets.tobytes(),
+        columns.description_lengths.tobytes(),
+        bytes(columns.descriptions),
+    ]
+    offset = len(MAGIC) + _HEADER.size + _SECTION.size * _SECTIONS
+    table = []
+    for section in sections:
+        offset = _aligned(offset)
+        table.append((offset, len(section)))
+        offset += len(section)
+
+    tmp_path = path.with_name(f'{path.name}.tmp')
+    with tmp_path.open('wb') as file:
+        file.write(MAGIC)
+        file.write(_HEADER.pack(len(columns), len(columns.name_table), sys.byteorder == 'little'))
+        for section_offset, size in table:
+            file.write(_SECTION.pack(section_offset, size))
+        for (section_offset, _), section in zip(table, sections):
+            file.write(b'\0' * (section_offset - file.tell()))
+            file.write(section)
+        file.flush()
+        os.fsync(file.fileno())
+    os.replace(tmp_path, path)
+
+
+class MappedCategoryColumns(CategoryColumns):
+    """The columns of a generation file, mapped read-only."""
+
+    def __init__(self, path: Path):  # pylint: disable=super-init-not-called
+        self.path = Path(path)
+        with self.path.open('rb') as file:
+            if os.fstat(file.fileno()).st_size < len(MAGIC) + _HEADER.size + _SECTION.size * _SECTIONS:
+                raise ReadModelError(f"'{path}' is not a category read model")
+            self._mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._mmap[:len(MAGIC)] != MAGIC:
+            raise ReadModelError(f"'{path}' is not a category read model")
+        count, name_count, little_endian = _HEADER.unpack_from(self._mmap, len(MAGIC))
+        if little_endian != (sys.byteorder == 'little'):
+            raise ReadModelError(f"'{path}' was written on a host of another byte order")
+
+        view = memoryview(self._mmap)
+        table = [
+            _SECTION.unpack_from(self._mmap, len(MAGIC) + _HEADER.size + _SECTION.size * index)
+            for index in range(_SECTIONS)
+        ]
+        if any(offset + size > len(self._mmap) for offset, size in table):
+            raise ReadModelError(f"'{path}' is truncated")
+        (ids, created_at, is_active, names, name_ranks, name_offsets, name_blob,
+         description_offsets, description_lengths, descriptions) = [
+            view[offset:offset + size] for offset, size in table
+        ]
+        if len(ids) != count * ID_SIZE or len(name_offsets) != (name_count + 1) * 8:
+            raise ReadModelError(f"'{path}' is corrupted")
+
+        self._ids_start, self._ids_end = table[0][0], table[0][0] + table[0][1]
+        self.ids = ids
+        self.created_at = created_at.cast('q')
+        self.is_active = Bitmap(is_active, count)
+        self.names = names.cast('I')
+        self._name_ranks = name_ranks.cast('I')
+        self.name_table = [str(name_blob[start:end], 'utf-8') for start, end in pairwise(name_offsets.cast('q'))]
+        self.lowered_names = [name.lower() for name in self.name_table]
+        self.descriptions = descriptions
+        self.description_offsets = description_offsets.cast('q')
+        self.description_lengths = description_lengths.cast('i')
+        self._garbage = 0
+
+    def find(self, key: bytes) -> Optional[int]:
+        # searches the mapping itself, memoryviews have no find()
+        position = self._mmap.find(key, self._ids_start, self._ids_end)
+        while position != -1:
+            if (position - self._ids_start) % ID_SIZE == 0:
+                return (position - self._ids_start) // ID_SIZE
+            position = self._mmap.find(key, position + 1, self._ids_end)
+        return None
+
+    def copy(self) -> 'MappedCategoryColumns':
+        # a generation never changes
+        return self
+
+    def append(self, category: Category) -> None:
+        raise ReadOnlyRepositoryError('The columns of a generation are read-only')
+
+    def replace(self, row: int, category: Category) -> None:
+        raise ReadOnlyRepositoryError('The columns of a generation are read-only')
+
+    def delete(self, row: int) -> None:
+        raise ReadOnlyRepositoryError('The columns of a generation are read-only')
+
+
+class SharedCategoryStore:
+    """The generations of the read model in `directory` and CURRENT, the
+    name of the one to read. Only one loader publishes at a time."""
+
+    def __init__(self, directory: Path, keep: int = 2):
+        self.directory = Path(directory)
+        # the previous generations stay for the workers that are about to
+        # map them
+        self.keep = keep
+        self.current_path = self.directory / 'CURRENT'
+
+    def generations(self) -> List[Path]:
+        if not self.directory.exists():
+            return []
+        paths = [path for path in self.directory.iterdir() if _GENERATION.fullmatch(path.name)]
+        return sorted(paths, key=lambda path: int(_GENERATION.fullmatch(path.name).group(1)))
+
+    def current(self) -> Optional[Path]:
+        try:
+            name = self.current_path.read_text(encoding='ascii').strip()
+        except FileNotFoundError:
+            return None
+        return self.directory / name
+
+    def publish(self, categories: Iterable[Category]) -> Path:
+        """Writes a new generation of the categories and makes it current."""
+        columns = CategoryColumns()
+        for category in categories:
+            columns.append(category)
+
+        self.directory.mkdir(parents=True, exist_ok=True)
+        generations = self.generations()
+        number = int(_GENERATION.fullmatch(generations[-1].name).group(1)) + 1 if generations else 1
+        path = self.directory / f'categories-{number:08d}.columns'
+        write_columns(columns, path)
+
+        tmp_path = self.directory / 'CURRENT.tmp'
+        tmp_path.write_text(path.name, encoding='ascii')
+        os.replace(tmp_path, self.current_path)
+
+        # workers still reading a removed generation keep it mapped
+        for old in self.generations()[:-self.keep]:
+            old.unlink(missing_ok=True)
+        return path
+
+    def attach(self) -> Optional[MappedCategoryColumns]:
+        """The columns of the current generation, None until one is published."""
+        for _ in range(3):
+            path = self.current()
+            if path is None:
+                return None
+            try:
+                return MappedCategoryColumns(path)
+            except FileNotFoundError:
+                # removed by newer generations since CURRENT was read
+                continue
+        raise ReadModelError(f'The generations of {self.directory} change faster than they can be read')
+
+
+class CategorySharedRepository(CategoryColumnarRepository):
+    """The read methods of CategoryRepository over the current generation of
+    a SharedCategoryStore. Until the first one is published, the reads go to
+    `fallback` when there is one, or find no categories.
+
+    A generation only changes when a new one is published, so find_by_id
+    always reads the fallback when there is one: a category is found right
+    after it was written. The lists stay as of the last publish."""
+
+    def __init__(  # pylint: disable=super-init-not-called
+        self,
+        store: SharedCategoryStore,
+        engine: Optional[ColumnarSearchEngine] = None,
+        refresh_interval: float = 1.0,
+        fallback: Optional[CategoryRepository] = None
+    ):
+        self.store = store
+        self.engine = engine or search_engine()
+        self.refresh_interval = refresh_interval
+        self.fallback = fallback
+        self._columns: CategoryColumns = CategoryColumns()
+        self._generation: Optional[Path] = None
+        self._checked_at = float('-inf')
+
+    def find_by_id(self, entity_id: str | UniqueEntityID) -> Category:
+        if self.fallback is not None:
+            return self.fallback.find_by_id(entity_id)
+        return super().find_by_id(entity_id)
+
+    def find_all(self) -> List[Category]:
+        if self._unpublished():
+            return self.fallback.find_all()
+        return super().find_all()
+
+    def iter_all(self, batch_size: int = DEFAULT_BATCH_SIZE) -> Iterator[Category]:
+        if self._unpublished():
+            return self.fallback.iter_all(batch_size)
+        return super().iter_all(batch_size)
+
+    def search(self, input_params: CategoryRepository.SearchParams) -> CategoryRepository.SearchResult:
+        if self._unpublished():
+            return self.fallback.search(input_params)
+        return super().search(input_params)
+
+    def _unpublished(self) -> bool:
+        if self.fallback is None:
+            return False
+        self._refresh_when_due()
+        return self._generation is None
+
+    @property
+    def columns(self) -> CategoryColumns:
+        self._refresh_when_due()
+        return self._columns
+
+    def _refresh_when_due(self) -> None:
+        now = time.monotonic()
+        if now - self._checked_at >= self.refresh_interval:
+            self._checked_at = now
+            try:
+                self.refresh()
+            except ReadModelError:
+                # the reads go on with the generation they had, the next
+                # check retries
+                logger.exception('Keeping the generation %s of the category read model', self._generation)
+
+    @property
+    def generation(self) -> Optional[Path]:
+        return self._generation
+
+    def refresh(self) -> bool:
+        """Swaps to the current generation, True when it changed."""
+        generation = self.store.current()
+        if generation is None or generation == self._generation:
+            return False
+        columns = self.store.attach()
+        if columns is None:
+            return False
+        # a single assignment, reads in progress keep their columns
+        self._columns, self._generation = columns, columns.path
+        return True
+
+    def insert(self, entity: Category) -> None:
+        raise self._read_only()
+
+    def bulk_insert(self, entities: List[Category]) -> None:
+        raise self._read_only()
+
+    def update(self, entity: Category) -> None:
+        raise self._read_only()
+
+    def upsert(self, entity: Category) -> None:
+        raise self._read_only()
+
+    def bulk_upsert(self, entities: List[Category]) -> None:
+        raise self._read_only()
+
+    def delete(self, entity_id: str | UniqueEntityID) -> None:
+        raise self._read_only()
+
+    def _read_only(self) -> ReadOnlyRepositoryError:
+        return ReadOnlyRepositoryError(
+            f'{type(self).__name__} is read-only, publish a new generation to {self.store.directory} instead'
+        )
+
+
+def category_shared_repository(
+    directory: Optional[str],
+    engine: str = 'auto',
+    refresh_interval: float = 1.0,
+    fallback: Optional[CategoryRepository] = None
+) -> Optional[CategorySharedRepository]:
+    """The repository of the CATEGORY_READ_MODEL_DIR setting, None when it
+    is not set."""
+    if not directory:
+        return None
+    return CategorySharedRepository(
+        SharedCategoryStore(directory), engine=search_engine(engine),
+        refresh_interval=refresh_interval, fallback=fallback
+    )
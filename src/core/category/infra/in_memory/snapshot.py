@@ -0,0 +1,346 @@
+"""
+Snapshots and write log of the in-memory category repository.
+
+A snapshot stores the categories column by column: the ids as fixed width
+ASCII (in the hyphenated form, like the UUIDField of the Django model
+stores them), created_at as int64 microseconds since the epoch, is_active and
+whether there is a description as one byte each, and the names and the
+descriptions as a single UTF-8 text each. The values of a text are joined
+by the ASCII unit separator and split back in one call, or, when a value
+contains the separator, stored with the offset of every value. Loading
+maps the file and materializes the categories a column at a time, with the
+slots of the dataclasses set directly: the data was validated when it was
+written, so it skips the per row validation (and the Python loop) of
+Category.restore().
+
+Writes made after the snapshot are appended to a write log, records of
+`<op><length><crc32><payload>` where an upsert carries its categories in
+the snapshot encoding and a delete the id. The log is replayed after the
+snapshot on startup, a record cut short by a crash ends the replay.
+"""
+import array
+import datetime
+import gc
+import mmap
+import os
+import struct
+import sys
+import uuid
+import zlib
+from collections import deque
+from itertools import accumulate, chain, repeat
+from pathlib import Path
+from typing import BinaryIO, Dict, Iterable, List, Optional, Sequence
+
+from core.__seedwork.domain.entities import Entity
+from core.__seedwork.domain.value_objects import UniqueEntityID
+from core.category.domain.entities import Category
+from core.category.infra.in_memory.repositories import CategoryInMemoryRepository
+
+MAGIC = b'CATSNAP1'
+
+ID_SIZE = 36
+EPOCH = datetime.datetime(1970, 1, 1, tzinfo=datetime.timezone.utc)
+_MICROSECOND = datetime.timedelta(microseconds=1)
+
+_COUNT = struct.Struct('<Q')
+_SECTION = struct.Struct('<Q')
+_RECORD = struct.Struct('<BII')
+
+_SEPARATOR = '\x1f'
+_JOINED = 0
+_OFFSETS = 1
+
+UPSERT = 1
+DELETE = 2
+
+
+class SnapshotError(Exception):
+    pass
+
+
+def _int64(values: Iterable[int]) -> bytes:
+    column = array.array('q', values)
+    if sys.byteorder == 'big':
+        column.byteswap()
+    return column.tobytes()
+
+
+def _from_int64(buffer) -> array.array:
+    column = array.array('q')
+    column.frombytes(buffer)
+    if sys.byteorder == 'big':
+        column.byteswap()
+    return column
+
+
+def _microseconds(value: datetime.datetime) -> int:
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=datetime.timezone.utc)
+    return (value - EPOCH) // _MICROSECOND
+
+
+def _encode_texts(values: List[str]) -> bytes:
+    text = _SEPARATOR.join(values)
+    if text.count(_SEPARATOR) == max(len(values) - 1, 0):
+        return bytes([_JOINED]) + text.encode('utf-8')
+    # offsets in characters, the text is sliced once decoded
+    offsets = _int64(chain([0], accumulate(map(len, values))))
+    return b''.join([
+        bytes([_OFFSETS]), _SECTION.pack(len(offsets)), offsets, ''.join(values).encode('utf-8')
+    ])
+
+
+def _decode_texts(buffer: memoryview, count: int) -> List[str]:
+    if count == 0:
+        return []
+    if buffer[0] == _JOINED:
+        values = str(buffer[1:], 'utf-8').split(_SEPARATOR)
+    else:
+        (size,) = _SECTION.unpack_from(buffer, 1)
+        start = 1 + _SECTION.size
+        offsets = _from_int64(buffer[start:start + size])
+        text = str(buffer[start + size:], 'utf-8')
+        values = list(map(text.__getitem__, map(slice, offsets, offsets[1:])))
+    if len(values) != count:
+        raise SnapshotError('corrupted snapshot')
+    return values
+
+
+def _encode_ids(categories: Sequence[Category]) -> bytes:
+    ids = ''.join(category.id for category in categories)
+    if len(ids) != len(categories) * ID_SIZE:
+        # UniqueEntityID accepts every form uuid.UUID() parses
+        ids = ''.join(str(uuid.UUID(category.id)) for category in categories)
+    return ids.encode('ascii')
+
+
+def encode(categories: Sequence[Category]) -> bytes:
+    sections = [
+        _encode_ids(categories),
+        _int64(_microseconds(category.created_at) for category in categories),
+        bytes(bool(category.is_active) for category in categories),
+        bytes(category.description is not None for category in categories),
+        _encode_texts([category.name for category in categories]),
+        _encode_texts([category.description or '' for category in categories]),
+    ]
+    return b''.join([
+        _COUNT.pack(len(categories)),
+        *(part for section in sections for part in (_SECTION.pack(len(section)), section))
+    ])
+
+
+def _sections(buffer: memoryview, count: int) -> List[memoryview]:
+    sections = []
+    offset = _COUNT.size
+    for _ in range(6):
+        (size,) = _SECTION.unpack_from(buffer, offset)
+        offset += _SECTION.size
+        if offset + size > len(buffer):
+            raise SnapshotError('truncated snapshot')
+        sections.append(buffer[offset:offset + size])
+        offset += size
+    if len(sections[0]) != count * ID_SIZE:
+        raise SnapshotError('corrupted snapshot')
+    return sections
+
+
+def _set(slot, objects: List[object], values: Iterable) -> None:
+    # the member descriptor of a slot writes through frozen dataclasses,
+    # deque(maxlen=0) runs the map without building a list
+    deque(map(slot.__set__, objects, values), maxlen=0)
+
+
+def decode(buffer) -> List[Category]:
+    buffer = memoryview(buffer)
+    (count,) = _COUNT.unpack_from(buffer)
+    ids, created_at, is_active, has_description, names, descriptions = _sections(buffer, count)
+
+    ids_text = str(ids, 'ascii')
+
+    # millions of new objects would trigger full collections for nothing
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        unique_entity_ids = list(map(object.__new__, repeat(UniqueEntityID, count)))
+        _set(UniqueEntityID.id, unique_entity_ids, map(
+            ids_text.__getitem__, map(slice, range(0, count * ID_SIZE, ID_SIZE),
+                                      range(ID_SIZE, (count + 1) * ID_SIZE, ID_SIZE))
+        ))
+        categories = list(map(object.__new__, repeat(Category, count)))
+        _set(Entity.unique_entity_id, categories, unique_entity_ids)
+        _set(Entity._events, categories, [[] for _ in range(count)])  # pylint: disable=protected-access
+        _set(Category.name, categories, _decode_texts(names, count))
+        _set(Category.description, categories, map(
+            lambda value, present: value if present else None,
+            _decode_texts(descriptions, count), bytes(has_description)
+        ))
+        _set(Category.is_active, categories, map(bool, bytes(is_active)))
+        # an int / int division is correctly rounded, fromtimestamp() gets
+        # the exact microsecond back
+        _set(Category.created_at, categories, map(
+            datetime.datetime.fromtimestamp,
+            map(int.__truediv__, _from_int64(created_at), repeat(1_000_000)),
+            repeat(datetime.timezone.utc)
+        ))
+    finally:
+        if gc_enabled:
+            gc.enable()
+    return categories
+
+
+def save_snapshot(categories: Sequence[Category], path: Path) -> None:
+    """Writes to a temporary file renamed over `path`, readers never see
+    a partial snapshot."""
+    path = Path(path)
+    tmp_path = path.with_name(f'{path.name}.tmp')
+    with tmp_path.open('wb') as file:
+        file.write(MAGIC)
+        file.write(encode(categories))
+        file.flush()
+        os.fsync(file.fileno())
+    os.replace(tmp_path, path)
+
+
+def load_snapshot(path: Path) -> List[Category]:
+    with Path(path).open('rb') as file:
+        if os.fstat(file.fileno()).st_size < len(MAGIC) + _COUNT.size:
+            raise SnapshotError(f"'{path}' is not a category snapshot")
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            if mapped[:len(MAGIC)] != MAGIC:
+                raise SnapshotError(f"'{path}' is not a category snapshot")
+            categories = _decode_mapped(mapped)
+    if categories is None:
+        raise SnapshotError(f"'{path}' is a corrupted category snapshot")
+    return categories
+
+
+def _decode_mapped(mapped: mmap.mmap) -> Optional[List[Category]]:
+    # None when the data is corrupted: the traceback of the error would keep
+    # the views of the decoding frames alive, and neither the view nor the
+    # map could be released
+    view = memoryview(mapped)
+    try:
+        return decode(view[len(MAGIC):])
+    except (SnapshotError, ValueError, OverflowError, struct.error):
+        return None
+    finally:
+        view.release()
+
+
+class WriteLog:
+    """Append-only log of the writes made since the last snapshot."""
+
+    def __init__(self, path: Path, fsync: bool = False):
+        self.path = Path(path)
+        self.fsync = fsync
+        self._file: Optional[BinaryIO] = None
+
+    def append_upsert(self, categories: Sequence[Category]) -> None:
+        if categories:
+            self._append(UPSERT, encode(categories))
+
+    def append_delete(self, entity_id: str) -> None:
+        self._append(DELETE, str(entity_id).encode('ascii'))
+
+    def replay(self, categories: List[Category]) -> List[Category]:
+        """The categories with the logged writes applied. A record cut short
+        by a crash, and whatever follows it, is dropped from the log."""
+        if not self.path.exists():
+            return categories
+        by_id: Dict[str, Category] = {category.id: category for category in categories}
+        data = self.path.read_bytes()
+        offset = 0
+        while offset + _RECORD.size <= len(data):
+            operation, size, checksum = _RECORD.unpack_from(data, offset)
+            payload = data[offset + _RECORD.size:offset + _RECORD.size + size]
+            if len(payload) != size or zlib.crc32(payload) != checksum:
+                break
+            if operation == UPSERT:
+                # like bulk_upsert, an existing category keeps its position
+                by_id.update((category.id, category) for category in decode(payload))
+            elif operation == DELETE:
+                by_id.pop(payload.decode('ascii'), None)
+            offset += _RECORD.size + size
+        if offset != len(data):
+            self.close()
+            with self.path.open('r+b') as file:
+                file.truncate(offset)
+        return list(by_id.values())
+
+    def truncate(self) -> None:
+        self.close()
+        with self.path.open('wb'):
+            pass
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def _append(self, operation: int, payload: bytes) -> None:
+        if self._file is None:
+            self._file = self.path.open('ab')
+        self._file.write(_RECORD.pack(operation, len(payload), zlib.crc32(payload)) + payload)
+        self._file.flush()
+        if self.fsync:
+            os.fsync(self._file.fileno())
+
+
+class JournaledCategoryRepository:
+    """Proxies an in-memory repository and logs its successful writes."""
+
+    def __init__(self, repository: CategoryInMemoryRepository, log: WriteLog):
+        self._repository = repository
+        self._log = log
+
+    def insert(self, entity: Category) -> None:
+        self._repository.insert(entity)
+        self._log.append_upsert([entity])
+
+    def bulk_insert(self, entities: List[Category]) -> None:
+        self._repository.bulk_insert(entities)
+        self._log.append_upsert(entities)
+
+    def update(self, entity: Category) -> None:
+        self._repository.update(entity)
+        self._log.append_upsert([entity])
+
+    def upsert(self, entity: Category) -> None:
+        self._repository.upsert(entity)
+        self._log.append_upsert([entity])
+
+    def bulk_upsert(self, entities: List[Category]) -> None:
+        self._repository.bulk_upsert(entities)
+        self._log.append_upsert(entities)
+
+    def delete(self, entity_id: str | UniqueEntityID) -> None:
+        self._repository.delete(entity_id)
+        self._log.append_delete(str(entity_id))
+
+    def __getattr__(self, name: str):
+        return getattr(self._repository, name)
+
+
+class CategorySnapshotStore:
+    """The snapshot and the write log of a repository in `directory`."""
+
+    def __init__(self, directory: Path, fsync: bool = False):
+        self.directory = Path(directory)
+        self.snapshot_path = self.directory / 'categories.snapshot'
+        self.log = WriteLog(self.directory / 'categories.log', fsync=fsync)
+
+    def load(self) -> JournaledCategoryRepository:
+        """The repository of the last snapshot and the writes logged since,
+        journaling its new writes. Empty when nothing was saved yet."""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        categories = load_snapshot(self.snapshot_path) if self.snapshot_path.exists() else []
+        repository = CategoryInMemoryRepository(items=self.log.replay(categories))
+        return JournaledCategoryRepository(repository, self.log)
+
+    def checkpoint(self, repository: CategoryInMemoryRepository) -> None:
+        """Snapshots the repository and starts an empty log, the writes must
+        be paused while it runs."""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        save_snapshot(repository.items, self.snapshot_path)
+        self.log.truncate()
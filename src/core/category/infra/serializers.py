@@ -7,3 +7,15 @@ class CategorySerializer(serializers.Serializer):
   description = serializers.CharField(required=False, allow_null=True)
   is_active = serializers.BooleanField(required=False)
   created_at = serializers.DateTimeField(read_only=True, format=ISO_8601)
+
+
+class CategoryUpdatesQuerySerializer(serializers.Serializer):
+  updated_since = serializers.DateTimeField()
+  after_id = serializers.UUIDField(required=False, format='hex_verbose')
+  limit = serializers.IntegerField(required=False, min_value=1, max_value=1000, default=100)
+
+  def to_internal_value(self, data):
+    values = super().to_internal_value(data)
+    if 'after_id' in values:
+      values['after_id'] = str(values['after_id'])
+    return values
@@ -5,4 +5,5 @@ def init_category_resource_all_none():
         'create_use_case': None,
         'update_use_case': None,
         'delete_use_case': None,
+        'list_updates_use_case': None,
     }
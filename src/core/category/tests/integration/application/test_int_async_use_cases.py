@@ -0,0 +1,86 @@
+import unittest
+from asgiref.sync import async_to_sync
+from model_bakery import baker
+import pytest
+from core.__seedwork.domain.exceptions import NotFoundException
+from core.category.application.async_use_cases import (
+    AsyncCreateCategoryUseCase,
+    AsyncDeleteCategoryUseCase,
+    AsyncGetCategoryUseCase,
+    AsyncListCategoriesUseCase,
+    AsyncUpdateCategoryUseCase
+)
+from core.category.application.dto import CategoryOutPutMapper
+from core.category.infra.django_app.mappers import CategoryModelMapper
+from core.category.infra.django_app.models import CategoryModel
+from core.category.infra.django_app.repositories import CategoryDjangoAsyncRepository
+
+
+@pytest.mark.django_db
+class TestAsyncCategoryUseCasesInt(unittest.TestCase):
+
+    repo: CategoryDjangoAsyncRepository
+
+    def setUp(self) -> None:
+        self.repo = CategoryDjangoAsyncRepository()
+
+    def test_create(self):
+        use_case = AsyncCreateCategoryUseCase(self.repo)
+        output = async_to_sync(use_case.execute)(
+            AsyncCreateCategoryUseCase.Input(name='Movie'))
+
+        model = CategoryModel.objects.get(pk=output.id)
+        self.assertEqual(output, AsyncCreateCategoryUseCase.Output(
+            id=str(model.id),
+            name='Movie',
+            description=None,
+            is_active=True,
+            created_at=model.created_at
+        ))
+
+    def test_get(self):
+        model = baker.make(CategoryModel)
+        use_case = AsyncGetCategoryUseCase(self.repo)
+
+        output = async_to_sync(use_case.execute)(
+            AsyncGetCategoryUseCase.Input(str(model.id)))
+        self.assertEqual(
+            output,
+            CategoryOutPutMapper.from_child(AsyncGetCategoryUseCase.Output)
+            .to_output(CategoryModelMapper.to_entity(model))
+        )
+
+        with self.assertRaises(NotFoundException):
+            async_to_sync(use_case.execute)(
+                AsyncGetCategoryUseCase.Input('fake id'))
+
+    def test_list(self):
+        models = baker.make(CategoryModel, _quantity=2)
+        use_case = AsyncListCategoriesUseCase(self.repo)
+
+        output = async_to_sync(use_case.execute)(
+            AsyncListCategoriesUseCase.Input(sort='name', fields='name'))
+        models.sort(key=lambda model: model.name)
+        self.assertEqual(output, AsyncListCategoriesUseCase.Output(
+            items=[{'id': str(model.id), 'name': model.name} for model in models],
+            total=2,
+            current_page=1,
+            per_page=15,
+            last_page=1
+        ))
+
+    def test_update_and_delete(self):
+        model = baker.make(CategoryModel, is_active=True)
+
+        output = async_to_sync(AsyncUpdateCategoryUseCase(self.repo).execute)(
+            AsyncUpdateCategoryUseCase.Input(
+                id=str(model.id), name='Movie', is_active=False)
+        )
+        self.assertEqual(output.name, 'Movie')
+        self.assertFalse(output.is_active)
+        self.assertFalse(CategoryModel.objects.get(pk=model.id).is_active)
+
+        async_to_sync(AsyncDeleteCategoryUseCase(self.repo).execute)(
+            AsyncDeleteCategoryUseCase.Input(id=str(model.id))
+        )
+        self.assertFalse(CategoryModel.objects.filter(pk=model.id).exists())
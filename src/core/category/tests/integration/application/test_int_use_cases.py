@@ -12,7 +12,8 @@ from core.category.application.use_cases import (
     DeleteCategoryUseCase,
     GetCategoryUseCase,
     ListCategoriesUseCase,
-    UpdateCategoryUseCase
+    UpdateCategoryUseCase,
+    UpsertCategoryUseCase
 )
 from core.category.infra.django_app.repositories import CategoryDjangoRepository
 
@@ -369,6 +370,49 @@ class TestUpdateCategoryUseCaseInt(unittest.TestCase):
             self.assertEqual(category.created_at, expected['created_at'])
 
 
+@pytest.mark.django_db
+class TestUpsertCategoryUseCaseInt(unittest.TestCase):
+
+    use_case: UpsertCategoryUseCase
+    repo: CategoryDjangoRepository
+
+    def setUp(self) -> None:
+        self.repo = CategoryDjangoRepository()
+        self.use_case = UpsertCategoryUseCase(self.repo)
+
+    def test_execute(self):
+        request = UpsertCategoryUseCase.Input(
+            id='af46842e-027d-4c91-b259-3a3642144ba4',
+            name='test'
+        )
+        response = self.use_case.execute(request)
+        model = CategoryModel.objects.get(pk=request.id)
+        self.assertEqual(response, UpsertCategoryUseCase.Output(
+            id=request.id,
+            name='test',
+            description=None,
+            is_active=True,
+            created_at=model.created_at
+        ))
+
+        request = UpsertCategoryUseCase.Input(
+            id='af46842e-027d-4c91-b259-3a3642144ba4',
+            name='test changed',
+            description='some description',
+            is_active=False
+        )
+        response = self.use_case.execute(request)
+        self.assertEqual(CategoryModel.objects.count(), 1)
+        model = CategoryModel.objects.get(pk=request.id)
+        self.assertEqual(response, UpsertCategoryUseCase.Output(
+            id=request.id,
+            name=model.name,
+            description=model.description,
+            is_active=model.is_active,
+            created_at=model.created_at
+        ))
+
+
 @pytest.mark.django_db
 class TestDeleteCategoryUseCaseInt(unittest.TestCase):
 
@@ -0,0 +1,118 @@
+import json
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.test import AsyncClient, AsyncRequestFactory, override_settings
+from model_bakery import baker
+
+from core.category.infra.django_app.async_api import AsyncCategoryResource
+from core.category.infra.django_app.models import CategoryModel
+from core.category.tests.fixture.categories_api_fixture import CategoryApiFixture
+from django_app import container
+
+
+@pytest.mark.django_db
+class TestAsyncCategoryResourceInt:
+
+    @classmethod
+    def setup_class(cls):
+        cls.view = staticmethod(AsyncCategoryResource.as_view(
+            create_use_case=container.async_use_case_category_create_category,
+            list_use_case=container.async_use_case_category_list_categories,
+            get_use_case=container.async_use_case_category_get_category,
+            update_use_case=container.async_use_case_category_update_category,
+            delete_use_case=container.async_use_case_category_delete_category,
+            list_updates_use_case=container.use_case_category_list_category_updates
+        ))
+        cls.factory = AsyncRequestFactory()
+
+    def _call(self, request, **kwargs):
+        response = async_to_sync(self.view)(request, **kwargs)
+        body = json.loads(response.content) if response.content else None
+        return response, body
+
+    def test_view_is_async(self):
+        assert AsyncCategoryResource.view_is_async
+
+    def test_post(self):
+        request = self.factory.post(
+            '/categories/', {'name': 'Movie'}, content_type='application/json')
+        response, body = self._call(request)
+
+        assert response.status_code == 201
+        assert list(body.keys()) == CategoryApiFixture.keys_in_category_response()
+        assert CategoryModel.objects.get(pk=body['id']).name == 'Movie'
+
+        request = self.factory.post(
+            '/categories/', {'name': ''}, content_type='application/json')
+        response, body = self._call(request)
+        assert response.status_code == 400
+        assert 'name' in body
+
+        request = self.factory.post(
+            '/categories/', '{not json', content_type='application/json')
+        response, body = self._call(request)
+        assert response.status_code == 400
+
+    def test_get(self):
+        model = baker.make(CategoryModel, description='some description')
+
+        response, body = self._call(self.factory.get('/categories/'))
+        assert response.status_code == 200
+        assert body['total'] == 1
+        assert body['items'][0]['id'] == str(model.id)
+
+        response, body = self._call(
+            self.factory.get('/categories/', {'fields': 'name'}))
+        assert body['items'] == [{'id': str(model.id), 'name': model.name}]
+
+        response, body = self._call(
+            self.factory.get(f'/categories/{model.id}/'), id=model.id)
+        assert response.status_code == 200
+        assert body['description'] == 'some description'
+
+        response, body = self._call(
+            self.factory.get('/categories/af46842e-027d-4c91-b259-3a3642144ba4/'),
+            id='af46842e-027d-4c91-b259-3a3642144ba4')
+        assert response.status_code == 404
+
+    def test_put_and_delete(self):
+        model = baker.make(CategoryModel)
+
+        request = self.factory.put(
+            f'/categories/{model.id}/',
+            {'name': 'Movie', 'is_active': False},
+            content_type='application/json'
+        )
+        response, body = self._call(request, id=model.id)
+        assert response.status_code == 200
+        assert body['name'] == 'Movie'
+        assert body['is_active'] is False
+
+        response, _ = self._call(
+            self.factory.delete(f'/categories/{model.id}/'), id=model.id)
+        assert response.status_code == 204
+        assert not CategoryModel.objects.filter(pk=model.id).exists()
+
+
+@pytest.mark.django_db
+class TestAsyncCategoryResourceCsrfInt:
+
+    @override_settings(ROOT_URLCONF='django_app.asgi_urls')
+    def test_writes_are_csrf_exempt(self):
+        async def call():
+            client = AsyncClient(enforce_csrf_checks=True)
+            created = await client.post(
+                '/categories/', {'name': 'Movie'}, content_type='application/json')
+            url = f"/categories/{created.json()['id']}/"
+            updated = await client.put(url, {'name': 'Documentary'}, content_type='application/json')
+            deleted = await client.delete(url)
+            return created, updated, deleted
+
+        created, updated, deleted = async_to_sync(call)()
+
+        assert created.status_code == 201
+        assert updated.status_code == 200
+        assert updated.json()['name'] == 'Documentary'
+        assert deleted.status_code == 204
+        assert not CategoryModel.objects.exists()
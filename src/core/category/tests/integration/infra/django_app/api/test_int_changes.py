@@ -0,0 +1,85 @@
+import datetime
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.db.models import F
+from django.test import AsyncClient, override_settings
+from rest_framework.test import APIClient
+
+from core.category.domain.entities import Category
+from core.category.infra.django_app.models import OutboxEventModel
+from core.category.infra.django_app.repositories import CategoryDjangoRepository
+
+
+def age_the_events():
+    # past the safety lag of the feed, which holds back the recent events
+    OutboxEventModel.objects.update(occurred_at=F('occurred_at') - datetime.timedelta(minutes=1))
+
+
+@pytest.mark.django_db
+class TestCategoryChangesResourceInt:
+
+    def test_changes_since(self):
+        client = APIClient()
+        response = client.post('/categories/', {'name': 'Movie'}, format='json')
+        category_id = response.json()['id']
+        client.put(f'/categories/{category_id}/', {'name': 'Documentary'}, format='json')
+        client.delete(f'/categories/{category_id}/')
+        age_the_events()
+
+        response = client.get('/categories/changes', {'limit': 2})
+        assert response.status_code == 200
+        body = response.json()
+        assert [item['event_type'] for item in body['items']] == [
+            'CategoryCreated', 'CategoryUpdated'
+        ]
+        assert body['items'][0]['aggregate_id'] == category_id
+        assert body['items'][1]['payload']['name'] == 'Documentary'
+        assert body['has_more'] is True
+
+        response = client.get('/categories/changes', {'since': body['next_since']})
+        body = response.json()
+        assert [item['event_type'] for item in body['items']] == ['CategoryDeleted']
+        assert body['has_more'] is False
+
+        response = client.get('/categories/changes', {'since': body['next_since']})
+        assert response.json() == {
+            'items': [], 'next_since': body['next_since'], 'has_more': False
+        }
+
+    def test_recent_events_are_held_back(self):
+        APIClient().post('/categories/', {'name': 'Movie'}, format='json')
+
+        response = APIClient().get('/categories/changes')
+        assert response.json() == {'items': [], 'next_since': 0, 'has_more': False}
+
+    def test_writes_without_events_are_not_in_the_feed(self):
+        CategoryDjangoRepository().insert(Category(name='Movie'))
+
+        response = APIClient().get('/categories/changes')
+        assert response.json()['items'] == []
+
+    @override_settings(ROOT_URLCONF='django_app.asgi_urls')
+    def test_changes_under_asgi(self):
+        async def create():
+            created = await AsyncClient().post(
+                '/categories/', {'name': 'Movie'}, content_type='application/json')
+            return created.json()
+
+        async def call():
+            client = AsyncClient()
+            first = await client.get('/categories/changes', {'limit': 1})
+            rest = await client.get('/categories/changes', {'since': first.json()['next_since']})
+            return first, rest.json()
+
+        category = async_to_sync(create)()
+        age_the_events()
+        response, rest = async_to_sync(call)()
+
+        assert response.status_code == 200
+        body = response.json()
+        assert [item['event_type'] for item in body['items']] == ['CategoryCreated']
+        assert body['items'][0]['aggregate_id'] == category['id']
+        assert body['items'][0]['payload']['name'] == 'Movie'
+        assert body['has_more'] is False
+        assert rest == {'items': [], 'next_since': body['next_since'], 'has_more': False}
@@ -0,0 +1,45 @@
+import pytest
+from model_bakery import baker
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from core.category.infra.django_app.api import CategoryResource
+from core.category.infra.django_app.models import CategoryModel
+from core.category.tests.helpers import init_category_resource_all_none
+from django_app import container
+
+
+@pytest.mark.django_db
+class TestCategoryResourceGetMethodInt:
+
+    resource: CategoryResource
+
+    @classmethod
+    def setup_class(cls):
+        cls.resource = CategoryResource(**{
+            **init_category_resource_all_none(),
+            'list_use_case': container.use_case_category_list_categories
+        })
+
+    def test_list_using_fields(self):
+        model = baker.make(CategoryModel, description='some description')
+
+        _request = APIRequestFactory().get('/categories/', {'fields': 'id,name'})
+        response = self.resource.get(Request(_request))
+
+        assert response.status_code == 200
+        assert response.data['items'] == [
+            {'id': str(model.id), 'name': model.name}
+        ]
+        assert response.data['total'] == 1
+
+    def test_list_without_fields(self):
+        baker.make(CategoryModel)
+
+        _request = APIRequestFactory().get('/categories/')
+        response = self.resource.get(Request(_request))
+
+        assert response.status_code == 200
+        assert list(response.data['items'][0].keys()) == [
+            'id', 'name', 'description', 'is_active', 'created_at'
+        ]
@@ -22,7 +22,8 @@ class TestCategoryResourcePostMethodInt:
             update_use_case=None,
             get_use_case=None,
             list_use_case=None,
-            delete_use_case=None
+            delete_use_case=None,
+            list_updates_use_case=None
         )
 
     @pytest.mark.parametrize('http_expect', CategoryApiFixture.arrange_for_save())
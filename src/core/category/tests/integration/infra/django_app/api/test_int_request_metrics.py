@@ -0,0 +1,101 @@
+import logging
+import re
+
+import pytest
+from asgiref.sync import async_to_sync, iscoroutinefunction
+from django.http import HttpResponse
+from django.test import AsyncClient, Client, override_settings
+from model_bakery import baker
+
+from core.category.infra.django_app.models import CategoryModel
+from django_app.instrumentation import RequestMetricsMiddleware
+
+
+def server_timing(response):
+    header = response['Server-Timing']
+    metrics = dict(re.findall(r'([\w-]+);dur=([\d.]+)', header))
+    queries = int(re.search(r'desc="(\d+) queries"', header).group(1))
+    return {name: float(value) for name, value in metrics.items()}, queries
+
+
+@pytest.mark.django_db
+class TestRequestMetricsMiddlewareInt:
+
+    client: Client
+
+    def setup_method(self):
+        self.client = Client()
+
+    def test_server_timing_header(self):
+        baker.make(CategoryModel, _quantity=3)
+
+        response = self.client.get('/categories/')
+        assert response.status_code == 200
+
+        durations, queries = server_timing(response)
+        assert list(durations.keys()) == ['db', 'use-case', 'serialization', 'total']
+        assert queries == 2
+        assert durations['db'] > 0
+        assert durations['use-case'] >= durations['db']
+        assert durations['serialization'] > 0
+        assert durations['total'] >= durations['use-case']
+
+    def test_queries_per_endpoint(self):
+        # the writes also INSERT their event into the outbox, inside a
+        # savepoint (SAVEPOINT and RELEASE) of the test transaction
+        response = self.client.post(
+            '/categories/', {'name': 'Movie'}, content_type='application/json')
+        assert server_timing(response)[1] == 4
+        category_id = response.json()['id']
+
+        response = self.client.get(f'/categories/{category_id}/')
+        assert server_timing(response)[1] == 1
+
+        response = self.client.put(
+            f'/categories/{category_id}/', {'name': 'Documentary'},
+            content_type='application/json')
+        assert response.status_code == 200
+        assert server_timing(response)[1] == 5
+
+        response = self.client.delete(f'/categories/{category_id}/')
+        assert response.status_code == 204
+        # and the tombstone of the category
+        assert server_timing(response)[1] == 5
+
+    @override_settings(ROOT_URLCONF='django_app.asgi_urls')
+    def test_server_timing_header_on_async_views(self):
+        baker.make(CategoryModel, _quantity=3)
+
+        async def get():
+            return await AsyncClient().get('/categories/')
+
+        response = async_to_sync(get)()
+        assert response.status_code == 200
+
+        durations, queries = server_timing(response)
+        assert queries == 2
+        assert durations['use-case'] >= durations['db'] > 0
+        assert durations['serialization'] > 0
+
+    def test_middleware_runs_async_under_asgi(self):
+        async def get_response(_request):
+            return HttpResponse()
+
+        assert iscoroutinefunction(RequestMetricsMiddleware(get_response))
+        assert not iscoroutinefunction(RequestMetricsMiddleware(lambda _request: HttpResponse()))
+
+    def test_log_slow_requests(self, caplog):
+        baker.make(CategoryModel, name='Movie')
+        with override_settings(SLOW_REQUEST_QUERY_THRESHOLD=1):
+            client = Client()
+            with caplog.at_level(logging.WARNING, 'django_app.instrumentation'):
+                client.get('/categories/?filter=movie')
+        assert len(caplog.records) == 1
+        assert caplog.records[0].getMessage().startswith(
+            'slow request GET /categories/?filter=movie status=200')
+        assert 'queries=2' in caplog.records[0].getMessage()
+
+        caplog.clear()
+        with caplog.at_level(logging.WARNING, 'django_app.instrumentation'):
+            self.client.get('/categories/')
+        assert not caplog.records
@@ -0,0 +1,125 @@
+import datetime
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.db.models import F
+from django.test import AsyncClient, override_settings
+from model_bakery import baker
+from rest_framework.test import APIClient
+
+from core.category.infra.django_app.models import CategoryModel, CategoryTombstoneModel
+
+
+def age_the_writes():
+    # past the safety lag of the feed, which holds back the recent writes
+    lag = datetime.timedelta(minutes=1)
+    CategoryModel.objects.update(updated_at=F('updated_at') - lag)
+    CategoryTombstoneModel.objects.update(deleted_at=F('deleted_at') - lag)
+
+
+@pytest.mark.django_db
+class TestCategoryResourceUpdatesInt:
+
+    def test_list_updates(self):
+        client = APIClient()
+        ids = [
+            client.post('/categories/', {'name': f'Movie {index}'}, format='json').json()['id']
+            for index in range(3)
+        ]
+        client.delete(f'/categories/{ids[0]}/')
+        age_the_writes()
+
+        response = client.get('/categories/', {
+            'updated_since': '1970-01-01T00:00:00Z', 'limit': 2
+        })
+        assert response.status_code == 200
+        body = response.json()
+        assert [item['id'] for item in body['items']] == ids[1:]
+        assert body['items'][0]['name'] == 'Movie 1'
+        assert body['items'][0]['deleted'] is False
+        assert body['has_more'] is True
+
+        response = client.get('/categories/', {
+            'updated_since': body['next_updated_since'],
+            'after_id': body['next_after_id'],
+            'limit': 2
+        })
+        body = response.json()
+        assert body['items'] == [{
+            'id': ids[0],
+            'updated_at': body['items'][0]['updated_at'],
+            'deleted': True,
+            'name': None,
+            'description': None,
+            'is_active': None,
+            'created_at': None
+        }]
+        assert body['has_more'] is False
+
+        # nothing changed since the last page
+        response = client.get('/categories/', {
+            'updated_since': body['next_updated_since'], 'after_id': body['next_after_id']
+        })
+        assert response.json()['items'] == []
+
+        # without updated_since the listing is unchanged
+        assert client.get('/categories/').json()['total'] == CategoryModel.objects.count()
+
+    def test_recent_writes_are_held_back(self):
+        client = APIClient()
+        client.post('/categories/', {'name': 'Movie'}, format='json')
+
+        response = client.get('/categories/', {'updated_since': '1970-01-01T00:00:00Z'})
+        assert response.json()['items'] == []
+
+    @pytest.mark.parametrize('params, field', [
+        ({'updated_since': 'fake'}, 'updated_since'),
+        ({'updated_since': '2020-01-01T00:00:00Z', 'after_id': 'fake'}, 'after_id'),
+        ({'updated_since': '2020-01-01T00:00:00Z', 'limit': 0}, 'limit'),
+        ({'updated_since': '2020-01-01T00:00:00Z', 'limit': 5000}, 'limit'),
+    ])
+    def test_invalid_params(self, params, field):
+        response = APIClient().get('/categories/', params)
+        assert response.status_code == 400
+        assert field in response.json()
+
+
+@pytest.mark.django_db
+class TestAsyncCategoryResourceUpdatesInt:
+
+    @override_settings(ROOT_URLCONF='django_app.asgi_urls')
+    def test_list_updates(self):
+        ids = sorted(str(model.id) for model in baker.make(CategoryModel, _quantity=3))
+        age_the_writes()
+
+        async def call():
+            client = AsyncClient()
+            first = await client.get('/categories/', {
+                'updated_since': '1970-01-01T00:00:00Z', 'limit': 2
+            })
+            body = first.json()
+            rest = await client.get('/categories/', {
+                'updated_since': body['next_updated_since'], 'after_id': body['next_after_id']
+            })
+            return first, rest.json()
+
+        first, rest = async_to_sync(call)()
+
+        assert first.status_code == 200
+        body = first.json()
+        assert body['has_more'] is True
+        # the microseconds of next_updated_since are kept, as by the sync API
+        assert body['next_updated_since'] == APIClient().get('/categories/', {
+            'updated_since': '1970-01-01T00:00:00Z', 'limit': 2
+        }).json()['next_updated_since']
+        assert sorted(item['id'] for item in body['items'] + rest['items']) == ids
+        assert rest['has_more'] is False
+
+    @override_settings(ROOT_URLCONF='django_app.asgi_urls')
+    def test_invalid_params(self):
+        async def call():
+            return await AsyncClient().get('/categories/', {'updated_since': 'fake'})
+
+        response = async_to_sync(call)()
+        assert response.status_code == 400
+        assert 'updated_since' in response.json()
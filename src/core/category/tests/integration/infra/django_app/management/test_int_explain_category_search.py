@@ -0,0 +1,31 @@
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test import override_settings
+
+from core.category.infra.django_app.search import install_full_text_search
+
+
+@pytest.mark.django_db
+class TestExplainCategorySearchCommandInt:
+
+    def _call(self, **options) -> str:
+        # the tests run without migrations, which install the index
+        install_full_text_search(connection)
+        out = StringIO()
+        call_command('explain_category_search', filter='movie', stdout=out, **options)
+        return out.getvalue()
+
+    def test_icontains(self):
+        output = self._call(backend='icontains')
+        assert 'LIKE' in output
+        assert 'categories_fts' not in output
+
+    def test_backend_option(self):
+        assert 'categories_fts' in self._call(backend='fulltext')
+
+    @override_settings(CATEGORY_SEARCH_BACKEND='fulltext')
+    def test_configured_backend_by_default(self):
+        assert 'categories_fts' in self._call()
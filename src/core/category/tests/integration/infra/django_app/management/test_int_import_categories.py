@@ -0,0 +1,182 @@
+import json
+from io import StringIO
+from pathlib import Path
+
+import pytest
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import IntegrityError
+
+from core.category.infra.django_app.models import CategoryModel, OutboxEventModel
+from core.category.infra.django_app.repositories import CategoryDjangoRepository
+
+
+@pytest.mark.django_db
+class TestImportCategoriesCommandInt:
+
+    def _call(self, *args, **options) -> str:
+        out = StringIO()
+        call_command('import_categories', *args, stdout=out, **options)
+        return out.getvalue()
+
+    def test_import_csv(self, tmp_path: Path):
+        file = tmp_path / 'categories.csv'
+        file.write_text(
+            'id,name,description,is_active,created_at\n'
+            'af46842e-027d-4c91-b259-3a3642144ba4,Movie,,true,2023-01-01T10:00:00Z\n'
+            ',Documentary,some description,false,\n'
+            ',Series,,,\n',
+            encoding='utf-8'
+        )
+
+        output = self._call(str(file), batch_size=2)
+
+        assert CategoryModel.objects.count() == 3
+        movie = CategoryModel.objects.get(pk='af46842e-027d-4c91-b259-3a3642144ba4')
+        assert movie.name == 'Movie'
+        assert movie.description is None
+        assert movie.is_active is True
+        assert movie.created_at.isoformat() == '2023-01-01T10:00:00+00:00'
+
+        documentary = CategoryModel.objects.get(name='Documentary')
+        assert documentary.description == 'some description'
+        assert documentary.is_active is False
+        assert CategoryModel.objects.get(name='Series').is_active is True
+
+        assert '2 rows read, 2 imported, 0 rejected' in output
+        assert 'Done: 3 rows read, 3 imported, 0 rejected' in output
+        assert 'rows/s' in output
+
+    def test_reject_invalid_rows(self, tmp_path: Path):
+        file = tmp_path / 'categories.jsonl'
+        file.write_text('\n'.join([
+            json.dumps({'name': 'Movie'}),
+            json.dumps({'name': ''}),
+            json.dumps({'name': 'Movie', 'is_active': 'maybe'}),
+            json.dumps({'id': 'fake id', 'name': 'Movie'}),
+            '{not json',
+            json.dumps({'name': 'a' * 256}),
+        ]) + '\n', encoding='utf-8')
+
+        output = self._call(str(file))
+
+        assert CategoryModel.objects.count() == 1
+        assert 'Done: 6 rows read, 1 imported, 5 rejected' in output
+
+        rejects_file = tmp_path / 'categories.jsonl.rejects.jsonl'
+        rejects = [json.loads(line) for line in rejects_file.read_text().splitlines()]
+        assert [reject['row'] for reject in rejects] == [2, 3, 4, 5, 6]
+        assert list(rejects[0]['errors']) == ['name']
+        assert list(rejects[1]['errors']) == ['is_active']
+        assert rejects[2]['errors'] == {'id': ['Id must be a valid UUID']}
+        assert list(rejects[3]['errors']) == ['row']
+        assert rejects[3]['data'] == '{not json'
+
+    def test_reject_rows_conflicting_with_existing_ids(self, tmp_path: Path):
+        file = tmp_path / 'categories.jsonl'
+        existing_id = 'af46842e-027d-4c91-b259-3a3642144ba4'
+        file.write_text('\n'.join([
+            json.dumps({'name': 'Movie'}),
+            json.dumps({'id': existing_id, 'name': 'Documentary'}),
+            json.dumps({'id': existing_id, 'name': 'Documentary again'}),
+        ]), encoding='utf-8')
+
+        output = self._call(str(file))
+
+        assert 'Done: 3 rows read, 2 imported, 1 rejected' in output
+        assert CategoryModel.objects.get(pk=existing_id).name == 'Documentary'
+
+        rejects_file = tmp_path / 'categories.jsonl.rejects.jsonl'
+        rejects = [json.loads(line) for line in rejects_file.read_text().splitlines()]
+        assert [reject['row'] for reject in rejects] == [3]
+        assert rejects[0]['errors'] == {'id': [f"Category with id '{existing_id}' already exists"]}
+
+    def test_reject_rows_violating_other_constraints(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+        file = tmp_path / 'categories.jsonl'
+        file.write_text('\n'.join([
+            json.dumps({'name': 'Movie'}),
+            json.dumps({'name': 'Documentary'}),
+        ]), encoding='utf-8')
+
+        original_bulk_insert = CategoryDjangoRepository.bulk_insert
+
+        def bulk_insert(repo, entities):
+            if entities[-1].name == 'Documentary':
+                raise IntegrityError('CHECK constraint failed: name')
+            original_bulk_insert(repo, entities)
+        monkeypatch.setattr(CategoryDjangoRepository, 'bulk_insert', bulk_insert)
+
+        output = self._call(str(file))
+
+        assert 'Done: 2 rows read, 1 imported, 1 rejected' in output
+        rejects_file = tmp_path / 'categories.jsonl.rejects.jsonl'
+        rejects = [json.loads(line) for line in rejects_file.read_text().splitlines()]
+        assert rejects[0]['errors'] == {'non_field_errors': ['CHECK constraint failed: name']}
+
+    def test_upsert_rows_with_existing_ids(self, tmp_path: Path):
+        file = tmp_path / 'categories.jsonl'
+        existing_id = 'af46842e-027d-4c91-b259-3a3642144ba4'
+        file.write_text('\n'.join([
+            json.dumps({'id': existing_id, 'name': 'Documentary'}),
+            json.dumps({'id': existing_id, 'name': 'Documentary again', 'is_active': False}),
+        ]), encoding='utf-8')
+
+        output = self._call(str(file), upsert=True)
+
+        assert 'Done: 2 rows read, 2 imported, 0 rejected' in output
+        model = CategoryModel.objects.get(pk=existing_id)
+        assert model.name == 'Documentary again'
+        assert model.is_active is False
+
+    def test_emit_events(self, tmp_path: Path):
+        file = tmp_path / 'categories.jsonl'
+        file.write_text('\n'.join([
+            json.dumps({'name': 'Movie'}),
+            json.dumps({'name': 'Documentary'}),
+        ]), encoding='utf-8')
+
+        self._call(str(file))
+        assert OutboxEventModel.objects.count() == 0
+
+        self._call(str(file), emit_events=True)
+        assert list(OutboxEventModel.objects.values_list('event_type', flat=True)) == [
+            'CategoryCreated', 'CategoryCreated'
+        ]
+
+        self._call(str(file), emit_events=True, upsert=True)
+        assert OutboxEventModel.objects.filter(event_type='CategoryUpdated').count() == 2
+
+    def test_resume_from_checkpoint(self, tmp_path: Path):
+        file = tmp_path / 'categories.jsonl'
+        file.write_text('\n'.join(
+            json.dumps({'name': f'Movie {i}'}) for i in range(5)
+        ), encoding='utf-8')
+        checkpoint = tmp_path / 'categories.jsonl.checkpoint.json'
+        checkpoint.write_text(json.dumps(
+            {'file': str(file.resolve()), 'rows': 3}), encoding='utf-8')
+
+        output = self._call(str(file), resume=True)
+
+        assert 'Done: 2 rows read, 2 imported, 0 rejected' in output
+        assert sorted(CategoryModel.objects.values_list('name', flat=True)) == [
+            'Movie 3', 'Movie 4'
+        ]
+        assert json.loads(checkpoint.read_text())['rows'] == 5
+
+    def test_invalid_arguments(self, tmp_path: Path):
+        with pytest.raises(CommandError, match='does not exist'):
+            self._call(str(tmp_path / 'missing.csv'))
+
+        file = tmp_path / 'categories.txt'
+        file.write_text('name\nMovie\n', encoding='utf-8')
+        with pytest.raises(CommandError, match='use --format'):
+            self._call(str(file))
+
+        self._call(str(file), format='csv')
+        assert CategoryModel.objects.count() == 1
+
+        checkpoint = tmp_path / 'other.checkpoint.json'
+        checkpoint.write_text(json.dumps(
+            {'file': '/another/file.csv', 'rows': 1}), encoding='utf-8')
+        with pytest.raises(CommandError, match='belongs to another file'):
+            self._call(str(file), format='csv', checkpoint=str(checkpoint), resume=True)
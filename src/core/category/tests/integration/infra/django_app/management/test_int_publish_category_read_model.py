@@ -0,0 +1,48 @@
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.core.management.base import CommandError
+
+from core.category.infra.django_app.repositories import CategoryDjangoRepository
+from core.category.infra.in_memory.shared import CategorySharedRepository, SharedCategoryStore
+from core.category.infra.in_memory.snapshot import CategorySnapshotStore
+from core.category.infra.fixtures import CategoryDatasetFixture
+
+
+@pytest.mark.django_db
+class TestPublishCategoryReadModelCommandInt:
+
+    def _call(self, *args, **options) -> str:
+        out = StringIO()
+        call_command('publish_category_read_model', *args, stdout=out, **options)
+        return out.getvalue()
+
+    def test_publish_from_the_database(self, tmp_path):
+        CategoryDatasetFixture(seed=1).populate_table(25)
+
+        output = self._call(str(tmp_path), batch_size=10)
+
+        assert 'Done: categories-00000001.columns is the current generation' in output
+        repo = CategorySharedRepository(SharedCategoryStore(tmp_path))
+        assert sorted(repo.find_all(), key=lambda category: category.id) == \
+            sorted(CategoryDjangoRepository().find_all(), key=lambda category: category.id)
+
+    def test_publish_from_a_snapshot(self, tmp_path):
+        snapshot_store = CategorySnapshotStore(tmp_path / 'snapshot')
+        snapshot_repo = snapshot_store.load()
+        snapshot_repo.bulk_insert(list(CategoryDatasetFixture(seed=2).categories(5)))
+        snapshot_store.checkpoint(snapshot_repo)
+
+        self._call(str(tmp_path / 'read_model'), from_snapshot=str(tmp_path / 'snapshot'))
+        self._call(str(tmp_path / 'read_model'), from_snapshot=str(tmp_path / 'snapshot'), keep=1)
+
+        store = SharedCategoryStore(tmp_path / 'read_model')
+        assert [path.name for path in store.generations()] == ['categories-00000002.columns']
+        assert CategorySharedRepository(store).find_all() == snapshot_repo.find_all()
+
+    def test_invalid_options(self, tmp_path):
+        with pytest.raises(CommandError, match='--batch-size must be greater than 0'):
+            self._call(str(tmp_path), batch_size=0)
+        with pytest.raises(CommandError, match='--keep must be greater than 0'):
+            self._call(str(tmp_path), keep=0)
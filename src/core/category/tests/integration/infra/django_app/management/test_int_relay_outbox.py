@@ -0,0 +1,69 @@
+import json
+from io import StringIO
+from unittest import mock
+
+import pytest
+from django.core.management import call_command
+from django.core.management.base import CommandError
+
+from core.category.domain.entities import Category
+from core.category.infra.django_app.models import OutboxEventModel
+from core.category.infra.django_app.repositories import CategoryDjangoRepository
+
+
+@pytest.mark.django_db
+class TestRelayOutboxCommandInt:
+
+    def _call(self, *args, **options) -> str:
+        out = StringIO()
+        call_command('relay_outbox', *args, stdout=out, stderr=StringIO(), **options)
+        return out.getvalue()
+
+    def test_relay_once(self):
+        repo = CategoryDjangoRepository()
+        for index in range(5):
+            repo.insert(Category.create(name=f'Movie {index}'))
+
+        output = self._call(once=True, batch_size=2)
+
+        events = [json.loads(line) for line in output.splitlines()]
+        assert [event['payload']['name'] for event in events] == [
+            f'Movie {index}' for index in range(5)
+        ]
+        assert not OutboxEventModel.objects.filter(published_at__isnull=True).exists()
+        assert self._call(once=True) == ''
+
+    def test_output_file_and_prune(self, tmp_path):
+        CategoryDjangoRepository().insert(Category.create(name='Movie'))
+        output = tmp_path / 'events.jsonl'
+
+        self._call(once=True, output=output, prune_after=-1)
+
+        assert len(output.read_text(encoding='utf-8').splitlines()) == 1
+        assert OutboxEventModel.objects.count() == 0
+
+    def test_prunes_while_polling(self):
+        repo = CategoryDjangoRepository()
+        repo.insert(Category.create(name='Movie'))
+        stderr = StringIO()
+
+        def sleep(_):
+            # a write between two polls, then the relay is stopped
+            if OutboxEventModel.objects.count() == 0 and sleep.polls == 0:
+                sleep.polls += 1
+                repo.insert(Category.create(name='Documentary'))
+                return
+            raise KeyboardInterrupt()
+        sleep.polls = 0
+
+        with mock.patch('time.sleep', sleep):
+            call_command(
+                'relay_outbox', stdout=StringIO(), stderr=stderr, prune_after=-1, prune_interval=0)
+
+        # pruned after the first poll, before the second and at exit
+        assert stderr.getvalue().count('published events pruned') == 3
+        assert OutboxEventModel.objects.count() == 0
+
+    def test_invalid_options(self):
+        with pytest.raises(CommandError, match='--batch-size must be greater than 0'):
+            self._call(once=True, batch_size=0)
@@ -0,0 +1,44 @@
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.core.management.base import CommandError
+
+from core.category.infra.django_app.models import CategoryModel
+from core.category.infra.fixtures import CategoryDatasetFixture
+
+
+@pytest.mark.django_db
+class TestSeedCategoriesCommandInt:
+
+    def _call(self, *args, **options) -> str:
+        out = StringIO()
+        call_command('seed_categories', *args, stdout=out, **options)
+        return out.getvalue()
+
+    def test_seed(self):
+        output = self._call('25', seed=3, batch_size=10)
+
+        assert CategoryModel.objects.count() == 25
+        expected_ids = {row['id'] for row in CategoryDatasetFixture(seed=3).rows(25)}
+        assert set(
+            str(pk) for pk in CategoryModel.objects.values_list('id', flat=True)
+        ) == expected_ids
+        assert '10 categories inserted' in output
+        assert '20 categories inserted' in output
+        assert 'Done: 25 categories seeded with seed 3' in output
+
+    def test_truncate(self):
+        self._call('5', seed=1)
+        self._call('5', seed=2, truncate=True)
+
+        expected_ids = {row['id'] for row in CategoryDatasetFixture(seed=2).rows(5)}
+        assert set(
+            str(pk) for pk in CategoryModel.objects.values_list('id', flat=True)
+        ) == expected_ids
+
+    def test_invalid_options(self):
+        with pytest.raises(CommandError, match='count must not be negative'):
+            self._call('-1')
+        with pytest.raises(CommandError, match='--batch-size must be greater than 0'):
+            self._call('1', batch_size=0)
@@ -0,0 +1,35 @@
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.core.management.base import CommandError
+
+from core.category.infra.django_app.repositories import CategoryDjangoRepository
+from core.category.infra.in_memory.snapshot import CategorySnapshotStore
+from core.category.infra.fixtures import CategoryDatasetFixture
+
+
+@pytest.mark.django_db
+class TestSnapshotCategoriesCommandInt:
+
+    def _call(self, *args, **options) -> str:
+        out = StringIO()
+        call_command('snapshot_categories', *args, stdout=out, **options)
+        return out.getvalue()
+
+    def test_snapshot(self, tmp_path):
+        CategoryDatasetFixture(seed=1).populate_table(25)
+        store = CategorySnapshotStore(tmp_path)
+        store.log.path.write_bytes(b'obsolete')
+
+        output = self._call(str(tmp_path), batch_size=10)
+
+        assert 'Done: 25 categories' in output
+        assert store.log.path.read_bytes() == b''
+        repo = store.load()
+        assert sorted(repo.find_all(), key=lambda category: category.id) == \
+            sorted(CategoryDjangoRepository().find_all(), key=lambda category: category.id)
+
+    def test_invalid_options(self, tmp_path):
+        with pytest.raises(CommandError, match='--batch-size must be greater than 0'):
+            self._call(str(tmp_path), batch_size=0)
@@ -0,0 +1,125 @@
+# pylint: disable=unexpected-keyword-arg,no-member
+
+import datetime
+import unittest
+from asgiref.sync import async_to_sync
+from model_bakery import baker
+from model_bakery.recipe import seq
+import pytest
+from core.__seedwork.domain.exceptions import NotFoundException
+from core.category.domain.entities import Category
+from core.category.domain.repositories import CategoryAsyncRepository
+from core.category.infra.django_app.mappers import CategoryModelMapper
+from core.category.infra.django_app.models import CategoryModel
+from core.category.infra.django_app.repositories import CategoryDjangoAsyncRepository
+
+
+async def _collect(iterator):
+    return [item async for item in iterator]
+
+
+@pytest.mark.django_db
+class TestCategoryDjangoAsyncRepositoryInt(unittest.TestCase):
+
+    repo: CategoryDjangoAsyncRepository
+
+    def setUp(self):
+        self.repo = CategoryDjangoAsyncRepository()
+
+    def test_insert_and_find_by_id(self):
+        category = Category(name='Movie', description='some description')
+        async_to_sync(self.repo.insert)(category)
+
+        model = CategoryModel.objects.get(pk=category.id)
+        self.assertEqual(CategoryModelMapper.to_entity(model), category)
+
+        category_found = async_to_sync(self.repo.find_by_id)(category.id)
+        self.assertEqual(category_found, category)
+
+        category_found = async_to_sync(self.repo.find_by_id)(category.unique_entity_id)
+        self.assertEqual(category_found, category)
+
+    def test_throw_not_found_exception(self):
+        for method in [self.repo.find_by_id, self.repo.delete]:
+            with self.assertRaises(NotFoundException) as assert_error:
+                async_to_sync(method)('fake id')
+            self.assertEqual(
+                assert_error.exception.args[0], "Entity not found using ID 'fake id'")
+
+        entity = Category(name='Movie')
+        with self.assertRaises(NotFoundException):
+            async_to_sync(self.repo.update)(entity)
+
+    def test_find_all_and_iter_all(self):
+        models = baker.make(CategoryModel, _quantity=3)
+        expected = [CategoryModelMapper.to_entity(model) for model in models]
+
+        categories = async_to_sync(self.repo.find_all)()
+        self.assertCountEqual(categories, expected)
+
+        categories = async_to_sync(_collect)(self.repo.iter_all(batch_size=2))
+        self.assertEqual(
+            categories,
+            sorted(expected, key=lambda category: category.unique_entity_id.id)
+        )
+
+        with self.assertRaises(ValueError):
+            self.repo.iter_all(batch_size=0)
+
+    def test_update_and_delete(self):
+        category = Category(name='Movie')
+        async_to_sync(self.repo.insert)(category)
+
+        category.update(name='Movie changed', description='description changed')
+        async_to_sync(self.repo.update)(category)
+        self.assertEqual(CategoryModel.objects.get(pk=category.id).name, 'Movie changed')
+
+        async_to_sync(self.repo.delete)(category.id)
+        self.assertFalse(CategoryModel.objects.filter(pk=category.id).exists())
+
+    def test_search(self):
+        models = baker.make(
+            CategoryModel,
+            _quantity=4,
+            created_at=seq(datetime.datetime.now(), datetime.timedelta(days=1))
+        )
+        models.reverse()
+
+        search_result = async_to_sync(self.repo.search)(
+            CategoryAsyncRepository.SearchParams(page=2, per_page=3)
+        )
+        self.assertEqual(search_result, CategoryAsyncRepository.SearchResult(
+            items=[CategoryModelMapper.to_entity(models[3])],
+            total=4,
+            current_page=2,
+            per_page=3,
+            sort=None,
+            sort_dir=None,
+            filter=None
+        ))
+
+        search_result = async_to_sync(self.repo.search)(
+            CategoryAsyncRepository.SearchParams(
+                per_page=1, sort='name', sort_dir='desc', fields='name')
+        )
+        first = max(models, key=lambda model: model.name)
+        self.assertEqual(search_result.items, [
+            {'id': str(first.id), 'name': first.name}
+        ])
+        self.assertEqual(search_result.total, 4)
+        self.assertEqual(search_result.fields, ['id', 'name'])
+
+    def test_search_past_the_last_page(self):
+        baker.make(CategoryModel, _quantity=3)
+        search_result = async_to_sync(self.repo.search)(
+            CategoryAsyncRepository.SearchParams(page=3, per_page=2)
+        )
+        self.assertEqual(search_result, CategoryAsyncRepository.SearchResult(
+            items=[],
+            total=3,
+            current_page=3,
+            per_page=2,
+            sort=None,
+            sort_dir=None,
+            filter=None
+        ))
@@ -0,0 +1,70 @@
+import os
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+SRC = Path(__file__).parents[6]
+TRIGGERS = ['categories_fts_delete', 'categories_fts_insert', 'categories_fts_update']
+
+
+class TestCategoryMigrationsInt(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()  # pylint: disable=consider-using-with
+        self.addCleanup(self.tmp_dir.cleanup)
+        self.db_name = Path(self.tmp_dir.name) / 'db.sqlite3'
+
+    def migrate(self, *args: str):
+        subprocess.run(
+            [sys.executable, str(SRC / 'django_app' / 'manage.py'), 'migrate', *args, '--verbosity', '0'],
+            cwd=SRC, env={**os.environ, 'PYTHONPATH': str(SRC), 'DB_NAME': str(self.db_name)},
+            capture_output=True, check=True
+        )
+
+    def execute(self, *statements: str) -> list:
+        with sqlite3.connect(self.db_name) as db:
+            rows = [db.execute(statement).fetchall() for statement in statements]
+        db.close()
+        return rows[-1]
+
+    def triggers(self) -> list:
+        return [name for name, in self.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'trigger' ORDER BY name"
+        )]
+
+    def search(self, text: str) -> list:
+        return [name for name, in self.execute(
+            'SELECT categories.name FROM categories JOIN categories_fts '
+            f"ON categories_fts.rowid = categories.rowid WHERE categories_fts MATCH '{text}'"
+        )]
+
+    def test_migrate_backwards_keeps_the_full_text_index(self):
+        self.migrate('category')
+        self.assertEqual(self.triggers(), TRIGGERS)
+
+        self.migrate('category', '0003')
+        self.assertEqual(self.triggers(), TRIGGERS)
+        self.execute(
+            'INSERT INTO categories (id, name, description, is_active, created_at) '
+            "VALUES ('af46842e027d4c91b2593a3642144ba4', 'Filmes', NULL, 1, '2026-01-01')"
+        )
+        self.assertEqual(self.search('filmes'), ['Filmes'])
+
+        self.migrate('category')
+        self.assertEqual(self.triggers(), TRIGGERS)
+        self.assertEqual(self.search('filmes'), ['Filmes'])
+
+    def test_migrate_rebuilds_the_index_of_renumbered_rows(self):
+        self.migrate('category')
+        self.execute(
+            'INSERT INTO categories (id, name, description, is_active, created_at, updated_at) '
+            "VALUES ('af46842e027d4c91b2593a3642144ba4', 'Filmes', NULL, 1, '2026-01-01', '2026-01-01')",
+            'UPDATE categories SET rowid = rowid + 1000'
+        )
+        self.assertEqual(self.search('filmes'), [])
+
+        self.migrate('category')
+        self.assertEqual(self.search('filmes'), ['Filmes'])
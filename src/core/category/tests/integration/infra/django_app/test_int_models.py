@@ -16,7 +16,9 @@ class TestCategoryModelInt(unittest.TestCase):
         self.assertEqual(table_name, 'categories')
 
         fields_name = tuple(field.name for field in CategoryModel._meta.fields)
-        self.assertEqual(fields_name, ('id', 'name', 'description', 'is_active', 'created_at'))
+        self.assertEqual(
+            fields_name, ('id', 'name', 'description', 'is_active', 'created_at', 'updated_at')
+        )
 
         id_field: models.UUIDField = CategoryModel.id.field
         self.assertIsInstance(id_field, models.UUIDField)
@@ -47,6 +49,11 @@ class TestCategoryModelInt(unittest.TestCase):
         self.assertIsNone(created_at_field.db_column)
         self.assertFalse(created_at_field.null)
 
+        updated_at_field: models.DateTimeField = CategoryModel.updated_at.field
+        self.assertIsInstance(updated_at_field, models.DateTimeField)
+        self.assertFalse(updated_at_field.null)
+        self.assertIs(updated_at_field.default, timezone.now)
+
     def test_create(self):
 
         arrange = {
@@ -0,0 +1,189 @@
+# pylint: disable=unexpected-keyword-arg,no-member
+
+import datetime
+import io
+import json
+import unittest
+from uuid import UUID
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.db.models import F
+
+from core.__seedwork.domain.exceptions import NotFoundException
+from core.category.domain.entities import Category
+from core.category.infra.django_app.models import CategoryModel, OutboxEventModel
+from core.category.infra.django_app.outbox import (
+    CategoryDjangoChangeFeed,
+    EventPublisher,
+    JsonLinesPublisher,
+    OutboxRelay
+)
+from core.category.infra.django_app.repositories import (
+    CategoryDjangoAsyncRepository,
+    CategoryDjangoRepository
+)
+
+
+def outbox():
+    return list(OutboxEventModel.objects.order_by('sequence').values_list(
+        'event_type', 'aggregate_id'
+    ))
+
+
+@pytest.mark.django_db
+class TestOutboxInt(unittest.TestCase):
+
+    repo: CategoryDjangoRepository
+
+    def setUp(self):
+        self.repo = CategoryDjangoRepository()
+
+    def test_writes_append_their_events(self):
+        category = Category.create(name='Movie')
+        self.repo.insert(category)
+        self.assertEqual(category.events, [])
+
+        category.update('Documentary', None)
+        category.deactivate()
+        self.repo.update(category)
+        self.repo.delete(category.id)
+
+        self.assertEqual(outbox(), [
+            ('CategoryCreated', UUID(category.id)),
+            ('CategoryUpdated', UUID(category.id)),
+            ('CategoryDeactivated', UUID(category.id)),
+            ('CategoryDeleted', UUID(category.id)),
+        ])
+        event = OutboxEventModel.objects.get(event_type='CategoryUpdated')
+        self.assertEqual(event.aggregate_type, 'category')
+        self.assertEqual(event.payload, {
+            'name': 'Documentary',
+            'description': None,
+            'is_active': True,
+            'created_at': category.created_at.isoformat()
+        })
+        self.assertIsNone(event.published_at)
+
+    def test_entities_without_events_write_no_event(self):
+        category = Category(name='Movie')
+        self.repo.insert(category)
+        self.repo.update(category)
+        self.assertEqual(outbox(), [])
+
+    def test_bulk_writes(self):
+        categories = [Category.create(name=f'Movie {index}') for index in range(3)]
+        self.repo.bulk_insert(categories)
+        self.repo.bulk_upsert([Category.replace(
+            unique_entity_id=categories[0].unique_entity_id, name='Documentary'
+        )])
+
+        self.assertEqual(outbox(), [
+            *(('CategoryCreated', UUID(category.id)) for category in categories),
+            ('CategoryUpdated', UUID(categories[0].id)),
+        ])
+
+    def test_failed_write_leaves_no_event(self):
+        category = Category.create(name='Movie')
+        with self.assertRaises(NotFoundException):
+            self.repo.update(category)
+        with self.assertRaises(NotFoundException):
+            self.repo.delete(category.id)
+
+        self.assertEqual(outbox(), [])
+        # the events are kept for a retry
+        self.assertEqual(len(category.events), 1)
+
+    def test_async_writes(self):
+        repo = CategoryDjangoAsyncRepository()
+        category = Category.create(name='Movie')
+        async_to_sync(repo.insert)(category)
+        category.deactivate()
+        async_to_sync(repo.update)(category)
+        async_to_sync(repo.delete)(category.id)
+
+        self.assertEqual([event_type for event_type, _ in outbox()], [
+            'CategoryCreated', 'CategoryDeactivated', 'CategoryDeleted'
+        ])
+
+    def test_change_feed(self):
+        categories = [Category.create(name=f'Movie {index}') for index in range(3)]
+        for category in categories:
+            self.repo.insert(category)
+
+        feed = CategoryDjangoChangeFeed(safety_lag=0)
+        changes = feed.changes_since(0, 2)
+        self.assertEqual(
+            [change.aggregate_id for change in changes],
+            [category.id for category in categories[:2]]
+        )
+        self.assertEqual(changes[0].event_type, 'CategoryCreated')
+        self.assertEqual(changes[0].payload['name'], 'Movie 0')
+
+        changes = feed.changes_since(changes[-1].sequence, 2)
+        self.assertEqual([change.aggregate_id for change in changes], [categories[2].id])
+
+    def test_change_feed_stops_at_the_first_recent_event(self):
+        categories = [Category.create(name=f'Movie {index}') for index in range(3)]
+        for category in categories:
+            self.repo.insert(category)
+        # the second event may still have a transaction committing before it
+        OutboxEventModel.objects.exclude(aggregate_id=categories[1].id).update(
+            occurred_at=F('occurred_at') - datetime.timedelta(minutes=1))
+
+        feed = CategoryDjangoChangeFeed(safety_lag=5)
+        changes = feed.changes_since(0, 10)
+        self.assertEqual([change.aggregate_id for change in changes], [categories[0].id])
+        self.assertEqual(feed.changes_since(changes[-1].sequence, 10), [])
+
+        OutboxEventModel.objects.update(occurred_at=F('occurred_at') - datetime.timedelta(minutes=1))
+        self.assertEqual(
+            [change.aggregate_id for change in feed.changes_since(changes[-1].sequence, 10)],
+            [category.id for category in categories[1:]]
+        )
+
+
+class FailingPublisher(EventPublisher):
+
+    def publish(self, changes):
+        raise ConnectionError('sink unavailable')
+
+
+@pytest.mark.django_db
+class TestOutboxRelayInt(unittest.TestCase):
+
+    def setUp(self):
+        repo = CategoryDjangoRepository()
+        for index in range(3):
+            repo.insert(Category.create(name=f'Movie {index}'))
+
+    def test_relay_once(self):
+        stream = io.StringIO()
+        relay = OutboxRelay(JsonLinesPublisher(stream), batch_size=2)
+
+        self.assertEqual(relay.relay_once(), 2)
+        self.assertEqual(relay.relay_once(), 1)
+        self.assertEqual(relay.relay_once(), 0)
+
+        lines = [json.loads(line) for line in stream.getvalue().splitlines()]
+        self.assertEqual([line['payload']['name'] for line in lines], [
+            'Movie 0', 'Movie 1', 'Movie 2'
+        ])
+        self.assertEqual(lines[0]['event_type'], 'CategoryCreated')
+        self.assertFalse(OutboxEventModel.objects.filter(published_at__isnull=True).exists())
+
+    def test_failed_publish_is_retried(self):
+        with self.assertRaises(ConnectionError):
+            OutboxRelay(FailingPublisher()).relay_once()
+        self.assertEqual(OutboxEventModel.objects.filter(published_at__isnull=True).count(), 3)
+
+        self.assertEqual(OutboxRelay(JsonLinesPublisher(io.StringIO())).relay_once(), 3)
+
+    def test_prune(self):
+        relay = OutboxRelay(JsonLinesPublisher(io.StringIO()), batch_size=1)
+        relay.relay_once()
+
+        self.assertEqual(relay.prune(datetime.timedelta(hours=1)), 0)
+        self.assertEqual(relay.prune(datetime.timedelta(seconds=-1)), 1)
+        self.assertEqual(OutboxEventModel.objects.count(), 2)
+        self.assertEqual(CategoryModel.objects.count(), 3)
@@ -11,6 +11,8 @@ from core.category.infra.django_app.mappers import CategoryModelMapper
 from model_bakery import baker
 from model_bakery.recipe import seq
 import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from core.category.infra.django_app.repositories import CategoryDjangoRepository
 from core.category.infra.django_app.models import CategoryModel
 from core.category.domain.entities import Category
@@ -54,6 +56,20 @@ class TestCategoryDjangoRepositoryInt(unittest.TestCase):
         self.assertFalse(model.is_active)
         self.assertEqual(model.created_at, category.created_at)
 
+    def test_bulk_insert(self):
+        categories = [
+            Category(name='Movie'),
+            Category(name='Documentary', description='some description', is_active=False)
+        ]
+
+        with CaptureQueriesContext(connection) as queries:
+            self.repo.bulk_insert(categories)
+        self.assertEqual(len(queries), 1)
+
+        for category in categories:
+            model = CategoryModel.objects.get(pk=category.id)
+            self.assertEqual(CategoryModelMapper.to_entity(model), category)
+
     def test_throw_not_found_exception_in_find_by_id(self):
         with self.assertRaises(NotFoundException) as assert_error:
             self.repo.find_by_id('fake id')
@@ -96,6 +112,31 @@ class TestCategoryDjangoRepositoryInt(unittest.TestCase):
         self.assertEqual(
             categories[1], CategoryModelMapper.to_entity(models[1]))
 
+    def test_iter_all(self):
+        models = baker.make(CategoryModel, _quantity=5)
+        models.sort(key=lambda model: model.pk)
+
+        with CaptureQueriesContext(connection) as queries:
+            iterator = self.repo.iter_all(batch_size=2)
+            self.assertEqual(len(queries), 0)
+
+            categories = list(iterator)
+
+        self.assertEqual(len(queries), 3)
+        self.assertEqual(
+            categories,
+            [CategoryModelMapper.to_entity(model) for model in models]
+        )
+
+        CategoryModel.objects.all().delete()
+        self.assertEqual(list(self.repo.iter_all()), [])
+
+    def test_iter_all_with_invalid_batch_size(self):
+        with CaptureQueriesContext(connection) as queries, self.assertRaises(ValueError) as assert_error:
+            self.repo.iter_all(batch_size=0)
+        self.assertEqual(len(queries), 0)
+        self.assertEqual(assert_error.exception.args[0], 'batch_size must be greater than 0, got 0')
+
     def test_throw_not_found_exception_in_update(self):
         entity = Category(name='Movie')
         with self.assertRaises(NotFoundException) as assert_error:
@@ -118,6 +159,60 @@ class TestCategoryDjangoRepositoryInt(unittest.TestCase):
         self.assertTrue(model.is_active)
         self.assertEqual(model.created_at, category.created_at)
 
+    def test_upsert(self):
+        category = Category(name='Movie')
+        self.repo.upsert(category)
+        self.assertEqual(self.repo.find_by_id(category.id), category)
+
+        category.update(name='Movie changed', description='description changed')
+        category.deactivate()
+        self.repo.upsert(category)
+
+        self.assertEqual(CategoryModel.objects.count(), 1)
+        self.assertEqual(self.repo.find_by_id(category.id), category)
+
+    def test_bulk_upsert(self):
+        existing = Category(name='Movie')
+        self.repo.insert(existing)
+
+        existing.update(name='Movie changed', description=None)
+        categories = [existing, Category(name='Documentary')]
+
+        with CaptureQueriesContext(connection) as queries:
+            self.repo.bulk_upsert(categories)
+        writes = [query['sql'] for query in queries if 'SAVEPOINT' not in query['sql']]
+        # the upsert and the outbox row of the recorded CategoryUpdated
+        self.assertEqual(len(writes), 2)
+
+        self.assertEqual(CategoryModel.objects.count(), 2)
+        for category in categories:
+            self.assertEqual(self.repo.find_by_id(category.id), category)
+
+    def test_bulk_upsert_keeps_created_at(self):
+        existing = Category(name='Movie', created_at=timezone.now() - datetime.timedelta(days=10))
+        self.repo.insert(existing)
+
+        replaced = Category(
+            name='Movie changed', unique_entity_id=existing.unique_entity_id, created_at=timezone.now())
+        self.repo.bulk_upsert([replaced])
+
+        category = self.repo.find_by_id(existing.id)
+        self.assertEqual(category.name, 'Movie changed')
+        self.assertEqual(category.created_at, existing.created_at)
+
+    def test_bulk_upsert_with_repeated_ids(self):
+        first = Category(name='Movie')
+        last = Category(name='Movie again', unique_entity_id=first.unique_entity_id, is_active=False)
+        other = Category(name='Documentary')
+
+        self.repo.bulk_upsert([first, other, last])
+
+        self.assertEqual(CategoryModel.objects.count(), 2)
+        category = self.repo.find_by_id(first.id)
+        self.assertEqual(category.name, 'Movie again')
+        self.assertFalse(category.is_active)
+        self.assertEqual(category.created_at, last.created_at)
+
     def test_throw_not_found_exception_in_delete(self):
         with self.assertRaises(NotFoundException) as assert_error:
             self.repo.delete('fake id')
@@ -358,6 +453,19 @@ class TestCategoryDjangoRepositoryInt(unittest.TestCase):
                 f"The output using sort_dir desc on index {index} is different"
             )
 
+    def test_search_past_the_last_page(self):
+        baker.make(CategoryModel, _quantity=3)
+        search_output = self.repo.search(CategoryDjangoRepository.SearchParams(page=3, per_page=2))
+        self.assertEqual(search_output, CategoryDjangoRepository.SearchResult(
+            items=[],
+            total=3,
+            current_page=3,
+            per_page=2,
+            sort=None,
+            sort_dir=None,
+            filter=None
+        ))
+
     def test_search_applying_filter_sort_and_paginate(self):
         default_props = {
             'description': None,
@@ -430,3 +538,41 @@ class TestCategoryDjangoRepositoryInt(unittest.TestCase):
             sort_dir='asc',
             filter='TEST'
         ))
+
+    def test_search_applying_projection(self):
+        models = baker.make(
+            CategoryModel,
+            _quantity=3,
+            created_at=seq(datetime.datetime.now(), datetime.timedelta(days=1))
+        )
+        models.reverse()
+
+        with CaptureQueriesContext(connection) as queries:
+            search_result = self.repo.search(CategoryRepository.SearchParams(
+                per_page=2,
+                fields='name'
+            ))
+        self.assertNotIn('description', queries[-1]['sql'])
+        self.assertNotIn('created_at"', queries[-1]['sql'].split('FROM')[0])
+
+        self.assertEqual(search_result, CategoryRepository.SearchResult(
+            items=[
+                {'id': str(models[0].id), 'name': models[0].name},
+                {'id': str(models[1].id), 'name': models[1].name},
+            ],
+            total=3,
+            current_page=1,
+            per_page=2,
+            sort=None,
+            sort_dir=None,
+            filter=None,
+            fields=['id', 'name']
+        ))
+
+        search_result = self.repo.search(
+            CategoryRepository.SearchParams(fields='fake'))
+        self.assertEqual(
+            search_result.items,
+            [CategoryModelMapper.to_entity(model) for model in models]
+        )
+        self.assertIsNone(search_result.fields)
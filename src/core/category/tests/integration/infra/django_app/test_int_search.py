@@ -0,0 +1,143 @@
+# pylint: disable=unexpected-keyword-arg,no-member
+
+import time
+import unittest
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.db import connection
+
+from core.category.domain.entities import Category
+from core.category.domain.repositories import CategoryRepository
+from core.category.infra.django_app.models import CategoryModel
+from core.category.infra.django_app.repositories import (
+    CategoryDjangoAsyncRepository,
+    CategoryDjangoRepository
+)
+from core.category.infra.django_app.search import (
+    IContainsSearchBackend,
+    SqliteFullTextSearchBackend,
+    install_full_text_search,
+    rebuild_full_text_search,
+    search_backend
+)
+
+
+@pytest.mark.django_db
+class TestSqliteFullTextSearchInt(unittest.TestCase):
+
+    repo: CategoryDjangoRepository
+
+    def setUp(self):
+        # the tests run without migrations, which install the index
+        install_full_text_search(connection)
+        self.repo = CategoryDjangoRepository(search_backend=SqliteFullTextSearchBackend())
+        self.action = Category(name='Filmes de Ação', description='Explosões e perseguições')
+        self.comedy = Category(name='Comédia', description='Filmes para rir')
+        self.documentary = Category(name='Documentários', description=None)
+        self.repo.bulk_insert([self.action, self.comedy, self.documentary])
+
+    def search(self, **kwargs) -> CategoryRepository.SearchResult:
+        return self.repo.search(CategoryRepository.SearchParams(**kwargs))
+
+    def test_rank_is_sortable(self):
+        self.assertEqual(self.repo.sortable_fields, ['name', 'created_at', 'rank'])
+        self.assertEqual(
+            CategoryDjangoRepository().sortable_fields, ['name', 'created_at'])
+
+    def test_matches_name_and_description(self):
+        result = self.search(filter='filmes', sort='name')
+        self.assertEqual(result.items, [self.comedy, self.action])
+        self.assertEqual(result.total, 2)
+
+    def test_matches_word_prefixes_ignoring_case_and_accents(self):
+        self.assertEqual(self.search(filter='DOCUMENTARIO').items, [self.documentary])
+        self.assertEqual(self.search(filter='acao explos').items, [self.action])
+        self.assertEqual(self.search(filter='acao rir').items, [])
+        self.assertEqual(self.search(filter='"*()').items, [])
+
+    def test_sort_by_rank(self):
+        # a match in the name ranks before a match in the description
+        result = self.search(filter='filmes', sort='rank')
+        self.assertEqual(result.items, [self.action, self.comedy])
+
+        result = self.search(filter='filmes', sort='rank', sort_dir='desc')
+        self.assertEqual(result.items, [self.comedy, self.action])
+
+        result = self.search(filter='filmes', sort='rank', fields='id,name')
+        self.assertEqual(
+            result.items,
+            [{'id': self.action.id, 'name': self.action.name},
+             {'id': self.comedy.id, 'name': self.comedy.name}]
+        )
+
+    def test_rank_runs_the_match_once(self):
+        query = SqliteFullTextSearchBackend().filter(
+            CategoryModel.objects.all(), 'filmes', rank=True).order_by('rank')
+        sql, params = query.query.sql_with_params()
+        with connection.cursor() as cursor:
+            cursor.execute(f'EXPLAIN QUERY PLAN {sql}', params)
+            plan = [row[-1] for row in cursor.fetchall()]
+        self.assertEqual(len([step for step in plan if 'categories_fts VIRTUAL TABLE' in step]), 1)
+        self.assertFalse([step for step in plan if 'CORRELATED' in step])
+
+    def test_ranked_search_stays_close_to_unranked(self):
+        self.repo.bulk_insert([
+            Category(name=f'Filme {index}', description='filmes de aventura') for index in range(5000)
+        ])
+
+        def duration(**kwargs):
+            start = time.perf_counter()
+            for _ in range(3):
+                self.search(filter='filmes', per_page=15, **kwargs)
+            return time.perf_counter() - start
+
+        duration(sort='rank')
+        # a MATCH per ranked row took hundreds of times longer
+        self.assertLess(duration(sort='rank'), 3 * duration() + 0.05)
+
+    def test_sort_by_rank_without_filter(self):
+        result = self.search(sort='rank')
+        self.assertEqual(result.items, [self.documentary, self.comedy, self.action])
+
+    def test_index_follows_writes(self):
+        self.action.update('Aventura', 'Filmes de aventura')
+        self.repo.update(self.action)
+        self.repo.delete(self.comedy.id)
+        self.documentary.update('Séries', None)
+        self.repo.upsert(self.documentary)
+
+        self.assertEqual(self.search(filter='aventura').items, [self.action])
+        self.assertEqual(self.search(filter='rir').items, [])
+        self.assertEqual(self.search(filter='documentario').items, [])
+        self.assertEqual(self.search(filter='series').total, 1)
+
+    def test_async_search(self):
+        repo = CategoryDjangoAsyncRepository(search_backend=SqliteFullTextSearchBackend())
+        result = async_to_sync(repo.search)(
+            CategoryRepository.SearchParams(filter='filmes', sort='rank'))
+        self.assertEqual(result.items, [self.action, self.comedy])
+        self.assertEqual(result.total, 2)
+
+    def test_install_indexes_existing_rows(self):
+        install_full_text_search(connection)
+        self.assertEqual(self.search(filter='comedia').items, [self.comedy])
+
+    def test_rebuild_after_the_rowids_change(self):
+        # like a VACUUM or a table rebuild, which don't go through the triggers
+        with connection.cursor() as cursor:
+            cursor.execute('UPDATE categories SET rowid = rowid + 1000')
+        self.assertEqual(self.search(filter='comedia').items, [])
+
+        rebuild_full_text_search(connection)
+        self.assertEqual(self.search(filter='comedia').items, [self.comedy])
+        self.assertEqual(self.search(filter='filmes', sort='rank').items, [self.action, self.comedy])
+
+
+class TestSearchBackendInt(unittest.TestCase):
+
+    def test_search_backend(self):
+        self.assertIsInstance(search_backend('icontains'), IContainsSearchBackend)
+        self.assertIsInstance(search_backend('fulltext'), SqliteFullTextSearchBackend)
+        with self.assertRaises(ValueError):
+            search_backend('elasticsearch')
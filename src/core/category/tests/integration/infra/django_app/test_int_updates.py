@@ -0,0 +1,113 @@
+# pylint: disable=unexpected-keyword-arg,no-member
+
+import datetime
+import unittest
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from core.category.domain.entities import Category
+from core.category.infra.django_app.models import CategoryModel, CategoryTombstoneModel
+from core.category.infra.django_app.repositories import (
+    CategoryDjangoRepository,
+    CategoryDjangoUpdatesFeed
+)
+
+EPOCH = datetime.datetime(1970, 1, 1, tzinfo=datetime.timezone.utc)
+
+
+@pytest.mark.django_db
+class TestCategoryDjangoUpdatesFeedInt(unittest.TestCase):
+
+    repo: CategoryDjangoRepository
+    feed: CategoryDjangoUpdatesFeed
+
+    def setUp(self):
+        self.repo = CategoryDjangoRepository()
+        # the writes of the tests are served right away
+        self.feed = CategoryDjangoUpdatesFeed(safety_lag=0)
+
+    def test_writes_bump_updated_at(self):
+        category = Category(name='Movie')
+        self.repo.insert(category)
+        inserted_at = CategoryModel.objects.get().updated_at
+
+        category.update('Documentary', None)
+        self.repo.update(category)
+        updated_at = CategoryModel.objects.get().updated_at
+        self.assertGreater(updated_at, inserted_at)
+
+        self.repo.upsert(category)
+        self.assertGreater(CategoryModel.objects.get().updated_at, updated_at)
+
+    def test_delete_leaves_a_tombstone(self):
+        category = Category(name='Movie')
+        self.repo.insert(category)
+        self.repo.delete(category.id)
+
+        [update] = self.feed.updated_since(EPOCH, None, 10)
+        self.assertEqual(update.id, category.id)
+        self.assertTrue(update.deleted)
+        self.assertEqual(update.updated_at, CategoryTombstoneModel.objects.get().deleted_at)
+
+        # deleted again after an upsert brought it back
+        self.repo.upsert(category)
+        self.repo.delete(category.id)
+        self.assertEqual(CategoryTombstoneModel.objects.count(), 1)
+
+    def test_updated_since(self):
+        categories = [Category(name=f'Movie {index}') for index in range(3)]
+        for category in categories:
+            self.repo.insert(category)
+        since = timezone.now()
+        categories[0].update('Documentary', None)
+        self.repo.update(categories[0])
+        self.repo.delete(categories[1].id)
+
+        updates = self.feed.updated_since(since, None, 10)
+        self.assertEqual(
+            [(update.id, update.deleted) for update in updates],
+            [(categories[0].id, False), (categories[1].id, True)]
+        )
+        self.assertEqual(updates[0].category, categories[0])
+        self.assertIsNone(updates[1].category)
+
+        self.assertEqual(len(self.feed.updated_since(EPOCH, None, 10)), 3)
+
+    def test_recent_writes_wait_for_the_safety_lag(self):
+        old, recent = Category(name='Old'), Category(name='Recent')
+        self.repo.bulk_insert([old, recent])
+        self.repo.delete(recent.id)
+        CategoryModel.objects.filter(pk=old.id).update(
+            updated_at=timezone.now() - datetime.timedelta(seconds=10))
+
+        feed = CategoryDjangoUpdatesFeed(safety_lag=5)
+        self.assertEqual([update.id for update in feed.updated_since(EPOCH, None, 10)], [old.id])
+
+    def test_keyset_pagination_over_equal_timestamps(self):
+        now = timezone.now()
+        categories = [Category(name=f'Movie {index}') for index in range(5)]
+        self.repo.bulk_insert(categories)
+        self.repo.delete(categories[2].id)
+        CategoryModel.objects.update(updated_at=now)
+        CategoryTombstoneModel.objects.update(deleted_at=now)
+
+        seen = []
+        since, after_id = EPOCH, None
+        while updates := self.feed.updated_since(since, after_id, 2):
+            seen.extend(update.id for update in updates)
+            since, after_id = updates[-1].updated_at, updates[-1].id
+
+        self.assertEqual(seen, sorted(category.id for category in categories))
+
+    def test_uses_the_keyset_index(self):
+        with CaptureQueriesContext(connection) as queries:
+            self.feed.updated_since(timezone.now(), '11ed3535-7af7-4d9d-80a7-245a2121954c', 10)
+        self.assertEqual(len(queries), 2)
+
+        with connection.cursor() as cursor:
+            cursor.execute(f'EXPLAIN QUERY PLAN {queries[0]["sql"]}')
+            plan = ' '.join(str(row) for row in cursor.fetchall())
+        self.assertIn('categories_updated_idx', plan)
@@ -1,21 +1,33 @@
 # pylint: disable=no-member,protected-access
 
 from datetime import datetime, timedelta, timezone
+import sys
+import threading
 from typing import Optional
 import unittest
 from unittest.mock import patch
 from core.__seedwork.application.dto import PaginationOutput, PaginationOutputMapper, SearchInput
 from core.__seedwork.application.use_cases import UseCase
-from core.__seedwork.domain.exceptions import NotFoundException
+from core.__seedwork.domain.exceptions import EntityValidationException, InvalidUuidException, NotFoundException
 from core.category.application.dto import CategoryOutPutMapper, CategoryOutput
 from core.category.application.use_cases import (
     CreateCategoryUseCase,
     DeleteCategoryUseCase,
     GetCategoryUseCase,
     ListCategoriesUseCase,
-    UpdateCategoryUseCase
+    ListCategoryChangesUseCase,
+    ListCategoryUpdatesUseCase,
+    UpdateCategoryUseCase,
+    UpsertCategoryUseCase
 )
 from core.category.domain.entities import Category
+from core.category.domain.events import CategoryCreated, CategoryUpdated
+from core.category.domain.repositories import (
+    CategoryChange,
+    CategoryChangeFeed,
+    CategoryUpdate,
+    CategoryUpdatesFeed
+)
 
 from core.category.infra.in_memory.repositories import CategoryInMemoryRepository
 
@@ -225,6 +237,37 @@ class TestListCategoriesUseCase(unittest.TestCase):
             )
         )
 
+    def test_to_output_when_result_is_projected(self):
+        result = CategoryInMemoryRepository.SearchResult(
+            items=[{'id': 'fake id', 'name': 'Movie'}],
+            total=1,
+            current_page=1,
+            per_page=2,
+            fields=['id', 'name']
+        )
+        output = self.use_case._ListCategoriesUseCase__to_output(result)
+        self.assertEqual(output, ListCategoriesUseCase.Output(
+            items=[{'id': 'fake id', 'name': 'Movie'}],
+            total=1,
+            current_page=1,
+            last_page=1,
+            per_page=2
+        ))
+
+    def test_execute_using_fields(self):
+        entity = Category(name='Movie', description='some description')
+        self.category_repo.items = [entity]
+
+        output = self.use_case.execute(
+            ListCategoriesUseCase.Input(fields=['name', 'is_active']))
+        self.assertEqual(output, ListCategoriesUseCase.Output(
+            items=[{'id': entity.id, 'name': 'Movie', 'is_active': True}],
+            total=1,
+            current_page=1,
+            last_page=1,
+            per_page=15
+        ))
+
     def test_execute_using_empty_search_params(self):
         self.category_repo.items = [
             Category(name='teste 1'),
@@ -493,6 +536,148 @@ class TestUpdateCategoryUseCase(unittest.TestCase):
                 )
 
 
+class TestUpdateCategoryUseCaseThreadSafeStress(unittest.TestCase):
+
+    def setUp(self) -> None:
+        # switch threads as often as possible to interleave reads and writes
+        self.switch_interval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)
+
+    def tearDown(self) -> None:
+        sys.setswitchinterval(self.switch_interval)
+
+    def test_rejected_updates_are_never_seen(self):
+        categories = [Category(name=f'Movie {index:03}') for index in range(120)]
+        repo = CategoryInMemoryRepository(items=list(categories), thread_safe=True)
+        use_case = UpdateCategoryUseCase(repo)
+        too_long = 'x' * 300
+        errors = []
+        writing = threading.Event()
+
+        def run(target):
+            def wrapper(*args):
+                try:
+                    target(*args)
+                except Exception as exception:  # pylint: disable=broad-except
+                    errors.append(exception)
+            return wrapper
+
+        def write(worker):
+            for category in categories[worker::4]:
+                for attempt in range(3):
+                    # the name is set on the entity before the validation rejects it
+                    with self.assertRaises(EntityValidationException):
+                        use_case.execute(UpdateCategoryUseCase.Input(
+                            id=category.id, name=too_long, is_active=False))
+                    use_case.execute(UpdateCategoryUseCase.Input(
+                        id=category.id, name=f'Updated {attempt} {category.name}'))
+
+        def read():
+            while writing.is_set():
+                for category in repo.find_all():
+                    assert category.name != too_long and category.is_active, category
+                for category in categories[::10]:
+                    found = repo.find_by_id(category.id)
+                    assert found.name != too_long and found.is_active, found
+
+        writing.set()
+        readers = [threading.Thread(target=run(read)) for _ in range(4)]
+        writers = [threading.Thread(target=run(write), args=(worker,)) for worker in range(4)]
+        for thread in readers + writers:
+            thread.start()
+        for thread in writers:
+            thread.join()
+        writing.clear()
+        for thread in readers:
+            thread.join()
+
+        self.assertEqual(errors, [])
+        self.assertEqual(
+            [category.name for category in repo.find_all()],
+            [f'Updated 2 {category.name}' for category in categories]
+        )
+        # the categories given to the repository are not changed either
+        self.assertEqual(categories[0].name, 'Movie 000')
+
+
+class TestUpsertCategoryUseCase(unittest.TestCase):
+
+    use_case: UpsertCategoryUseCase
+    category_repo: CategoryInMemoryRepository
+
+    def setUp(self) -> None:
+        self.category_repo = CategoryInMemoryRepository()
+        self.use_case = UpsertCategoryUseCase(self.category_repo)
+
+    def test_instance_use_case(self):
+        self.assertIsInstance(self.use_case, UseCase)
+
+    def test_input(self):
+        self.assertEqual(UpsertCategoryUseCase.Input.__annotations__, {
+            'id': str,
+            'name': str,
+            'description': Optional[str],
+            'is_active': Optional[bool]
+        })
+
+        description_field = UpsertCategoryUseCase.Input.__dataclass_fields__[
+            'description']
+        self.assertEqual(description_field.default,
+                         Category.get_field('description').default)
+
+        is_active_field = UpsertCategoryUseCase.Input.__dataclass_fields__[
+            'is_active']
+        self.assertEqual(is_active_field.default,
+                         Category.get_field('is_active').default)
+
+    def test_output(self):
+        self.assertTrue(issubclass(
+            UpsertCategoryUseCase.Output, CategoryOutput
+        ))
+
+    def test_raise_exception_when_id_is_invalid(self):
+        request = UpsertCategoryUseCase.Input(id='fake id', name='test')
+        with self.assertRaises(InvalidUuidException):
+            self.use_case.execute(request)
+
+    def test_execute(self):
+        with patch.object(
+            self.category_repo,
+            'upsert',
+            wraps=self.category_repo.upsert
+        ) as spy_upsert:
+            request = UpsertCategoryUseCase.Input(
+                id='af46842e-027d-4c91-b259-3a3642144ba4',
+                name='test',
+            )
+            response = self.use_case.execute(request)
+            spy_upsert.assert_called_once()
+            self.assertEqual(len(self.category_repo.items), 1)
+            self.assertEqual(response, UpsertCategoryUseCase.Output(
+                id='af46842e-027d-4c91-b259-3a3642144ba4',
+                name='test',
+                description=None,
+                is_active=True,
+                created_at=self.category_repo.items[0].created_at
+            ))
+
+            request = UpsertCategoryUseCase.Input(
+                id='af46842e-027d-4c91-b259-3a3642144ba4',
+                name='test changed',
+                description='some description',
+                is_active=False
+            )
+            response = self.use_case.execute(request)
+            self.assertEqual(len(self.category_repo.items), 1)
+            self.assertEqual(response, UpsertCategoryUseCase.Output(
+                id='af46842e-027d-4c91-b259-3a3642144ba4',
+                name='test changed',
+                description='some description',
+                is_active=False,
+                created_at=self.category_repo.items[0].created_at
+            ))
+
+
 class TestDeleteCategoryUseCase(unittest.TestCase):
 
     use_case: DeleteCategoryUseCase
@@ -531,3 +716,152 @@ class TestDeleteCategoryUseCase(unittest.TestCase):
             self.use_case.execute(request)
             spy_delete.assert_called_once()
             self.assertEqual(self.category_repo.items, [])
+
+
+class StubChangeFeed(CategoryChangeFeed):
+
+    def __init__(self, count: int):
+        self.changes = [
+            CategoryChange(
+                sequence=sequence,
+                event_type='CategoryCreated',
+                aggregate_id=f'id {sequence}',
+                occurred_at=datetime(2020, 1, 1, tzinfo=timezone.utc),
+                payload={'name': f'Movie {sequence}'}
+            )
+            for sequence in range(1, count + 1)
+        ]
+
+    def changes_since(self, since: int, limit: int):
+        return [change for change in self.changes if change.sequence > since][:limit]
+
+
+class TestListCategoryChangesUseCase(unittest.TestCase):
+
+    def test_execute(self):
+        use_case = ListCategoryChangesUseCase(StubChangeFeed(5))
+
+        output = use_case.execute(ListCategoryChangesUseCase.Input(since=1, limit=2))
+        self.assertEqual([item.sequence for item in output.items], [2, 3])
+        self.assertEqual(output.items[0], ListCategoryChangesUseCase.Change(
+            sequence=2,
+            event_type='CategoryCreated',
+            aggregate_id='id 2',
+            occurred_at=datetime(2020, 1, 1, tzinfo=timezone.utc),
+            payload={'name': 'Movie 2'}
+        ))
+        self.assertEqual(output.next_since, 3)
+        self.assertTrue(output.has_more)
+
+        output = use_case.execute(ListCategoryChangesUseCase.Input(since=output.next_since))
+        self.assertEqual([item.sequence for item in output.items], [4, 5])
+        self.assertEqual(output.next_since, 5)
+        self.assertFalse(output.has_more)
+
+        output = use_case.execute(ListCategoryChangesUseCase.Input(since=5))
+        self.assertEqual(output.items, [])
+        self.assertEqual(output.next_since, 5)
+        self.assertFalse(output.has_more)
+
+    def test_normalize_input(self):
+        use_case = ListCategoryChangesUseCase(StubChangeFeed(2000))
+
+        for since, limit, expected_first, expected_count in [
+            ('3', '2', 4, 2),
+            ('fake', 'fake', 1, 100),
+            (-1, 0, 1, 1),
+            (None, 5000, 1, ListCategoryChangesUseCase.max_limit),
+        ]:
+            output = use_case.execute(ListCategoryChangesUseCase.Input(since=since, limit=limit))
+            self.assertEqual(output.items[0].sequence, expected_first)
+            self.assertEqual(len(output.items), expected_count)
+
+
+class EventRecordingRepository(CategoryInMemoryRepository):
+    """Keeps the events of the written entities, the in-memory writes drop
+    them."""
+
+    def __init__(self):
+        super().__init__()
+        self.events = []
+
+    def insert(self, entity):
+        self.events.extend(entity.events)
+        super().insert(entity)
+
+    def bulk_upsert(self, entities):
+        self.events.extend(event for entity in entities for event in entity.events)
+        super().bulk_upsert(entities)
+
+
+class TestUseCaseEventsUnit(unittest.TestCase):
+
+    def test_create_records_category_created(self):
+        repo = EventRecordingRepository()
+        output = CreateCategoryUseCase(repo).execute(CreateCategoryUseCase.Input(name='Movie'))
+        [event] = repo.events
+        self.assertIsInstance(event, CategoryCreated)
+        self.assertEqual(event.aggregate_id, output.id)
+        self.assertEqual(repo.find_by_id(output.id).events, [])
+
+    def test_upsert_records_category_updated(self):
+        repo = EventRecordingRepository()
+        output = UpsertCategoryUseCase(repo).execute(UpsertCategoryUseCase.Input(
+            id='af46842e-027d-4c91-b259-3a3642144ba4', name='Movie'
+        ))
+        [event] = repo.events
+        self.assertIsInstance(event, CategoryUpdated)
+        self.assertEqual(event.aggregate_id, output.id)
+
+
+class StubUpdatesFeed(CategoryUpdatesFeed):
+
+    def __init__(self, updates):
+        self.updates = updates
+        self.calls = []
+
+    def updated_since(self, since, after_id, limit):
+        self.calls.append((since, after_id, limit))
+        return self.updates[:limit]
+
+
+class TestListCategoryUpdatesUseCase(unittest.TestCase):
+
+    def test_execute(self):
+        category = Category(name='Movie')
+        at = datetime(2020, 1, 1, tzinfo=timezone.utc)
+        feed = StubUpdatesFeed([
+            CategoryUpdate(id=category.id, updated_at=at, category=category),
+            CategoryUpdate(id='deleted id', updated_at=at + timedelta(seconds=1), category=None),
+            CategoryUpdate(id='next id', updated_at=at + timedelta(seconds=2), category=None),
+        ])
+        use_case = ListCategoryUpdatesUseCase(feed)
+
+        output = use_case.execute(ListCategoryUpdatesUseCase.Input(updated_since=at, limit=2))
+        self.assertEqual(feed.calls, [(at, None, 3)])
+        self.assertEqual(output.items, [
+            ListCategoryUpdatesUseCase.Item(
+                id=category.id,
+                updated_at=at,
+                deleted=False,
+                name='Movie',
+                description=None,
+                is_active=True,
+                created_at=category.created_at
+            ),
+            ListCategoryUpdatesUseCase.Item(
+                id='deleted id', updated_at=at + timedelta(seconds=1), deleted=True
+            ),
+        ])
+        self.assertEqual(output.next_updated_since, at + timedelta(seconds=1))
+        self.assertEqual(output.next_after_id, 'deleted id')
+        self.assertTrue(output.has_more)
+
+    def test_execute_without_updates(self):
+        at = datetime(2020, 1, 1, tzinfo=timezone.utc)
+        output = ListCategoryUpdatesUseCase(StubUpdatesFeed([])).execute(
+            ListCategoryUpdatesUseCase.Input(updated_since=at, after_id='some id')
+        )
+        self.assertEqual(output, ListCategoryUpdatesUseCase.Output(
+            items=[], next_updated_since=at, next_after_id='some id', has_more=False
+        ))
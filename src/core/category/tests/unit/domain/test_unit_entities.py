@@ -5,6 +5,13 @@ from unittest.mock import patch
 
 
 from core.category.domain.entities import Category
+from core.category.domain.events import (
+    CategoryActivated,
+    CategoryCreated,
+    CategoryDeactivated,
+    CategoryDeleted,
+    CategoryUpdated
+)
 
 
 class TestCategoryUnit(unittest.TestCase):
@@ -12,6 +19,22 @@ class TestCategoryUnit(unittest.TestCase):
     def test_if_is_a_dataclass(self):
         self.assertTrue(is_dataclass(Category))
 
+    def test_restore_skips_validation(self):
+        with patch.object(Category, 'validate') as mock_validate_method:
+            created_at = datetime.now()
+            category = Category.restore(
+                name='Movie',
+                is_active=False,
+                created_at=created_at
+            )
+            mock_validate_method.assert_not_called()
+            self.assertEqual(category, Category(
+                unique_entity_id=category.unique_entity_id,
+                name='Movie',
+                is_active=False,
+                created_at=created_at
+            ))
+
     def test_constructor(self):
         with patch.object(Category, 'validate') as mock_validate_method:
             category = Category(name='Movie')
@@ -66,3 +89,56 @@ class TestCategoryUnit(unittest.TestCase):
             category = Category(name='Movie')
             category.deactivate()
             self.assertFalse(category.is_active)
+
+
+class TestCategoryEventsUnit(unittest.TestCase):
+
+    def test_constructor_records_nothing(self):
+        self.assertEqual(Category(name='Movie').events, [])
+
+    def test_create(self):
+        category = Category.create(name='Movie', description='some description')
+        [event] = category.events
+        self.assertIsInstance(event, CategoryCreated)
+        self.assertEqual(event.aggregate_id, category.id)
+        self.assertEqual(event.event_type, 'CategoryCreated')
+        self.assertEqual(event.payload(), {
+            'name': 'Movie',
+            'description': 'some description',
+            'is_active': True,
+            'created_at': category.created_at
+        })
+
+    def test_replace(self):
+        category = Category.replace(name='Movie')
+        self.assertEqual([type(event) for event in category.events], [CategoryUpdated])
+
+    def test_update_records_changes_only(self):
+        category = Category(name='Movie')
+        category.update('Movie', None)
+        self.assertEqual(category.events, [])
+
+        category.update('Documentary', None)
+        [event] = category.events
+        self.assertIsInstance(event, CategoryUpdated)
+        self.assertEqual(event.payload()['name'], 'Documentary')
+
+    def test_activate_and_deactivate_record_changes_only(self):
+        category = Category(name='Movie')
+        category.activate()
+        self.assertEqual(category.events, [])
+
+        category.deactivate()
+        category.deactivate()
+        category.activate()
+        self.assertEqual(
+            [type(event) for event in category.events],
+            [CategoryDeactivated, CategoryActivated]
+        )
+        self.assertFalse(category.events[0].payload()['is_active'])
+
+    def test_deleted(self):
+        event = Category.deleted('some id')
+        self.assertIsInstance(event, CategoryDeleted)
+        self.assertEqual(event.aggregate_id, 'some id')
+        self.assertEqual(event.payload(), {})
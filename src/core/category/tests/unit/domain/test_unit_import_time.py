@@ -0,0 +1,45 @@
+import os
+import re
+import subprocess
+import sys
+import unittest
+from pathlib import Path
+
+SRC_DIR = Path(__file__).resolve().parents[5]
+
+# cumulative import time budget of the pure domain modules, importing DRF
+# alone takes several times this
+BUDGET_MS = 150
+
+
+def import_module(module: str):
+    env = {key: value for key, value in os.environ.items() if key != 'DJANGO_SETTINGS_MODULE'}
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c',
+         f'import sys, {module}; print(" ".join(sorted(sys.modules)))'],
+        cwd=SRC_DIR, env=env, capture_output=True, text=True, check=True
+    )
+    match = re.search(
+        rf'^import time:\s+\d+ \|\s+(\d+) \| {re.escape(module)}$', result.stderr, re.MULTILINE)
+    return int(match.group(1)) / 1000, set(result.stdout.split())
+
+
+class TestImportTimeUnit(unittest.TestCase):
+
+    def test_domain_imports_without_django(self):
+        for module in [
+            'core.category.domain.entities',
+            'core.category.infra.in_memory.repositories',
+            'core.category.application.use_cases',
+        ]:
+            with self.subTest(module=module):
+                elapsed_ms, modules = import_module(module)
+                self.assertFalse({
+                    name for name in modules if name.split('.')[0] in ('django', 'rest_framework')
+                })
+                self.assertLess(elapsed_ms, BUDGET_MS)
+
+    def test_settings_do_not_import_the_application(self):
+        _, modules = import_module('django_app.settings')
+        self.assertNotIn('dependency_injector', modules)
+        self.assertFalse({name for name in modules if name.startswith('core.')})
@@ -6,6 +6,7 @@ from unittest import mock
 from core.category.application.dto import CategoryOutput
 from core.category.infra.serializers import CategorySerializer
 from core.category.tests.helpers import init_category_resource_all_none
+from django.urls import resolve
 from rest_framework.request import Request
 from rest_framework.test import APIRequestFactory
 from core.category.application.use_cases import (
@@ -15,7 +16,7 @@ from core.category.application.use_cases import (
     ListCategoriesUseCase,
     UpdateCategoryUseCase,
 )
-from core.category.infra.django_app.api import CategoryResource
+from core.category.infra.django_app.api import CategoryResource, resolve_once
 
 
 class StubCategorySerializer:
@@ -224,3 +225,30 @@ class TestCategoryResourceUnit(unittest.TestCase):
             id='c71404e4-1a1f-4587-9ff1-5e6b90589a81'
         ))
         self.assertEqual(response.status_code, 204)
+
+
+class TestResolveOnceUnit(unittest.TestCase):
+
+    def test_use_case_is_resolved_on_first_request_only(self):
+        mock_list_use_case = mock.Mock(ListCategoriesUseCase)
+        mock_list_use_case.execute.return_value = ListCategoriesUseCase.Output(
+            items=[], total=0, current_page=1, per_page=15, last_page=1
+        )
+        factory = mock.Mock(return_value=mock_list_use_case)
+        view = CategoryResource.as_view(**{
+            **init_category_resource_all_none(),
+            'list_use_case': resolve_once(factory)
+        })
+
+        for _ in range(3):
+            response = view(APIRequestFactory().get('/'))
+            self.assertEqual(response.status_code, 200)
+
+        factory.assert_called_once_with()
+        self.assertEqual(mock_list_use_case.execute.call_count, 3)
+
+    def test_urls_share_one_view(self):
+        self.assertIs(
+            resolve('/categories/').func,
+            resolve('/categories/c71404e4-1a1f-4587-9ff1-5e6b90589a81/').func
+        )
@@ -0,0 +1,24 @@
+import unittest
+
+from core.category.infra.django_app.search import (
+    PostgresFullTextSearchBackend,
+    SqliteFullTextSearchBackend,
+    search_terms
+)
+
+
+class TestSearchTermsUnit(unittest.TestCase):
+
+    def test_search_terms(self):
+        self.assertEqual(search_terms('Filmes de ação!'), ['Filmes', 'de', 'ação'])
+        self.assertEqual(search_terms('" OR *'), ['OR'])
+
+    def test_fts5_match(self):
+        self.assertEqual(
+            SqliteFullTextSearchBackend.match('filmes "ação"'), '"filmes"* "ação"*')
+        self.assertIsNone(SqliteFullTextSearchBackend.match('*'))
+
+    def test_tsquery(self):
+        self.assertEqual(
+            PostgresFullTextSearchBackend.tsquery("filmes & 'ação'"), 'filmes:* & ação:*')
+        self.assertIsNone(PostgresFullTextSearchBackend.tsquery('!'))
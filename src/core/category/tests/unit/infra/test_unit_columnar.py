@@ -0,0 +1,197 @@
+import datetime
+import random
+import unittest
+
+from core.__seedwork.domain.exceptions import NotFoundException
+from core.category.domain.entities import Category
+from core.category.domain.repositories import CategoryRepository
+from core.category.infra.in_memory.columnar import Bitmap, CategoryColumnarRepository
+from core.category.infra.in_memory.repositories import CategoryInMemoryRepository, category_in_memory_repository
+from core.category.infra.in_memory.search_engines import (
+    HAS_NUMPY,
+    NumpySearchEngine,
+    PythonSearchEngine,
+    search_engine
+)
+
+
+def categories(count: int, seed: int = 1):
+    generator = random.Random(seed)
+    start = datetime.datetime(2020, 1, 1, tzinfo=datetime.timezone.utc)
+    return [
+        Category(
+            name=generator.choice(['Movie', 'movies', 'Série 🎬', 'Documentary', 'a', 'B']),
+            description=generator.choice([None, '', 'some description', 'descrição']),
+            is_active=generator.random() < 0.8,
+            # few distinct values, so the sorts have ties to keep in order
+            created_at=start + datetime.timedelta(seconds=generator.randrange(10), microseconds=123)
+        )
+        for _ in range(count)
+    ]
+
+
+class TestBitmapUnit(unittest.TestCase):
+
+    def test_append_set_and_delete(self):
+        values = [index % 3 == 0 for index in range(21)]
+        bitmap = Bitmap()
+        for value in values:
+            bitmap.append(value)
+        self.assertEqual(list(bitmap), values)
+
+        bitmap[1] = True
+        bitmap[0] = False
+        values[1], values[0] = True, False
+        self.assertEqual(list(bitmap), values)
+
+        for row in (20, 7, 0, 8):
+            bitmap.delete(row)
+            del values[row]
+            self.assertEqual(list(bitmap), values)
+        self.assertEqual(len(bitmap.data), 3)
+
+
+class TestCategoryColumnarRepositoryUnit(unittest.TestCase):
+
+    def engine(self):
+        return PythonSearchEngine()
+
+    def setUp(self):
+        self.items = categories(60)
+        self.repo = CategoryColumnarRepository(self.items, engine=self.engine())
+        self.expected = CategoryInMemoryRepository(items=list(self.items))
+
+    def test_round_trip(self):
+        self.assertEqual(self.repo.find_all(), self.items)
+        self.assertEqual(self.repo.items, self.items)
+        entity = self.repo.find_by_id(self.items[3].unique_entity_id)
+        self.assertEqual(entity, self.items[3])
+        self.assertEqual(entity.created_at, self.items[3].created_at)
+        self.assertEqual(entity.description, self.items[3].description)
+        self.assertEqual(list(self.repo.iter_all(batch_size=7)), self.items)
+        with self.assertRaises(ValueError):
+            self.repo.iter_all(batch_size=0)
+
+    def test_not_found(self):
+        for entity_id in ('fake id', 'af46842e-027d-4c91-b259-3a3642144ba4'):
+            with self.assertRaises(NotFoundException) as assert_error:
+                self.repo.find_by_id(entity_id)
+            self.assertEqual(assert_error.exception.args[0], f"Entity not found using ID '{entity_id}'")
+            with self.assertRaises(NotFoundException):
+                self.repo.delete(entity_id)
+        with self.assertRaises(NotFoundException):
+            self.repo.update(Category(name='Movie'))
+
+    def test_writes(self):
+        changed = self.items[5]
+        changed.update('Changed', 'a much longer description ' * 10)
+        changed.deactivate()
+        new = Category(name='New')
+        self.repo.update(changed)
+        self.repo.upsert(new)
+        self.repo.bulk_upsert([self.items[0], Category(name='Other'), self.items[9]])
+        self.repo.delete(self.items[7].id)
+        self.repo.delete(self.items[-1].id)
+
+        self.expected.update(changed)
+        self.expected.upsert(new)
+        self.expected.bulk_upsert([self.items[0], self.repo.items[-1], self.items[9]])
+        self.expected.delete(self.items[7].id)
+        self.expected.delete(self.items[-1].id)
+
+        self.assertEqual(self.repo.find_all(), self.expected.find_all())
+        self.assertEqual(self.repo.find_by_id(changed.id).description, changed.description)
+        self.assertFalse(self.repo.find_by_id(changed.id).is_active)
+
+    def test_writes_clear_the_events(self):
+        new = Category(name='New')
+        self.repo.insert(new)
+        changed = self.items[5]
+        changed.deactivate()
+        self.repo.update(changed)
+        other = self.items[6]
+        other.update('Other', None)
+        self.repo.bulk_upsert([other, Category(name='Another')])
+
+        self.assertEqual([new.events, changed.events, other.events], [[], [], []])
+
+    def test_iter_all_ignores_writes_made_while_iterating(self):
+        iterator = self.repo.iter_all()
+        first = next(iterator)
+        self.repo.delete(self.items[1].id)
+        self.assertEqual([first, *iterator], self.items)
+
+    def test_descriptions_are_compacted(self):
+        entity = self.items[0]
+        for index in range(200):
+            entity.update(entity.name, f'{index} ' + 'x' * 100)
+            self.repo.update(entity)
+        self.assertLess(len(self.repo.columns.descriptions), 15_000)
+        self.assertEqual(self.repo.find_by_id(entity.id).description, entity.description)
+        self.assertEqual(self.repo.find_all()[1:], self.items[1:])
+
+    def test_search_is_the_same_as_the_list_repository(self):
+        for params in (
+            {},
+            {'page': 2, 'per_page': 7},
+            {'filter': 'MOV'},
+            {'filter': 'nothing'},
+            {'sort': 'name', 'sort_dir': 'asc', 'per_page': 50},
+            {'sort': 'name', 'sort_dir': 'desc', 'page': 3},
+            {'sort': 'created_at', 'sort_dir': 'asc', 'filter': 'e'},
+            {'sort': 'created_at', 'sort_dir': 'desc', 'page': 2, 'per_page': 2},
+            {'sort': 'is_active', 'sort_dir': 'asc'},
+            {'fields': ['id', 'name'], 'sort': 'name'},
+            {'page': 100},
+        ):
+            with self.subTest(params=params):
+                search_params = CategoryRepository.SearchParams(**params)
+                self.assertEqual(
+                    self.repo.search(search_params).to_dict(), self.expected.search(search_params).to_dict()
+                )
+
+    def test_top_k_search_of_many_rows(self):
+        items = categories(2000, seed=2)
+        repo = CategoryColumnarRepository(items, engine=self.engine())
+        expected = CategoryInMemoryRepository(items=items)
+        for params in (
+            {'per_page': 5},
+            {'sort': 'name', 'sort_dir': 'desc', 'page': 3, 'per_page': 10},
+            {'sort': 'created_at', 'sort_dir': 'asc', 'per_page': 15},
+        ):
+            with self.subTest(params=params):
+                search_params = CategoryRepository.SearchParams(**params)
+                self.assertEqual(repo.search(search_params).to_dict(), expected.search(search_params).to_dict())
+
+
+@unittest.skipIf(not HAS_NUMPY, 'NumPy is not installed')
+class TestCategoryColumnarRepositoryNumpyUnit(TestCategoryColumnarRepositoryUnit):
+
+    def engine(self):
+        return NumpySearchEngine()
+
+    def test_empty(self):
+        repo = CategoryColumnarRepository(engine=self.engine())
+        for params in ({}, {'filter': 'movie', 'sort': 'name'}):
+            self.assertEqual(repo.search(CategoryRepository.SearchParams(**params)).items, [])
+
+
+class TestCategoryInMemoryRepositoryFactoryUnit(unittest.TestCase):
+
+    def test_storages(self):
+        self.assertIsInstance(category_in_memory_repository(), CategoryInMemoryRepository)
+        self.assertTrue(category_in_memory_repository('objects', thread_safe=True).thread_safe)
+        repo = category_in_memory_repository('columnar', 'python')
+        self.assertIsInstance(repo, CategoryColumnarRepository)
+        self.assertIsInstance(repo.engine, PythonSearchEngine)
+        with self.assertRaises(ValueError):
+            category_in_memory_repository('rows')
+
+    def test_search_engines(self):
+        self.assertIsInstance(search_engine('python'), PythonSearchEngine)
+        self.assertIsInstance(search_engine(), NumpySearchEngine if HAS_NUMPY else PythonSearchEngine)
+        with self.assertRaises(ValueError):
+            search_engine('pandas')
+        if not HAS_NUMPY:
+            with self.assertRaises(ValueError):
+                search_engine('numpy')
@@ -0,0 +1,67 @@
+import unittest
+
+from core.category.domain.entities import Category
+from core.category.domain.validators import CategoryValidatorFactory
+from core.category.infra.in_memory.repositories import CategoryInMemoryRepository
+from core.category.infra.fixtures import CategoryDatasetFixture
+
+
+class TestCategoryDatasetFixtureUnit(unittest.TestCase):
+
+    def test_same_seed_produces_same_rows(self):
+        self.assertEqual(
+            list(CategoryDatasetFixture(seed=7).rows(200)),
+            list(CategoryDatasetFixture(seed=7).rows(200))
+        )
+        self.assertNotEqual(
+            list(CategoryDatasetFixture(seed=7).rows(200)),
+            list(CategoryDatasetFixture(seed=8).rows(200))
+        )
+
+    def test_rows_are_valid_categories(self):
+        validator = CategoryValidatorFactory.create()
+        for row in CategoryDatasetFixture().rows(500):
+            self.assertTrue(validator.validate(row), validator.errors)
+
+    def test_rows_mix(self):
+        fixture = CategoryDatasetFixture(
+            inactive_ratio=0.3, description_ratio=0.5, duplicate_ratio=0.1)
+        rows = list(fixture.rows(5000))
+
+        inactive = sum(not row['is_active'] for row in rows) / len(rows)
+        with_description = sum(
+            row['description'] is not None for row in rows) / len(rows)
+        self.assertAlmostEqual(inactive, 0.3, delta=0.03)
+        self.assertAlmostEqual(with_description, 0.5, delta=0.03)
+
+        self.assertEqual(len({row['id'] for row in rows}), len(rows))
+        self.assertLess(len({row['name'] for row in rows}), len(rows))
+        self.assertTrue(any(
+            char in 'áâãçéêíóôõú' for row in rows for char in row['name'].lower()
+        ))
+        self.assertTrue(all(
+            fixture.start <= row['created_at'] <= fixture.end for row in rows
+        ))
+
+    def test_created_at_is_skewed_to_recent_dates(self):
+        fixture = CategoryDatasetFixture()
+        middle = fixture.start + (fixture.end - fixture.start) / 2
+        recent = sum(row['created_at'] >= middle for row in fixture.rows(2000))
+        self.assertGreater(recent, 1500)
+
+    def test_categories(self):
+        fixture = CategoryDatasetFixture()
+        rows = list(fixture.rows(10))
+        categories = list(fixture.categories(10))
+
+        for row, category in zip(rows, categories):
+            self.assertIsInstance(category, Category)
+            self.assertEqual(category.id, row['id'])
+            self.assertEqual(category.name, row['name'])
+            self.assertEqual(category.is_active, row['is_active'])
+            self.assertEqual(category.created_at, row['created_at'])
+
+    def test_populate_in_memory(self):
+        repo = CategoryInMemoryRepository()
+        CategoryDatasetFixture().populate_in_memory(repo, 50)
+        self.assertEqual(len(repo.items), 50)
@@ -0,0 +1,208 @@
+import datetime
+import subprocess
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+from core.__seedwork.domain.exceptions import NotFoundException
+from core.category.domain.entities import Category
+from core.category.domain.repositories import CategoryRepository
+from core.category.infra.in_memory.repositories import CategoryInMemoryRepository
+from core.category.infra.in_memory.search_engines import HAS_NUMPY, NumpySearchEngine, PythonSearchEngine
+from core.category.infra.in_memory.shared import (
+    CategorySharedRepository,
+    MappedCategoryColumns,
+    ReadModelError,
+    ReadOnlyRepositoryError,
+    SharedCategoryStore,
+    category_shared_repository
+)
+
+
+def categories():
+    start = datetime.datetime(2020, 1, 1, 10, 30, 15, 123456, tzinfo=datetime.timezone.utc)
+    return [
+        Category(name='Movie', description='some description', created_at=start),
+        Category(name='Documentário 🎬', description=None, is_active=False,
+                 created_at=start + datetime.timedelta(days=1)),
+        Category(name='Series', description='', created_at=start + datetime.timedelta(days=2)),
+        Category(name='movie', description='descrição', created_at=start),
+    ]
+
+
+class TestSharedCategoryStoreUnit(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()  # pylint: disable=consider-using-with
+        self.store = SharedCategoryStore(Path(self.tmp_dir.name) / 'read_model')
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_publish_and_attach(self):
+        self.assertIsNone(self.store.attach())
+        items = categories()
+        path = self.store.publish(items)
+
+        self.assertEqual(self.store.current(), path)
+        columns = self.store.attach()
+        self.assertEqual(len(columns), 4)
+        self.assertEqual([columns.category(row) for row in range(len(columns))], items)
+        self.assertEqual(columns.find(bytes.fromhex(items[2].id.replace('-', ''))), 2)
+
+    def test_old_generations_are_removed(self):
+        items = categories()
+        first = self.store.publish(items)
+        mapped = MappedCategoryColumns(first)
+        self.store.publish([])
+        last = self.store.publish(items[:1])
+
+        self.assertEqual(self.store.generations(), [self.store.directory / 'categories-00000002.columns', last])
+        self.assertFalse(first.exists())
+        # still readable through its mapping
+        self.assertEqual(mapped.category(0), items[0])
+
+    def test_not_a_read_model(self):
+        path = self.store.directory / 'categories-00000001.columns'
+        self.store.directory.mkdir(parents=True)
+        path.write_bytes(b'something else entirely' * 20)
+        with self.assertRaises(ReadModelError):
+            MappedCategoryColumns(path)
+
+
+class TestCategorySharedRepositoryUnit(unittest.TestCase):
+
+    def engine(self):
+        return PythonSearchEngine()
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()  # pylint: disable=consider-using-with
+        self.store = SharedCategoryStore(Path(self.tmp_dir.name))
+        self.repo = CategorySharedRepository(self.store, engine=self.engine(), refresh_interval=0)
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_empty_until_published(self):
+        self.assertEqual(self.repo.find_all(), [])
+        self.assertEqual(self.repo.search(CategoryRepository.SearchParams()).total, 0)
+        self.assertIsNone(self.repo.generation)
+
+    def test_reads(self):
+        items = categories()
+        self.store.publish(items)
+        expected = CategoryInMemoryRepository(items=items)
+
+        self.assertEqual(self.repo.find_all(), items)
+        self.assertEqual(list(self.repo.iter_all()), items)
+        self.assertEqual(self.repo.find_by_id(items[1].unique_entity_id), items[1])
+        with self.assertRaises(NotFoundException):
+            self.repo.find_by_id('af46842e-027d-4c91-b259-3a3642144ba4')
+        for params in (
+            {},
+            {'filter': 'MOV', 'sort': 'name', 'sort_dir': 'desc'},
+            {'sort': 'created_at', 'sort_dir': 'asc', 'per_page': 2, 'page': 2},
+            {'fields': ['name', 'is_active'], 'sort': 'name'},
+        ):
+            with self.subTest(params=params):
+                search_params = CategoryRepository.SearchParams(**params)
+                self.assertEqual(
+                    self.repo.search(search_params).to_dict(), expected.search(search_params).to_dict()
+                )
+
+    def test_reads_the_fallback_until_published(self):
+        stored = categories()
+        fallback = CategoryInMemoryRepository(items=list(stored))
+        repo = CategorySharedRepository(
+            self.store, engine=self.engine(), refresh_interval=0, fallback=fallback)
+
+        self.assertEqual(repo.find_all(), stored)
+        self.assertEqual(list(repo.iter_all()), stored)
+        self.assertEqual(repo.find_by_id(stored[1].id), stored[1])
+        self.assertEqual(repo.search(CategoryRepository.SearchParams()).total, 4)
+
+        movie = Category(name='Only movie')
+        self.store.publish([movie])
+        self.assertEqual(repo.find_all(), [movie])
+        self.assertEqual(repo.search(CategoryRepository.SearchParams()).total, 1)
+        # the lookups by id read the fallback, written categories are found
+        # before the next publish
+        self.assertEqual(repo.find_by_id(stored[1].id), stored[1])
+        with self.assertRaises(NotFoundException):
+            repo.find_by_id(movie.id)
+
+    def test_corrupted_generation_keeps_the_previous_one(self):
+        first = self.store.publish(categories())
+        self.assertEqual(len(self.repo.find_all()), 4)
+
+        second = self.store.publish([Category(name='Only movie')])
+        second.write_bytes(b'corrupted')
+        with self.assertLogs('core.category.infra.in_memory.shared', 'ERROR') as logs:
+            self.assertEqual(len(self.repo.find_all()), 4)
+        self.assertEqual(self.repo.generation, first)
+        self.assertIn(str(first), logs.records[0].getMessage())
+        with self.assertRaises(ReadModelError):
+            self.repo.refresh()
+
+    def test_generation_swap(self):
+        first = self.store.publish(categories())
+        self.assertEqual(len(self.repo.find_all()), 4)
+        self.assertEqual(self.repo.generation, first)
+
+        movie = Category(name='Only movie')
+        second = self.store.publish([movie])
+        self.assertEqual(self.repo.find_all(), [movie])
+        self.assertEqual(self.repo.generation, second)
+        self.assertFalse(self.repo.refresh())
+
+    def test_refresh_interval(self):
+        self.store.publish(categories())
+        repo = CategorySharedRepository(self.store, engine=self.engine(), refresh_interval=3600)
+        self.assertEqual(len(repo.find_all()), 4)
+        self.store.publish([])
+        self.assertEqual(len(repo.find_all()), 4)
+        self.assertTrue(repo.refresh())
+        self.assertEqual(repo.find_all(), [])
+
+    def test_read_only(self):
+        self.store.publish(categories())
+        entity = Category(name='Movie')
+        for write in (
+            lambda: self.repo.insert(entity),
+            lambda: self.repo.bulk_insert([entity]),
+            lambda: self.repo.update(entity),
+            lambda: self.repo.upsert(entity),
+            lambda: self.repo.bulk_upsert([entity]),
+            lambda: self.repo.delete(entity.id),
+        ):
+            with self.assertRaises(ReadOnlyRepositoryError):
+                write()
+
+    def test_other_processes_read_the_same_generation(self):
+        items = categories()
+        self.store.publish(items)
+        script = (
+            'import sys\n'
+            'from core.category.infra.in_memory.shared import category_shared_repository\n'
+            'repo = category_shared_repository(sys.argv[1], "python")\n'
+            'print(",".join(category.name for category in repo.find_all()))\n'
+        )
+        output = subprocess.run(
+            [sys.executable, '-c', script, str(self.store.directory)],
+            cwd=Path(__file__).parents[5], capture_output=True, check=True, text=True
+        ).stdout
+        self.assertEqual(output.strip(), ','.join(category.name for category in items))
+
+    def test_factory(self):
+        self.assertIsNone(category_shared_repository(None))
+        repo = category_shared_repository(self.tmp_dir.name, 'python', 5)
+        self.assertEqual(repo.store.directory, Path(self.tmp_dir.name))
+        self.assertEqual(repo.refresh_interval, 5)
+
+
+@unittest.skipIf(not HAS_NUMPY, 'NumPy is not installed')
+class TestCategorySharedRepositoryNumpyUnit(TestCategorySharedRepositoryUnit):
+
+    def engine(self):
+        return NumpySearchEngine()
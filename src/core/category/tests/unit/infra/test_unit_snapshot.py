@@ -0,0 +1,175 @@
+import datetime
+import tempfile
+import unittest
+from pathlib import Path
+
+from core.__seedwork.domain.exceptions import NotFoundException
+from core.__seedwork.domain.value_objects import UniqueEntityID
+from core.category.domain.entities import Category
+from core.category.infra.in_memory.snapshot import (
+    CategorySnapshotStore,
+    SnapshotError,
+    WriteLog,
+    decode,
+    encode,
+    load_snapshot,
+    save_snapshot
+)
+
+
+def categories():
+    return [
+        Category(
+            name='Movie',
+            description='some description',
+            created_at=datetime.datetime(2020, 1, 1, 10, 30, 15, 123456, tzinfo=datetime.timezone.utc)
+        ),
+        Category(name='Documentário 🎬', description=None, is_active=False),
+        Category(name='Series', description=''),
+    ]
+
+
+class TestSnapshotEncodingUnit(unittest.TestCase):
+
+    def test_round_trip(self):
+        original = categories()
+        loaded = decode(encode(original))
+
+        self.assertEqual(loaded, original)
+        self.assertIsNone(loaded[1].description)
+        self.assertEqual(loaded[2].description, '')
+        self.assertEqual(loaded[0].created_at, original[0].created_at)
+        self.assertEqual(loaded[0].created_at.tzinfo, datetime.timezone.utc)
+        self.assertIsInstance(loaded[0].unique_entity_id, UniqueEntityID)
+
+    def test_values_containing_the_separator(self):
+        original = [Category(name='Movie\x1fSeries', description='a\x1fb'), Category(name='Movie')]
+        self.assertEqual(decode(encode(original)), original)
+
+    def test_empty(self):
+        self.assertEqual(decode(encode([])), [])
+
+    def test_loaded_categories_record_their_own_events(self):
+        first, second = decode(encode(categories()[:2]))
+        first.update('Documentary', None)
+        self.assertEqual(len(first.events), 1)
+        self.assertEqual(second.events, [])
+
+    def test_corrupted(self):
+        data = encode(categories())
+        with self.assertRaises(SnapshotError):
+            decode(data[:len(data) // 2])
+
+
+class TestSnapshotFileUnit(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()  # pylint: disable=consider-using-with
+        self.path = Path(self.tmp_dir.name) / 'categories.snapshot'
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_save_and_load(self):
+        original = categories()
+        save_snapshot(original, self.path)
+        self.assertEqual(load_snapshot(self.path), original)
+        self.assertFalse(self.path.with_name('categories.snapshot.tmp').exists())
+
+    def test_not_a_snapshot(self):
+        self.path.write_bytes(b'something else entirely')
+        with self.assertRaises(SnapshotError):
+            load_snapshot(self.path)
+        self.path.write_bytes(b'')
+        with self.assertRaises(SnapshotError):
+            load_snapshot(self.path)
+
+    def test_corrupted_file(self):
+        save_snapshot(categories(), self.path)
+        data = self.path.read_bytes()
+        for corrupted in [data[:-3], data[:len(data) // 2], data[:len(data) - 20] + b'\xff' * 20]:
+            self.path.write_bytes(corrupted)
+            with self.assertRaises(SnapshotError):
+                load_snapshot(self.path)
+
+    def test_ids_are_stored_hyphenated(self):
+        category = Category(
+            name='Movie', unique_entity_id=UniqueEntityID('af46842e027d4c91b2593a3642144ba4')
+        )
+        save_snapshot([category, *categories()], self.path)
+        loaded = load_snapshot(self.path)
+        self.assertEqual(loaded[0].id, 'af46842e-027d-4c91-b259-3a3642144ba4')
+        self.assertEqual([item.name for item in loaded], ['Movie', 'Movie', 'Documentário 🎬', 'Series'])
+
+
+class TestCategorySnapshotStoreUnit(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()  # pylint: disable=consider-using-with
+        self.directory = Path(self.tmp_dir.name) / 'store'
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_writes_are_replayed_after_the_snapshot(self):
+        store = CategorySnapshotStore(self.directory)
+        repo = store.load()
+        self.assertEqual(repo.find_all(), [])
+
+        movie, documentary, series = categories()
+        repo.bulk_insert([movie, documentary])
+        store.checkpoint(repo)
+
+        repo.insert(series)
+        movie.update('Movie changed', None)
+        repo.update(movie)
+        repo.delete(documentary.id)
+        store.log.close()
+
+        loaded = CategorySnapshotStore(self.directory).load()
+        self.assertEqual(loaded.find_all(), [movie, series])
+        self.assertEqual(loaded.find_by_id(movie.id).name, 'Movie changed')
+
+    def test_writes_clear_the_events(self):
+        repo = CategorySnapshotStore(self.directory).load()
+        movie, documentary, _ = categories()
+        repo.bulk_insert([movie, documentary])
+        movie.update('Movie changed', None)
+        repo.update(movie)
+
+        self.assertEqual([item.events for item in repo.find_all()], [[], []])
+
+    def test_failed_writes_are_not_logged(self):
+        store = CategorySnapshotStore(self.directory)
+        repo = store.load()
+        with self.assertRaises(NotFoundException):
+            repo.delete('af46842e-027d-4c91-b259-3a3642144ba4')
+        self.assertFalse(store.log.path.exists())
+
+    def test_checkpoint_empties_the_log(self):
+        store = CategorySnapshotStore(self.directory)
+        repo = store.load()
+        repo.bulk_upsert(categories())
+        self.assertGreater(store.log.path.stat().st_size, 0)
+
+        store.checkpoint(repo)
+        self.assertEqual(store.log.path.stat().st_size, 0)
+        self.assertEqual(CategorySnapshotStore(self.directory).load().find_all(), repo.find_all())
+
+    def test_torn_record_ends_the_replay(self):
+        store = CategorySnapshotStore(self.directory)
+        repo = store.load()
+        movie, documentary, _ = categories()
+        repo.insert(movie)
+        repo.insert(documentary)
+        store.log.close()
+
+        data = store.log.path.read_bytes()
+        store.log.path.write_bytes(data[:-5])
+
+        log = WriteLog(store.log.path)
+        self.assertEqual(log.replay([]), [movie])
+        # the torn record is dropped, new records follow the last good one
+        log.append_delete(movie.id)
+        log.close()
+        self.assertEqual(WriteLog(store.log.path).replay([]), [])
@@ -1,4 +1,24 @@
-from .container import Container
+import functools
+from typing import TYPE_CHECKING
 
+if TYPE_CHECKING:
+    from .containers import Container
 
-container = Container()
+    # for static tools, the module __getattr__ builds it on first access
+    container: Container
+
+__all__ = ['container']
+
+
+@functools.lru_cache(maxsize=None)
+def _container():
+    from .containers import Container  # pylint: disable=import-outside-toplevel
+    return Container()
+
+
+def __getattr__(name: str):
+    # django_app.settings is imported by every manage.py command and worker,
+    # building the container there would import the whole application
+    if name == 'container':
+        return _container()
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
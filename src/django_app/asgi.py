@@ -3,14 +3,28 @@ ASGI config for django_app project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
 
+Requests served here resolve against ``django_app.asgi_urls``, which routes
+the category endpoints to the async handlers.
+
 For more information on this file, see
 https://docs.djangoproject.com/en/4.2/howto/deployment/asgi/
 """
 
 import os
 
-from django.core.asgi import get_asgi_application
+import django
+from django.core.handlers.asgi import ASGIHandler as BaseASGIHandler, ASGIRequest as BaseASGIRequest
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'django_app.settings')
 
-application = get_asgi_application()
+
+class ASGIRequest(BaseASGIRequest):
+    urlconf = 'django_app.asgi_urls'
+
+
+class ASGIHandler(BaseASGIHandler):
+    request_class = ASGIRequest
+
+
+django.setup(set_prefix=False)
+application = ASGIHandler()
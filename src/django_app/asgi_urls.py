@@ -0,0 +1,21 @@
+"""
+URL configuration served by django_app.asgi.
+
+Same routes as django_app.urls, but the category endpoints are handled by
+AsyncCategoryResource and AsyncCategoryChangesResource so concurrent
+requests share one event loop.
+"""
+from django.contrib import admin
+from django.urls import path, include
+
+from django_app.metrics import metrics_view
+from django_app.profiler import profile_view
+from django_app.slow_queries import slow_queries_view
+
+urlpatterns = [
+    path('admin/profile/', profile_view),
+    path('admin/slow-queries/', slow_queries_view),
+    path('admin/', admin.site.urls),
+    path('metrics', metrics_view),
+    path('', include('core.category.infra.django_app.async_urls')),
+]
@@ -0,0 +1,269 @@
+from typing import Optional
+
+from dependency_injector import containers, providers
+from django.conf import settings
+from django.utils.module_loading import import_string
+
+from core.__seedwork.application.interceptors import (
+    AsyncInterceptedUseCase,
+    InMemorySpanExporter,
+    InterceptedUseCase,
+    JsonLinesSpanExporter,
+    ProfilingInterceptor,
+    SlowCallLoggingInterceptor,
+    SpanExporter,
+    TimingInterceptor,
+    TracingInterceptor
+)
+from django_app import metrics
+from django_app.instrumentation import track_serialization
+from django_app.metrics import InstrumentedRepository
+from django_app.slow_queries import SlowQueryRecorder
+
+
+_USE_CASES = 'core.category.application.use_cases'
+_ASYNC_USE_CASES = 'core.category.application.async_use_cases'
+_DJANGO_REPOSITORIES = 'core.category.infra.django_app.repositories'
+_IN_MEMORY_REPOSITORIES = 'core.category.infra.in_memory.repositories'
+
+
+def _lazy(path: str):
+    # the class is imported when the provider is first called, so loading the
+    # container does not import every use case and repository up front
+    def create(*args, **kwargs):
+        return import_string(path)(*args, **kwargs)
+    create.__qualname__ = f'lazy {path}'
+    return create
+
+
+def _setting(name: str, default=None):
+    return getattr(settings, name, default)
+
+
+def _instrumented(repository):
+    # an optional repository that is not configured stays None
+    return InstrumentedRepository(repository) if repository is not None else None
+
+
+def _first_configured(*repositories):
+    return next(repository for repository in repositories if repository is not None)
+
+
+def _span_exporter() -> Optional[SpanExporter]:
+    # no tracing unless USE_CASE_TRACING is on or the spans go to USE_CASE_TRACE_FILE
+    trace_file = _setting('USE_CASE_TRACE_FILE')
+    if trace_file:
+        return JsonLinesSpanExporter(trace_file)
+    return InMemorySpanExporter() if _setting('USE_CASE_TRACING', False) else None
+
+
+class Container(containers.DeclarativeContainer):
+
+    span_exporter = providers.Singleton(_span_exporter)
+
+    # every use case runs inside this chain, the first interceptor is the outermost
+    use_case_interceptors = providers.List(
+        providers.Singleton(
+            TimingInterceptor, record=metrics.record_use_case_duration
+        ),
+        providers.Singleton(TracingInterceptor, exporter=span_exporter),
+        providers.Singleton(
+            SlowCallLoggingInterceptor,
+            threshold_ms=providers.Callable(_setting, 'USE_CASE_SLOW_CALL_MS', 200)
+        ),
+        providers.Singleton(
+            ProfilingInterceptor,
+            sample_rate=providers.Callable(_setting, 'USE_CASE_PROFILE_RATE', 0.0),
+            output_dir=providers.Callable(_setting, 'USE_CASE_PROFILE_DIR')
+        ),
+    )
+
+    # handed to the views, which can't import django_app themselves
+    track_serialization = providers.Object(track_serialization)
+
+    # CATEGORY_IN_MEMORY_STORAGE: objects or columnar
+    repository_category_in_memory = providers.Singleton(
+        _lazy(f'{_IN_MEMORY_REPOSITORIES}.category_in_memory_repository'),
+        providers.Callable(_setting, 'CATEGORY_IN_MEMORY_STORAGE', 'objects'),
+        providers.Callable(_setting, 'CATEGORY_IN_MEMORY_SEARCH_ENGINE', 'auto'),
+        providers.Callable(_setting, 'CATEGORY_IN_MEMORY_THREAD_SAFE', False)
+    )
+
+    slow_query_recorder = providers.Singleton(
+        SlowQueryRecorder,
+        threshold_ms=providers.Callable(_setting, 'SLOW_QUERY_THRESHOLD_MS', 100),
+        maxlen=providers.Callable(_setting, 'SLOW_QUERY_LOG_SIZE', 100)
+    )
+
+    # CATEGORY_SEARCH_BACKEND: icontains or fulltext, see core.category.infra.django_app.search
+    category_search_backend = providers.Singleton(
+        _lazy('core.category.infra.django_app.search.search_backend'),
+        providers.Callable(_setting, 'CATEGORY_SEARCH_BACKEND', 'icontains')
+    )
+
+    repository_category_django_orm = providers.Singleton(
+        InstrumentedRepository,
+        providers.Factory(
+            _lazy(f'{_DJANGO_REPOSITORIES}.CategoryDjangoRepository'),
+            slow_query_recorder=slow_query_recorder,
+            search_backend=category_search_backend
+        )
+    )
+
+    # None unless CATEGORY_READ_MODEL_DIR is set, reads from the database
+    # until the first generation is published
+    repository_category_shared = providers.Singleton(
+        _instrumented,
+        providers.Factory(
+            _lazy('core.category.infra.in_memory.shared.category_shared_repository'),
+            providers.Callable(_setting, 'CATEGORY_READ_MODEL_DIR'),
+            providers.Callable(_setting, 'CATEGORY_IN_MEMORY_SEARCH_ENGINE', 'auto'),
+            providers.Callable(_setting, 'CATEGORY_READ_MODEL_REFRESH_INTERVAL', 1.0),
+            fallback=repository_category_django_orm
+        )
+    )
+
+    # the reads of the get and list use cases: the shared read model when
+    # CATEGORY_READ_MODEL_DIR is set, the database otherwise
+    repository_category_read = providers.Singleton(
+        _first_configured, repository_category_shared, repository_category_django_orm
+    )
+
+    category_change_feed = providers.Singleton(
+        _lazy('core.category.infra.django_app.outbox.CategoryDjangoChangeFeed'),
+        safety_lag=providers.Callable(_setting, 'CATEGORY_CHANGES_SAFETY_LAG', 5.0)
+    )
+
+    category_updates_feed = providers.Singleton(
+        _lazy(f'{_DJANGO_REPOSITORIES}.CategoryDjangoUpdatesFeed'),
+        safety_lag=providers.Callable(_setting, 'CATEGORY_UPDATES_SAFETY_LAG', 5.0)
+    )
+
+    use_case_category_create_category = providers.Singleton(
+        InterceptedUseCase,
+        providers.Factory(
+            _lazy(f'{_USE_CASES}.CreateCategoryUseCase'),
+            category_repo=repository_category_django_orm
+        ),
+        interceptors=use_case_interceptors
+    )
+
+    use_case_category_list_categories = providers.Singleton(
+        InterceptedUseCase,
+        providers.Factory(
+            _lazy(f'{_USE_CASES}.ListCategoriesUseCase'),
+            category_repo=repository_category_read
+        ),
+        interceptors=use_case_interceptors
+    )
+
+    use_case_category_get_category = providers.Singleton(
+        InterceptedUseCase,
+        providers.Factory(
+            _lazy(f'{_USE_CASES}.GetCategoryUseCase'),
+            category_repo=repository_category_read
+        ),
+        interceptors=use_case_interceptors
+    )
+
+    use_case_category_update_category = providers.Singleton(
+        InterceptedUseCase,
+        providers.Factory(
+            _lazy(f'{_USE_CASES}.UpdateCategoryUseCase'),
+            category_repo=repository_category_django_orm
+        ),
+        interceptors=use_case_interceptors
+    )
+
+    use_case_category_upsert_category = providers.Singleton(
+        InterceptedUseCase,
+        providers.Factory(
+            _lazy(f'{_USE_CASES}.UpsertCategoryUseCase'),
+            category_repo=repository_category_django_orm
+        ),
+        interceptors=use_case_interceptors
+    )
+
+    use_case_category_delete_category = providers.Singleton(
+        InterceptedUseCase,
+        providers.Factory(
+            _lazy(f'{_USE_CASES}.DeleteCategoryUseCase'),
+            category_repo=repository_category_django_orm
+        ),
+        interceptors=use_case_interceptors
+    )
+
+    use_case_category_list_category_changes = providers.Singleton(
+        InterceptedUseCase,
+        providers.Factory(
+            _lazy(f'{_USE_CASES}.ListCategoryChangesUseCase'),
+            change_feed=category_change_feed
+        ),
+        interceptors=use_case_interceptors
+    )
+
+    use_case_category_list_category_updates = providers.Singleton(
+        InterceptedUseCase,
+        providers.Factory(
+            _lazy(f'{_USE_CASES}.ListCategoryUpdatesUseCase'),
+            updates_feed=category_updates_feed
+        ),
+        interceptors=use_case_interceptors
+    )
+
+    repository_category_django_orm_async = providers.Singleton(
+        InstrumentedRepository,
+        providers.Factory(
+            _lazy(f'{_DJANGO_REPOSITORIES}.CategoryDjangoAsyncRepository'),
+            slow_query_recorder=slow_query_recorder,
+            search_backend=category_search_backend
+        )
+    )
+
+    async_use_case_category_create_category = providers.Singleton(
+        AsyncInterceptedUseCase,
+        providers.Factory(
+            _lazy(f'{_ASYNC_USE_CASES}.AsyncCreateCategoryUseCase'),
+            category_repo=repository_category_django_orm_async
+        ),
+        interceptors=use_case_interceptors
+    )
+
+    # the async reads stay on the database: the shared read model checks
+    # CURRENT on disk and searches its columns without yielding, which would
+    # block the event loop, and its fallback is the sync repository
+    async_use_case_category_list_categories = providers.Singleton(
+        AsyncInterceptedUseCase,
+        providers.Factory(
+            _lazy(f'{_ASYNC_USE_CASES}.AsyncListCategoriesUseCase'),
+            category_repo=repository_category_django_orm_async
+        ),
+        interceptors=use_case_interceptors
+    )
+
+    async_use_case_category_get_category = providers.Singleton(
+        AsyncInterceptedUseCase,
+        providers.Factory(
+            _lazy(f'{_ASYNC_USE_CASES}.AsyncGetCategoryUseCase'),
+            category_repo=repository_category_django_orm_async
+        ),
+        interceptors=use_case_interceptors
+    )
+
+    async_use_case_category_update_category = providers.Singleton(
+        AsyncInterceptedUseCase,
+        providers.Factory(
+            _lazy(f'{_ASYNC_USE_CASES}.AsyncUpdateCategoryUseCase'),
+            category_repo=repository_category_django_orm_async
+        ),
+        interceptors=use_case_interceptors
+    )
+
+    async_use_case_category_delete_category = providers.Singleton(
+        AsyncInterceptedUseCase,
+        providers.Factory(
+            _lazy(f'{_ASYNC_USE_CASES}.AsyncDeleteCategoryUseCase'),
+            category_repo=repository_category_django_orm_async
+        ),
+        interceptors=use_case_interceptors
+    )
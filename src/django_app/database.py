@@ -0,0 +1,173 @@
+"""
+Database settings read from the environment.
+
+Connections are persistent by default: every worker thread keeps its
+connection for DB_CONN_MAX_AGE seconds and, with health checks on, Django
+pings it before reusing it in a new request. DB_POOL replaces persistent
+connections with a process wide pool on the backends that have one
+(PostgreSQL with psycopg 3 from Django 5.1 on).
+
+SQLite connections run the PRAGMAs of their SQLITE_PRAGMAS database setting
+as soon as they are opened. The default profile suits concurrent readers and
+writers: WAL lets readers go on while a writer commits, synchronous=NORMAL
+only syncs on checkpoints (safe from corruption in WAL mode, the last
+commits can be lost on power failure), and busy_timeout makes a connection
+wait for a lock instead of failing with "database is locked".
+
+DB_REPLICAS lists the read replicas of the primary, see django_app.routers.
+"""
+import re
+from pathlib import Path
+from typing import Any, Dict, Mapping, Optional
+
+import django
+from django.core.exceptions import ImproperlyConfigured
+from django.db.backends.signals import connection_created
+
+SQLITE = 'django.db.backends.sqlite3'
+POSTGRESQL = 'django.db.backends.postgresql'
+
+DEFAULT_CONN_MAX_AGE = 60
+
+SQLITE_PRAGMAS = {
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+    'mmap_size': 256 * 1024 * 1024,
+    # negative sizes are in KiB, i.e. 64MiB of page cache per connection
+    'cache_size': -64 * 1024,
+    'busy_timeout': 5000,
+    'temp_store': 'MEMORY',
+}
+_PRAGMA_VALUE = re.compile(r'-?\w+')
+
+_TRUE = ('1', 'true', 'yes', 'on')
+_FALSE = ('0', 'false', 'no', 'off', '')
+
+
+def env_bool(environ: Mapping[str, str], name: str, default: bool) -> bool:
+    value = environ.get(name)
+    if value is None:
+        return default
+    if value.lower() in _TRUE:
+        return True
+    if value.lower() in _FALSE:
+        return False
+    raise ImproperlyConfigured(f'{name} must be a boolean, got {value!r}')
+
+
+def env_int(environ: Mapping[str, str], name: str, default: int) -> int:
+    value = environ.get(name)
+    if value is None:
+        return default
+    try:
+        return int(value)
+    except ValueError as exception:
+        raise ImproperlyConfigured(f'{name} must be an integer, got {value!r}') from exception
+
+
+def conn_max_age(environ: Mapping[str, str]) -> Optional[int]:
+    """0 closes the connection at the end of each request, `none` keeps it
+    for the lifetime of the thread."""
+    if environ.get('DB_CONN_MAX_AGE', '').lower() == 'none':
+        return None
+    return env_int(environ, 'DB_CONN_MAX_AGE', DEFAULT_CONN_MAX_AGE)
+
+
+def supports_pool(engine: str) -> bool:
+    return engine == POSTGRESQL and django.VERSION >= (5, 1)
+
+
+def pool_options(environ: Mapping[str, str], engine: str) -> Optional[Dict[str, Any]]:
+    if not env_bool(environ, 'DB_POOL', False):
+        return None
+    if not supports_pool(engine):
+        raise ImproperlyConfigured(
+            f'DB_POOL needs the PostgreSQL backend with psycopg 3 and Django 5.1+, '
+            f'{engine} on Django {django.get_version()} has no connection pool'
+        )
+    return {
+        'min_size': env_int(environ, 'DB_POOL_MIN_SIZE', 2),
+        'max_size': env_int(environ, 'DB_POOL_MAX_SIZE', 10),
+        'timeout': env_int(environ, 'DB_POOL_TIMEOUT', 10),
+    }
+
+
+def sqlite_pragmas(environ: Mapping[str, str]) -> Dict[str, Any]:
+    """DB_SQLITE_TUNING=false keeps the SQLite defaults, DB_SQLITE_<PRAGMA>
+    overrides a single pragma, e.g. DB_SQLITE_MMAP_SIZE=0."""
+    if not env_bool(environ, 'DB_SQLITE_TUNING', True):
+        return {}
+    pragmas = dict(SQLITE_PRAGMAS)
+    for name in pragmas:
+        value = environ.get(f'DB_SQLITE_{name.upper()}')
+        if value is None:
+            continue
+        # the values end up in the PRAGMA statements as they are
+        if not _PRAGMA_VALUE.fullmatch(value):
+            raise ImproperlyConfigured(f'DB_SQLITE_{name.upper()} is not a valid value: {value!r}')
+        pragmas[name] = value
+    return pragmas
+
+
+def apply_sqlite_pragmas(sender, connection, **kwargs):  # pylint: disable=unused-argument
+    if connection.vendor != 'sqlite':
+        return
+    for name, value in connection.settings_dict.get('SQLITE_PRAGMAS', {}).items():
+        connection.connection.execute(f'PRAGMA {name} = {value}')
+
+
+connection_created.connect(apply_sqlite_pragmas, dispatch_uid='apply_sqlite_pragmas')
+
+
+def database_from_env(environ: Mapping[str, str], default_name: Path) -> Dict[str, Any]:
+    engine = environ.get('DB_ENGINE', SQLITE)
+    database: Dict[str, Any] = {
+        'ENGINE': engine,
+        'NAME': environ.get('DB_NAME', default_name),
+        'CONN_MAX_AGE': conn_max_age(environ),
+        'CONN_HEALTH_CHECKS': env_bool(environ, 'DB_CONN_HEALTH_CHECKS', True),
+        'OPTIONS': {},
+    }
+    if engine == SQLITE:
+        database['SQLITE_PRAGMAS'] = sqlite_pragmas(environ)
+    else:
+        database.update({
+            'USER': environ.get('DB_USER', ''),
+            'PASSWORD': environ.get('DB_PASSWORD', ''),
+            'HOST': environ.get('DB_HOST', ''),
+            'PORT': environ.get('DB_PORT', ''),
+        })
+
+    pool = pool_options(environ, engine)
+    if pool is not None:
+        # pooled connections go back to the pool at the end of the request,
+        # Django refuses persistent connections on top of a pool
+        database['CONN_MAX_AGE'] = 0
+        database['OPTIONS']['pool'] = pool
+    return database
+
+
+def replicas_from_env(environ: Mapping[str, str], primary: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+    """DB_REPLICAS is a comma separated list of database files on SQLite and
+    of host[:port] on the other backends, every replica otherwise shares the
+    settings of the primary. They become the replica_1... aliases."""
+    databases = {}
+    for index, replica in enumerate(
+        (value.strip() for value in environ.get('DB_REPLICAS', '').split(',')), start=1
+    ):
+        if not replica:
+            continue
+        database = {
+            **primary,
+            'OPTIONS': dict(primary['OPTIONS']),
+            # tests read the test database of the primary through the replicas
+            'TEST': {'MIRROR': 'default'},
+        }
+        if primary['ENGINE'] == SQLITE:
+            database['NAME'] = replica
+        else:
+            host, _, port = replica.partition(':')
+            database['HOST'] = host
+            database['PORT'] = port or primary.get('PORT', '')
+        databases[f'replica_{index}'] = database
+    return databases
@@ -0,0 +1,174 @@
+import contextlib
+import logging
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Iterator, Optional
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.db import connections
+
+from core.__seedwork.application.interceptors import UseCaseInterceptor, intercept_executions
+from django_app import metrics as prometheus
+
+logger = logging.getLogger(__name__)
+
+_current: ContextVar[Optional['RequestMetrics']] = ContextVar(
+    'request_metrics', default=None
+)
+
+
+@dataclass(slots=True)
+class RequestMetrics(UseCaseInterceptor):
+    queries: int = 0
+    db_time: float = 0.0
+    use_case_time: float = 0.0
+    serialization_time: float = 0.0
+    total_time: float = 0.0
+    _use_case_depth: int = 0
+
+    def record_query(self, execute, sql, params, many, context):  # pylint: disable=too-many-arguments
+        started_at = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.db_time += time.perf_counter() - started_at
+            self.queries += 1
+
+    @contextlib.contextmanager
+    def intercept(self, use_case, input_param) -> Iterator[None]:
+        # only the outermost use case is timed, nested executions are part of it
+        self._use_case_depth += 1
+        started_at = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._use_case_depth -= 1
+            if not self._use_case_depth:
+                self.use_case_time += time.perf_counter() - started_at
+
+    def server_timing(self) -> str:
+        return ', '.join([
+            f'db;dur={self.db_time * 1000:.2f};desc="{self.queries} queries"',
+            f'use-case;dur={self.use_case_time * 1000:.2f}',
+            f'serialization;dur={self.serialization_time * 1000:.2f}',
+            f'total;dur={self.total_time * 1000:.2f}',
+        ])
+
+
+def current_metrics() -> Optional[RequestMetrics]:
+    return _current.get()
+
+
+@contextlib.contextmanager
+def track_serialization() -> Iterator[None]:
+    metrics = _current.get()
+    started_at = time.perf_counter()
+    try:
+        yield
+    finally:
+        if metrics is not None:
+            metrics.serialization_time += time.perf_counter() - started_at
+
+
+def _record_query(execute, sql, params, many, context):  # pylint: disable=too-many-arguments
+    metrics = _current.get()
+    if metrics is None:
+        return execute(sql, params, many, context)
+    return metrics.record_query(execute, sql, params, many, context)
+
+
+def _instrument_connections() -> None:
+    # the connections are per thread, so this runs in the thread of the
+    # queries: the ORM calls of an async view run in another thread than
+    # the middleware. Each query is counted by the request of its context.
+    for connection in connections.all():
+        if _record_query not in connection.execute_wrappers:
+            connection.execute_wrappers.append(_record_query)
+
+
+class RequestMetricsMiddleware:
+    """Measures queries, DB time, use case and serialization time of each
+    request, reports them in the Server-Timing header and logs slow requests.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.slow_request_ms = getattr(settings, 'SLOW_REQUEST_THRESHOLD_MS', 500)
+        self.max_queries = getattr(settings, 'SLOW_REQUEST_QUERY_THRESHOLD', 10)
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        _instrument_connections()
+        metrics = RequestMetrics()
+        with self.measure(metrics):
+            response = self.get_response(request)
+        return self.report(request, response, metrics)
+
+    async def __acall__(self, request):
+        await sync_to_async(_instrument_connections)()
+        metrics = RequestMetrics()
+        with self.measure(metrics):
+            response = await self.get_response(request)
+        return self.report(request, response, metrics)
+
+    @staticmethod
+    @contextlib.contextmanager
+    def measure(metrics: RequestMetrics) -> Iterator[None]:
+        token = _current.set(metrics)
+        started_at = time.perf_counter()
+        try:
+            with intercept_executions(metrics):
+                yield
+        finally:
+            _current.reset(token)
+            metrics.total_time = time.perf_counter() - started_at
+
+    def report(self, request, response, metrics: RequestMetrics):
+        response['Server-Timing'] = metrics.server_timing()
+        self.log_if_slow(request, response, metrics)
+        self.export(request, response, metrics)
+        return response
+
+    def process_template_response(self, _request, response):
+        # DRF responses are rendered after the view returns, count it as serialization
+        metrics = _current.get()
+        started_at = time.perf_counter()
+
+        def rendered(_response):
+            metrics.serialization_time += time.perf_counter() - started_at
+
+        if metrics is not None:
+            response.add_post_render_callback(rendered)
+        return response
+
+    @staticmethod
+    def export(request, response, metrics: RequestMetrics) -> None:
+        handler = prometheus.handler_name(request)
+        prometheus.http_requests_total.inc(handler, str(response.status_code))
+        prometheus.http_request_duration_seconds.observe(metrics.total_time, handler)
+        prometheus.http_request_db_duration_seconds.observe(metrics.db_time, handler)
+        prometheus.db_queries_total.inc(handler, amount=metrics.queries)
+        store = prometheus.multiprocess_store()
+        if store is not None:
+            # flushed by a thread of the worker, this only starts it once
+            store.start(prometheus.registry)
+
+    def log_if_slow(self, request, response, metrics: RequestMetrics) -> None:
+        if metrics.total_time * 1000 < self.slow_request_ms \
+                and metrics.queries <= self.max_queries:
+            return
+        logger.warning(
+            'slow request %s %s status=%s total=%.1fms queries=%d db=%.1fms '
+            'use_case=%.1fms serialization=%.1fms',
+            request.method, request.get_full_path(), response.status_code,
+            metrics.total_time * 1000, metrics.queries, metrics.db_time * 1000,
+            metrics.use_case_time * 1000, metrics.serialization_time * 1000
+        )
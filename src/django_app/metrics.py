@@ -0,0 +1,496 @@
+"""
+In-process Prometheus metrics.
+
+Metrics are plain counters and histograms guarded by one lock each, so they
+are safe under multi-threaded workers. When METRICS_MULTIPROCESS_DIR is set,
+every process periodically writes a snapshot of its metrics to that directory
+from a background thread and the /metrics endpoint sums the snapshots of all
+processes, which covers multiprocess gunicorn deployments without an external
+service.
+"""
+import atexit
+import bisect
+import contextlib
+import fcntl
+import functools
+import inspect
+import json
+import os
+import tempfile
+import threading
+import time
+import uuid
+import weakref
+from collections import Counter as Tally
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, TypeVar
+
+from django.conf import settings
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.http import HttpRequest, HttpResponse
+
+LabelValues = Tuple[str, ...]
+
+DEFAULT_BUCKETS = (
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0
+)
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+
+class Metric:
+
+    type: str
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def snapshot(self) -> Dict[str, Any]:
+        raise NotImplementedError()
+
+    def _describe(self, samples: List[Any]) -> Dict[str, Any]:
+        return {
+            'type': self.type,
+            'help': self.documentation,
+            'labelnames': list(self.labelnames),
+            'samples': samples
+        }
+
+
+class Counter(Metric):
+
+    type = 'counter'
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, *labelvalues: str, amount: float = 1.0) -> None:
+        with self._lock:
+            self._values[labelvalues] = self._values.get(labelvalues, 0.0) + amount
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            samples = [[list(labels), value] for labels, value in self._values.items()]
+        return self._describe(samples)
+
+
+class Histogram(Metric):
+
+    type = 'histogram'
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(buckets)
+        # per label values: one count per bucket plus +Inf, then the sum
+        self._observations: Dict[LabelValues, List[float]] = {}
+
+    def observe(self, value: float, *labelvalues: str) -> None:
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            observation = self._observations.get(labelvalues)
+            if observation is None:
+                observation = self._observations[labelvalues] = \
+                    [0] * (len(self.buckets) + 1) + [0.0]
+            observation[index] += 1
+            observation[-1] += value
+
+    @contextlib.contextmanager
+    def time(self, *labelvalues: str) -> Iterator[None]:
+        started_at = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started_at, *labelvalues)
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            samples = [
+                [list(labels), list(observation)]
+                for labels, observation in self._observations.items()
+            ]
+        return {**self._describe(samples), 'buckets': list(self.buckets)}
+
+
+class CallbackGauge(Metric):
+    """Gauge whose samples are read by `collect` when the metrics are
+    exported, for values owned by something else (e.g. open connections)."""
+
+    type = 'gauge'
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str],
+        collect: Callable[[], Iterable[Tuple[LabelValues, float]]]
+    ):
+        super().__init__(name, documentation, labelnames)
+        self._collect = collect
+
+    def snapshot(self) -> Dict[str, Any]:
+        return self._describe([[list(labels), value] for labels, value in self._collect()])
+
+
+MetricT = TypeVar('MetricT', bound=Metric)
+
+
+class Registry:
+
+    def __init__(self):
+        self._metrics: Dict[str, Metric] = {}
+
+    def register(self, metric: MetricT) -> MetricT:
+        self._metrics[metric.name] = metric
+        return metric
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        return {name: metric.snapshot() for name, metric in self._metrics.items()}
+
+
+registry = Registry()
+
+http_requests_total = registry.register(Counter(
+    'http_requests_total', 'HTTP requests by handler and status code',
+    ['handler', 'status']
+))
+http_request_duration_seconds = registry.register(Histogram(
+    'http_request_duration_seconds', 'HTTP request latency by handler',
+    ['handler']
+))
+use_case_duration_seconds = registry.register(Histogram(
+    'use_case_duration_seconds', 'Use case execute() latency by use case class',
+    ['use_case']
+))
+repository_operation_duration_seconds = registry.register(Histogram(
+    'repository_operation_duration_seconds', 'Repository operation latency',
+    ['repository', 'operation']
+))
+http_request_db_duration_seconds = registry.register(Histogram(
+    'http_request_db_duration_seconds', 'Time spent in SQL queries per request by handler',
+    ['handler']
+))
+db_queries_total = registry.register(Counter(
+    'db_queries_total', 'SQL queries executed while serving requests by handler',
+    ['handler']
+))
+db_connections_opened_total = registry.register(Counter(
+    'db_connections_opened_total', 'Database connections opened', ['alias']
+))
+
+
+# every connection wrapper that connected at least once, one per thread and alias
+_wrappers: 'weakref.WeakSet' = weakref.WeakSet()
+_wrappers_lock = threading.Lock()
+
+
+def _open_connections() -> Iterable[Tuple[LabelValues, float]]:
+    with _wrappers_lock:
+        wrappers = list(_wrappers)
+    opened = Tally(wrapper.alias for wrapper in wrappers if wrapper.connection is not None)
+    return [((alias,), float(count)) for alias, count in opened.items()]
+
+
+def _pool_stats(key: str) -> Callable[[], Iterable[Tuple[LabelValues, float]]]:
+    def collect():
+        samples = []
+        for alias in connections:
+            if 'pool' not in connections.settings[alias].get('OPTIONS', {}):
+                continue
+            pool = getattr(connections[alias], 'pool', None)
+            if pool is not None:
+                samples.append(((alias,), float(pool.get_stats().get(key, 0))))
+        return samples
+    return collect
+
+
+db_connections_open = registry.register(CallbackGauge(
+    'db_connections_open', 'Database connections currently open in this process',
+    ['alias'], _open_connections
+))
+db_pool_size = registry.register(CallbackGauge(
+    'db_pool_size', 'Connections managed by the pool, idle or in use',
+    ['alias'], _pool_stats('pool_size')
+))
+db_pool_available = registry.register(CallbackGauge(
+    'db_pool_available', 'Idle connections ready in the pool',
+    ['alias'], _pool_stats('pool_available')
+))
+db_pool_requests_waiting = registry.register(CallbackGauge(
+    'db_pool_requests_waiting', 'Requests waiting for a pooled connection',
+    ['alias'], _pool_stats('requests_waiting')
+))
+
+
+def record_use_case_duration(seconds: float, use_case: str) -> None:
+    use_case_duration_seconds.observe(seconds, use_case)
+
+
+def handler_name(request: HttpRequest) -> str:
+    match = getattr(request, 'resolver_match', None)
+    if match is None:
+        return 'unmatched'
+    view_class = getattr(match.func, 'view_class', None)
+    view_name = view_class.__name__ if view_class else match.func.__name__
+    return f'{view_name}.{request.method.lower()}'
+
+
+def _count_connection(sender, connection, **kwargs):  # pylint: disable=unused-argument
+    db_connections_opened_total.inc(connection.alias)
+    with _wrappers_lock:
+        _wrappers.add(connection)
+
+
+connection_created.connect(_count_connection)
+
+
+class InstrumentedRepository:
+    """Proxies a repository and records the latency of its operations."""
+
+    operations = (
+        'insert', 'bulk_insert', 'find_by_id', 'find_all', 'update',
+        'upsert', 'bulk_upsert', 'delete', 'search',
+    )
+
+    def __init__(self, repository):
+        self._repository = repository
+        repository_name = type(repository).__name__
+        for operation in self.operations:
+            method = getattr(repository, operation, None)
+            if method is not None:
+                setattr(self, operation, _timed(method, repository_name, operation))
+
+    def __getattr__(self, name: str):
+        return getattr(self._repository, name)
+
+
+def _timed(method, repository_name: str, operation: str):
+    labels = (repository_name, operation)
+
+    if inspect.iscoroutinefunction(method):
+        @functools.wraps(method)
+        async def async_wrapper(*args, **kwargs):
+            with repository_operation_duration_seconds.time(*labels):
+                return await method(*args, **kwargs)
+        return async_wrapper
+
+    @functools.wraps(method)
+    def wrapper(*args, **kwargs):
+        with repository_operation_duration_seconds.time(*labels):
+            return method(*args, **kwargs)
+    return wrapper
+
+
+class MultiProcessStore:
+    """Snapshot files of every worker process, one JSON file per process.
+
+    A worker writes its file from a background thread every
+    `flush_interval` seconds, never on the request path. At exit it adds its
+    snapshot to the totals of the dead processes and removes its file, and
+    collect() does the same for the files of processes that died without
+    exiting, without their gauges. A file is named after the pid and a token of the process: a
+    new process reusing a pid writes a file of its own instead of replacing
+    the counts of the previous one. The directory is meant for the workers
+    of one host, a process is alive when its pid is.
+    """
+
+    DEAD = 'dead.json'
+
+    def __init__(self, directory: Path, flush_interval: float = 1.0):
+        self.directory = Path(directory)
+        self.flush_interval = flush_interval
+        self._lock = threading.Lock()
+        self._pid: Optional[int] = None
+        self._path: Optional[Path] = None
+        self._flusher_pid: Optional[int] = None
+        self._stopped = threading.Event()
+
+    @property
+    def path(self) -> Path:
+        """The file of the current process."""
+        pid = os.getpid()
+        if self._pid != pid:
+            # a worker forked after the store was created gets a file of its own
+            self._pid, self._path = pid, self.directory / f'{pid}-{uuid.uuid4().hex[:12]}.json'
+        return self._path
+
+    def start(self, source: Registry) -> None:
+        """Flushes `source` in a daemon thread of the current process, once
+        more and retires its file at exit. A no-op once started."""
+        pid = os.getpid()
+        if self._flusher_pid == pid:
+            return
+        with self._lock:
+            if self._flusher_pid == pid:
+                return
+            self._flusher_pid = pid
+            self._stopped = threading.Event()
+            threading.Thread(
+                target=self._run, args=(source, self._stopped), name='metrics-flush', daemon=True
+            ).start()
+            atexit.register(self.close, source)
+
+    def _run(self, source: Registry, stopped: threading.Event) -> None:
+        while not stopped.wait(self.flush_interval):
+            with contextlib.suppress(OSError):
+                self.flush(source)
+
+    def close(self, source: Registry) -> None:
+        """Stops the flusher, the counts of the process go to the dead totals."""
+        self._stopped.set()
+        atexit.unregister(self.close)
+        with contextlib.suppress(OSError):
+            self.flush(source)
+            with self._exclusive():
+                self._retire(self.path)
+
+    def flush(self, source: Registry) -> None:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        data = json.dumps(source.snapshot())
+        with self._lock:
+            self._write(self.path, data)
+
+    def collect(self) -> Dict[str, Dict[str, Any]]:
+        merged: Dict[str, Dict[str, Any]] = {}
+        with self._exclusive():
+            for path in self._process_files():
+                if not _is_alive(int(path.name.split('-')[0].removesuffix('.json'))):
+                    self._retire(path)
+            for path in [self.directory / self.DEAD, *self._process_files()]:
+                snapshot = _read_snapshot(path)
+                if snapshot is not None:
+                    merge_snapshots(merged, snapshot)
+        return merged
+
+    def _process_files(self) -> List[Path]:
+        return sorted(path for path in self.directory.glob('*.json') if path.name[0].isdigit())
+
+    def _retire(self, path: Path) -> None:
+        # adds the counters and histograms of a process that is gone to the
+        # dead totals, with the lock of the directory held. Its gauges are
+        # dropped: the connections it had open are gone with it
+        snapshot = _read_snapshot(path)
+        if snapshot is not None:
+            dead = _read_snapshot(self.directory / self.DEAD) or {}
+            merge_snapshots(dead, {
+                name: metric for name, metric in snapshot.items() if metric['type'] != CallbackGauge.type
+            })
+            self._write(self.directory / self.DEAD, json.dumps(dead))
+        path.unlink(missing_ok=True)
+
+    def _write(self, path: Path, data: str) -> None:
+        with tempfile.NamedTemporaryFile(
+            'w', dir=self.directory, suffix='.tmp', delete=False, encoding='utf-8'
+        ) as file:
+            file.write(data)
+        os.replace(file.name, path)
+
+    @contextlib.contextmanager
+    def _exclusive(self) -> Iterator[None]:
+        # the processes sharing the directory retire files one at a time
+        self.directory.mkdir(parents=True, exist_ok=True)
+        with open(self.directory / '.lock', 'w', encoding='utf-8') as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+
+
+def _read_snapshot(path: Path) -> Optional[Dict[str, Dict[str, Any]]]:
+    try:
+        return json.loads(path.read_text(encoding='utf-8'))
+    except (OSError, ValueError):
+        return None
+
+
+def _is_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        # a process of another user
+        return True
+    return True
+
+
+def merge_snapshots(target: Dict[str, Dict[str, Any]], snapshot: Dict[str, Dict[str, Any]]) -> None:
+    for name, metric in snapshot.items():
+        if name not in target:
+            target[name] = {**metric, 'samples': []}
+        merged = {tuple(labels): value for labels, value in target[name]['samples']}
+        for labels, value in metric['samples']:
+            labels = tuple(labels)
+            if labels not in merged:
+                merged[labels] = value
+            elif isinstance(value, list):
+                merged[labels] = [a + b for a, b in zip(merged[labels], value)]
+            else:
+                merged[labels] += value
+        target[name]['samples'] = [[list(labels), value] for labels, value in merged.items()]
+
+
+@functools.lru_cache(maxsize=None)
+def multiprocess_store() -> Optional[MultiProcessStore]:
+    directory = getattr(settings, 'METRICS_MULTIPROCESS_DIR', None)
+    if not directory:
+        return None
+    return MultiProcessStore(
+        directory, getattr(settings, 'METRICS_FLUSH_INTERVAL', 1.0))
+
+
+def _escape(value: str) -> str:
+    return str(value).replace('\\', r'\\').replace('\n', r'\n').replace('"', r'\"')
+
+
+def _labels(names: Sequence[str], values: Sequence[str], extra: str = '') -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+def _format_value(value: float) -> str:
+    return repr(float(value))
+
+
+def render(snapshot: Dict[str, Dict[str, Any]]) -> str:
+    lines = []
+    for name, metric in snapshot.items():
+        lines.append(f'# HELP {name} {metric["help"]}')
+        lines.append(f'# TYPE {name} {metric["type"]}')
+        labelnames = metric['labelnames']
+        for labels, value in metric['samples']:
+            if metric['type'] != 'histogram':
+                lines.append(f'{name}{_labels(labelnames, labels)} {_format_value(value)}')
+                continue
+            cumulative = 0
+            bounds = [_format_value(bound) for bound in metric['buckets']] + ['+Inf']
+            for bound, count in zip(bounds, value[:-1]):
+                cumulative += count
+                bucket_labels = _labels(labelnames, labels, f'le="{bound}"')
+                lines.append(f'{name}_bucket{bucket_labels} {_format_value(cumulative)}')
+            lines.append(f'{name}_sum{_labels(labelnames, labels)} {_format_value(value[-1])}')
+            lines.append(f'{name}_count{_labels(labelnames, labels)} {_format_value(cumulative)}')
+    return '\n'.join(lines) + '\n'
+
+
+def metrics_view(_request: HttpRequest) -> HttpResponse:
+    store = multiprocess_store()
+    if store is None:
+        snapshot = registry.snapshot()
+    else:
+        store.start(registry)
+        store.flush(registry)
+        snapshot = store.collect()
+    return HttpResponse(render(snapshot), content_type=CONTENT_TYPE)
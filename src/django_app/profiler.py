@@ -0,0 +1,122 @@
+"""
+On-demand statistical profiler for a running worker.
+
+A daemon thread samples the stack of every other thread of the process at a
+fixed interval, so the overhead is bounded by the sampling rate and nothing
+runs while no profile is being taken. The result is in the collapsed stack
+format (`frame;frame;frame count` per line) read by flamegraph.pl,
+speedscope and inferno.
+
+The view waits for the profile without blocking the worker: it is async,
+under ASGI the event loop keeps serving the other requests (and is sampled
+doing so) while it sleeps.
+"""
+import asyncio
+import sys
+import threading
+from collections import Counter
+from typing import Dict, Optional, Set
+
+from asgiref.sync import sync_to_async
+from django.contrib.admin.views.decorators import staff_member_required
+from django.http import HttpRequest, HttpResponse, HttpResponseNotAllowed
+from rest_framework.status import HTTP_400_BAD_REQUEST, HTTP_409_CONFLICT
+
+MAX_DURATION = 60.0
+DEFAULT_INTERVAL = 0.005
+
+
+def _frame_name(frame) -> str:
+    module = frame.f_globals.get('__name__', '?')
+    return f'{module}:{frame.f_code.co_name}'
+
+
+class SamplingProfiler:
+
+    def __init__(self, interval: float = DEFAULT_INTERVAL, focus: Optional[str] = None):
+        self.interval = interval
+        # keep only the stacks going through a module starting with this prefix
+        self.focus = focus
+        self.samples: Counter = Counter()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        self._thread = threading.Thread(
+            target=self._run, name='sampling-profiler', daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self) -> None:
+        ignored = {threading.get_ident()}
+        while not self._stop.wait(self.interval):
+            self.sample(sys._current_frames(), ignored)  # pylint: disable=protected-access
+
+    def sample(self, frames: Dict[int, object], ignored: Set[int] = frozenset()) -> None:
+        for ident, frame in frames.items():
+            if ident in ignored:
+                continue
+            stack = []
+            while frame is not None:
+                stack.append(_frame_name(frame))
+                frame = frame.f_back
+            if self.focus and not any(name.startswith(self.focus) for name in stack):
+                continue
+            stack.reverse()
+            self.samples[';'.join(stack)] += 1
+
+    def collapsed(self) -> str:
+        return ''.join(
+            f'{stack} {count}\n' for stack, count in self.samples.most_common()
+        )
+
+
+_profiling = threading.Lock()
+
+
+async def profile(seconds: float, interval: float = DEFAULT_INTERVAL, focus: Optional[str] = None) -> str:
+    profiler = SamplingProfiler(interval, focus)
+    profiler.start()
+    try:
+        await asyncio.sleep(seconds)
+    finally:
+        profiler.stop()
+    return profiler.collapsed()
+
+
+# the login check of staff_member_required, None for staff users. It reads
+# the user of the session, a sync query
+_deny_non_staff = staff_member_required(lambda _request: None)
+
+
+async def profile_view(request: HttpRequest) -> HttpResponse:
+    """Samples this process for ?seconds=N (default 10) every ?interval_ms
+    (default 5) and returns the collapsed stacks, ?focus=core keeps only the
+    stacks running application code."""
+    if request.method != 'GET':
+        return HttpResponseNotAllowed(['GET'])
+    denied = await sync_to_async(_deny_non_staff)(request)
+    if denied is not None:
+        return denied
+    try:
+        seconds = float(request.GET.get('seconds', 10))
+        interval = float(request.GET.get('interval_ms', DEFAULT_INTERVAL * 1000)) / 1000
+    except ValueError:
+        return HttpResponse('seconds and interval_ms must be numbers', status=HTTP_400_BAD_REQUEST)
+    if not 0 < seconds <= MAX_DURATION or interval <= 0:
+        return HttpResponse(
+            f'seconds must be in (0, {MAX_DURATION:g}] and interval_ms positive',
+            status=HTTP_400_BAD_REQUEST
+        )
+
+    # one profile at a time, the samplers would slow each other down
+    if not _profiling.acquire(blocking=False):
+        return HttpResponse('a profile is already running', status=HTTP_409_CONFLICT)
+    try:
+        output = await profile(seconds, interval, request.GET.get('focus') or None)
+    finally:
+        _profiling.release()
+    return HttpResponse(output, content_type='text/plain; charset=utf-8')
@@ -0,0 +1,103 @@
+"""
+Read/write splitting across the primary and its read replicas.
+
+Writes always go to `default`, the primary. Reads go to one of the
+DATABASE_REPLICAS, except when the replica could miss data the caller just
+wrote: inside a transaction on the primary, after a write in the same
+request (replication lag would hide it from the rest of the request) and
+inside use_primary().
+"""
+import contextlib
+import random
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Iterator, List, Optional
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+
+@dataclass(slots=True)
+class _Stickiness:
+    # the request wrote or is going to write to the primary
+    wrote: bool = False
+
+
+_request: ContextVar[Optional[_Stickiness]] = ContextVar('replica_stickiness', default=None)
+_primary: ContextVar[bool] = ContextVar('use_primary', default=False)
+
+
+@contextlib.contextmanager
+def use_primary() -> Iterator[None]:
+    """Reads of the block go to the primary."""
+    token = _primary.set(True)
+    try:
+        yield
+    finally:
+        _primary.reset(token)
+
+
+def replicas() -> List[str]:
+    return getattr(settings, 'DATABASE_REPLICAS', [])
+
+
+def reads_primary() -> bool:
+    request = _request.get()
+    return _primary.get() \
+        or (request is not None and request.wrote) \
+        or connections[DEFAULT_DB_ALIAS].in_atomic_block
+
+
+class ReplicaRouter:
+
+    def db_for_read(self, model, **hints):  # pylint: disable=unused-argument
+        aliases = replicas()
+        if not aliases or reads_primary():
+            return DEFAULT_DB_ALIAS
+        return random.choice(aliases)
+
+    def db_for_write(self, model, **hints):  # pylint: disable=unused-argument
+        request = _request.get()
+        if request is not None:
+            request.wrote = True
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):  # pylint: disable=unused-argument
+        # the replicas hold the same data as the primary
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):  # pylint: disable=unused-argument
+        return db not in replicas()
+
+
+class ReplicaStickinessMiddleware:
+    """Sends the reads of a request to the primary once it wrote something.
+    Requests with unsafe methods read from the primary from the start, their
+    reads usually lead to a write based on them (e.g. find then update)."""
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        token = _request.set(_Stickiness(wrote=request.method not in SAFE_METHODS))
+        try:
+            return self.get_response(request)
+        finally:
+            _request.reset(token)
+
+    async def __acall__(self, request):
+        token = _request.set(_Stickiness(wrote=request.method not in SAFE_METHODS))
+        try:
+            return await self.get_response(request)
+        finally:
+            _request.reset(token)
@@ -10,8 +10,11 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/4.2/ref/settings/
 """
 
+import os
 from pathlib import Path
 
+from django_app.database import database_from_env, env_bool, replicas_from_env
+
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent.parent
 
@@ -42,6 +45,8 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'django_app.instrumentation.RequestMetricsMiddleware',
+    'django_app.routers.ReplicaStickinessMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -53,6 +58,56 @@ MIDDLEWARE = [
 
 ROOT_URLCONF = 'django_app.urls'
 
+# requests slower than this or running more queries are logged by
+# django_app.instrumentation.RequestMetricsMiddleware
+SLOW_REQUEST_THRESHOLD_MS = 500
+SLOW_REQUEST_QUERY_THRESHOLD = 10
+
+# with several worker processes every process writes its metrics to this
+# directory and /metrics aggregates them, see django_app.metrics
+METRICS_MULTIPROCESS_DIR = os.environ.get('METRICS_MULTIPROCESS_DIR')
+METRICS_FLUSH_INTERVAL = 1.0
+
+# use case interceptors, see the use_case_interceptors provider in django_app.containers
+USE_CASE_SLOW_CALL_MS = 200
+USE_CASE_PROFILE_RATE = float(os.environ.get('USE_CASE_PROFILE_RATE', 0))
+USE_CASE_PROFILE_DIR = os.environ.get('USE_CASE_PROFILE_DIR')
+USE_CASE_TRACING = env_bool(os.environ, 'USE_CASE_TRACING', False)
+USE_CASE_TRACE_FILE = os.environ.get('USE_CASE_TRACE_FILE')
+
+# repository queries slower than this are kept with their EXPLAIN output,
+# the last SLOW_QUERY_LOG_SIZE are listed by /admin/slow-queries/
+SLOW_QUERY_THRESHOLD_MS = 100
+SLOW_QUERY_LOG_SIZE = 100
+
+# icontains (substring of the name) or fulltext (indexed word prefixes of the
+# name and description, sortable by rank), see core.category.infra.django_app.search
+CATEGORY_SEARCH_BACKEND = os.environ.get('CATEGORY_SEARCH_BACKEND', 'icontains')
+
+# seconds a category write waits before GET /categories/?updated_since= lists
+# it, so writes committing out of order aren't skipped, see
+# core.category.infra.django_app.repositories.CategoryDjangoUpdatesFeed
+CATEGORY_UPDATES_SAFETY_LAG = float(os.environ.get('CATEGORY_UPDATES_SAFETY_LAG', '5'))
+
+# seconds an event waits before GET /categories/changes lists it, for the same
+# reason, see core.category.infra.django_app.outbox.CategoryDjangoChangeFeed
+CATEGORY_CHANGES_SAFETY_LAG = float(os.environ.get('CATEGORY_CHANGES_SAFETY_LAG', '5'))
+
+# objects (a list of categories) or columnar (a compact column per field),
+# see core.category.infra.in_memory.columnar
+CATEGORY_IN_MEMORY_STORAGE = os.environ.get('CATEGORY_IN_MEMORY_STORAGE', 'objects')
+# how the columnar storage filters and sorts: python, numpy or auto (numpy
+# when it is installed), see core.category.infra.in_memory.search_engines
+CATEGORY_IN_MEMORY_SEARCH_ENGINE = os.environ.get('CATEGORY_IN_MEMORY_SEARCH_ENGINE', 'auto')
+# copy-on-write writes and lock-free reads of the objects storage, for
+# threaded servers, see core.__seedwork.domain.repositories.InMemoryRepository
+CATEGORY_IN_MEMORY_THREAD_SAFE = env_bool(os.environ, 'CATEGORY_IN_MEMORY_THREAD_SAFE', False)
+
+# directory of the category read model shared by the worker processes,
+# published by publish_category_read_model, see core.category.infra.in_memory.shared
+CATEGORY_READ_MODEL_DIR = os.environ.get('CATEGORY_READ_MODEL_DIR')
+CATEGORY_READ_MODEL_REFRESH_INTERVAL = float(os.environ.get('CATEGORY_READ_MODEL_REFRESH_INTERVAL', '1'))
+
 TEMPLATES = [
     {
         'BACKEND': 'django.template.backends.django.DjangoTemplates',
@@ -75,12 +130,17 @@ WSGI_APPLICATION = 'django_app.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/4.2/ref/settings/#databases
 
+# DB_ENGINE, DB_NAME, DB_CONN_MAX_AGE, DB_CONN_HEALTH_CHECKS, DB_POOL...,
+# see django_app.database
 DATABASES = {
-    'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
-    }
+    'default': database_from_env(os.environ, BASE_DIR / 'db.sqlite3')
 }
+DATABASES.update(replicas_from_env(os.environ, DATABASES['default']))
+
+# reads go to the replicas, writes and the reads that follow them in the
+# same request to the primary, see django_app.routers
+DATABASE_REPLICAS = [alias for alias in DATABASES if alias != 'default']
+DATABASE_ROUTERS = ['django_app.routers.ReplicaRouter']
 
 
 # Password validation
@@ -0,0 +1,132 @@
+"""
+Slow query log for repository operations.
+
+Repositories run their queries inside SlowQueryRecorder.capture(), or
+acapture() for the async ORM. Queries
+slower than the threshold are kept, with the repository context (e.g. the
+SearchParams) and the backend's EXPLAIN output, in a bounded ring buffer of
+the process, served to staff users by /admin/slow-queries/.
+"""
+import contextlib
+import datetime
+import threading
+import time
+from collections import deque
+from contextvars import ContextVar
+from dataclasses import asdict, dataclass
+from typing import Any, AsyncIterator, Deque, Dict, Iterator, List, Optional, Tuple
+
+from asgiref.sync import sync_to_async
+from django.contrib.admin.views.decorators import staff_member_required
+from django.db import DatabaseError, connections
+from django.http import HttpRequest, JsonResponse
+from django.views.decorators.http import require_GET
+
+
+@dataclass(slots=True, frozen=True)
+class SlowQuery:
+    sql: str
+    params: List[Any]
+    duration_ms: float
+    context: Dict[str, Any]
+    explain: Optional[str]
+    recorded_at: str
+
+
+_explaining: ContextVar[bool] = ContextVar('explaining_slow_query', default=False)
+
+
+class SlowQueryRecorder:
+
+    def __init__(self, threshold_ms: float = 100, maxlen: int = 100, explain: bool = True):
+        self.threshold_ms = threshold_ms
+        self.explain = explain
+        self._entries: Deque[SlowQuery] = deque(maxlen=maxlen)
+        self._lock = threading.Lock()
+
+    @contextlib.contextmanager
+    def capture(self, using: str = 'default', **context: Any) -> Iterator[None]:
+        if _explaining.get():
+            yield
+            return
+
+        connection = connections[using]
+        slow: List[Tuple[str, Any, float]] = []
+
+        def wrapper(execute, sql, params, many, execute_context):
+            started_at = time.perf_counter()
+            try:
+                return execute(sql, params, many, execute_context)
+            finally:
+                duration_ms = (time.perf_counter() - started_at) * 1000
+                if duration_ms >= self.threshold_ms:
+                    slow.append((sql, params, duration_ms))
+
+        with connection.execute_wrapper(wrapper):
+            yield
+
+        # EXPLAIN runs once the repository is done with the connection
+        for sql, params, duration_ms in slow:
+            self._record(SlowQuery(
+                sql=sql,
+                params=list(params or []),
+                duration_ms=round(duration_ms, 3),
+                context=context,
+                explain=self._explain(connection, sql, params) if self.explain else None,
+                recorded_at=datetime.datetime.now(datetime.timezone.utc).isoformat()
+            ))
+
+    @contextlib.asynccontextmanager
+    async def acapture(self, using: str = 'default', **context: Any) -> AsyncIterator[None]:
+        """capture() around async ORM queries. They run in the thread of the
+        thread sensitive sync_to_async() calls, which has connections of its
+        own: the wrapper is installed and the EXPLAIN run in that thread."""
+        capture = self.capture(using, **context)
+        await sync_to_async(capture.__enter__)()
+        try:
+            yield
+        except BaseException as exception:
+            if not await sync_to_async(capture.__exit__)(type(exception), exception, exception.__traceback__):
+                raise
+        else:
+            await sync_to_async(capture.__exit__)(None, None, None)
+
+    def entries(self) -> List[SlowQuery]:
+        """Newest first."""
+        with self._lock:
+            return list(reversed(self._entries))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def _record(self, entry: SlowQuery) -> None:
+        with self._lock:
+            self._entries.append(entry)
+
+    @staticmethod
+    def _explain(connection, sql: str, params) -> Optional[str]:
+        if not sql.lstrip().upper().startswith('SELECT'):
+            return None
+        token = _explaining.set(True)
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute(f'{connection.ops.explain_query_prefix()} {sql}', params)
+                return '\n'.join(
+                    ' '.join(str(column) for column in row) for row in cursor.fetchall()
+                )
+        except DatabaseError as exception:
+            return f'EXPLAIN failed: {exception}'
+        finally:
+            _explaining.reset(token)
+
+
+@require_GET
+@staff_member_required
+def slow_queries_view(_request: HttpRequest) -> JsonResponse:
+    from django_app import container  # pylint: disable=import-outside-toplevel
+    recorder: SlowQueryRecorder = container.slow_query_recorder()
+    return JsonResponse({
+        'threshold_ms': recorder.threshold_ms,
+        'items': [asdict(entry) for entry in recorder.entries()]
+    })
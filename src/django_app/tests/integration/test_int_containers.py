@@ -0,0 +1,54 @@
+import tempfile
+from pathlib import Path
+
+import pytest
+from django.test import override_settings
+from model_bakery import baker
+
+from core.category.application.use_cases import (
+    CreateCategoryUseCase,
+    GetCategoryUseCase,
+    ListCategoriesUseCase
+)
+from core.category.domain.entities import Category
+from core.category.infra.django_app.models import CategoryModel
+from core.category.infra.in_memory.shared import SharedCategoryStore
+from django_app.containers import Container
+
+
+@pytest.mark.django_db
+class TestCategoryReadModelInt:
+
+    def test_reads_go_to_the_database_without_a_read_model(self):
+        model = baker.make(CategoryModel)
+        container = Container()
+
+        assert container.repository_category_shared() is None
+        output = container.use_case_category_get_category().execute(GetCategoryUseCase.Input(str(model.id)))
+        assert output.id == str(model.id)
+
+    def test_reads_go_to_the_read_model(self):
+        model = baker.make(CategoryModel)
+        with tempfile.TemporaryDirectory() as directory, override_settings(
+            CATEGORY_READ_MODEL_DIR=directory, CATEGORY_READ_MODEL_REFRESH_INTERVAL=0
+        ):
+            container = Container()
+            get_category = container.use_case_category_get_category()
+            list_categories = container.use_case_category_list_categories()
+
+            # the database until a generation is published
+            assert get_category.execute(GetCategoryUseCase.Input(str(model.id))).id == str(model.id)
+            assert list_categories.execute(ListCategoriesUseCase.Input()).total == 1
+
+            movie = Category(name='Published movie')
+            SharedCategoryStore(Path(directory)).publish([movie])
+            output = list_categories.execute(ListCategoriesUseCase.Input())
+            assert [item.id for item in output.items] == [movie.id]
+
+            # the writes still go to the database, and get finds them before
+            # the next publish
+            created = container.use_case_category_create_category().execute(
+                CreateCategoryUseCase.Input(name='New'))
+            assert CategoryModel.objects.count() == 2
+            assert get_category.execute(GetCategoryUseCase.Input(created.id)).name == 'New'
+            assert list_categories.execute(ListCategoriesUseCase.Input()).total == 1
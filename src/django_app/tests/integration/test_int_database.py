@@ -0,0 +1,44 @@
+import pytest
+from django.db import connections
+from django.db.backends.sqlite3.base import DatabaseWrapper
+
+from django_app.database import SQLITE_PRAGMAS
+
+
+def pragma(wrapper: DatabaseWrapper, name: str):
+    with wrapper.cursor() as cursor:
+        cursor.execute(f'PRAGMA {name}')
+        return cursor.fetchone()[0]
+
+
+@pytest.mark.django_db
+class TestSqlitePragmasInt:
+
+    def open(self, tmp_path, pragmas) -> DatabaseWrapper:
+        wrapper = DatabaseWrapper({
+            **connections['default'].settings_dict,
+            'NAME': str(tmp_path / 'pragmas.sqlite3'),
+            'SQLITE_PRAGMAS': pragmas,
+        }, alias='pragmas')
+        wrapper.ensure_connection()
+        return wrapper
+
+    def test_applied_on_connection(self, tmp_path):
+        wrapper = self.open(tmp_path, SQLITE_PRAGMAS)
+        try:
+            assert pragma(wrapper, 'journal_mode') == 'wal'
+            assert pragma(wrapper, 'synchronous') == 1
+            assert pragma(wrapper, 'mmap_size') == SQLITE_PRAGMAS['mmap_size']
+            assert pragma(wrapper, 'cache_size') == SQLITE_PRAGMAS['cache_size']
+            assert pragma(wrapper, 'busy_timeout') == 5000
+            assert pragma(wrapper, 'temp_store') == 2
+        finally:
+            wrapper.close()
+
+    def test_sqlite_defaults(self, tmp_path):
+        wrapper = self.open(tmp_path, {})
+        try:
+            assert pragma(wrapper, 'journal_mode') == 'delete'
+            assert pragma(wrapper, 'synchronous') == 2
+        finally:
+            wrapper.close()
@@ -0,0 +1,112 @@
+import re
+import threading
+
+import pytest
+from django.db import connections
+from django.test import Client, override_settings
+
+from django_app import metrics
+
+
+def sample(body: str, line_prefix: str) -> float:
+    match = re.search(rf'^{re.escape(line_prefix)} (\S+)$', body, re.MULTILINE)
+    return float(match.group(1)) if match else 0.0
+
+
+@pytest.mark.django_db
+class TestMetricsEndpointInt:
+
+    def test_metrics(self):
+        client = Client()
+        before = client.get('/metrics').content.decode()
+
+        response = client.post(
+            '/categories/', {'name': 'Movie'}, content_type='application/json')
+        client.get(f"/categories/{response.json()['id']}/")
+        client.get('/categories/')
+
+        response = client.get('/metrics')
+        assert response.status_code == 200
+        assert response['Content-Type'] == metrics.CONTENT_TYPE
+        body = response.content.decode()
+
+        for line, increment in [
+            ('http_requests_total{handler="CategoryResource.post",status="201"}', 1),
+            ('http_requests_total{handler="CategoryResource.get",status="200"}', 2),
+            ('http_request_duration_seconds_count{handler="CategoryResource.get"}', 2),
+            ('use_case_duration_seconds_count{use_case="CreateCategoryUseCase"}', 1),
+            ('use_case_duration_seconds_count{use_case="GetCategoryUseCase"}', 1),
+            ('use_case_duration_seconds_count{use_case="ListCategoriesUseCase"}', 1),
+            ('repository_operation_duration_seconds_count'
+             '{repository="CategoryDjangoRepository",operation="insert"}', 1),
+            ('repository_operation_duration_seconds_count'
+             '{repository="CategoryDjangoRepository",operation="search"}', 1),
+            # the INSERTs of the category and of its outbox event, in a savepoint
+            ('db_queries_total{handler="CategoryResource.post"}', 4),
+        ]:
+            assert sample(body, line) - sample(before, line) == increment, line
+        assert '# TYPE http_request_duration_seconds histogram' in body
+
+    def test_metrics_aggregated_across_processes(self, tmp_path):
+        (tmp_path / '1.json').write_text(
+            '{"http_requests_total": {"type": "counter", "help": "HTTP requests", '
+            '"labelnames": ["handler", "status"], '
+            '"samples": [[["CategoryResource.delete", "204"], 5.0]]}}',
+            encoding='utf-8'
+        )
+        metrics.multiprocess_store.cache_clear()
+        try:
+            with override_settings(METRICS_MULTIPROCESS_DIR=str(tmp_path)):
+                body = Client().get('/metrics').content.decode()
+        finally:
+            metrics.multiprocess_store.cache_clear()
+
+        assert sample(
+            body, 'http_requests_total{handler="CategoryResource.delete",status="204"}'
+        ) >= 5
+        assert len(list(tmp_path.glob('*.json'))) == 2
+
+
+def open_connections() -> float:
+    samples = dict(
+        (tuple(labels), value)
+        for labels, value in metrics.db_connections_open.snapshot()['samples']
+    )
+    return samples.get(('default',), 0.0)
+
+
+class FakePool:
+
+    @staticmethod
+    def get_stats():
+        return {'pool_size': 4, 'pool_available': 3, 'requests_waiting': 0}
+
+
+@pytest.mark.django_db
+class TestConnectionMetricsInt:
+
+    def test_open_connections(self):
+        counts = []
+
+        def work():
+            before = open_connections()
+            with connections['default'].cursor() as cursor:
+                cursor.execute('SELECT 1')
+            counts.append(open_connections() - before)
+
+        thread = threading.Thread(target=work)
+        thread.start()
+        thread.join()
+
+        assert counts == [1]
+
+    def test_pool_stats(self, monkeypatch):
+        monkeypatch.setitem(connections.settings['default'], 'OPTIONS', {'pool': {}})
+        monkeypatch.setattr(connections['default'], 'pool', FakePool(), raising=False)
+
+        body = Client().get('/metrics').content.decode()
+
+        assert sample(body, 'db_pool_size{alias="default"}') == 4
+        assert sample(body, 'db_pool_available{alias="default"}') == 3
+        assert sample(body, 'db_pool_requests_waiting{alias="default"}') == 0
+        assert '# TYPE db_connections_open gauge' in body
@@ -0,0 +1,84 @@
+import asyncio
+import threading
+import time
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.contrib.auth.models import User
+from django.test import AsyncClient, Client, override_settings
+
+from core.category.infra.fixtures import CategoryDatasetFixture
+
+
+def generate_categories(stop: threading.Event):
+    fixture = CategoryDatasetFixture()
+    while not stop.is_set():
+        for _ in fixture.rows(100):
+            pass
+
+
+@pytest.mark.django_db
+class TestProfileEndpointInt:
+
+    def test_admin_only(self):
+        response = Client().get('/admin/profile/?seconds=0.01')
+        assert response.status_code == 302
+        assert response['Location'].startswith('/admin/login/')
+
+    def test_profile(self):
+        client = Client()
+        client.force_login(User.objects.create_user('admin', is_staff=True))
+
+        stop = threading.Event()
+        worker = threading.Thread(target=generate_categories, args=(stop,))
+        worker.start()
+        try:
+            response = client.get(
+                '/admin/profile/', {'seconds': 0.2, 'interval_ms': 1, 'focus': 'core.'})
+        finally:
+            stop.set()
+            worker.join()
+
+        assert response.status_code == 200
+        lines = response.content.decode().splitlines()
+        assert lines
+        assert all(int(line.rsplit(' ', 1)[1]) > 0 for line in lines)
+        assert any(
+            'core.category.infra.fixtures:rows' in line
+            for line in lines
+        )
+
+    def test_invalid_parameters(self):
+        client = Client()
+        client.force_login(User.objects.create_user('admin', is_staff=True))
+
+        assert client.get('/admin/profile/?seconds=abc').status_code == 400
+        assert client.get('/admin/profile/?seconds=0').status_code == 400
+        assert client.get('/admin/profile/?seconds=61').status_code == 400
+        assert client.get('/admin/profile/?interval_ms=-1').status_code == 400
+
+    def test_only_get(self):
+        client = Client()
+        client.force_login(User.objects.create_user('admin', is_staff=True))
+        assert client.post('/admin/profile/?seconds=0.01').status_code == 405
+
+    @override_settings(ROOT_URLCONF='django_app.asgi_urls')
+    def test_profile_does_not_block_the_event_loop(self):
+        client = AsyncClient()
+        client.force_login(User.objects.create_user('admin', is_staff=True))
+
+        async def timed(request):
+            response = await request
+            return response, time.perf_counter()
+
+        async def run():
+            profiled = asyncio.ensure_future(timed(client.get('/admin/profile/', {'seconds': 0.5})))
+            await asyncio.sleep(0.05)
+            listed = await timed(client.get('/categories/'))
+            return await profiled, listed
+
+        (profile_response, profiled_at), (list_response, listed_at) = async_to_sync(run)()
+
+        assert profile_response.status_code == 200
+        assert list_response.status_code == 200
+        assert listed_at < profiled_at
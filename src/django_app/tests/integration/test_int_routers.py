@@ -0,0 +1,62 @@
+# pylint: disable=unexpected-keyword-arg,no-member
+
+import io
+
+import pytest
+from django.core.management import call_command
+from django.db import connections
+from django.test import RequestFactory, override_settings
+
+from core.category.domain.entities import Category
+from core.category.domain.repositories import CategoryRepository
+from core.category.infra.django_app.repositories import CategoryDjangoRepository
+from django_app.routers import ReplicaStickinessMiddleware, use_primary
+
+
+@pytest.fixture
+def replica(tmp_path):
+    # a second SQLite file standing in for a replica of the test database
+    connections.settings['replica_1'] = {
+        **connections['default'].settings_dict,
+        'NAME': str(tmp_path / 'replica.sqlite3'),
+    }
+    try:
+        with override_settings(DATABASE_REPLICAS=['replica_1']):
+            yield 'replica_1'
+    finally:
+        connections['replica_1'].close()
+        del connections['replica_1']
+        del connections.settings['replica_1']
+
+
+def names(repo: CategoryDjangoRepository):
+    return [item.name for item in repo.search(CategoryRepository.SearchParams(sort='name')).items]
+
+
+@pytest.mark.django_db(transaction=True)
+class TestReplicaRoutingInt:
+
+    def test_reads_from_the_replica_until_a_write(self, replica):  # pylint: disable=unused-argument
+        repo = CategoryDjangoRepository()
+        synced = Category(name='Synced')
+        repo.insert(synced)
+        call_command('sync_sqlite_replicas', stdout=io.StringIO())
+        repo.insert(Category(name='Not synced'))
+
+        assert names(repo) == ['Synced']
+        assert repo.find_by_id(synced.id) == synced
+        with use_primary():
+            assert names(repo) == ['Not synced', 'Synced']
+
+        reads = []
+
+        def view(_request):
+            reads.append(names(repo))
+            repo.insert(Category(name='Written'))
+            reads.append(names(repo))
+            return reads
+
+        ReplicaStickinessMiddleware(view)(RequestFactory().get('/categories/'))
+
+        assert reads == [['Synced'], ['Not synced', 'Synced', 'Written']]
+        assert names(repo) == ['Synced']
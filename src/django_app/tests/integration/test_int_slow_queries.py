@@ -0,0 +1,112 @@
+from io import StringIO
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.test import Client
+from model_bakery import baker
+
+from core.category.infra.django_app.models import CategoryModel
+from core.category.infra.django_app.repositories import CategoryDjangoAsyncRepository, CategoryDjangoRepository
+from django_app import container
+from django_app.slow_queries import SlowQueryRecorder
+
+
+@pytest.mark.django_db
+class TestSlowQueryRecorderInt:
+
+    def test_capture_search_queries(self):
+        baker.make(CategoryModel, name='Movie')
+        recorder = SlowQueryRecorder(threshold_ms=0)
+        repository = CategoryDjangoRepository(slow_query_recorder=recorder)
+
+        repository.search(CategoryDjangoRepository.SearchParams(
+            filter='mov', sort='name', per_page=5))
+
+        page_query, count_query = recorder.entries()
+        assert 'COUNT(*)' in count_query.sql
+        assert 'ORDER BY' in page_query.sql
+        assert page_query.params == ['%mov%']
+        assert page_query.duration_ms >= 0
+        assert page_query.context == {
+            'repository': 'CategoryDjangoRepository',
+            'operation': 'search',
+            'search_params': {
+                'page': 1, 'per_page': 5, 'sort': 'name', 'sort_dir': 'asc',
+                'filter': 'mov', 'fields': None
+            }
+        }
+        assert 'categories' in page_query.explain
+
+    def test_capture_async_search_queries(self):
+        baker.make(CategoryModel, name='Movie')
+        recorder = SlowQueryRecorder(threshold_ms=0)
+        repository = CategoryDjangoAsyncRepository(slow_query_recorder=recorder)
+
+        result = async_to_sync(repository.search)(CategoryDjangoAsyncRepository.SearchParams(
+            filter='mov', sort='name', per_page=5))
+
+        assert result.total == 1
+        count_query, page_query = recorder.entries()
+        assert 'COUNT(*)' in count_query.sql
+        assert 'ORDER BY' in page_query.sql
+        assert page_query.context['repository'] == 'CategoryDjangoAsyncRepository'
+        assert page_query.context['search_params']['filter'] == 'mov'
+        assert 'categories' in page_query.explain
+
+    def test_threshold_and_ring_buffer(self):
+        repository = CategoryDjangoRepository(
+            slow_query_recorder=SlowQueryRecorder(threshold_ms=60000))
+        repository.search(CategoryDjangoRepository.SearchParams())
+        assert not repository.slow_query_recorder.entries()
+
+        recorder = SlowQueryRecorder(threshold_ms=0, maxlen=1, explain=False)
+        baker.make(CategoryModel)
+        CategoryDjangoRepository(slow_query_recorder=recorder).search(
+            CategoryDjangoRepository.SearchParams())
+        entries = recorder.entries()
+        assert len(entries) == 1
+        assert entries[0].explain is None
+
+        recorder.clear()
+        assert not recorder.entries()
+
+    def test_without_recorder(self):
+        baker.make(CategoryModel)
+        result = CategoryDjangoRepository().search(CategoryDjangoRepository.SearchParams())
+        assert result.total == 1
+
+    def test_admin_endpoint(self):
+        recorder = container.slow_query_recorder()
+        recorder.clear()
+        threshold_ms = recorder.threshold_ms
+        recorder.threshold_ms = 0
+        try:
+            client = Client()
+            assert client.get('/admin/slow-queries/').status_code == 302
+
+            client.force_login(User.objects.create_user('admin', is_staff=True))
+            baker.make(CategoryModel)
+            client.get('/categories/?filter=a')
+            response = client.get('/admin/slow-queries/')
+        finally:
+            recorder.threshold_ms = threshold_ms
+            recorder.clear()
+
+        assert response.status_code == 200
+        body = response.json()
+        assert body['threshold_ms'] == 0
+        assert len(body['items']) == 2
+        assert body['items'][0]['context']['search_params']['filter'] == 'a'
+
+    def test_explain_category_search_command(self):
+        baker.make(CategoryModel, name='Movie')
+        out = StringIO()
+        call_command(
+            'explain_category_search', filter='mov', sort='name', per_page=5, stdout=out)
+        output = out.getvalue()
+
+        assert output.count('SELECT') == 2
+        assert "params: ['%mov%']" in output
+        assert 'duration: ' in output
@@ -0,0 +1,115 @@
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from django.core.exceptions import ImproperlyConfigured
+
+from django_app import database
+from django_app.database import POSTGRESQL, SQLITE, database_from_env, replicas_from_env
+
+DEFAULT_NAME = Path('db.sqlite3')
+
+
+class TestDatabaseFromEnvUnit(unittest.TestCase):
+
+    def test_defaults(self):
+        self.assertEqual(database_from_env({}, DEFAULT_NAME), {
+            'ENGINE': SQLITE,
+            'NAME': DEFAULT_NAME,
+            'CONN_MAX_AGE': database.DEFAULT_CONN_MAX_AGE,
+            'CONN_HEALTH_CHECKS': True,
+            'OPTIONS': {},
+            'SQLITE_PRAGMAS': database.SQLITE_PRAGMAS,
+        })
+
+    def test_persistent_connections(self):
+        arrange = [
+            ({'DB_CONN_MAX_AGE': '0'}, 0, True),
+            ({'DB_CONN_MAX_AGE': '300', 'DB_CONN_HEALTH_CHECKS': 'false'}, 300, False),
+            ({'DB_CONN_MAX_AGE': 'None', 'DB_CONN_HEALTH_CHECKS': '1'}, None, True),
+        ]
+        for environ, conn_max_age, health_checks in arrange:
+            with self.subTest(environ=environ):
+                settings = database_from_env(environ, DEFAULT_NAME)
+                self.assertEqual(settings['CONN_MAX_AGE'], conn_max_age)
+                self.assertEqual(settings['CONN_HEALTH_CHECKS'], health_checks)
+
+    def test_invalid_values(self):
+        for environ in [{'DB_CONN_MAX_AGE': 'forever'}, {'DB_CONN_HEALTH_CHECKS': 'maybe'}]:
+            with self.subTest(environ=environ), self.assertRaises(ImproperlyConfigured):
+                database_from_env(environ, DEFAULT_NAME)
+
+    def test_server_backend(self):
+        settings = database_from_env({
+            'DB_ENGINE': POSTGRESQL,
+            'DB_NAME': 'catalog',
+            'DB_USER': 'catalog',
+            'DB_HOST': 'db',
+            'DB_PORT': '5432',
+        }, DEFAULT_NAME)
+
+        self.assertEqual(settings['NAME'], 'catalog')
+        self.assertEqual(settings['USER'], 'catalog')
+        self.assertEqual(settings['PASSWORD'], '')
+        self.assertEqual(settings['HOST'], 'db')
+        self.assertEqual(settings['PORT'], '5432')
+        self.assertNotIn('SQLITE_PRAGMAS', settings)
+
+    def test_sqlite_pragmas(self):
+        settings = database_from_env(
+            {'DB_SQLITE_MMAP_SIZE': '0', 'DB_SQLITE_JOURNAL_MODE': 'delete'}, DEFAULT_NAME)
+
+        self.assertEqual(settings['SQLITE_PRAGMAS'], {
+            **database.SQLITE_PRAGMAS, 'mmap_size': '0', 'journal_mode': 'delete'
+        })
+        self.assertEqual(
+            database_from_env({'DB_SQLITE_TUNING': 'false'}, DEFAULT_NAME)['SQLITE_PRAGMAS'], {})
+
+    def test_sqlite_pragmas_reject_statements(self):
+        with self.assertRaises(ImproperlyConfigured):
+            database_from_env({'DB_SQLITE_SYNCHRONOUS': 'OFF; DROP TABLE categories'}, DEFAULT_NAME)
+
+    def test_pool(self):
+        environ = {'DB_ENGINE': POSTGRESQL, 'DB_POOL': 'true', 'DB_POOL_MAX_SIZE': '20'}
+
+        with mock.patch.object(database.django, 'VERSION', (5, 1, 0, 'final', 0)):
+            settings = database_from_env(environ, DEFAULT_NAME)
+
+        self.assertEqual(settings['CONN_MAX_AGE'], 0)
+        self.assertEqual(
+            settings['OPTIONS']['pool'], {'min_size': 2, 'max_size': 20, 'timeout': 10})
+
+    def test_pool_unsupported(self):
+        for environ in [
+            {'DB_POOL': 'true'},
+            {'DB_ENGINE': POSTGRESQL, 'DB_POOL': 'true'},
+        ]:
+            with self.subTest(environ=environ), \
+                    mock.patch.object(database.django, 'VERSION', (4, 2, 0, 'final', 0)), \
+                    self.assertRaises(ImproperlyConfigured):
+                database_from_env(environ, DEFAULT_NAME)
+
+
+class TestReplicasFromEnvUnit(unittest.TestCase):
+
+    def test_without_replicas(self):
+        self.assertEqual(replicas_from_env({}, database_from_env({}, DEFAULT_NAME)), {})
+
+    def test_sqlite_replicas(self):
+        primary = database_from_env({}, DEFAULT_NAME)
+        replicas = replicas_from_env({'DB_REPLICAS': 'replica1.sqlite3, replica2.sqlite3'}, primary)
+
+        self.assertEqual(list(replicas), ['replica_1', 'replica_2'])
+        self.assertEqual(replicas['replica_2']['NAME'], 'replica2.sqlite3')
+        self.assertEqual(replicas['replica_1']['TEST'], {'MIRROR': 'default'})
+        self.assertEqual(replicas['replica_1']['SQLITE_PRAGMAS'], primary['SQLITE_PRAGMAS'])
+
+    def test_server_replicas(self):
+        primary = database_from_env(
+            {'DB_ENGINE': POSTGRESQL, 'DB_HOST': 'db', 'DB_PORT': '5432'}, DEFAULT_NAME)
+        replicas = replicas_from_env({'DB_REPLICAS': 'replica1,replica2:6432'}, primary)
+
+        self.assertEqual(
+            [(replica['HOST'], replica['PORT']) for replica in replicas.values()],
+            [('replica1', '5432'), ('replica2', '6432')]
+        )
@@ -0,0 +1,205 @@
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import unittest
+from pathlib import Path
+
+from django_app.metrics import (
+    Counter,
+    Histogram,
+    InstrumentedRepository,
+    MultiProcessStore,
+    Registry,
+    render
+)
+
+
+class TestCounterUnit(unittest.TestCase):
+
+    def test_inc_is_thread_safe(self):
+        counter = Counter('requests_total', 'Requests', ['handler'])
+
+        def work():
+            for _ in range(10000):
+                counter.inc('get')
+
+        threads = [threading.Thread(target=work) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(counter.snapshot()['samples'], [[['get'], 40000.0]])
+
+
+class TestHistogramUnit(unittest.TestCase):
+
+    def test_observe(self):
+        histogram = Histogram('latency_seconds', 'Latency', ['handler'], buckets=[0.1, 1])
+        histogram.observe(0.05, 'get')
+        histogram.observe(0.1, 'get')
+        histogram.observe(0.5, 'get')
+        histogram.observe(3, 'get')
+
+        self.assertEqual(histogram.snapshot(), {
+            'type': 'histogram',
+            'help': 'Latency',
+            'labelnames': ['handler'],
+            'buckets': [0.1, 1],
+            'samples': [[['get'], [2, 1, 1, 3.65]]]
+        })
+
+
+class TestRenderUnit(unittest.TestCase):
+
+    def test_render(self):
+        registry = Registry()
+        counter = registry.register(Counter('requests_total', 'Requests', ['handler', 'status']))
+        histogram = registry.register(Histogram('latency_seconds', 'Latency', buckets=[0.5]))
+        counter.inc('Category"Resource.get', '200', amount=2)
+        histogram.observe(0.25)
+        histogram.observe(1)
+
+        self.assertEqual(render(registry.snapshot()), '\n'.join([
+            '# HELP requests_total Requests',
+            '# TYPE requests_total counter',
+            'requests_total{handler="Category\\"Resource.get",status="200"} 2.0',
+            '# HELP latency_seconds Latency',
+            '# TYPE latency_seconds histogram',
+            'latency_seconds_bucket{le="0.5"} 1.0',
+            'latency_seconds_bucket{le="+Inf"} 2.0',
+            'latency_seconds_sum 1.25',
+            'latency_seconds_count 2.0',
+        ]) + '\n')
+
+
+class TestMultiProcessStoreUnit(unittest.TestCase):
+
+    def test_collect_sums_every_process_snapshot(self):
+        registry = Registry()
+        counter = registry.register(Counter('requests_total', 'Requests', ['handler']))
+        histogram = registry.register(Histogram('latency_seconds', 'Latency', buckets=[0.5]))
+        counter.inc('get')
+        histogram.observe(0.25)
+
+        with tempfile.TemporaryDirectory() as directory:
+            store = MultiProcessStore(Path(directory))
+            store.flush(registry)
+            # another worker process
+            (Path(directory) / '1.json').write_text(
+                '{"requests_total": {"type": "counter", "help": "Requests", '
+                '"labelnames": ["handler"], "samples": [[["get"], 2.0], [["post"], 1.0]]}, '
+                '"latency_seconds": {"type": "histogram", "help": "Latency", '
+                '"labelnames": [], "buckets": [0.5], "samples": [[[], [0, 1, 2.0]]]}}',
+                encoding='utf-8'
+            )
+            (Path(directory) / '2.json').write_text('{corrupted', encoding='utf-8')
+            merged = store.collect()
+
+        self.assertEqual(
+            sorted(merged['requests_total']['samples']),
+            [[['get'], 3.0], [['post'], 1.0]]
+        )
+        self.assertEqual(merged['latency_seconds']['samples'], [[[], [1, 1, 2.25]]])
+
+    def test_start_flushes_in_the_background(self):
+        registry = Registry()
+        counter = registry.register(Counter('requests_total', 'Requests', ['handler']))
+        counter.inc('get')
+        with tempfile.TemporaryDirectory() as directory:
+            store = MultiProcessStore(Path(directory), flush_interval=0.01)
+            store.start(registry)
+            store.start(registry)
+            try:
+                for _ in range(500):
+                    if store.path.exists():
+                        break
+                    time.sleep(0.01)
+                self.assertEqual(list(Path(directory).glob('*.json')), [store.path])
+                self.assertTrue(store.path.name.startswith(f'{os.getpid()}-'))
+            finally:
+                counter.inc('get')
+                store.close(registry)
+
+            # at exit the counts of the process go to the dead totals
+            self.assertEqual([path.name for path in Path(directory).glob('*.json')], ['dead.json'])
+            self.assertEqual(store.collect()['requests_total']['samples'], [[['get'], 2.0]])
+
+    def test_collect_retires_dead_processes(self):
+        def snapshot(value):
+            return (
+                '{"requests_total": {"type": "counter", "help": "Requests", '
+                f'"labelnames": ["handler"], "samples": [[["get"], {value}]]}}}}'
+            )
+
+        dead_pid = _dead_pid()
+        with tempfile.TemporaryDirectory() as directory:
+            store = MultiProcessStore(Path(directory))
+            (Path(directory) / f'{dead_pid}-a.json').write_text(snapshot(5.0), encoding='utf-8')
+            (Path(directory) / f'{os.getpid()}-b.json').write_text(snapshot(1.0), encoding='utf-8')
+
+            self.assertEqual(store.collect()['requests_total']['samples'], [[['get'], 6.0]])
+            self.assertEqual(
+                sorted(path.name for path in Path(directory).glob('*.json')),
+                [f'{os.getpid()}-b.json', 'dead.json']
+            )
+            self.assertEqual(store.collect()['requests_total']['samples'], [[['get'], 6.0]])
+
+            # another process of the same pid adds to the counts instead of replacing them
+            (Path(directory) / f'{dead_pid}-c.json').write_text(snapshot(1.0), encoding='utf-8')
+            self.assertEqual(store.collect()['requests_total']['samples'], [[['get'], 7.0]])
+
+    def test_collect_drops_the_gauges_of_dead_processes(self):
+        def snapshot(connections):
+            return (
+                '{"requests_total": {"type": "counter", "help": "Requests", '
+                '"labelnames": ["handler"], "samples": [[["get"], 1.0]]}, '
+                '"db_connections_open": {"type": "gauge", "help": "Connections", '
+                f'"labelnames": ["alias"], "samples": [[["default"], {connections}]]}}}}'
+            )
+
+        # pylint: disable-next=consider-using-with
+        worker = subprocess.Popen([sys.executable, '-c', 'import time; time.sleep(60)'])
+        with tempfile.TemporaryDirectory() as directory:
+            store = MultiProcessStore(Path(directory))
+            (Path(directory) / f'{worker.pid}-a.json').write_text(snapshot(3.0), encoding='utf-8')
+            (Path(directory) / f'{os.getpid()}-b.json').write_text(snapshot(1.0), encoding='utf-8')
+            self.assertEqual(store.collect()['db_connections_open']['samples'], [[['default'], 4.0]])
+
+            worker.kill()
+            worker.wait()
+            merged = store.collect()
+            self.assertEqual(merged['db_connections_open']['samples'], [[['default'], 1.0]])
+            self.assertEqual(merged['requests_total']['samples'], [[['get'], 2.0]])
+            self.assertNotIn('db_connections_open', json.loads((Path(directory) / 'dead.json').read_text()))
+
+
+def _dead_pid() -> int:
+    process = subprocess.Popen([sys.executable, '-c', ''])  # pylint: disable=consider-using-with
+    process.wait()
+    return process.pid
+
+
+class TestInstrumentedRepositoryUnit(unittest.TestCase):
+
+    def test_proxy_times_operations(self):
+        class StubRepository:
+            sortable_fields = ['name']
+
+            def find_by_id(self, entity_id):
+                return entity_id
+
+            async def delete(self, entity_id):
+                return entity_id
+
+        repository = InstrumentedRepository(StubRepository())
+
+        self.assertEqual(repository.find_by_id('1'), '1')
+        self.assertEqual(asyncio.run(repository.delete('2')), '2')
+        self.assertEqual(repository.sortable_fields, ['name'])
+        self.assertFalse(hasattr(repository, 'insert'))
@@ -0,0 +1,50 @@
+import sys
+import threading
+import unittest
+
+from django_app.profiler import SamplingProfiler
+
+
+def busy_leaf(stop: threading.Event):
+    while not stop.is_set():
+        pass
+
+
+def busy_root(stop: threading.Event):
+    busy_leaf(stop)
+
+
+class TestSamplingProfilerUnit(unittest.TestCase):
+
+    def test_sample_collapses_stacks(self):
+        stop = threading.Event()
+        worker = threading.Thread(target=busy_root, args=(stop,))
+        worker.start()
+        try:
+            profiler = SamplingProfiler()
+            for _ in range(3):
+                profiler.sample(sys._current_frames(), {threading.get_ident()})  # pylint: disable=protected-access
+        finally:
+            stop.set()
+            worker.join()
+
+        lines = profiler.collapsed().splitlines()
+        # the worker may be sampled inside stop.is_set(), below busy_leaf
+        worker_samples = [
+            line.rsplit(' ', 1) for line in lines
+            if f'{__name__}:busy_root;{__name__}:busy_leaf' in line
+        ]
+        self.assertEqual(sum(int(count) for _, count in worker_samples), 3)
+        self.assertTrue(all(
+            stack.startswith('threading:_bootstrap;') for stack, _ in worker_samples
+        ))
+        self.assertFalse(any('test_sample_collapses_stacks' in line for line in lines))
+
+    def test_focus(self):
+        profiler = SamplingProfiler(focus='core.')
+        profiler.sample(sys._current_frames())  # pylint: disable=protected-access
+        self.assertEqual(profiler.collapsed(), '')
+
+        profiler = SamplingProfiler(focus=__name__)
+        profiler.sample(sys._current_frames())  # pylint: disable=protected-access
+        self.assertIn(f'{__name__}:test_focus', profiler.collapsed())
@@ -0,0 +1,96 @@
+from unittest import mock
+
+from asgiref.sync import async_to_sync, iscoroutinefunction
+from django.test import RequestFactory, SimpleTestCase, override_settings
+
+from django_app import routers
+from django_app.routers import ReplicaRouter, ReplicaStickinessMiddleware, use_primary
+
+REPLICAS = ['replica_1', 'replica_2']
+
+
+@override_settings(DATABASE_REPLICAS=REPLICAS)
+class TestReplicaRouterUnit(SimpleTestCase):
+
+    def setUp(self):
+        self.router = ReplicaRouter()
+
+    def test_reads_go_to_the_replicas(self):
+        reads = {self.router.db_for_read(None) for _ in range(100)}
+        self.assertEqual(reads, set(REPLICAS))
+
+    def test_writes_go_to_the_primary(self):
+        self.assertEqual(self.router.db_for_write(None), 'default')
+
+    def test_reads_without_replicas(self):
+        with override_settings(DATABASE_REPLICAS=[]):
+            self.assertEqual(self.router.db_for_read(None), 'default')
+
+    def test_use_primary(self):
+        with use_primary():
+            self.assertEqual(self.router.db_for_read(None), 'default')
+        self.assertIn(self.router.db_for_read(None), REPLICAS)
+
+    def test_reads_inside_a_transaction_go_to_the_primary(self):
+        with mock.patch.object(routers, 'connections', {'default': mock.Mock(in_atomic_block=True)}):
+            self.assertEqual(self.router.db_for_read(None), 'default')
+
+    def test_migrations_skip_the_replicas(self):
+        self.assertTrue(self.router.allow_migrate('default', 'category'))
+        self.assertFalse(self.router.allow_migrate('replica_1', 'category'))
+
+    def test_writes_outside_requests_do_not_stick(self):
+        self.router.db_for_write(None)
+        self.assertIn(self.router.db_for_read(None), REPLICAS)
+
+
+@override_settings(DATABASE_REPLICAS=REPLICAS)
+class TestReplicaStickinessMiddlewareUnit(SimpleTestCase):
+
+    def setUp(self):
+        self.router = ReplicaRouter()
+
+    def dispatch(self, method: str, write: bool):
+        reads = []
+
+        def view(_request):
+            reads.append(self.router.db_for_read(None))
+            if write:
+                self.router.db_for_write(None)
+            reads.append(self.router.db_for_read(None))
+            return reads
+
+        ReplicaStickinessMiddleware(view)(RequestFactory().generic(method, '/categories/'))
+        return reads
+
+    def test_reads_after_a_write_stick_to_the_primary(self):
+        before, after = self.dispatch('GET', write=True)
+        self.assertIn(before, REPLICAS)
+        self.assertEqual(after, 'default')
+
+        # the next request reads from the replicas again
+        before, after = self.dispatch('GET', write=False)
+        self.assertIn(before, REPLICAS)
+        self.assertIn(after, REPLICAS)
+
+    def test_unsafe_methods_read_from_the_primary(self):
+        for method in ['POST', 'PUT', 'PATCH', 'DELETE']:
+            with self.subTest(method=method):
+                self.assertEqual(self.dispatch(method, write=False), ['default', 'default'])
+
+    def test_async_requests(self):
+        reads = []
+
+        async def view(_request):
+            reads.append(self.router.db_for_read(None))
+            self.router.db_for_write(None)
+            reads.append(self.router.db_for_read(None))
+            return reads
+
+        middleware = ReplicaStickinessMiddleware(view)
+        self.assertTrue(iscoroutinefunction(middleware))
+        async_to_sync(middleware)(RequestFactory().get('/categories/'))
+
+        self.assertIn(reads[0], REPLICAS)
+        self.assertEqual(reads[1], 'default')
+        self.assertIn(self.router.db_for_read(None), REPLICAS)